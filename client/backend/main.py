@@ -9,14 +9,20 @@ Run:
   uvicorn main:app --host 0.0.0.0 --port 18000 --reload
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import uuid
 import os
+import sys
+import json
+import signal
 import asyncio
+import contextlib
+from collections import OrderedDict
 from pathlib import Path
 
 # ===== FastAPI 앱 초기화 =====
@@ -33,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Preview-Info"],  # 미리듣기 메타데이터
 )
 
 # ===== 상수 및 설정 =====
@@ -41,9 +48,27 @@ OUTPUT_DIR = Path("./outputs")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# 믹스 엔진 (server/mix_engine.py) 위치 - 환경변수로 변경 가능
+MIX_ENGINE_DIR = Path(os.getenv("MIX_ENGINE_DIR", Path(__file__).resolve().parents[2] / "server"))
+# 엔진 스크립트 하위 프로세스 환경 (한글 진행 메시지가 깨지지 않도록 stdout을 UTF-8로)
+def engine_env() -> Dict[str, str]:
+    return {**os.environ, "DAW_TRACKS_DIR": str(UPLOAD_DIR.resolve()), "PYTHONIOENCODING": "utf-8"}
+
+# 동시에 실행할 믹스 작업 수 (Demucs/rubberband가 무거우므로 기본 1개)
+MIX_MAX_CONCURRENT = int(os.getenv("MIX_MAX_CONCURRENT", "1"))
+
 # 작업 상태 저장 (실제 서비스에서는 Redis 등 사용)
 jobs: Dict[str, Dict[str, Any]] = {}
 
+# 스트리밍 업로드 중에 계산한 BPM/비트 (fileId -> 결과, analyze_beats가 beat_track 대신 사용)
+# 최근 STREAM_ANALYSES_MAX개만 보관 (밀려난 파일은 analyze_beats가 beat_track으로 다시 계산)
+STREAM_ANALYSES_MAX = int(os.getenv("STREAM_ANALYSES_MAX", "256"))
+stream_analyses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# 작업별 진행률 구독자 (SSE 연결마다 하나의 Queue)
+job_subscribers: Dict[str, List[asyncio.Queue]] = {}
+mix_semaphore = asyncio.Semaphore(MIX_MAX_CONCURRENT)
+
 
 # ===== Pydantic 모델 =====
 
@@ -59,13 +84,34 @@ class StemRequest(BaseModel):
 
 
 class MixRequest(BaseModel):
-    """트랜지션 믹스 요청"""
+    """트랜지션 믹스 요청 (trackA/trackB: {"fileId": ..., "bpm": 선택})"""
     trackA: Dict[str, Any]
     trackB: Dict[str, Any]
     transitionType: str = "blend"  # blend | drop
     transitionDuration: float = 8.0
     syncBpm: bool = True
     targetBpm: Optional[float] = None
+    bridgeBars: int = 4
+    params: Optional[Dict[str, Any]] = None  # 믹스 파라미터 덮어쓰기 (server/pipeline.py TUNABLE_PARAMS)
+    tier: Optional[str] = None  # 품질 티어 draft | standard | master (server/config.py QUALITY_TIERS)
+    progressive: bool = False  # 렌더링 중에 앞부분부터 스트리밍 (전환 위치가 정해지면 streamUrl 재생 가능)
+    output: Optional[str] = None  # wav | manifest (전환 구간만 렌더링, 전체 WAV는 스트리밍 요청 때 생성)
+
+
+class BatchMixRequest(BaseModel):
+    """여러 트랜지션 믹스를 한 번에 요청 (pairs: [{"trackA": {...}, "trackB": {...}}, ...], 공유 트랙은 한 번만 분석/분리)"""
+    pairs: List[Dict[str, Any]]
+    params: Optional[Dict[str, Any]] = None
+    tier: Optional[str] = None
+
+
+class PreviewRequest(BaseModel):
+    """트랜지션 미리듣기 요청 (전환 구간만 렌더링, 값이 없으면 엔진 config 기본값)"""
+    trackA: Dict[str, Any]
+    trackB: Dict[str, Any]
+    preSec: Optional[float] = None
+    postSec: Optional[float] = None
+    sampleRate: Optional[int] = None
 
 
 class HealthResponse(BaseModel):
@@ -133,23 +179,240 @@ async def upload_audio(file: UploadFile = File(...)):
     channels = 2
     
     try:
-        import librosa
-        y, sr = librosa.load(str(file_path), sr=None, mono=False)
-        duration = librosa.get_duration(y=y, sr=sr)
-        sample_rate = sr
-        channels = 1 if y.ndim == 1 else y.shape[0]
+        # 디코딩 결과를 PCM 캐시에 저장해 두므로 이후 분석/믹싱은 MP3 디코드를 건너뜀
+        pcm_cache = await run_in_threadpool(load_engine_module, "utils.pcm_cache")
+        info = await run_in_threadpool(pcm_cache.audio_info, str(file_path))
+        duration = info["duration"]
+        sample_rate = info["sr"]
+        channels = info["channels"]
     except Exception as e:
         print(f"Metadata extraction failed: {e}")
     
+    prefetcher.enqueue(file_path.name)
     return {
         "fileId": file_id,
         "filename": file.filename,
         "duration": duration,
         "sampleRate": sample_rate,
         "channels": channels,
+        "prefetch": prefetcher.state.get(file_path.name, {}).get("status", "disabled"),
+    }
+
+
+@app.post("/api/transition/upload/stream")
+async def upload_audio_stream(request: Request, filename: str):
+    """
+    오디오 파일 스트리밍 업로드 (요청 본문 = 파일 바이트 그대로, ?filename=track.mp3)
+    받는 대로 디코딩/분석해서 업로드가 끝나면 잠정 BPM/비트/파형을 바로 반환합니다.
+    (multipart는 핸들러 전에 본문 전체를 받으므로 원시 본문으로 받음)
+    디코딩한 PCM은 엔진의 PCM 캐시에 저장되어 이후 분석/믹싱이 다시 디코딩하지 않습니다.
+    """
+    file_id = str(uuid.uuid4())
+    file_ext = Path(filename).suffix.lower()
+
+    if file_ext not in [".wav", ".mp3", ".flac", ".ogg"]:
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+
+    file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
+    analyzer_stream = await run_in_threadpool(load_engine_module, "services.analyzer_stream")
+    upload = analyzer_stream.UploadAnalyzer(str(file_path))
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(upload.feed, chunk)
+        analysis = await run_in_threadpool(upload.finish)
+    except Exception as e:
+        upload.abort()
+        raise HTTPException(status_code=400, detail=f"Upload decode failed: {str(e)}")
+
+    stream_analyses[file_id] = analysis
+    while len(stream_analyses) > STREAM_ANALYSES_MAX:
+        stream_analyses.popitem(last=False)
+    prefetcher.enqueue(file_path.name)
+    return {
+        "fileId": file_id,
+        "filename": filename,
+        "duration": analysis["duration"],
+        "sampleRate": analysis["sampleRate"],
+        "channels": analysis["channels"],
+        "prefetch": prefetcher.state.get(file_path.name, {}).get("status", "disabled"),
+        "analysis": {key: analysis[key] for key in ("bpm", "beats", "downbeats", "rmsDb", "waveformData", "provisional")},
     }
 
 
+# ===== 업로드 후 선행 처리 =====
+
+# 업로드된 트랙의 분석 + 스템 분리를 믹스 요청 전에 미리 실행 (server/prefetch.py, 자원 예산은 엔진 config PREFETCH_*)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "1") == "1"
+PREFETCH_POLL_SEC = 5.0  # 예산 초과 시 재확인 / 실행 중 메모리 확인 주기 (초)
+
+
+class PrefetchScheduler:
+    """
+    선행 처리 대기열 (업로드 순서대로 한 번에 하나, 낮은 우선순위 프로세스)
+    - 자원 예산(services/prefetch.budget_allows) 안에서만 시작하고, 실행 중 메모리가 부족해지면 중단 후 다시 대기
+    - 믹스 작업이 있는 동안은 시작하지 않고, 실행 중이면 프로세스 그룹(Demucs 포함)을 일시정지
+      믹스가 같은 트랙의 스템을 분리하면 중복 Demucs를 피하려고 중단 (믹스 후 남은 단계만 다시, 단계별 캐시)
+      GPU(CUDA)로 스템을 분리 중이면 일시정지해도 VRAM이 그대로 잡혀 있으므로 역시 중단
+    """
+
+    def __init__(self):
+        self.queue: List[str] = []
+        self.state: Dict[str, Dict[str, Any]] = {}  # 트랙 파일명 -> {"status", "progress", "message" ...}
+        self.process = None
+        self.current: Optional[str] = None
+        self.paused = False
+        self.cancelled = False
+        self.gpu = False  # 실행 중인 선행 처리가 GPU로 스템을 분리하는 중인지
+        self.interactive = 0
+        self.wake = asyncio.Event()
+        self.task = None
+
+    def enqueue(self, track: str):
+        if not PREFETCH_ENABLED:
+            return
+        if track not in self.queue and track != self.current:
+            self.queue.append(track)
+            self.state[track] = {"status": "queued", "progress": 0, "message": "선행 처리 대기 중..."}
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        self.wake.set()
+
+    async def run(self):
+        prefetch = await run_in_threadpool(load_engine_module, "services.prefetch")
+        while True:
+            if not self.queue or self.interactive:
+                self.wake.clear()
+                await self.wake.wait()
+                continue
+            allowed, reason = await run_in_threadpool(prefetch.budget_allows)
+            if not allowed:
+                self.state[self.queue[0]]["message"] = f"자원 대기 중 ({reason})"
+                await asyncio.sleep(PREFETCH_POLL_SEC)
+                continue
+            await self.run_track(self.queue.pop(0), prefetch)
+
+    async def run_track(self, track: str, prefetch):
+        self.current, self.paused, self.cancelled, self.gpu = track, False, False, False
+        self.state[track] = {"status": "running", "progress": 0, "message": "선행 처리 시작..."}
+        env = engine_env()
+        result = None
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, "prefetch.py", json.dumps({"trackId": track}),
+                cwd=str(MIX_ENGINE_DIR),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=True,  # Demucs 자식까지 프로세스 그룹으로 일시정지/중단
+            )
+            watchdog = asyncio.create_task(self.watch_memory(prefetch))
+            try:
+                async for raw_line in self.process.stdout:
+                    line = raw_line.decode("utf-8", errors="replace").strip()
+                    if not line.startswith("{"):
+                        continue
+                    try:
+                        msg = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if "prefetched" in msg or ("error" in msg and "progress" not in msg):
+                        result = msg
+                    elif msg.get("stage") == "prefetch":
+                        self.state[track].update(progress=msg["progress"], message=msg.get("message", ""))
+                        if "device" in msg:
+                            self.gpu = msg["device"] == "cuda"
+                    elif "progress" in msg:
+                        # 스템 분리 진행률
+                        self.state[track]["subProgress"] = msg["progress"]
+                await self.process.wait()
+            finally:
+                watchdog.cancel()
+        except Exception as e:
+            result = {"error": str(e)}
+        finally:
+            self.process, self.current, self.paused, self.gpu = None, None, False, False
+
+        if self.cancelled:
+            self.queue.insert(0, track)
+            self.state[track] = {"status": "queued", "progress": 0, "message": "중단됨, 다시 대기 중..."}
+        elif result is not None and "prefetched" in result:
+            self.state[track] = {"status": "completed", "progress": 100, "bpm": result["bpm"], "stems": result["stems"]}
+        else:
+            error = result["error"] if result else "Prefetch exited without result"
+            self.state[track] = {"status": "failed", "error": error}
+            print(f"Prefetch failed ({track}): {error}")
+
+    async def watch_memory(self, prefetch):
+        """실행 중(일시정지 포함) 가용 메모리가 예산 하한 아래로 내려가면 중단"""
+        while True:
+            await asyncio.sleep(PREFETCH_POLL_SEC)
+            allowed, reason = await run_in_threadpool(prefetch.budget_allows, True)
+            if not allowed:
+                print(f"Prefetch stopped ({self.current}): {reason}")
+                self.stop()
+                return
+
+    def send_signal(self, sig):
+        try:
+            os.killpg(self.process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        """실행 중인 선행 처리 중단 (대기열 앞으로 되돌림)"""
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.cancelled = True
+        if hasattr(os, "killpg"):
+            self.send_signal(signal.SIGTERM)
+            if self.paused:
+                self.send_signal(signal.SIGCONT)
+        else:
+            self.process.terminate()
+
+    @contextlib.asynccontextmanager
+    async def interactive_job(self, stem_tracks=()):
+        """
+        사용자 요청 작업(믹스 등) 동안 선행 처리 양보
+        stem_tracks: 이 작업이 스템을 분리할 수 있는 트랙 (그 트랙을 처리 중이면 일시정지 대신 중단)
+        GPU 스템 분리 중이면 트랙과 관계없이 중단 (정지한 프로세스의 VRAM이 믹스의 Demucs와 겹치지 않도록)
+        """
+        self.interactive += 1
+        if self.process is not None:
+            if self.current in stem_tracks or self.gpu or not hasattr(signal, "SIGSTOP"):
+                self.stop()
+            elif not self.paused:
+                self.send_signal(signal.SIGSTOP)
+                self.paused = True
+                self.state[self.current].update(status="paused", message="믹스 작업 중 일시정지")
+        try:
+            yield
+        finally:
+            self.interactive -= 1
+            if not self.interactive:
+                if self.paused and self.process is not None:
+                    self.send_signal(signal.SIGCONT)
+                    self.paused = False
+                    self.state[self.current]["status"] = "running"
+                self.wake.set()
+
+
+prefetcher = PrefetchScheduler()
+
+
+@app.get("/api/transition/prefetch/{file_id}")
+async def prefetch_status(file_id: str):
+    """업로드 후 선행 처리(분석 + 스템 분리) 상태"""
+    file_path = find_file(file_id)
+    if not file_path:
+        raise HTTPException(status_code=404, detail="File not found")
+    state = prefetcher.state.get(file_path.name)
+    if state is None:
+        return {"fileId": file_id, "status": "none" if PREFETCH_ENABLED else "disabled"}
+    return {"fileId": file_id, **state}
+
+
 # ===== 비트 분석 =====
 
 @app.post("/api/transition/analyze")
@@ -169,13 +432,20 @@ async def analyze_beats(request: AnalyzeRequest):
         import librosa
         import numpy as np
         
-        # 오디오 로드
-        y, sr = librosa.load(str(file_path), sr=22050, mono=True)
+        # 오디오 로드 (엔진의 PCM 캐시 사용)
+        pcm_cache = await run_in_threadpool(load_engine_module, "utils.pcm_cache")
+        y, sr = await run_in_threadpool(pcm_cache.load_audio, str(file_path), 22050)
         duration = librosa.get_duration(y=y, sr=sr)
         
-        # BPM 추출
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-        beat_times = librosa.frames_to_time(beats, sr=sr).tolist()
+        # BPM 추출 (스트리밍 업로드였으면 업로드 중에 같은 계산을 끝냄)
+        streamed = stream_analyses.get(request.fileId)
+        if streamed is not None:
+            stream_analyses.move_to_end(request.fileId)
+        if streamed is not None and streamed["bpm"] is not None:
+            tempo, beat_times = streamed["bpm"], streamed["beats"]
+        else:
+            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+            beat_times = librosa.frames_to_time(beats, sr=sr).tolist()
         
         # 다운비트 추출 (4박자 기준)
         downbeats = [i for i in range(0, len(beat_times), 4)]
@@ -184,15 +454,22 @@ async def analyze_beats(request: AnalyzeRequest):
         hop_length = len(y) // 2000
         peaks = np.abs(y[::hop_length]).tolist()[:2000]
         
-        # 기본 섹션 (실제로는 더 정교한 분석 필요)
-        sections = [
-            {"name": "Intro", "start": 0, "end": duration * 0.1},
-            {"name": "Verse", "start": duration * 0.1, "end": duration * 0.3},
-            {"name": "Chorus", "start": duration * 0.3, "end": duration * 0.5},
-            {"name": "Verse", "start": duration * 0.5, "end": duration * 0.7},
-            {"name": "Chorus", "start": duration * 0.7, "end": duration * 0.9},
-            {"name": "Outro", "start": duration * 0.9, "end": duration},
-        ]
+        # 섹션 (엔진의 비트 단위 구조 분석, 결과는 엔진 분석 캐시에 저장되어 믹싱에서 재사용)
+        # 실패해도 비트 분석 결과는 반환 (섹션만 비움)
+        try:
+            analysis_cache = await run_in_threadpool(load_engine_module, "services.analysis_cache")
+            structure = await run_in_threadpool(analysis_cache.get_cached_structure, str(file_path))
+            sections = structure["sections"]
+        except Exception as e:
+            print(f"Structure analysis failed: {e}")
+            sections = []
+
+        # 유사 트랙 추천 인덱스에 증분 추가 (실패해도 분석 결과는 반환)
+        try:
+            similarity = await run_in_threadpool(load_engine_module, "services.track_similarity")
+            await run_in_threadpool(similarity.index_track, str(file_path), y, sr)
+        except Exception as e:
+            print(f"Similarity indexing failed: {e}")
         
         return {
             "fileId": request.fileId,
@@ -210,6 +487,28 @@ async def analyze_beats(request: AnalyzeRequest):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+# ===== 유사 트랙 추천 =====
+
+@app.get("/api/transition/similar/{file_id}")
+async def similar_tracks(file_id: str, k: int = 10):
+    """
+    음색이 비슷한 다음 곡 추천 (엔진의 임베딩 인덱스, 분석한 업로드 중에서 검색)
+    인덱스에 없는 트랙이면 임베딩을 먼저 계산합니다.
+    """
+    file_path = find_file(file_id)
+    if not file_path:
+        raise HTTPException(status_code=404, detail="File not found")
+    if k < 1 or k > 100:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 100")
+
+    similarity = await run_in_threadpool(load_engine_module, "services.track_similarity")
+    results = await run_in_threadpool(similarity.similar_tracks, file_path.name, k)
+    return {
+        "fileId": file_id,
+        "similar": [{"fileId": Path(item["trackId"]).stem, "score": item["score"]} for item in results],
+    }
+
+
 # ===== 스템 분리 =====
 
 @app.post("/api/transition/stems")
@@ -289,22 +588,464 @@ async def get_stem_status(job_id: str):
 @app.post("/api/transition/mix")
 async def create_transition_mix(request: MixRequest):
     """
-    트랜지션 믹스 생성 (PyRubberband 기반 시간 스트레칭)
+    트랜지션 믹스 생성 요청
+    server/mix_engine.py를 백그라운드 작업으로 실행하고 즉시 mixId를 반환합니다.
+    진행률은 /api/transition/mix/{mix_id}/events (SSE)로 푸시됩니다.
     """
-    # TODO: 실제 믹스 로직 구현
+    file_a = find_file(str(request.trackA.get("fileId", "")))
+    file_b = find_file(str(request.trackB.get("fileId", "")))
+    if not file_a or not file_b:
+        raise HTTPException(status_code=404, detail="File not found")
+
     mix_id = str(uuid.uuid4())
-    
+    jobs[mix_id] = {
+        "status": "queued",
+        "type": "mix",
+        "progress": 0,
+        "message": "대기 중...",
+    }
+
+    # 엔진 입력 (이미 분석된 BPM이 있으면 함께 넘겨 재분석 생략)
+    engine_input = {
+        "trackA": file_a.name,
+        "trackB": file_b.name,
+        "mixType": request.transitionType,
+        "bridgeBars": request.bridgeBars,
+        "bpmA": request.trackA.get("bpm"),
+        "bpmB": request.trackB.get("bpm"),
+        "params": request.params,
+        "tier": request.tier,
+        "progressive": request.progressive,
+        "output": request.output,
+    }
+    # 매니페스트의 전환 구간이 믹스 캐시에서 지워지면 같은 입력으로 다시 렌더링 (restore_manifest_segments)
+    jobs[mix_id]["engineInput"] = engine_input
+    asyncio.create_task(run_mix_job(mix_id, engine_input))
+
     return {
         "mixId": mix_id,
+        "status": "queued",
+        "statusUrl": f"/api/transition/mix/{mix_id}",
+        "eventsUrl": f"/api/transition/mix/{mix_id}/events",
+        "streamUrl": f"/api/transition/stream/{mix_id}",
+    }
+
+
+async def run_mix_job(mix_id: str, engine_input: Dict[str, Any]):
+    """
+    mix_engine.py 실행 (백그라운드)
+    stdout의 진행률 JSON을 파싱해 구독자에게 푸시합니다.
+    스템/비트 분석은 엔진 쪽 캐시(output/htdemucs_ft_shifts2, output/analysis)를 재사용합니다.
+    """
+    async with mix_semaphore, prefetcher.interactive_job([engine_input["trackA"], engine_input["trackB"]]):
+        update_job(mix_id, status="processing", message="믹스 엔진 시작...")
+        env = engine_env()
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "mix_engine.py", json.dumps(engine_input),
+                cwd=str(MIX_ENGINE_DIR),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+
+            result = None
+            async for raw_line in process.stdout:
+                line = raw_line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    msg = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if "mixUrl" in msg or "manifest" in msg or ("error" in msg and "progress" not in msg):
+                    result = msg
+                elif msg.get("stage") == "commit":
+                    # 점진적 출력: 엔진이 파일에 확정한 범위 (stream_audio가 이 범위까지 바로 보냄)
+                    update_job(
+                        mix_id,
+                        partialPath=str(MIX_ENGINE_DIR / "output" / msg["partialUrl"]),
+                        committedBytes=msg["committedBytes"],
+                        committedDuration=msg["committedSec"],
+                    )
+                elif msg.get("stage") == "mix":
+                    update_job(mix_id, progress=msg["progress"], message=msg.get("message", ""))
+                elif "progress" in msg:
+                    # 스템 분리 등 하위 작업 진행률 (전체 진행률은 건드리지 않음)
+                    update_job(mix_id, subProgress=msg["progress"], message=msg.get("message", ""))
+
+            await process.wait()
+
+            if result is None:
+                raise RuntimeError(f"Mix engine exited with code {process.returncode}")
+            if "error" in result:
+                raise RuntimeError(result["error"])
+
+            update_job(
+                mix_id,
+                status="completed",
+                progress=100,
+                message="믹싱 완료!",
+                # 매니페스트 출력이면 전체 WAV는 stream_audio에서 처음 요청될 때 생성
+                path=str(MIX_ENGINE_DIR / "output" / result["mixUrl"]) if "mixUrl" in result else None,
+                manifest=result.get("manifest"),
+                duration=result.get("duration"),
+                mixType=result.get("mixType"),
+                bpmA=result.get("bpmA"),
+                bpmB=result.get("bpmB"),
+                streamUrl=f"/api/transition/stream/{mix_id}",
+            )
+        except Exception as e:
+            update_job(mix_id, status="failed", error=str(e))
+
+
+def update_job(job_id: str, **fields):
+    """작업 상태 갱신 후 SSE 구독자에게 스냅샷 전달"""
+    jobs[job_id].update(fields)
+    snapshot = public_job(job_id)
+    for queue in job_subscribers.get(job_id, []):
+        queue.put_nowait(snapshot)
+
+
+def public_job(job_id: str) -> Dict[str, Any]:
+    """클라이언트에 노출할 작업 상태 (서버 내부 경로 제외)"""
+    return {k: v for k, v in jobs[job_id].items() if k not in ("path", "partialPath", "manifest", "engineInput")}
+
+
+async def restore_manifest_segments(mix_id: str):
+    """
+    매니페스트가 참조하는 전환 구간 WAV가 믹스 캐시 예산 때문에 지워졌으면 같은 요청으로 다시 렌더링
+    (캐시 키가 내용 주소라 같은 경로에 다시 생기고, 스템/분석 캐시를 재사용하므로 보통 전환 구간 렌더링만)
+    """
+    job = jobs[mix_id]
+    manifest_lib = await run_in_threadpool(load_engine_module, "utils.mix_manifest")
+    if not await run_in_threadpool(manifest_lib.missing_segments, job["manifest"]):
+        return
+    if not job.get("engineInput"):
+        raise HTTPException(status_code=410, detail="Rendered segment was evicted from the mix cache")
+    await run_mix_job(mix_id, job["engineInput"])
+    if jobs[mix_id]["status"] != "completed":
+        raise HTTPException(status_code=500, detail=f"Re-render failed: {jobs[mix_id].get('error')}")
+
+
+@app.post("/api/transition/batch")
+async def create_batch_mix(request: BatchMixRequest):
+    """
+    트랜지션 믹스 여러 개를 한 번에 생성 (server/batch_mixer.py, 비동기)
+    진행률/상태는 믹스와 같은 /api/transition/mix/{batch_id}(/events)로 조회하고,
+    완료되면 "mixes"에 쌍 순서대로 개별 mixId/streamUrl이 채워집니다.
+    """
+    pairs = []
+    for pair in request.pairs:
+        track_a = pair.get("trackA") or {}
+        track_b = pair.get("trackB") or {}
+        file_a = find_file(str(track_a.get("fileId", "")))
+        file_b = find_file(str(track_b.get("fileId", "")))
+        if not file_a or not file_b:
+            raise HTTPException(status_code=404, detail="File not found")
+        pairs.append({
+            "trackA": file_a.name,
+            "trackB": file_b.name,
+            "bpmA": track_a.get("bpm"),
+            "bpmB": track_b.get("bpm"),
+        })
+    if not pairs:
+        raise HTTPException(status_code=400, detail="pairs is empty")
+
+    batch_id = str(uuid.uuid4())
+    jobs[batch_id] = {
+        "status": "queued",
+        "type": "batch",
+        "progress": 0,
+        "message": "대기 중...",
+    }
+    engine_input = {"pairs": pairs, "params": request.params, "tier": request.tier}
+    asyncio.create_task(run_batch_job(batch_id, engine_input))
+
+    return {
+        "batchId": batch_id,
+        "status": "queued",
+        "statusUrl": f"/api/transition/mix/{batch_id}",
+        "eventsUrl": f"/api/transition/mix/{batch_id}/events",
+    }
+
+
+async def run_batch_job(batch_id: str, engine_input: Dict[str, Any]):
+    """
+    batch_mixer.py 실행 (백그라운드)
+    "batch" 진행률만 전체 진행률로 쓰고, 쌍별 렌더링/스템 분리 진행률은 subProgress로 전달합니다.
+    """
+    tracks = [track for pair in engine_input["pairs"] for track in (pair["trackA"], pair["trackB"])]
+    async with mix_semaphore, prefetcher.interactive_job(tracks):
+        update_job(batch_id, status="processing", message="배치 믹스 시작...")
+        env = engine_env()
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "batch_mixer.py", json.dumps(engine_input),
+                cwd=str(MIX_ENGINE_DIR),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+
+            result = None
+            async for raw_line in process.stdout:
+                line = raw_line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    msg = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if "mixes" in msg or ("error" in msg and "progress" not in msg and "mixUrl" not in msg):
+                    result = msg
+                elif msg.get("stage") == "batch":
+                    update_job(batch_id, progress=msg["progress"], message=msg.get("message", ""))
+                elif "progress" in msg:
+                    update_job(batch_id, subProgress=msg["progress"])
+
+            await process.wait()
+
+            if result is None:
+                raise RuntimeError(f"Batch mixer exited with code {process.returncode}")
+            if "error" in result:
+                raise RuntimeError(result["error"])
+
+            # 쌍마다 완료된 믹스 작업으로 등록 (기존 스트리밍/상태 API를 그대로 사용)
+            mixes = []
+            for mix in result["mixes"]:
+                if "error" in mix:
+                    mixes.append({"status": "failed", "error": mix["error"]})
+                    continue
+                mix_id = str(uuid.uuid4())
+                jobs[mix_id] = {
+                    "status": "completed",
+                    "type": "mix",
+                    "progress": 100,
+                    "message": "믹싱 완료!",
+                    "path": str(MIX_ENGINE_DIR / "output" / mix["mixUrl"]),
+                    "duration": mix.get("duration"),
+                    "mixType": mix.get("mixType"),
+                    "bpmA": mix.get("bpmA"),
+                    "bpmB": mix.get("bpmB"),
+                    "streamUrl": f"/api/transition/stream/{mix_id}",
+                }
+                mixes.append({"mixId": mix_id, **public_job(mix_id)})
+
+            update_job(
+                batch_id,
+                status="completed",
+                progress=100,
+                message="배치 믹싱 완료!",
+                mixes=mixes,
+                uniqueTracks=result.get("uniqueTracks"),
+            )
+        except Exception as e:
+            update_job(batch_id, status="failed", error=str(e))
+
+
+@app.get("/api/transition/mix/{mix_id}")
+async def get_mix_status(mix_id: str):
+    """
+    믹스 작업 상태 조회 (SSE를 쓸 수 없는 클라이언트용)
+    """
+    if mix_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return public_job(mix_id)
+
+
+@app.get("/api/transition/mix/{mix_id}/manifest")
+async def get_mix_manifest(mix_id: str):
+    """
+    매니페스트 출력 믹스의 배치 정보 (클라이언트 플레이어가 직접 재생할 때)
+    track 구간에는 원본 업로드 파일의 streamUrl, rendered 구간에는 전환 구간 WAV의 streamUrl을 붙여 반환합니다.
+    """
+    job = jobs.get(mix_id)
+    if not job or not job.get("manifest"):
+        raise HTTPException(status_code=404, detail="Manifest not found")
+
+    segments = []
+    for i, segment in enumerate(job["manifest"]["segments"]):
+        if segment["source"] == "track":
+            stream_url = f"/api/transition/stream/{Path(segment['track']).stem}"
+        else:
+            stream_url = f"/api/transition/stream/{mix_id}/segments/{i}"
+        segments.append({**segment, "streamUrl": stream_url})
+    return {**job["manifest"], "segments": segments}
+
+
+@app.get("/api/transition/stream/{mix_id}/segments/{index}")
+async def stream_manifest_segment(mix_id: str, index: int):
+    """매니페스트의 rendered 구간 WAV (믹스 캐시에서 지워졌으면 같은 요청으로 다시 렌더링)"""
+    job = jobs.get(mix_id)
+    segments = (job or {}).get("manifest", {}).get("segments", [])
+    if not 0 <= index < len(segments) or segments[index]["source"] != "rendered":
+        raise HTTPException(status_code=404, detail="Segment not found")
+    await restore_manifest_segments(mix_id)
+    segments = jobs[mix_id]["manifest"]["segments"]
+    if index >= len(segments):
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return FileResponse(
+        path=MIX_ENGINE_DIR / "output" / segments[index]["url"],
+        media_type="audio/wav",
+        headers={"Accept-Ranges": "bytes"}
+    )
+
+
+@app.get("/api/transition/mix/{mix_id}/events")
+async def mix_events(mix_id: str):
+    """
+    믹스 진행률 푸시 (Server-Sent Events)
+    상태가 바뀔 때마다 `data: {...}` 이벤트를 보내고, 완료/실패 시 스트림을 닫습니다.
+    """
+    if mix_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    job_subscribers.setdefault(mix_id, []).append(queue)
+
+    async def event_stream():
+        try:
+            snapshot = public_job(mix_id)
+            yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+            while snapshot["status"] not in ("completed", "failed"):
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # 프록시가 연결을 끊지 않도록 keep-alive 주석 전송
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+        finally:
+            job_subscribers[mix_id].remove(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ===== 트랜지션 미리듣기 =====
+
+def load_engine_module(name: str):
+    """
+    server/의 엔진 모듈(preview, mix_engine)을 이 프로세스에 임포트
+    (librosa 등 임포트 비용과 pipeline 단계 캐시를 요청 간에 재사용하기 위해 서브프로세스 대신 프로세스 안에서 실행)
+    """
+    if str(MIX_ENGINE_DIR) not in sys.path:
+        # 엔진 config는 임포트 시점에 환경변수를 읽음
+        os.environ["DAW_TRACKS_DIR"] = str(UPLOAD_DIR.resolve())
+        os.environ["DAW_OUTPUT_DIR"] = str(MIX_ENGINE_DIR / "output")
+        sys.path.insert(0, str(MIX_ENGINE_DIR))
+    import importlib
+    return importlib.import_module(name)
+
+
+@app.post("/api/transition/preview")
+async def preview_transition(request: PreviewRequest):
+    """
+    전환 구간 미리듣기 (WAV 바이트를 바로 응답)
+    스템/비트 분석이 캐시되어 있을 때 가장 빠르며, 스템 분리는 실행하지 않습니다.
+    미리듣기 안에서의 전환 위치 등은 X-Preview-Info 헤더(JSON)로 전달합니다.
+    """
+    file_a = find_file(str(request.trackA.get("fileId", "")))
+    file_b = find_file(str(request.trackB.get("fileId", "")))
+    if not file_a or not file_b:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        async with prefetcher.interactive_job():
+            engine = await run_in_threadpool(load_engine_module, "preview")
+            wav_bytes, info = await run_in_threadpool(
+                engine.render_preview,
+                file_a.name,
+                file_b.name,
+                pre_sec=request.preSec,
+                post_sec=request.postSec,
+                sr=request.sampleRate,
+                bpm_a_hint=request.trackA.get("bpm"),
+                bpm_b_hint=request.trackB.get("bpm"),
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Preview failed: {e}")
+
+    return Response(
+        content=wav_bytes,
+        media_type="audio/wav",
+        headers={"X-Preview-Info": json.dumps(info), "Cache-Control": "no-store"},
+    )
+
+
+@app.post("/api/transition/rerender")
+async def rerender_transition_mix(request: MixRequest):
+    """
+    파라미터만 바꿔서 다시 렌더링 (UI 파라미터 스윕용, 동기 응답)
+    프로세스 안의 파이프라인이 단계 결과를 캐시하므로, 같은 트랙 쌍이면
+    바뀐 파라미터에 의존하는 단계(브릿지, 최종 렌더 등)만 다시 계산합니다.
+    스템 분리가 필요하면 요청 스레드를 오래 막으므로 409로 거절합니다. (/api/transition/mix 작업으로 먼저 분리)
+    """
+    file_a = find_file(str(request.trackA.get("fileId", "")))
+    file_b = find_file(str(request.trackB.get("fileId", "")))
+    if not file_a or not file_b:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    async with prefetcher.interactive_job([file_a.name, file_b.name]):
+        engine = await run_in_threadpool(load_engine_module, "mix_engine")
+        try:
+            ready = await run_in_threadpool(
+                engine.stems_ready,
+                file_a.name,
+                file_b.name,
+                request.trackA.get("bpm"),
+                request.trackB.get("bpm"),
+                request.params,
+                request.tier,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not ready:
+            raise HTTPException(
+                status_code=409,
+                detail="Stems are not separated yet. Start a mix job (/api/transition/mix) first.",
+            )
+        result = await run_in_threadpool(
+            engine.run_mix,
+            file_a.name,
+            file_b.name,
+            request.transitionType,
+            request.bridgeBars,
+            request.trackA.get("bpm"),
+            request.trackB.get("bpm"),
+            False,
+            request.params,
+            request.tier,
+            # 동기 응답이라 전체 WAV로 (매니페스트 출력이면 재렌더 작업 입력이 없어 세그먼트를 복구할 수 없음)
+            output="wav",
+        )
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+
+    mix_id = str(uuid.uuid4())
+    jobs[mix_id] = {
+        "status": "completed",
+        "type": "mix",
+        "progress": 100,
+        "message": "믹싱 완료!",
+        "path": str(MIX_ENGINE_DIR / "output" / result["mixUrl"]),
+        "duration": result.get("duration"),
+        "mixType": result.get("mixType"),
+        "bpmA": result.get("bpmA"),
+        "bpmB": result.get("bpmB"),
+        "recomputed": result.get("recomputed"),
         "streamUrl": f"/api/transition/stream/{mix_id}",
-        "duration": 300.0,  # 예시
-        "transitionPoints": {
-            "fadeOutStart": 0,
-            "fadeOutEnd": request.transitionDuration,
-            "fadeInStart": 0,
-            "fadeInEnd": request.transitionDuration,
-        }
     }
+    return {"mixId": mix_id, **public_job(mix_id)}
 
 
 # ===== 스트리밍 =====
@@ -312,9 +1053,24 @@ async def create_transition_mix(request: MixRequest):
 @app.get("/api/transition/stream/{file_id}")
 async def stream_audio(file_id: str):
     """
-    오디오 스트리밍
+    오디오 스트리밍 (업로드 파일 또는 완료된 믹스 결과)
+    점진적 출력 믹스가 렌더링 중이면 확정된 부분부터 보내고 완료될 때까지 이어서 보냅니다.
+    (길이를 모르는 스트림이라 Range 요청은 완료 후에만 지원)
     """
-    file_path = find_file(file_id)
+    job = jobs.get(file_id)
+    if job and job.get("status") == "processing" and job.get("partialPath"):
+        return StreamingResponse(follow_partial_mix(file_id), media_type="audio/wav")
+    if job and job.get("manifest") and not job.get("path"):
+        # 매니페스트 출력: 처음 요청될 때 전체 WAV로 합침 (같은 매니페스트는 엔진 쪽에서 재사용)
+        engine = await run_in_threadpool(load_engine_module, "flatten_mix")
+        try:
+            flat = await run_in_threadpool(engine.flatten_mix, job["manifest"])
+        except FileNotFoundError:
+            await restore_manifest_segments(file_id)
+            flat = await run_in_threadpool(engine.flatten_mix, jobs[file_id]["manifest"])
+        job["path"] = str(MIX_ENGINE_DIR / "output" / flat["mixUrl"])
+
+    file_path = Path(job["path"]) if job and job.get("path") else find_file(file_id)
     if not file_path:
         raise HTTPException(status_code=404, detail="File not found")
     
@@ -325,6 +1081,48 @@ async def stream_audio(file_id: str):
     )
 
 
+STREAM_CHUNK_BYTES = 64 * 1024
+STREAM_POLL_SEC = 0.2
+
+
+async def follow_partial_mix(mix_id: str):
+    """
+    렌더링 중인 믹스 파일을 확정된 바이트까지 읽어 보내고, 커밋될 때마다 이어서 보냄
+    완료되면 최종 파일(데이터 바이트는 같고 헤더 길이만 확정됨)의 나머지를 보내고 종료
+    """
+    offset = 0
+    while True:
+        job = jobs[mix_id]
+        if job["status"] == "failed":
+            return
+        completed = job["status"] == "completed"
+        path = job["path"] if completed else job["partialPath"]
+        limit = None if completed else job.get("committedBytes", 0)
+
+        chunk = await run_in_threadpool(read_range, path, offset, limit)
+        if chunk:
+            offset += len(chunk)
+            yield chunk
+        elif completed:
+            return
+        else:
+            # 아직 커밋된 데이터가 없거나, 임시 파일이 최종 경로로 옮겨지는 중
+            await asyncio.sleep(STREAM_POLL_SEC)
+
+
+def read_range(path: str, offset: int, limit: Optional[int]) -> bytes:
+    """path의 offset부터 최대 STREAM_CHUNK_BYTES (limit가 있으면 그 바이트 전까지, 파일이 없으면 빈 값)"""
+    size = STREAM_CHUNK_BYTES if limit is None else min(STREAM_CHUNK_BYTES, limit - offset)
+    if size <= 0:
+        return b""
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+    except FileNotFoundError:
+        return b""
+
+
 # ===== 유틸리티 함수 =====
 
 def find_file(file_id: str) -> Optional[Path]:
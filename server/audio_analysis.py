@@ -14,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.analyzer_beat import get_beat_info
 from services.analyzer_key import get_key_from_audio
+from services.analysis_cache import store_beat_info, track_structure
+from services.track_similarity import index_track
 
 # Optional analyzers - wrap in try/except in case they fail or are missing
 try:
@@ -48,6 +50,8 @@ def analyze_audio(file_path):
         # 1. Beat & BPM Analysis (Loads audio internally)
         # analyzer_beat.py returns: { "bpm": float, "downbeats": array, "audio": y, "sr": sr }
         beat_info = get_beat_info(file_path)
+        # 믹스 엔진이 같은 트랙을 다시 분석하지 않도록 결과 캐시
+        store_beat_info(file_path, beat_info)
         
         y = beat_info['audio']
         sr = beat_info['sr']
@@ -61,25 +65,32 @@ def analyze_audio(file_path):
         key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
         key_str = f"{key_names[key_idx]} {key_mode}"
 
-        # 3. Structural Analysis (Intro/Outro)
+        # 3. Structural Analysis (Sections, Intro/Outro)
+        # 방금 저장한 비트 분석으로 비트 그리드를 맞춘 구조 분석 (캐시되어 믹스 엔진도 재사용)
+        structure = track_structure(file_path)
+        sections = structure["sections"] if structure else []
+
         intro_len = 0
         if get_intro_duration:
             try:
-                # get_intro_duration takes file_path usually, let's verify if we should pass y
-                # Based on file name it likely takes file path
-                intro_len = get_intro_duration(file_path)
+                intro_len = get_intro_duration(file_path, structure=structure)
             except Exception:
                 pass
         
         outro_point = 0
         if find_outro_endpoint:
             try:
-                # find_outro_endpoint(y, sr)
-                outro_point = find_outro_endpoint(y, sr)
+                outro_point = find_outro_endpoint(y, sr, structure=structure)
             except Exception:
                 pass
 
-        # 4. Construct Result
+        # 4. Timbre Embedding (유사 트랙 추천 인덱스에 증분 추가)
+        try:
+            index_track(file_path, y=y, sr=sr)
+        except Exception as e:
+            print(f"   ⚠️ Similarity indexing failed: {e}", file=sys.stderr)
+
+        # 5. Construct Result
         result = {
             "bpm": bpm,
             "key": key_str,
@@ -89,6 +100,7 @@ def analyze_audio(file_path):
             "beats": downbeats, # Array of sample indices
             "intro_length": intro_len,
             "outro_start": outro_point,
+            "sections": sections,
             "sample_rate": sr
         }
 
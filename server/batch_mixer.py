@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+batch_mixer.py - 여러 트랙 쌍을 한 번에 믹싱 (A→B, B→C, A→C 비교 등)
+요청한 모든 쌍으로 하나의 의존성 그래프(utils/task_graph.py)를 만들고 공유 노드는 한 번만 실행합니다.
+
+    decode:<트랙>   PCM 디코딩 (디스크 PCM 캐시 채우기)
+    beat:<트랙>     비트 분석 (analysis_cache)
+    plan:<쌍>       전략 결정 + 필요한 스템 (region 모드면 분리할 구간까지)
+    stems:<트랙>    그 트랙이 쓰이는 모든 쌍이 읽는 스템을 한 번에 분리   [heavy]
+    render:<쌍>     mix_engine 렌더링 (믹스 결과 캐시 + 프로세스 안 파이프라인 단계 캐시 공유)  [heavy]
+
+스템 분리와 분석이 트랙 단위로 한 번씩만 실행되므로 비용이 쌍 수가 아니라 고유 트랙 수에 비례합니다.
+heavy 노드는 config.BATCH_HEAVY_CONCURRENCY개까지만 동시에 실행됩니다.
+
+사용법:
+    python batch_mixer.py '{"pairs":[{"trackA":"a.mp3","trackB":"b.mp3"},{"trackA":"b.mp3","trackB":"c.mp3"}]}'
+    선택: "params", "tier" (모든 쌍에 적용, mix_engine.py와 같음), 쌍별 "bpmA" / "bpmB"
+
+출력:
+    - 진행률: {"progress": 50, "message": "노드 6/12 완료 (stems:b.mp3)", "stage": "batch"}
+      (각 쌍의 렌더링 진행률은 mix_engine과 같은 "stage": "mix" 줄로 섞여 나옴)
+    - 완료: {"mixes": [{"trackA": ..., "trackB": ..., "mixUrl": ...} 또는 {"trackA": ..., "error": ...}],
+             "uniqueTracks": 3, "nodes": 12}
+"""
+
+# ⚠️ [중요] pkg_resources 경고 억제 (madmom 관련)
+import warnings
+warnings.filterwarnings('ignore', category=UserWarning, module='pkg_resources')
+warnings.filterwarnings('ignore', category=DeprecationWarning, module='pkg_resources')
+
+import os
+import sys
+import json
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from mix_engine import _run_mix, convert_numpy_types
+from pipeline import get_pipeline, resolve_params, required_stems, choose_mix_type, tier_settings, quality_tier
+from services.analysis_cache import get_cached_beat_info
+from services.stem_separation import separate_stems, separate_transition_regions
+from utils.pcm_cache import load_audio
+from utils.task_graph import TaskGraph
+from utils.profiler import start_profiling, stop_profiling, profile_stage
+
+warnings.filterwarnings("ignore")
+
+
+def emit_progress(progress: int, message: str):
+    """배치 전체 진행률 (쌍별 렌더링 진행률의 "mix" 줄과 구분)"""
+    print(json.dumps({"progress": progress, "message": message, "stage": "batch"}), flush=True)
+
+
+def _track_path(track_id):
+    return os.path.join(config.TRACKS_DIR, track_id)
+
+
+def _decode(track_id):
+    with profile_stage("decode"):
+        load_audio(_track_path(track_id), sr=config.TARGET_SR)
+
+
+def _beat(track_id, bpm_hint):
+    if bpm_hint:
+        return float(bpm_hint)
+    with profile_stage("beat"):
+        return get_cached_beat_info(_track_path(track_id))["bpm"]
+
+
+def _plan(pair, params, bpm_a, bpm_b):
+    """쌍의 전략과 트랙별로 분리할 스템 (mix_engine._run_mix와 같은 기준)"""
+    resolved = resolve_params(params)
+    strategy = choose_mix_type(bpm_a, bpm_b, resolved["BPM_THRESHOLD"])
+    plan = {"pair": pair, "bpmA": bpm_a, "bpmB": bpm_b, "strategy": strategy, "stems": required_stems(strategy)}
+    if config.STEM_SEPARATION_MODE == "region":
+        plan["regions"] = get_pipeline().stem_regions(
+            _track_path(pair[0]), _track_path(pair[1]), bpm_a, bpm_b, params=params)
+    return plan
+
+
+def _stems(track_id, *plans):
+    """
+    트랙이 쓰이는 모든 쌍의 스템을 한 번에 분리
+    full 모드: 필요한 스템의 합집합으로 한 번 (하나뿐이면 2스템 모드)
+    region 모드: 쌍마다 구간을 분리 (이미 분리된 구간은 separate_regions가 건너뜀)
+    """
+    name = os.path.basename(track_id)
+    with profile_stage("separation"):
+        if config.STEM_SEPARATION_MODE != "region":
+            needed = set()
+            for plan in plans:
+                needed.update(plan["stems"]["a"] if plan["pair"][0] == track_id else [])
+                needed.update(plan["stems"]["b"] if plan["pair"][1] == track_id else [])
+            if needed:
+                separate_stems(name, sorted(needed))
+            return
+
+        for plan in plans:
+            if plan["pair"][0] == track_id and plan["stems"]["a"]:
+                separate_transition_regions(name, None, {"a": plan["regions"]["a"], "b": []},
+                                            {"a": plan["stems"]["a"], "b": []})
+            if plan["pair"][1] == track_id and plan["stems"]["b"]:
+                separate_transition_regions(None, name, {"a": [], "b": plan["regions"]["b"]},
+                                            {"a": [], "b": plan["stems"]["b"]})
+
+
+def _render(params, plan, *_stems_done):
+    track_a, track_b = plan["pair"]
+    # 스템은 이미 분리되어 있으므로 _run_mix의 분리 단계는 캐시 확인만 하고 넘어감
+    result = _run_mix(_track_path(track_a), _track_path(track_b), track_a, track_b,
+                      plan["bpmA"], plan["bpmB"], params)
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+
+def build_graph(pairs, params=None):
+    """
+    쌍 목록으로 의존성 그래프 생성
+
+    Args:
+        pairs: [{"trackA": ..., "trackB": ..., "bpmA": 선택, "bpmB": 선택}, ...]
+
+    Returns:
+        (graph, render_keys)  render_keys: 쌍 순서대로의 render 노드 키
+    """
+    graph = TaskGraph()
+    tracks = []
+    hints = {}
+    for pair in pairs:
+        for track_id, hint in ((pair["trackA"], pair.get("bpmA")), (pair["trackB"], pair.get("bpmB"))):
+            if track_id not in tracks:
+                tracks.append(track_id)
+            hints[track_id] = hints.get(track_id) or hint
+
+    for track_id in tracks:
+        graph.add(("decode", track_id), lambda t=track_id: _decode(t))
+        graph.add(("beat", track_id), lambda _, t=track_id: _beat(t, hints[t]), deps=[("decode", track_id)])
+
+    pair_keys = []
+    for pair in pairs:
+        key = (pair["trackA"], pair["trackB"])
+        pair_keys.append(key)
+        graph.add(("plan",) + key, lambda bpm_a, bpm_b, k=key: _plan(k, params, bpm_a, bpm_b),
+                  deps=[("beat", key[0]), ("beat", key[1])])
+
+    for track_id in tracks:
+        plans = [("plan",) + key for key in dict.fromkeys(pair_keys) if track_id in key]
+        graph.add(("stems", track_id), lambda *p, t=track_id: _stems(t, *p), deps=plans, heavy=True)
+
+    render_keys = []
+    for key in pair_keys:
+        render_keys.append(graph.add(("render",) + key, lambda *deps: _render(params, *deps),
+                                     deps=[("plan",) + key, ("stems", key[0]), ("stems", key[1])], heavy=True))
+    return graph, render_keys
+
+
+def run_batch(pairs, params=None, tier=None, profile=None):
+    """
+    여러 쌍을 한 번에 믹싱
+
+    Args:
+        pairs: [{"trackA": ..., "trackB": ...}, ...] (같은 쌍이 반복되면 한 번만 렌더링)
+        params / tier / profile: mix_engine.run_mix와 같음 (모든 쌍에 적용)
+
+    Returns:
+        dict: {"mixes": [쌍 순서대로 run_mix 결과 + trackA/trackB], "uniqueTracks", "nodes"}
+    """
+    if not pairs:
+        return {"error": "pairs가 비어 있습니다."}
+    for pair in pairs:
+        if not pair.get("trackA") or not pair.get("trackB"):
+            return {"error": "각 쌍에는 trackA와 trackB가 모두 필요합니다."}
+        for track_id in (pair["trackA"], pair["trackB"]):
+            if not os.path.exists(_track_path(track_id)):
+                return {"error": f"트랙을 찾을 수 없습니다: {track_id}"}
+    tier = tier or config.QUALITY_TIER
+    try:
+        tier_settings(tier)
+        resolve_params(params)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if profile is None:
+        profile = config.PROFILE_ENABLED
+    profiler = start_profiling("batch", trace_memory=config.PROFILE_TRACE_MEMORY) if profile else None
+
+    try:
+        with quality_tier(tier):
+            graph, render_keys = build_graph(pairs, params)
+            unique_tracks = len({t for pair in pairs for t in (pair["trackA"], pair["trackB"])})
+            emit_progress(2, f"{len(pairs)}쌍 / 고유 트랙 {unique_tracks}곡 / 노드 {len(graph)}개")
+
+            def on_done(key, done, total):
+                emit_progress(2 + int(96 * done / total), f"노드 {done}/{total} 완료 ({key[0]}:{'→'.join(key[1:])})")
+
+            results, errors = graph.run(workers=config.BATCH_WORKERS, heavy_limit=config.BATCH_HEAVY_CONCURRENCY,
+                                        on_done=on_done)
+
+        mixes = []
+        for pair, key in zip(pairs, render_keys):
+            entry = {"trackA": pair["trackA"], "trackB": pair["trackB"]}
+            if key in errors:
+                entry["error"] = str(errors[key])
+            else:
+                entry.update(results[key], tier=tier)
+            mixes.append(entry)
+
+        emit_progress(100, "배치 믹싱 완료!")
+        return {"mixes": mixes, "uniqueTracks": unique_tracks, "nodes": len(graph)}
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        if profiler is not None:
+            profiler.emit_report()
+            stop_profiling()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        result = run_batch(request_data.get("pairs") or [], request_data.get("params"),
+                           request_data.get("tier"), request_data.get("profile"))
+        print(json.dumps(result, default=convert_numpy_types))
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+bench_beat.py - 비트 트래커 백엔드 속도/정확도 비교
+
+정답 비트/다운비트를 알고 있는 합성 클릭 트랙(benchmarks/synthetic.py)에
+BeatNet / Madmom / Librosa 백엔드를 실행하고,
+오디오 1분당 지연 시간과 비트/다운비트 F-measure(±70ms)를 출력합니다.
+마지막에 정확도 기준(--min-f)을 만족하는 가장 빠른 백엔드를 추천합니다.
+
+사용법:
+    python benchmarks/bench_beat.py
+    python benchmarks/bench_beat.py --backends librosa,madmom --bpms 100,128,174 --minutes 2
+    python benchmarks/bench_beat.py --min-f 0.9 --min-downbeat-f 0.7
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from benchmarks.synthetic import generate_track
+from services.beat_backends import BEAT_BACKENDS, get_beat_tracker
+
+# MIREX/mir_eval 관례: ±70ms 안에 들어오면 정답
+F_MEASURE_WINDOW = 0.07
+
+
+def f_measure(reference, estimated, window=F_MEASURE_WINDOW):
+    """일대일 매칭 기반 F-measure (두 배열 모두 초 단위, 정렬 가정)"""
+    reference = np.sort(np.asarray(reference, dtype=float))
+    estimated = np.sort(np.asarray(estimated, dtype=float))
+    if len(reference) == 0 or len(estimated) == 0:
+        return 0.0
+
+    # 가까운 쌍부터 탐욕적으로 매칭
+    diffs = np.abs(reference[:, None] - estimated[None, :])
+    ref_idx, est_idx = np.nonzero(diffs <= window)
+    order = np.argsort(diffs[ref_idx, est_idx])
+    used_ref, used_est = set(), set()
+    for k in order:
+        r, e = ref_idx[k], est_idx[k]
+        if r not in used_ref and e not in used_est:
+            used_ref.add(r)
+            used_est.add(e)
+
+    hits = len(used_ref)
+    precision = hits / len(estimated)
+    recall = hits / len(reference)
+    if precision + recall == 0:
+        return 0.0
+    return 2 * precision * recall / (precision + recall)
+
+
+def evaluate(tracker, bpms, minutes, sr, verbose=False):
+    """BPM별 합성 트랙에 대해 (지연 s/분, 비트 F, 다운비트 F, BPM 오차) 평균"""
+    latencies, beat_fs, downbeat_fs, bpm_errors = [], [], [], []
+    for i, bpm in enumerate(bpms):
+        y, _, info = generate_track(minutes * 60.0, bpm, key_index=i % 12, sr=sr, seed=100 + i)
+        ref_beats = info["beats"] / sr
+        ref_downbeats = info["downbeats"] / sr
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if verbose else log):
+            start = time.perf_counter()
+            result = tracker.track(y, sr)
+            elapsed = time.perf_counter() - start
+
+        latencies.append(elapsed / minutes)
+        beat_fs.append(f_measure(ref_beats, result["beats"]))
+        downbeat_fs.append(f_measure(ref_downbeats, result["downbeats"]))
+        bpm_errors.append(abs(result["bpm"] - bpm))
+
+    return {
+        "sec_per_min": float(np.mean(latencies)),
+        "beat_f": float(np.mean(beat_fs)),
+        "downbeat_f": float(np.mean(downbeat_fs)),
+        "bpm_error": float(np.mean(bpm_errors)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비트 트래커 백엔드 벤치마크")
+    parser.add_argument("--backends", default=",".join(BEAT_BACKENDS), help="쉼표 구분 백엔드 목록")
+    parser.add_argument("--bpms", default="90,110,124,128,140,174", help="테스트할 BPM 목록")
+    parser.add_argument("--minutes", type=float, default=1.0, help="트랙 길이(분)")
+    parser.add_argument("--sr", type=int, default=44100)
+    parser.add_argument("--min-f", type=float, default=0.9, help="비트 F-measure 기준")
+    parser.add_argument("--min-downbeat-f", type=float, default=0.0, help="다운비트 F-measure 기준")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    bpms = [float(x) for x in args.bpms.split(",") if x]
+    results = {}
+    for name in [b for b in args.backends.split(",") if b]:
+        tracker = get_beat_tracker(name)
+        if tracker is None:
+            print(f"⏭️ {name}: 사용 불가 (미설치)")
+            continue
+        # 첫 실행의 모델 로딩/JIT 비용 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            warm, _, _ = generate_track(10.0, 120.0, sr=args.sr)
+            tracker.track(warm, args.sr)
+        print(f"⏱️ {name} ...", flush=True)
+        results[name] = evaluate(tracker, bpms, args.minutes, args.sr, verbose=args.verbose)
+
+    if not results:
+        print("❌ 실행 가능한 백엔드가 없습니다.")
+        return 1
+
+    print(f"\n📊 {len(bpms)}개 BPM x {args.minutes:g}분 합성 트랙 (±{F_MEASURE_WINDOW * 1000:.0f}ms)")
+    header = f"{'backend':<10}{'s / min audio':>15}{'beat F':>10}{'downbeat F':>12}{'BPM err':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in sorted(results.items(), key=lambda kv: kv[1]["sec_per_min"]):
+        print(f"{name:<10}{r['sec_per_min']:>15.3f}{r['beat_f']:>10.3f}{r['downbeat_f']:>12.3f}{r['bpm_error']:>10.2f}")
+
+    qualified = [
+        (r["sec_per_min"], name) for name, r in results.items()
+        if r["beat_f"] >= args.min_f and r["downbeat_f"] >= args.min_downbeat_f
+    ]
+    if qualified:
+        best = min(qualified)[1]
+        print(f"\n✅ 기준(beat F ≥ {args.min_f}, downbeat F ≥ {args.min_downbeat_f})을 만족하는 가장 빠른 백엔드: {best}")
+        print(f"   config.BEAT_BACKEND = \"{best}\"  (또는 DAW_BEAT_BACKEND={best})")
+    else:
+        print(f"\n⚠️ 기준(beat F ≥ {args.min_f}, downbeat F ≥ {args.min_downbeat_f})을 만족하는 백엔드가 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
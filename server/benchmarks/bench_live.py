@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+bench_live.py - 실시간 믹싱 엔진(live_engine.py) 헤드리스 실행 + 블록 처리 시간 측정
+
+합성 트랙(benchmarks/synthetic.py) 한 쌍을 두 덱에 올리고 Blend/Drop 전환을 큐로 예약한 뒤,
+오디오 장치 없이 LiveMixer.process()를 블록마다 호출하며 호출 시간을 실시간 마감(블록 길이 / sr)과 비교합니다.
+전환 앞 --pre-sec부터 B 진입 후 --post-sec까지 실행합니다.
+
+사용법:
+    python benchmarks/bench_live.py                                  # blend/drop x 블록 256/512/1024
+    python benchmarks/bench_live.py --blocks 512 --strategies drop --out /tmp/live_drop.wav
+    python benchmarks/bench_live.py --check-alloc                    # 콜백 중 메모리 할당량 (tracemalloc)
+
+측정 전에 전략별로 한 번씩 워밍업 실행을 합니다 (처음 실행되는 경로의 인터프리터 특수화, numpy 루프 캐시 할당 제외).
+
+p99 블록 시간이 마감을 넘거나, --check-alloc에서 블록 하나라도 메모리를 할당하면 exit code 1로 종료합니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+import config
+from benchmarks.synthetic import generate_track
+from live_engine import LiveMixer, cue_blend, cue_drop
+
+# 전략별 (A BPM, A 키, B BPM, B 키), bench_pipeline.py와 같은 조합
+SCENARIOS = {
+    "blend": (124.0, 9, 126.0, 4),
+    "drop": (90.0, 0, 140.0, 7),
+}
+BLEND_OVERLAP_BEATS = 32  # config.BLEND_OVERLAP_BEATS가 None일 때 (합성 트랙 인트로 길이 대신)
+
+
+def make_tracks(strategy, duration, sr):
+    bpm_a, key_a, bpm_b, key_b = SCENARIOS[strategy]
+    y_a, _, info_a = generate_track(duration, bpm_a, key_a, sr=sr, seed=1)
+    y_b, _, _ = generate_track(duration, bpm_b, key_b, sr=sr, seed=2)
+    return y_a, y_b, bpm_a, bpm_b, info_a
+
+
+def setup_case(strategy, block_size, sr, duration, pre_sec, post_sec):
+    """덱 로드 + 전환 예약. Returns: (mixer, 렌더링할 블록 수)"""
+    y_a, y_b, bpm_a, bpm_b, info_a = make_tracks(strategy, duration, sr)
+    mixer = LiveMixer(sr=sr, block_size=block_size)
+    deck_a, deck_b = mixer.decks
+    deck_a.load(y_a, bpm_a)
+    deck_b.load(y_b, bpm_b)
+
+    # 보컬이 끝난 뒤 첫 박에서 전환 (mix_engine의 vocal_end / cut_point 역할)
+    beats = info_a["beats"]
+    point = int(beats[np.searchsorted(beats, info_a["vocal_end"])])
+    if strategy == "blend":
+        overlap = int((config.BLEND_OVERLAP_BEATS or BLEND_OVERLAP_BEATS) * 60.0 / bpm_a * sr)
+        cue_blend(deck_a, deck_b, bpm_a, bpm_b, point, overlap)
+        transition = overlap
+    else:
+        transition = cue_drop(deck_a, deck_b, bpm_a, bpm_b, point)
+
+    start = max(0, point - int(pre_sec * sr))
+    deck_a.play(start)
+    total = (point - start) + transition + int(post_sec * sr)
+    return mixer, -(-total // block_size)
+
+
+def warmup(strategy, block_size, sr, args):
+    mixer, n_blocks = setup_case(strategy, block_size, sr, args.duration, args.pre_sec, args.post_sec)
+    block = np.zeros(block_size, dtype=mixer._out.dtype)
+    for _ in range(n_blocks):
+        mixer.process(block)
+
+
+def run_case(strategy, block_size, sr, args):
+    mixer, n_blocks = setup_case(strategy, block_size, sr, args.duration, args.pre_sec, args.post_sec)
+    out = np.zeros(n_blocks * block_size, dtype=np.float32) if args.out else None
+    block = np.zeros(block_size, dtype=mixer._out.dtype)
+    times = np.zeros(n_blocks)
+    alloc = np.zeros(n_blocks, dtype=np.int64)
+
+    if args.check_alloc:
+        tracemalloc.start()
+    for i in range(n_blocks):
+        if args.check_alloc:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        mixer.process(block)
+        times[i] = time.perf_counter() - start
+        if args.check_alloc:
+            alloc[i] = tracemalloc.get_traced_memory()[1] - before
+        if out is not None:
+            out[i * block_size:(i + 1) * block_size] = block
+    if args.check_alloc:
+        tracemalloc.stop()
+
+    if out is not None:
+        path = args.out if len(args.strategies) * len(args.blocks) == 1 else \
+            f"{os.path.splitext(args.out)[0]}_{strategy}_{block_size}.wav"
+        sf.write(path, out, sr, subtype="FLOAT")
+
+    deadline = block_size / sr
+    return {
+        "strategy": strategy,
+        "block": block_size,
+        "blocks": n_blocks,
+        "deadline_us": deadline * 1e6,
+        "mean_us": times.mean() * 1e6,
+        "p99_us": np.percentile(times, 99) * 1e6,
+        "max_us": times.max() * 1e6,
+        "load": times.mean() / deadline,
+        "late": int(np.sum(times > deadline)),
+        "alloc_max": int(alloc.max()) if args.check_alloc else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strategies", default="blend,drop")
+    parser.add_argument("--blocks", default="256,512,1024", help="블록 크기 (샘플, 쉼표 구분)")
+    parser.add_argument("--sr", type=int, default=config.TARGET_SR)
+    parser.add_argument("--duration", type=float, default=60.0, help="합성 트랙 길이 (초)")
+    parser.add_argument("--pre-sec", type=float, default=8.0)
+    parser.add_argument("--post-sec", type=float, default=8.0)
+    parser.add_argument("--out", help="렌더링 결과 WAV (여러 조합이면 _<전략>_<블록> 접미사)")
+    parser.add_argument("--check-alloc", action="store_true",
+                        help="블록마다 tracemalloc으로 할당량 측정 (측정 오버헤드 때문에 시간은 참고용)")
+    parser.add_argument("--no-warmup", action="store_true", help="측정 전 워밍업 실행 생략")
+    args = parser.parse_args()
+    args.strategies = args.strategies.split(",")
+    args.blocks = [int(b) for b in args.blocks.split(",")]
+
+    header = f"{'strategy':>8} {'block':>6} {'deadline':>9} {'mean':>8} {'p99':>8} {'max':>8} {'load':>6} {'late':>5}"
+    if args.check_alloc:
+        header += f" {'alloc':>7}"
+    print(header + "   (us)")
+    if not args.no_warmup:
+        for strategy in args.strategies:
+            warmup(strategy, args.blocks[0], args.sr, args)
+    failed = False
+    for strategy in args.strategies:
+        for block_size in args.blocks:
+            r = run_case(strategy, block_size, args.sr, args)
+            line = (f"{r['strategy']:>8} {r['block']:>6} {r['deadline_us']:>9.0f} {r['mean_us']:>8.1f} "
+                    f"{r['p99_us']:>8.1f} {r['max_us']:>8.1f} {r['load']:>6.1%} {r['late']:>5}")
+            if args.check_alloc:
+                line += f" {r['alloc_max']:>6}B"
+            print(line)
+            failed |= r["p99_us"] > r["deadline_us"]
+            if args.check_alloc:
+                failed |= r["alloc_max"] > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
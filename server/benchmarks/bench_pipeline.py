@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+bench_pipeline.py - run_mix 전체 파이프라인 벤치마크 (합성 오디오)
+
+합성 트랙(benchmarks/synthetic.py)과 가짜 스템으로 Demucs 없이 run_mix를 실행하고,
+트랙 길이별 단계 시간(utils.profiler)과 처리량을 측정합니다.
+Blend(비슷한 BPM)와 Drop(BPM 차이 > BPM_THRESHOLD) 경로를 모두 실행합니다.
+
+사용법:
+    python benchmarks/bench_pipeline.py                       # 1, 2, 5, 10, 15분
+    python benchmarks/bench_pipeline.py --lengths 1,5 --strategies blend
+    python benchmarks/bench_pipeline.py --update-baseline     # 현재 결과를 기준선으로 저장
+    python benchmarks/bench_pipeline.py --tier draft          # 품질 티어 (기본 config.QUALITY_TIER)
+
+기준선(benchmarks/baseline_pipeline.json, 기준 머신에서 --update-baseline으로 생성)과 비교하여
+총 시간 또는 단계 시간이 허용치(--tolerance)를 넘게 느려졌거나 기준선 파일이 없으면 exit code 1로 종료합니다.
+기준선 항목은 "<티어>/<전략>/<분>" 키로 저장되며, 실행한 티어의 항목이 하나도 없어도 실패로 처리합니다.
+"""
+
+import os
+import io
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+import config
+from benchmarks.synthetic import write_track
+from utils.profiler import start_profiling, stop_profiling
+from pipeline import quality_tier, get_pipeline
+from services.stem_separation import stem_folder
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_pipeline.json")
+
+# 전략별 (A BPM, A 키, B BPM, B 키)
+SCENARIOS = {
+    "blend": (124.0, 9, 126.0, 4),
+    "drop": (90.0, 0, 140.0, 7),
+}
+
+# 이보다 짧은 단계는 측정 노이즈로 보고 회귀 판정에서 제외
+NOISE_FLOOR_SEC = 0.05
+
+# 콜드 측정에서 케이스마다 비우는 디스크 캐시 (config 이름 -> 임시 캐시 폴더 안의 하위 폴더)
+CACHE_DIRS = {"ANALYSIS_CACHE_DIR": "analysis", "PCM_CACHE_DIR": "pcm", "MIX_CACHE_DIR": "mix"}
+
+
+def fit_scaling_exponent(lengths, times):
+    """log(time) = a + b*log(length) 의 기울기 b (1.0이면 선형)"""
+    pts = [(l, t) for l, t in zip(lengths, times) if t > 0]
+    if len(pts) < 2:
+        return None
+    x = np.log([p[0] for p in pts])
+    y = np.log([p[1] for p in pts])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def run_case(strategy, minutes, tracks_dir, tier, verbose=False):
+    """합성 트랙 한 쌍 생성 -> run_mix 실행 -> 프로파일 리포트 반환 (quality_tier(tier) 안에서 호출)"""
+    from mix_engine import run_mix
+
+    bpm_a, key_a, bpm_b, key_b = SCENARIOS[strategy]
+    duration = minutes * 60.0
+    name_a = f"bench_{strategy}_{minutes:g}m_a"
+    name_b = f"bench_{strategy}_{minutes:g}m_b"
+
+    file_a, _ = write_track(name_a, duration, bpm_a, tracks_dir, config.OUTPUT_DIR,
+                            key_index=key_a, sr=config.TARGET_SR, seed=1)
+    file_b, _ = write_track(name_b, duration, bpm_b, tracks_dir, config.OUTPUT_DIR,
+                            key_index=key_b, sr=config.TARGET_SR, seed=2)
+
+    # 콜드 측정: 이전 실행의 캐시(비트/구조 분석, PCM, 믹스 결과)를 보지 않도록 케이스마다 빈 캐시 폴더에서,
+    # 프로세스 안의 파이프라인 단계 캐시도 비움 (믹스 결과도 이 폴더에 쓰이므로 함께 지워짐)
+    cache_root = tempfile.mkdtemp(prefix=".bench_cache_", dir=config.OUTPUT_DIR)
+    get_pipeline().clear()
+    profiler = start_profiling(f"{strategy}_{minutes:g}m", trace_memory=False)
+    try:
+        log = io.StringIO()
+        with config.overrides({name: os.path.join(cache_root, sub) for name, sub in CACHE_DIRS.items()}), \
+                contextlib.redirect_stdout(sys.stdout if verbose else log):
+            result = run_mix(file_a, file_b, profile=False, tier=tier)
+        report = profiler.report()
+    finally:
+        stop_profiling()
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    if "error" in result:
+        raise RuntimeError(f"{strategy} {minutes}m failed: {result['error']}")
+
+    expected = f"{strategy}_mix"
+    if result.get("mixType") != expected:
+        print(f"   ⚠️ {strategy} 시나리오가 {result.get('mixType')}로 실행됨 (BPM 분석 결과 확인 필요)")
+
+    audio_minutes = 2 * minutes
+    return {
+        "tier": tier,
+        "strategy": strategy,
+        "minutes": minutes,
+        "mixType": result.get("mixType"),
+        "total_wall_s": report["total_wall_s"],
+        "peak_rss_mb": report["peak_rss_mb"],
+        "throughput_audio_min_per_s": audio_minutes / report["total_wall_s"],
+        "stages": {s["path"]: s["wall_s"] for s in report["stages"]},
+        "_artifacts": (name_a, name_b),
+    }
+
+
+def print_results(results):
+    strategies = sorted({r["strategy"] for r in results})
+    for strategy in strategies:
+        rows = sorted([r for r in results if r["strategy"] == strategy], key=lambda r: r["minutes"])
+        paths = []
+        for r in rows:
+            for p in r["stages"]:
+                if p not in paths:
+                    paths.append(p)
+
+        print(f"\n📊 [{strategy}] 단계별 Wall time (초)")
+        header = f"{'stage':<24}" + "".join(f"{r['minutes']:>9g}m" for r in rows) + f"{'scaling':>10}"
+        print(header)
+        print("-" * len(header))
+        lengths = [r["minutes"] for r in rows]
+        for p in paths + ["TOTAL"]:
+            times = [r["total_wall_s"] if p == "TOTAL" else r["stages"].get(p, 0.0) for r in rows]
+            exponent = fit_scaling_exponent(lengths, times)
+            exp_str = f"n^{exponent:.2f}" if exponent is not None else "-"
+            print(f"{p:<24}" + "".join(f"{t:>10.3f}" for t in times) + f"{exp_str:>10}")
+        print(f"{'throughput (min/s)':<24}" + "".join(f"{r['throughput_audio_min_per_s']:>10.2f}" for r in rows))
+        print(f"{'peak RSS (MB)':<24}" + "".join(f"{(r['peak_rss_mb'] or 0):>10.0f}" for r in rows))
+
+
+def _baseline_key(result):
+    return f"{result['tier']}/{result['strategy']}/{result['minutes']:g}"
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """기준선 대비 (회귀 목록, 비교한 항목 수) 반환"""
+    regressions = []
+    compared = 0
+    for r in results:
+        base = baseline.get(_baseline_key(r))
+        if base is None:
+            continue
+        compared += 1
+        key = _baseline_key(r)
+        checks = [("TOTAL", r["total_wall_s"], base["total_wall_s"])]
+        checks += [(p, t, base["stages"].get(p)) for p, t in r["stages"].items()]
+        for name, current, previous in checks:
+            if previous is None or previous < NOISE_FLOOR_SEC:
+                continue
+            if current > previous * (1.0 + tolerance):
+                regressions.append(f"{key} {name}: {previous:.3f}s -> {current:.3f}s (+{(current / previous - 1) * 100:.0f}%)")
+    return regressions, compared
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run_mix 합성 오디오 벤치마크")
+    parser.add_argument("--lengths", default="1,2,5,10,15", help="트랙 길이(분), 쉼표 구분")
+    parser.add_argument("--strategies", default="blend,drop", help="blend,drop 중 선택")
+    parser.add_argument("--tier", default=config.QUALITY_TIER, choices=list(config.QUALITY_TIERS),
+                        help="품질 티어 (기본 config.QUALITY_TIER)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준선 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 느려짐 비율 (0.25 = 25%%)")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--keep", action="store_true", help="생성한 합성 트랙/스템을 지우지 않음")
+    parser.add_argument("--verbose", action="store_true", help="run_mix 로그 출력")
+    parser.add_argument("--no-warmup", action="store_true", help="측정 전 워밍업(임포트/JIT) 실행 생략")
+    args = parser.parse_args()
+
+    lengths = [float(x) for x in args.lengths.split(",") if x]
+    strategies = [s for s in args.strategies.split(",") if s]
+
+    # config.OUTPUT_DIR 등 상대 경로 기준을 server/로 고정
+    os.chdir(SERVER_DIR)
+    tracks_dir = tempfile.mkdtemp(prefix="bench_tracks_")
+    config.TRACKS_DIR = tracks_dir
+
+    results = []
+    warmup = []
+    # 합성 스템을 티어의 스템 모델 폴더에 쓰고 지우도록 실행 전체를 티어 설정 안에서
+    with quality_tier(args.tier):
+        try:
+            if not args.no_warmup:
+                # numba JIT, 모델 로딩 등 첫 실행 비용을 측정에서 제외
+                print("🔥 워밍업 ...", flush=True)
+                warmup.append(run_case(strategies[0], 0.25, tracks_dir, args.tier))
+
+            for strategy in strategies:
+                for minutes in lengths:
+                    print(f"⏱️ {args.tier} / {strategy} / {minutes:g}분 ...", flush=True)
+                    results.append(run_case(strategy, minutes, tracks_dir, args.tier, verbose=args.verbose))
+        finally:
+            if not args.keep:
+                shutil.rmtree(tracks_dir, ignore_errors=True)
+                for r in results + warmup:
+                    for name in r["_artifacts"]:
+                        shutil.rmtree(os.path.join(config.OUTPUT_DIR, stem_folder(), name), ignore_errors=True)
+
+    for r in results:
+        del r["_artifacts"]
+
+    print_results(results)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    current = {_baseline_key(r): r for r in results}
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(current)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n💾 기준선 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # 기준선 없이 통과하면 회귀 검사가 조용히 꺼지므로 실패로 처리
+        print(f"\n❌ 기준선 없음 ({args.baseline}). --update-baseline으로 생성하세요.")
+        return 1
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions, compared = compare_with_baseline(results, baseline, args.tolerance)
+    if not compared:
+        print(f"\n❌ 기준선에 이번 실행({args.tier} 티어, 전략/길이)과 비교할 항목이 없습니다. "
+              f"기준 머신에서 같은 옵션에 --update-baseline을 붙여 추가하세요.")
+        return 1
+    if regressions:
+        print(f"\n❌ 성능 회귀 {len(regressions)}건 (허용치 {args.tolerance * 100:.0f}%):")
+        for line in regressions:
+            print(f"   - {line}")
+        return 1
+
+    print("\n✅ 기준선 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
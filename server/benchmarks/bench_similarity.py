@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+bench_similarity.py - 유사 트랙 인덱스(utils/vector_index.py) 검색 지연/재현율
+
+임베딩과 같은 차원(services/analyzer_timbre.EMBEDDING_DIM)의 군집 합성 벡터 N개로 임시 인덱스를 만들고
+(증분 추가 배치 단위로 넣어서 재학습 경로까지 실행), 검색 1회 지연 시간과 정확 검색 대비 recall@k,
+한 곡 추가 지연과 그 직후 다른 인덱스 객체(다른 프로세스의 읽기 쪽)의 첫 검색 지연을 출력합니다.
+
+사용법:
+    python benchmarks/bench_similarity.py
+    python benchmarks/bench_similarity.py --tracks 100000 --nprobe 4,8,16 --queries 500
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from services.analyzer_timbre import EMBEDDING_DIM
+from utils.vector_index import VectorIndex
+
+
+def synthetic_embeddings(n, dim, clusters=500, spread=0.6, seed=0):
+    """장르/아티스트처럼 뭉쳐 있는 벡터 (군집 중심 + 잡음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    x = centers[rng.integers(0, clusters, n)] + spread * rng.normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=5000, help="증분 추가 배치 크기")
+    parser.add_argument("--nprobe", default="4,8,16")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    x = synthetic_embeddings(args.tracks, EMBEDDING_DIM)
+    root = tempfile.mkdtemp(prefix="bench_similarity_")
+    try:
+        index = VectorIndex(root, EMBEDDING_DIM, tag="bench")
+        start = time.perf_counter()
+        for i in range(0, args.tracks, args.batch):
+            index.add([str(j) for j in range(i, min(i + args.batch, args.tracks))], x[i:i + args.batch])
+        print(f"build: {args.tracks} vectors in {time.perf_counter() - start:.1f}s "
+              f"({len(index.centroids)} lists, {index.count - index.sorted} unsorted)")
+
+        rng = np.random.default_rng(1)
+        queries = rng.integers(0, args.tracks, args.queries)
+        truth = [set(np.argpartition(-(x @ x[q]), args.k)[:args.k]) for q in queries]
+
+        print(f"{'nprobe':>6} {'ms/query':>9} {'recall@' + str(args.k):>10}")
+        for nprobe in [int(n) for n in args.nprobe.split(",")]:
+            index.search(x[0], k=args.k, nprobe=nprobe)  # 워밍업
+            start = time.perf_counter()
+            results = [index.search(x[q], k=args.k, nprobe=nprobe) for q in queries]
+            latency = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean([len(t & {int(i) for i, _ in r}) / args.k for t, r in zip(truth, results)])
+            print(f"{nprobe:>6} {latency:>9.2f} {recall:>10.3f}")
+
+        reader = VectorIndex(root, EMBEDDING_DIM, tag="bench")
+        reader.search(x[0], k=args.k)
+        add_ms, first_ms = [], []
+        for j, v in enumerate(synthetic_embeddings(20, EMBEDDING_DIM, seed=2)):
+            start = time.perf_counter()
+            index.add([f"extra{j}"], v[None])
+            add_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            reader.search(v, k=args.k)
+            first_ms.append((time.perf_counter() - start) * 1000)
+        print(f"add 1 track: {np.median(add_ms):.2f} ms, first search after add: {np.median(first_ms):.2f} ms "
+              f"(median of {len(add_ms)})")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
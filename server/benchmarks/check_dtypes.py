@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+check_dtypes.py - float32 DSP 경로 검증
+
+utils/dsp.py와 strategies/의 각 함수를 config.AUDIO_DTYPE = "float32"로 실행해서
+    1) 출력이 float64로 승격되지 않았는지
+    2) 기준값 대비 상대 오차(RMS)가 허용치 이내인지
+를 확인합니다. 하나라도 실패하면 exit code 1.
+
+기준값
+    dsp 함수: float32 전환 이전 구현(benchmarks/reference_dsp.py)을 float64 입력으로 실행한 결과
+              (리팩터링이 동작을 바꿨다면 여기서 잡힘)
+    전략: 전략 인터페이스가 이후 바뀌어 이전 구현과 직접 비교할 수 없으므로 현재 코드를 float64로 실행한 결과
+          (dtype 정밀도 차이만 검사, 동작 변경은 dsp 기준값과 bench_pipeline.py로 확인)
+
+사용법:
+    python benchmarks/check_dtypes.py
+    python benchmarks/check_dtypes.py --skip-strategies   # rubberband 없이 dsp만 검사
+"""
+
+import os
+import io
+import sys
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+import config
+from benchmarks.synthetic import generate_track, write_track
+from benchmarks import reference_dsp as ref
+from utils import dsp
+
+SR = 44100
+
+
+def relative_error(reference, value):
+    reference = np.asarray(reference, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+    if reference.shape != value.shape:
+        return np.inf
+    scale = np.sqrt(np.mean(reference ** 2)) if reference.size else 0.0
+    diff = np.sqrt(np.mean((reference - value) ** 2)) if reference.size else 0.0
+    return diff / scale if scale > 0 else diff
+
+
+def run_with_dtype(dtype_name, fn):
+    with config.overrides({"AUDIO_DTYPE": dtype_name}), contextlib.redirect_stdout(io.StringIO()):
+        return fn(dtype_name)
+
+
+# 허용 상대오차 (RMS 기준)
+#   1e-6  원소별 곱/페이드: float32 반올림(약 6e-8)이 몇 번 누적되는 정도
+#   1e-4  apply_high_pass: 10차 하이패스를 float32 계수/상태로 재귀 필터링한 누적 오차
+#   1e-3  get_low_freq_energy: 4차 150Hz 로우패스는 극점이 단위원에 가까워(|z| > 0.98) float32 계수 양자화로
+#         응답이 약간 달라짐 (측정값 약 8e-5). 이 값은 Smart Trim 위상 보정에서 1.3배 비율 비교에만 쓰이므로
+#         0.1%는 판정에 영향이 없고, 측정값 근처에 허용치를 두면 scipy/BLAS 버전 차이만으로 실패함
+#   1e-3  rubberband 경로: 외부 프로세스 입출력(float32 WAV)을 거치므로 이미 float32 정밀도
+def build_cases(track_a, track_b, stems_a, stems_b, output_dir, name_a, include_strategies):
+    """(이름, 허용 상대오차, fn(dtype) -> 출력, 기준 fn() -> 출력 또는 None(현재 코드 float64)) 목록"""
+    def cast(y, dtype_name):
+        return np.asarray(y, dtype=dtype_name)
+
+    a_short = track_a[:SR * 10]
+    bpm_a, bpm_b = 124.0, 126.0
+    cut = len(track_a) - SR * 8
+
+    cases = [
+        ("normalize_audio", 1e-6, lambda d: dsp.normalize_audio(cast(track_a, d)),
+         lambda: ref.normalize_audio(track_a)),
+        ("smooth_concatenate", 1e-6, lambda d: dsp.smooth_concatenate(
+            [cast(track_a[:SR * 5], d), cast(track_b[:SR * 5], d)], fade_samples=config.BLEND_OVERLAP_FADE),
+         lambda: ref.smooth_concatenate([track_a[:SR * 5], track_b[:SR * 5]], fade_samples=config.BLEND_OVERLAP_FADE)),
+        ("linear_ramp", 1e-6, lambda d: dsp.linear_ramp(0.6, 1.0, SR * 4),
+         lambda: ref.linear_ramp(0.6, 1.0, SR * 4)),
+        ("apply_high_pass", 1e-4, lambda d: dsp.apply_high_pass(cast(a_short, d), SR, cutoff=400),
+         lambda: ref.apply_high_pass(a_short, SR, cutoff=400)),
+        ("get_low_freq_energy", 1e-3, lambda d: np.array([dsp.get_low_freq_energy(cast(a_short, d), SR)], dtype=d),
+         lambda: np.array([ref.get_low_freq_energy(a_short, SR)])),
+        ("preserve_energy", 1e-6, lambda d: dsp.preserve_energy(cast(a_short, d), cast(a_short * 0.5, d)),
+         lambda: ref.preserve_energy(a_short, a_short * 0.5)),
+    ]
+
+    if include_strategies:
+        from strategies.drop_mix import DropMixStrategy
+        from strategies.blend_mix import BlendMixStrategy
+
+        cases += [
+            ("match_bpm_with_safety_margin", 1e-3, lambda d: dsp.match_bpm_with_safety_margin(
+                cast(a_short, d), SR, bpm_a, bpm_b, SR * 9),
+             lambda: ref.match_bpm_with_safety_margin(a_short, SR, bpm_a, bpm_b, SR * 9)),
+            ("DropMixStrategy.process", 1e-3, lambda d: DropMixStrategy().process(
+                y_a=cast(track_a, d), y_a_vocals=cast(stems_a["vocals"], d), y_b=cast(track_b, d),
+                bpm_a=90.0, bpm_b=140.0, sr=SR, cut_point_a=cut, vocal_end_point=int(len(track_a) * 0.7)), None),
+            ("BlendMixStrategy.process", 1e-3, lambda d: BlendMixStrategy().process(
+                y_a_full=cast(track_a, d), y_a_no_rhythm=cast(track_a, d), y_a_vocals=cast(stems_a["vocals"], d),
+                y_b_full=cast(track_b, d), y_b_bass=cast(stems_b["bass"], d), bpm_a=bpm_a, bpm_b=bpm_b, sr=SR,
+                overlap_samples=SR * 8, vocal_end=int(len(track_a) * 0.7), trim_point=cut,
+                track_a_name=f"{name_a}.wav", output_dir=output_dir), None),
+        ]
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="float32 DSP 경로 dtype/오차 검사")
+    parser.add_argument("--seconds", type=float, default=60.0, help="합성 트랙 길이(초)")
+    parser.add_argument("--skip-strategies", action="store_true", help="rubberband가 필요한 검사 생략")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="check_dtypes_")
+    name_a = "dtype_check_a"
+    try:
+        # Blend는 Track A 스템을 파일에서 읽으므로 Demucs 레이아웃으로 저장
+        write_track(name_a, args.seconds, 124.0, os.path.join(work_dir, "tracks"), work_dir, sr=SR, seed=7)
+        track_a, stems_a, _ = generate_track(args.seconds, 124.0, sr=SR, seed=7)
+        track_b, stems_b, _ = generate_track(args.seconds, 126.0, key_index=7, sr=SR, seed=8)
+
+        failures = 0
+        print(f"{'case':<32}{'dtype':>10}{'rel err':>12}{'limit':>10}  기준")
+        print("-" * 72)
+        for name, tolerance, fn, reference_fn in build_cases(track_a, track_b, stems_a, stems_b, work_dir, name_a,
+                                                             not args.skip_strategies):
+            if reference_fn is not None:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    reference = reference_fn()
+                basis = "이전 구현"
+            else:
+                reference = run_with_dtype("float64", fn)
+                basis = "float64"
+            value = run_with_dtype("float32", fn)
+
+            dtype_ok = np.asarray(value).dtype == np.float32
+            err = relative_error(reference, value)
+            ok = dtype_ok and err <= tolerance
+            failures += 0 if ok else 1
+            status = "✅" if ok else "❌"
+            print(f"{name:<32}{str(np.asarray(value).dtype):>10}{err:>12.2e}{tolerance:>10.0e}  {basis} {status}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print(f"\n❌ {failures}건 실패")
+        return 1
+    print("\n✅ 모든 출력이 float32이며 기준값과의 오차가 허용치 이내입니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+float32 전환 이전의 utils/dsp.py 구현 (check_dtypes.py의 기준값)
+
+[user-030] 변경 직전 커밋의 함수 본문을 그대로 옮겨 둔 것입니다 (profile_stage 호출만 제외).
+현재 코드를 float64로 돌린 결과는 리팩터링이 바꾼 동작(곡선 캐시, 필터 계수 dtype, 구간 에너지 측정 등)을
+함께 바꾸므로 기준이 될 수 없어서, 이전 코드 경로와 직접 비교합니다.
+수정하지 마세요 (기준값이 바뀌면 검사가 의미를 잃음).
+"""
+
+import numpy as np
+from scipy import signal
+import pyrubberband as pyrb
+
+
+def normalize_audio(y, target_db=-1.0):
+    max_val = np.max(np.abs(y))
+    if max_val == 0: return y
+    target_amp = 10 ** (target_db / 20)
+    return y * (target_amp / max_val)
+
+
+def preserve_energy(y_original, y_stretched):
+    rms_orig = np.sqrt(np.mean(y_original**2))
+    rms_new = np.sqrt(np.mean(y_stretched**2))
+    if rms_new < 1e-5: return y_stretched
+    gain = rms_orig / rms_new
+    if gain > 3.0: gain = 3.0
+    return y_stretched * gain
+
+
+def smooth_concatenate(arrays, fade_samples=512):
+    if not arrays: return np.array([])
+    if len(arrays) == 1: return arrays[0]
+
+    result = arrays[0]
+    for i in range(1, len(arrays)):
+        next_arr = arrays[i]
+
+        if len(result) < fade_samples or len(next_arr) < fade_samples:
+            result = np.concatenate([result, next_arr])
+            continue
+
+        fade_out = np.cos(np.linspace(0, np.pi / 2, fade_samples))
+        fade_in = np.sin(np.linspace(0, np.pi / 2, fade_samples))
+
+        overlap_prev = result[-fade_samples:] * fade_out
+        overlap_next = next_arr[:fade_samples] * fade_in
+
+        combined = overlap_prev + overlap_next
+        result = np.concatenate([result[:-fade_samples], combined, next_arr[fade_samples:]])
+
+    return result
+
+
+def linear_ramp(start, stop, length):
+    # 이전에는 전략마다 np.linspace 곡선을 그 자리에서 만들었음
+    return np.linspace(start, stop, length)
+
+
+def get_low_freq_energy(y, sr):
+    """150Hz 이하 킥/베이스 에너지 측정 (위상 검증용)"""
+    try:
+        sos = signal.butter(4, 150, 'lp', fs=sr, output='sos')
+        y_low = signal.sosfilt(sos, y)
+        return np.sqrt(np.mean(y_low**2))
+    except:
+        return 0
+
+
+def match_bpm_with_safety_margin(y, sr, current_bpm, target_bpm, target_len_samples):
+    if current_bpm == target_bpm:
+        if len(y) > target_len_samples: return y[:target_len_samples]
+        return y
+
+    rate = target_bpm / current_bpm
+    y_stretched = pyrb.time_stretch(y, sr, rate)
+    y_stretched = preserve_energy(y, y_stretched)
+
+    if len(y_stretched) > target_len_samples:
+        return y_stretched[:target_len_samples]
+    elif len(y_stretched) < target_len_samples:
+        pad_len = target_len_samples - len(y_stretched)
+        return np.pad(y_stretched, (0, pad_len))
+    return y_stretched
+
+
+def apply_high_pass(y, sr, cutoff=400):
+    try:
+        sos = signal.butter(10, cutoff, 'hp', fs=sr, output='sos')
+        return signal.sosfilt(sos, y)
+    except:
+        return y
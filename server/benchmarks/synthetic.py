@@ -0,0 +1,176 @@
+"""
+벤치마크용 합성 트랙 생성기 (오프라인, 결정적)
+
+알려진 BPM/키로 킥·하이햇 패턴, 베이스, 패드(코드), 보컬 비슷한 멜로디를 만들고
+스템 분리 결과와 같은 레이아웃(output/<stem_folder()>/<name>/{vocals,drums,bass,other}.wav)으로
+가짜 스템을 저장합니다. 스템이 이미 있으면 separate_stems()는 Demucs를 건너뜁니다.
+
+구조 (4/4 박자 기준):
+    - 인트로 16마디: 드럼만
+    - 본문: 드럼 + 베이스 + 패드, 보컬은 전체 길이의 70% 지점까지 2마디 단위로 등장
+    - 아웃트로 8마디: 드럼이 점점 작아짐
+"""
+
+import os
+import numpy as np
+import soundfile as sf
+from scipy import signal
+
+from services.stem_separation import stem_folder
+
+KEY_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+STEM_NAMES = ["vocals", "drums", "bass", "other"]
+
+
+def _midi_to_hz(note):
+    return 440.0 * 2.0 ** ((note - 69) / 12.0)
+
+
+def _place(template, positions, length):
+    """템플릿을 주어진 샘플 위치들에 배치 (임펄스열 * 템플릿 컨볼루션)"""
+    impulses = np.zeros(length, dtype=np.float32)
+    positions = positions[positions < length]
+    impulses[positions] = 1.0
+    return signal.oaconvolve(impulses, template)[:length].astype(np.float32)
+
+
+def _kick(sr):
+    t = np.arange(int(0.25 * sr)) / sr
+    freq = 50.0 + 100.0 * np.exp(-t * 30.0)
+    phase = 2 * np.pi * np.cumsum(freq) / sr
+    return (np.sin(phase) * np.exp(-t * 12.0)).astype(np.float32)
+
+
+def _hat(sr, rng):
+    n = int(0.05 * sr)
+    noise = rng.standard_normal(n)
+    sos = signal.butter(4, 7000, 'hp', fs=sr, output='sos')
+    return (signal.sosfilt(sos, noise) * np.exp(-np.arange(n) / sr * 80.0) * 0.3).astype(np.float32)
+
+
+def _tone(freqs, length, sr, harmonics=(1.0,), vibrato=0.0):
+    """주파수 배열(샘플별)로 하모닉 톤 합성"""
+    phase = 2 * np.pi * np.cumsum(freqs) / sr
+    if vibrato:
+        phase = phase + vibrato * np.sin(2 * np.pi * 5.5 * np.arange(length) / sr)
+    out = np.zeros(length, dtype=np.float32)
+    for k, amp in enumerate(harmonics, start=1):
+        out += (amp * np.sin(k * phase)).astype(np.float32)
+    return out
+
+
+def generate_track(duration_sec, bpm, key_index=0, mode="major", sr=44100, seed=0):
+    """
+    합성 트랙과 스템 생성
+
+    Returns:
+        (mix, stems, info)
+        mix: float32 mono 배열
+        stems: {"vocals", "drums", "bass", "other"} -> float32 배열
+        info: {"bpm", "key_index", "mode", "beats" (샘플), "downbeats" (샘플), "vocal_end" (샘플)}
+    """
+    rng = np.random.default_rng(seed)
+    length = int(duration_sec * sr)
+    samples_per_beat = 60.0 / bpm * sr
+    n_beats = int(length / samples_per_beat)
+    beats = np.round(np.arange(n_beats) * samples_per_beat).astype(int)
+    downbeats = beats[::4]
+    n_bars = len(downbeats)
+
+    intro_bars = min(16, n_bars // 4)
+    outro_bars = min(8, n_bars // 8)
+    body_start = downbeats[intro_bars] if intro_bars < n_bars else length
+    outro_start = downbeats[n_bars - outro_bars] if outro_bars > 0 else length
+
+    # 🥁 드럼: 모든 박에 킥, 8분음표 뒷박에 하이햇
+    offbeats = np.round(beats + samples_per_beat / 2).astype(int)
+    drums = _place(_kick(sr), beats, length) + _place(_hat(sr, rng), offbeats, length)
+    if outro_start < length:
+        drums[outro_start:] *= np.linspace(1.0, 0.1, length - outro_start, dtype=np.float32)
+
+    # 🎹 코드 진행 (I - IV - V - I, 1마디씩)
+    root = 48 + key_index
+    third = 4 if mode == "major" else 3
+    progression = [0, 5, 7, 0]
+    bar_root = np.zeros(length, dtype=np.float32)
+    for bar, start in enumerate(downbeats):
+        end = downbeats[bar + 1] if bar + 1 < n_bars else length
+        bar_root[start:end] = root + progression[bar % 4]
+    bar_root[:downbeats[0]] = root
+
+    body_mask = np.zeros(length, dtype=np.float32)
+    body_mask[body_start:outro_start] = 1.0
+
+    # 🎸 베이스: 코드 루트 한 옥타브 아래, 박마다 재어택
+    bass_env = np.ones(length, dtype=np.float32)
+    for b in beats:
+        seg = bass_env[b:b + int(samples_per_beat)]
+        seg *= np.exp(-np.arange(len(seg)) / sr * 4.0).astype(np.float32)
+    bass = _tone(_midi_to_hz(bar_root - 12), length, sr, harmonics=(1.0, 0.3)) * bass_env * body_mask * 0.5
+
+    # 🎼 패드: 3화음
+    pad = np.zeros(length, dtype=np.float32)
+    for interval in (0, third, 7):
+        pad += _tone(_midi_to_hz(bar_root + 12 + interval), length, sr, harmonics=(1.0, 0.2))
+    other = pad * body_mask * 0.12
+
+    # 🎤 보컬 비슷한 멜로디: 2마디 노래 / 2마디 쉼, 전체 70% 지점까지
+    scale = [0, 2, 4, 5, 7, 9, 11] if mode == "major" else [0, 2, 3, 5, 7, 8, 10]
+    vocal_end = int(length * 0.7)
+    melody = np.full(length, float(root + 24), dtype=np.float32)
+    vocal_mask = np.zeros(length, dtype=np.float32)
+    for bar in range(intro_bars, n_bars):
+        start = downbeats[bar]
+        if start >= vocal_end:
+            break
+        if (bar - intro_bars) % 4 < 2:
+            end = min(vocal_end, downbeats[bar + 1] if bar + 1 < n_bars else length)
+            vocal_mask[start:end] = 1.0
+            for beat in range(4):
+                b0 = int(start + beat * samples_per_beat)
+                melody[b0:min(end, int(b0 + samples_per_beat))] = root + 24 + scale[rng.integers(len(scale))]
+    # 음 경계에서 클릭이 나지 않도록 마스크를 부드럽게
+    smooth = np.hanning(int(0.02 * sr)).astype(np.float32)
+    vocal_mask = np.convolve(vocal_mask, smooth / smooth.sum(), mode="same").astype(np.float32)
+    vocals = _tone(_midi_to_hz(melody), length, sr, harmonics=(1.0, 0.5, 0.25), vibrato=0.3) * vocal_mask * 0.2
+
+    stems = {"vocals": vocals, "drums": drums * 0.6, "bass": bass, "other": other}
+    mix = np.sum([stems[name] for name in STEM_NAMES], axis=0).astype(np.float32)
+
+    peak = np.max(np.abs(mix))
+    if peak > 0.99:
+        scale_factor = np.float32(0.99 / peak)
+        mix *= scale_factor
+        for name in STEM_NAMES:
+            stems[name] *= scale_factor
+
+    info = {
+        "bpm": float(bpm),
+        "key_index": int(key_index),
+        "mode": mode,
+        "beats": beats,
+        "downbeats": downbeats,
+        "vocal_end": vocal_end,
+    }
+    return mix, stems, info
+
+
+def write_track(name, duration_sec, bpm, tracks_dir, stems_root, key_index=0, mode="major", sr=44100, seed=0):
+    """
+    합성 트랙(tracks_dir/<name>.wav)과 가짜 스템(stems_root/<stem_folder()>/<name>/*.wav)을 저장
+
+    Returns:
+        (track_filename, info)
+    """
+    mix, stems, info = generate_track(duration_sec, bpm, key_index, mode, sr, seed)
+
+    os.makedirs(tracks_dir, exist_ok=True)
+    track_filename = f"{name}.wav"
+    sf.write(os.path.join(tracks_dir, track_filename), mix, sr, subtype="FLOAT")
+
+    stem_dir = os.path.join(stems_root, stem_folder(), name)
+    os.makedirs(stem_dir, exist_ok=True)
+    for stem_name, y in stems.items():
+        sf.write(os.path.join(stem_dir, f"{stem_name}.wav"), y, sr, subtype="FLOAT")
+
+    return track_filename, info
@@ -5,12 +5,53 @@
 import os
 
 # 📁 경로 설정
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 INPUT_DIR = "./uploads"
-OUTPUT_DIR = "./output"
+OUTPUT_DIR = os.environ.get("DAW_OUTPUT_DIR", "./output")  # 엔진을 프로세스 안에서 임포트할 때 절대 경로로 지정
 MIXED_RESULTS_DIR = os.path.join(OUTPUT_DIR, "mixed_results")
+ANALYSIS_CACHE_DIR = os.path.join(OUTPUT_DIR, "analysis")  # 비트 분석 결과 캐시
+
+# 업로드된 트랙 폴더 (다른 백엔드에서 엔진을 호출할 때 환경변수로 덮어쓸 수 있음)
+TRACKS_DIR = os.environ.get("DAW_TRACKS_DIR", os.path.join(BASE_DIR, "uploads", "tracks"))
 
 # 🎧 오디오 기본 설정
 TARGET_SR = 44100
+AUDIO_DTYPE = "float32"            # DSP 경로 전체의 샘플 dtype (float64는 검증용)
+
+# 🥁 비트 트래커 백엔드 ("beatnet" | "madmom" | "librosa" | "auto")
+# auto: BEAT_BACKEND_AUTO_ORDER 순서로 사용 가능한 첫 백엔드
+# 속도/정확도 비교: python benchmarks/bench_beat.py
+BEAT_BACKEND = os.environ.get("DAW_BEAT_BACKEND", "auto")
+BEAT_BACKEND_AUTO_ORDER = ["beatnet", "librosa"]
+TRIM_BEAT_BACKEND = "madmom"       # Smart Trim 다운비트 스냅용
+
+# 🎚️ 타임 스트레치 / 피치 시프트 엔진 ("rubberband" | "librosa")
+STRETCH_ENGINE = "rubberband"
+
+# 🎼 키 분석 전 HPSS (화성 성분 분리) 실행 여부 (정확하지만 키 분석 시간의 대부분)
+KEY_HPSS = True
+
+# 🏷️ 품질 티어 (요청 JSON의 "tier"로 선택, pipeline.quality_tier)
+# 티어는 위 config 값을 함께 바꿉니다. master는 이 파일의 기본값(가장 비싼 옵션) 그대로입니다.
+#   draft: 미리듣기/빠른 A/B 비교용 (가벼운 단일 모델 + shifts 0, 22.05kHz, 프로세스 내 스트레치)
+QUALITY_TIER = os.environ.get("DAW_QUALITY_TIER", "master")
+QUALITY_TIERS = {
+    "draft": {
+        "STEM_MODEL": "htdemucs",
+        "STEM_SHIFTS": 0,
+        "BEAT_BACKEND": "librosa",
+        "TRIM_BEAT_BACKEND": "librosa",
+        "TARGET_SR": 22050,
+        "KEY_HPSS": False,
+        "STRETCH_ENGINE": "librosa",
+    },
+    "standard": {
+        "STEM_MODEL": "htdemucs",
+        "STEM_SHIFTS": 1,
+        "KEY_HPSS": False,
+    },
+    "master": {},
+}
 
 # ⚖️ 믹싱 판단 기준
 BPM_THRESHOLD = 20  # BPM 차이가 이 값보다 크면 Drop Mix
@@ -24,4 +65,173 @@ DROP_VOCAL_SENSITIVITY = 0.001     # 보컬 감지 민감도 (RMS)
 
 # 🍹 Blend Mix 설정
 BLEND_OVERLAP_FADE = 512           # 기본 크로스페이드 샘플 수
-BLEND_MICRO_FADE = 256             # 타이밍 보정용 마이크로 페이드
\ No newline at end of file
+BLEND_MICRO_FADE = 256             # 타이밍 보정용 마이크로 페이드
+BLEND_OVERLAP_BEATS = None         # 겹침 길이(박). None이면 Track B 인트로 길이로 결정
+
+# ✂️ 스템 분리 모델 (Demucs, 결과는 output/<STEM_MODEL>_shifts<STEM_SHIFTS>/<트랙>/에 저장)
+STEM_MODEL = "htdemucs_ft"         # 기본 htdemucs보다 정교함 (4개 모델 묶음이라 약 4배 느림)
+STEM_SHIFTS = 2                    # 노이즈 제거를 위한 중복 분석 횟수 (횟수만큼 분리 시간 증가)
+STEM_OVERLAP = 0.25                # 구간 연결 부드러움 정도
+
+# 스템 분리 범위 ("full": 트랙 전체 | "region": 전환 주변 구간만, services/stem_separation.py)
+# 부분 스템은 캐시되며 나중에 full 모드로 분리하면 전체 스템으로 업그레이드됩니다.
+STEM_SEPARATION_MODE = os.environ.get("DAW_STEM_MODE", "full")
+REGION_A_LOOKBACK_SEC = 45.0       # Track A는 Smart Trim 지점 이만큼 전부터 곡 끝까지 분리
+REGION_PAD_SEC = 4.0               # 구간 앞뒤 여유 (Demucs 경계 잡음 방지, 안쪽만 기록)
+REGION_VOCAL_RMS = 0.01            # Track A 구간에 이보다 큰 보컬이 없으면 대략 분리로 보컬 위치 탐색
+REGION_COARSE_MODEL = "htdemucs"   # 대략 분리용 가벼운 모델 (단일 모델, shifts 0)
+
+# 🧱 구조 분석 (services/analyzer_structure.py, 비트 단위 자기 유사도 노벨티로 섹션 분할, 트랙별 캐시)
+STRUCTURE_ENABLED = True           # 인트로 끝/아웃트로 시작을 구조 분석 결과로 (False면 RMS 휴리스틱만)
+STRUCTURE_KERNEL_BEATS = 16        # 노벨티 체커보드 커널 반폭 (비트, 4마디)
+STRUCTURE_MIN_SECTION_BEATS = 16   # 섹션 최소 길이 (비트)
+
+# 🔎 전환 지점 탐색 (services/transition_search.py, A의 마디 출구 x B의 마디 진입 전체를 행렬 하나로 점수화)
+TRANSITION_SEARCH_ENABLED = True   # False면 휴리스틱 체인 (아웃트로 -> Smart Trim -> 보컬 끝, B는 처음부터 진입)
+TRANSITION_SEARCH_TOP_K = 5        # 결과에 남길 후보 수 (1순위를 렌더링에 사용)
+TRANSITION_SEARCH_WINDOW_BARS = 8  # 출구 전후/진입 후 비교 구간 (마디)
+TRANSITION_SEARCH_PHRASE_BARS = 8  # 프레이즈 길이 (마디, 경계 가산점 + 사전 점수 폭)
+TRANSITION_SEARCH_A_MIN_RATIO = 0.5  # A 출구 후보는 곡 길이의 이 비율 이후부터
+TRANSITION_SEARCH_B_MAX_RATIO = 0.5  # B 진입 후보는 곡 길이의 이 비율까지
+TRANSITION_SEARCH_WEIGHTS = {      # 전략별 점수 항목 가중치 (항목 설명은 services/transition_search.py)
+    "blend": {"energy": 1.0, "harmony": 1.0, "vocal_clash": -1.5, "vocal_cut": -1.0, "phrase": 0.5,
+              "section": 0.5, "exit_prior": 2.0, "entry_prior": 1.5},
+    "drop": {"energy": 0.3, "impact": 1.0, "harmony": 0.5, "vocal_loop": 0.5, "phrase": 0.5,
+             "section": 0.5, "exit_prior": 2.0, "entry_prior": 1.5},
+}
+
+# 📈 프로파일링 (단계별 시간/메모리 측정)
+PROFILE_ENABLED = os.environ.get("DAW_PROFILE", "0") == "1"  # 요청 JSON의 "profile"로도 켤 수 있음
+PROFILE_TRACE_MEMORY = True        # tracemalloc 피크 측정 (약간의 오버헤드 있음)
+PROFILE_CHROME_TRACE = os.environ.get("DAW_PROFILE_TRACE", "0") == "1"
+PROFILE_DIR = os.path.join(OUTPUT_DIR, "profiles")  # Chrome Trace 저장 폴더
+
+# 🔻 분석 피라미드 (utils/pyramid.py, 한 번 디코딩한 오디오를 1/2씩 데시메이션)
+# 분석기는 각자 선언한 MIN_SR 이상인 가장 낮은 레벨로 분석 (렌더링은 항상 TARGET_SR)
+ANALYSIS_PYRAMID_LEVELS = 3        # 44.1k, 22.05k, 11.025k (1이면 모든 분석을 TARGET_SR로)
+
+# 🧮 단계별 메모이즈 파이프라인 (pipeline.py)
+PIPELINE_CACHE_MB = 1024           # 단계 결과 메모리 캐시 예산 (LRU)
+
+# 💿 디코딩된 PCM 캐시 (utils/pcm_cache.py, 파일 내용 해시 키, 모노 float32 memmap)
+PCM_CACHE_ENABLED = os.environ.get("DAW_PCM_CACHE", "1") == "1"
+PCM_CACHE_DIR = os.path.join(OUTPUT_DIR, "pcm")
+PCM_CACHE_MAX_MB = 8192            # 디스크 예산 (넘으면 오래 안 쓴 항목부터 삭제, 0이면 무제한)
+
+# 🗃️ 믹스 결과 캐시 (services/mix_cache.py, 트랙 내용 해시 + 전략 + 파라미터 키)
+MIX_CACHE_DIR = os.path.join(OUTPUT_DIR, "blends", "cache")
+MIX_CACHE_VERSION = 4              # 믹싱 알고리즘이 바뀌면 올려서 기존 결과 무효화
+MIX_CACHE_MAX_MB = 4096            # 디스크 예산 (넘으면 오래 안 쓴 결과부터 삭제, 0이면 무제한)
+MIX_CACHE_LOCK_STALE_SEC = 3600    # 렌더링 락이 이보다 오래되면 죽은 것으로 간주 (스템 분리 포함)
+MIX_CACHE_POLL_SEC = 0.5           # 같은 요청이 렌더링 중일 때 결과를 확인하는 간격
+
+# 📡 점진적 출력 (utils/progressive_wav.py, 렌더링 중에 앞부분부터 재생)
+# 전환 위치가 정해지면 A 본체를 먼저 파일에 쓰고, 나머지는 렌더링이 끝나는 대로 블록 단위로 덧붙임
+# 요청 JSON의 "progressive"로도 켤 수 있음 (정규화 게인이 달라서 일반 모드와 결과 캐시를 따로 씀)
+MIX_PROGRESSIVE = os.environ.get("DAW_PROGRESSIVE", "0") == "1"
+PROGRESSIVE_COMMIT_BLOCK = 1 << 18  # 나머지 구간을 덧붙이는 블록 크기 (샘플, 블록마다 커밋 알림)
+
+# 🎛️ 세트 렌더링 (set_renderer.py, N곡 연속 믹스)
+SETS_DIR = os.path.join(OUTPUT_DIR, "sets")
+SET_PREFETCH_AHEAD = 1             # 현재 전환을 렌더링하는 동안 미리 준비할 다음 트랙 수
+SET_WRITE_BLOCK = 1 << 18          # 정규화 패스의 블록 크기 (샘플)
+
+# 🧾 매니페스트 출력 (utils/mix_manifest.py, 전환 구간만 렌더링하고 나머지는 원본 참조)
+# "wav": 전체 믹스 WAV / "manifest": 전환 구간 WAV + 배치 정보(JSON), 전체 WAV는 flatten_mix.py로 필요할 때 생성
+MIX_OUTPUT = os.environ.get("DAW_MIX_OUTPUT", "wav")  # 요청 JSON의 "output"으로도 지정 가능
+MIX_FLATTEN_DIR = os.path.join(OUTPUT_DIR, "blends", "flat")
+
+# 🗂️ 배치 믹스 (batch_mixer.py, 여러 트랙 쌍을 하나의 의존성 그래프로)
+BATCH_WORKERS = 4                  # 그래프 노드를 실행하는 워커 스레드 수
+BATCH_HEAVY_CONCURRENCY = 1        # 동시에 실행할 무거운 노드(스템 분리, 렌더링) 수 (GPU/메모리 한도)
+
+# 🧭 유사 트랙 추천 (services/track_similarity.py, 음색 임베딩 + 디스크 IVF 인덱스 utils/vector_index.py)
+SIMILARITY_INDEX_DIR = os.path.join(OUTPUT_DIR, "similarity")
+SIMILARITY_TOP_K = 10
+SIMILARITY_NPROBE = 8              # 검색할 IVF 리스트 수 (리스트 수는 약 sqrt(트랙 수), 클수록 정확하고 느림)
+SIMILARITY_REBUILD_RATIO = 0.1     # 새로 추가된 꼬리가 정렬된 부분의 이 비율을 넘으면 IVF 재학습
+SIMILARITY_REBUILD_MIN = 1024      # 꼬리가 이보다 짧으면 재학습하지 않음 (작은 라이브러리는 전부 정확 검색)
+AUDIO_EXTENSIONS = [".mp3", ".wav", ".flac", ".m4a", ".aac", ".ogg"]  # 백필 때 TRACKS_DIR에서 찾을 파일
+
+# 🎚️ 실시간 믹싱 (live_engine.py, 고정 블록 콜백 / 측정: benchmarks/bench_live.py)
+LIVE_BLOCK_SIZE = 512              # 콜백 블록 크기 (샘플, 44.1kHz에서 11.6ms 마감)
+LIVE_BASS_KILL_HZ = 150            # Blend 겹침 구간의 Track A 베이스 킬 하이패스 (오프라인은 베이스 제외 스템)
+LIVE_BASS_KILL_ORDER = 4
+LIVE_DROP_HP_HZ = 400              # Drop 브릿지 하이패스 (DropMixStrategy.build_bridge와 같은 값)
+LIVE_DROP_HP_ORDER = 10
+
+# 📥 업로드 중 증분 분석 (services/analyzer_stream.py, 잠정 BPM/비트/파형 + PCM 캐시 채우기)
+STREAM_DECODE_STEP_KB = 256        # 새 바이트가 이만큼 쌓일 때마다 받은 앞부분을 다시 열어 이어서 디코딩
+STREAM_DECODE_MP3_GROWTH = 0.25    # MP3는 받은 크기의 이 비율만큼 더 쌓여야 다음 라운드 (탐색이 앞부분을 다시 훑으므로)
+STREAM_DECODE_MARGIN = 4096        # 마지막 라운드 전에는 끝의 이만큼(프레임)은 보류 (잘린 MP3/OGG 프레임 보호)
+
+# 🔮 업로드 후 선행 처리 (services/prefetch.py, 비트/구조 분석 -> 전체 스템 분리를 낮은 우선순위로)
+# 백엔드가 한 번에 하나씩 실행하고, 믹스 작업이 시작되면 일시정지합니다.
+PREFETCH_STEMS = True              # False면 분석만 (스템 분리는 믹스 요청 때)
+PREFETCH_NICE = 19                 # 프로세스 우선순위 (자식 Demucs도 상속)
+PREFETCH_THREADS = max(1, (os.cpu_count() or 2) // 2)  # BLAS/OpenMP/torch 스레드 수 상한 (CPU 예산)
+PREFETCH_MAX_LOAD = 0.5            # 1분 평균 부하 / 코어 수가 이보다 크면 시작하지 않음
+PREFETCH_MIN_FREE_MB = 4096        # 시작할 때 필요한 가용 메모리 (htdemucs_ft CPU 분리 약 3GB)
+PREFETCH_RESERVE_MB = 1024         # 실행 중 가용 메모리가 이보다 줄면 중단하고 나중에 다시 (완료된 단계는 캐시)
+
+# 🛰️ 분산 작업 (worker.py가 큐에서 가져가 실행, services/task_queue.py + services/artifact_store.py)
+# DISTRIBUTED_TASKS에 넣은 종류만 워커로 보내고 나머지는 지금처럼 이 프로세스에서 실행합니다.
+DISTRIBUTED_TASKS = [kind for kind in os.environ.get("DAW_DISTRIBUTED_TASKS", "").split(",") if kind]  # separate, analyze, render
+TASK_QUEUE_URL = os.environ.get("DAW_TASK_QUEUE", "sqlite:///" + os.path.join(OUTPUT_DIR, "tasks.db"))
+ARTIFACT_STORE_URL = os.environ.get("DAW_ARTIFACT_STORE", "file://" + os.path.join(OUTPUT_DIR, "artifacts"))
+TASK_LEASE_SEC = 60.0              # 하트비트 없이 이 시간이 지나면 워커가 죽은 것으로 보고 다시 대기열로
+TASK_HEARTBEAT_SEC = 15.0          # 워커 하트비트 주기 (점유 연장 + 진행률)
+TASK_MAX_ATTEMPTS = 3              # 점유가 끊기거나 실패한 작업의 최대 시도 횟수
+TASK_POLL_SEC = 1.0                # 빈 큐 / 완료 대기 폴링 주기
+TASK_WAIT_TIMEOUT_SEC = 7200.0     # 작업을 보낸 쪽의 최대 대기 시간 (None: 무제한, 실패/재시도는 큐가 처리)
+TASK_UNCLAIMED_TIMEOUT_SEC = 300.0 # 이 시간 안에 어떤 워커도 가져가지 않으면 실패 (워커 없음, None: 계속 대기)
+
+# 🎧 트랜지션 미리듣기 (preview.py)
+PREVIEW_PRE_SEC = 20.0             # 전환 시작 전 구간 (초)
+PREVIEW_POST_SEC = 20.0            # Track B 진입 후 구간 (초)
+PREVIEW_SR = 22050                 # 미리듣기 렌더링 샘플레이트 (None이면 TARGET_SR)
+PREVIEW_STRETCH_ENGINE = "librosa" # rubberband 외부 프로세스 대신 프로세스 내 위상 보코더
+PREVIEW_TRIM_BEAT_BACKEND = "librosa"
+PREVIEW_KEY_HPSS = False           # 키 분석 전 HPSS (화성 성분 분리) 실행 여부
+PREVIEW_KEY_MIN_SEC = 2.0          # 키 분석 구간이 이보다 짧으면 (짧은 트랙 등) 키 매칭 생략
+PREVIEW_B_SCAN_SEC = 90.0          # Track B는 앞부분만 디코딩 (인트로 분석 + 진입 후 구간)
+
+
+# ====================================================
+# 🧵 요청별 config 덮어쓰기 (티어, 믹스 params, 미리듣기 설정)
+# ====================================================
+# 모듈 값을 직접 바꾸면 같은 프로세스에서 동시에 렌더링 중인 다른 요청까지 영향을 받으므로,
+# 덮어쓴 값은 현재 실행 컨텍스트(contextvars)에만 보이게 하고 config.X 조회 때 먼저 확인합니다.
+# 스레드 풀로 넘기는 작업은 contextvars.copy_context().run으로 실행해야 같은 값을 봅니다. (utils/task_graph.py)
+
+import sys as _sys
+import types as _types
+import contextvars as _contextvars
+from contextlib import contextmanager as _contextmanager
+
+_overrides = _contextvars.ContextVar("config_overrides", default={})
+
+
+class _ConfigModule(_types.ModuleType):
+
+    def __getattribute__(self, name):
+        values = _overrides.get()
+        if values and name in values:
+            return values[name]
+        return super().__getattribute__(name)
+
+
+@_contextmanager
+def overrides(values):
+    """with 블록 안(같은 컨텍스트)에서만 config 값을 바꿈 (중첩하면 안쪽 값 우선)"""
+    unknown = [name for name in values if not hasattr(_sys.modules[__name__], name)]
+    if unknown:
+        raise AttributeError(f"Unknown config values: {unknown}")
+    token = _overrides.set({**_overrides.get(), **values})
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+_sys.modules[__name__].__class__ = _ConfigModule
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+flatten_mix.py - 믹스 매니페스트(utils/mix_manifest.py)를 전체 WAV로 합치기
+매니페스트 출력 모드("output": "manifest")로 만든 믹스를 재생/다운로드할 때 필요한 순간에만 실행합니다.
+같은 매니페스트는 한 번만 합칩니다. (output/blends/flat/<매니페스트 해시>.wav)
+
+사용법:
+    python flatten_mix.py '{"manifestUrl":"blends/cache/<key>.json"}'   # mix_engine 결과 JSON ("manifest" 포함)
+    python flatten_mix.py '{"manifest":{...}}'
+
+출력:
+    - 완료: {"mixUrl": "blends/flat/<hash>.wav", "duration": 180, "cached": false}
+    - 전환 구간 WAV가 믹스 캐시에서 지워졌으면 FileNotFoundError (같은 요청으로 믹스를 다시 렌더링하면 복구)
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from utils.mix_manifest import flatten, manifest_digest
+from utils.profiler import profile_stage
+
+# 같은 매니페스트를 동시에 요청하면 (백엔드 스레드풀) 하나만 합치고 나머지는 그 결과를 씀
+_output_locks = {}
+_output_locks_guard = threading.Lock()
+
+
+def _output_lock(path):
+    with _output_locks_guard:
+        return _output_locks.setdefault(path, threading.Lock())
+
+
+def flatten_mix(manifest):
+    """
+    Args:
+        manifest: utils.mix_manifest.build_manifest() 결과
+
+    Returns:
+        dict: {"mixUrl": OUTPUT_DIR 기준 경로, "duration", "cached"}
+    """
+    os.makedirs(config.MIX_FLATTEN_DIR, exist_ok=True)
+    output_path = os.path.join(config.MIX_FLATTEN_DIR, f"{manifest_digest(manifest)}.wav")
+    with _output_lock(output_path):
+        cached = os.path.exists(output_path)
+        if not cached:
+            # 다른 프로세스(CLI 실행)와도 겹치지 않는 임시 파일에 쓰고 원자적으로 교체
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(output_path)[:-4]}.", suffix=".tmp.wav",
+                                            dir=config.MIX_FLATTEN_DIR)
+            os.close(fd)
+            try:
+                with profile_stage("flatten"):
+                    flatten(manifest, tmp_path)
+                os.replace(tmp_path, output_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    return {
+        "mixUrl": os.path.relpath(output_path, config.OUTPUT_DIR).replace(os.sep, "/"),
+        "duration": manifest["duration"],
+        "cached": cached,
+    }
+
+
+def load_manifest(manifest_url):
+    """OUTPUT_DIR 기준 경로의 매니페스트 (mix_engine 결과 JSON이면 그 안의 "manifest")"""
+    with open(os.path.join(config.OUTPUT_DIR, manifest_url), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("manifest", data)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        manifest = request_data.get("manifest")
+        if manifest is None and request_data.get("manifestUrl"):
+            manifest = load_manifest(request_data["manifestUrl"])
+        if manifest is None:
+            print(json.dumps({"error": "manifest 또는 manifestUrl이 필요합니다."}))
+            sys.exit(1)
+        print(json.dumps(flatten_mix(manifest)))
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""
+live_engine.py - 실시간(블록 단위) 믹싱 엔진
+
+mix_engine.py는 트랙 전체 배열로 전환을 렌더링합니다. 이 모듈은 같은 전환을 고정 크기 블록
+(config.LIVE_BLOCK_SIZE, 256~1024 샘플) 콜백으로 처리해서 오디오 장치에 바로 보낼 수 있게 합니다.
+
+    LiveMixer.process(out)   블록 하나 렌더링 (오디오 콜백에서 호출)
+      ├─ Deck x N            재생 위치/속도(바리스피드), 루프, 위치 큐, 하이패스 EQ, 게인
+      ├─ 크로스페이더         덱의 side("a" | "b")에 따라 곡선 게인 (side가 None이면 그대로 통과)
+      └─ 마스터 게인 + 클리핑
+    cue_blend / cue_drop     BlendMixStrategy / DropMixStrategy 전환을 덱 큐로 예약
+
+콜백 안에서는 메모리를 할당하지 않습니다 (처음 실행되는 경로 제외, benchmarks/bench_live.py --check-alloc로 확인).
+모든 numpy 연산은 미리 만든 버퍼에 out=으로 쓰고, 필터는 utils.filters.BlockSOSFilter를 씁니다.
+블록 안 구간은 슬라이스 대신 마스크로, 스칼라는 0차원 배열로 다룹니다 (_Block).
+트랙 로드, EQ 설계, 큐 예약은 콜백 밖에서 합니다.
+큐 콜백은 오디오 콜백 안에서 실행되므로 덱/파라미터 메서드만 호출해야 합니다 (offset은 float).
+
+오프라인 전략과의 차이:
+    - 템포 변경은 바리스피드 (피치도 같이 바뀜, rubberband 타임 스트레치는 실시간 경로에 없음)
+    - Blend 겹침 구간은 스템 대신 하이패스(베이스 킬)로 Track A 베이스를 빼고, Track B는 전체 믹스를 씀
+
+헤드리스 실행/블록 시간 측정: benchmarks/bench_live.py
+"""
+
+import math
+import bisect
+import collections
+
+import numpy as np
+
+import config
+from utils.dsp import audio_dtype, as_audio, tempo_ramp_rates
+from utils.filters import BlockSOSFilter
+
+CROSSFADER_CURVES = ("power", "linear", "cut")
+CUT_CURVE_SLOPE = 16.0  # "cut" 곡선: 끝 1/16 구간에서만 반대쪽 덱이 줄어듦 (스크래치 커브)
+
+
+class _Block:
+    """
+    블록 하나 안의 구간/스칼라 연산 (콜백용)
+
+    슬라이스(buf[i:j])는 뷰 객체를, 파이썬 스칼라를 넘긴 ufunc는 0차원 배열을 호출마다 만들기 때문에
+    구간은 블록 전체 마스크(np.putmask)로, 스칼라는 미리 만든 0차원 배열로 넘깁니다.
+    블록 안 위치와 샘플 수는 float으로 다룹니다 (256보다 큰 int는 연산 결과마다 새 객체).
+    내장 min()/max()와 for문도 이터레이터를 할당하므로 콜백 경로에서는 조건식과 while을 씁니다.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.index = np.arange(size, dtype=np.float64)
+        self.mask = np.zeros(size, dtype=bool)
+        self._below = np.zeros(size, dtype=bool)
+        self._lo = np.zeros((), dtype=np.float64)
+        self._hi = np.zeros((), dtype=np.float64)
+        self._value = np.zeros((), dtype=audio_dtype())
+        self._sample = np.zeros((), dtype=np.float64)
+
+    def select(self, lo, hi):
+        """[lo, hi) 구간 마스크 (다음 select 전까지 유효)"""
+        self._lo.fill(lo)
+        self._hi.fill(hi)
+        np.greater_equal(self.index, self._lo, out=self.mask)
+        np.less(self.index, self._hi, out=self._below)
+        np.logical_and(self.mask, self._below, out=self.mask)
+        return self.mask
+
+    def scalar(self, value):
+        """오디오 dtype 0차원 배열 (다음 scalar 전까지 유효)"""
+        self._value.fill(value)
+        return self._value
+
+    def sample(self, value):
+        """float64 0차원 배열 (재생 위치/속도, 다음 sample 전까지 유효)"""
+        self._sample.fill(value)
+        return self._sample
+
+    def put(self, buf, lo, hi, values):
+        """buf[lo:hi] = values (values: float 또는 블록 버퍼)"""
+        if hi <= lo:
+            return
+        if isinstance(values, float):
+            values = self.scalar(values)
+        if lo <= 0 and hi >= self.size:
+            np.copyto(buf, values)
+        else:
+            np.putmask(buf, self.select(lo, hi), values)
+
+    def multiply(self, buf, gain):
+        """buf *= gain (gain: float 또는 블록 버퍼)"""
+        if isinstance(gain, float):
+            gain = self.scalar(gain)
+        np.multiply(buf, gain, out=buf)
+
+
+class Param:
+    """
+    블록마다 샘플별 값으로 렌더링되는 파라미터 (게인, EQ 믹스, 크로스페이더)
+
+    set()/ramp()의 offset은 다음에 렌더링할 블록 안의 샘플 위치입니다.
+    큐 콜백이 받은 offset을 그대로 넘기면 샘플 단위로 정확하고, 블록 길이보다 크면 이후 블록에 적용됩니다.
+    예약은 clock(지금까지 렌더링한 샘플 수) 기준 시각으로 저장하므로 블록이 지나도 다시 쓰지 않습니다.
+    """
+
+    def __init__(self, value, block_size):
+        self.value = float(value)
+        self.clock = 0.0
+        self._target = self.value
+        self._step = 0.0
+        self._remaining = 0.0
+        # 예약: 시각 오름차순(같은 시각은 예약 순)으로 나란한 큐 (이벤트마다 튜플을 만들지 않도록)
+        self._times = collections.deque()
+        self._starts = collections.deque()  # 시작 값 또는 None
+        self._targets = collections.deque()
+        self._samples = collections.deque()  # 램프 샘플 수
+        self._block = _Block(block_size)
+        self._buf = np.zeros(block_size, dtype=audio_dtype())
+        self._ramp = np.zeros(block_size, dtype=audio_dtype())
+        self._steps = np.arange(1, block_size + 1, dtype=audio_dtype())
+
+    def ramp(self, target, samples=0, offset=0, start=None):
+        """offset부터 samples 동안 target까지 선형 변화 (start가 있으면 그 값으로 점프한 뒤 시작)"""
+        time = self.clock + offset
+        i = bisect.bisect(self._times, time)
+        self._times.insert(i, time)
+        self._starts.insert(i, None if start is None else float(start))
+        self._targets.insert(i, float(target))
+        self._samples.insert(i, float(samples))
+
+    def set(self, value, offset=0):
+        self.ramp(value, 0, offset)
+
+    def _apply(self, start, target, samples):
+        if start is not None:
+            self.value = start
+        self._target = target
+        if samples <= 0:
+            self.value = target
+            self._remaining = 0.0
+        else:
+            self._step = (target - self.value) / samples
+            self._remaining = samples
+
+    def _fill(self, lo, hi):
+        """_buf[lo:hi]를 현재 값/램프로 채움"""
+        if hi <= lo:
+            return
+        block = self._block
+        if self._remaining == 0:
+            block.put(self._buf, lo, hi, self.value)
+            return
+        m = hi - lo
+        if m > self._remaining:
+            m = self._remaining
+        # _ramp[lo:lo + m] = value + step * (1, 2, ..., m)
+        np.subtract(self._steps, block.scalar(lo), out=self._ramp)
+        np.multiply(self._ramp, block.scalar(self._step), out=self._ramp)
+        np.add(self._ramp, block.scalar(self.value), out=self._ramp)
+        block.put(self._buf, lo, lo + m, self._ramp)
+        self._remaining -= m
+        if self._remaining == 0:
+            self.value = self._target
+            block.put(self._buf, lo + m, hi, self.value)
+        else:
+            self.value += self._step * m
+
+    def render(self):
+        """블록 하나 (block_size 샘플). Returns: 블록 전체가 같은 값이면 float, 아니면 버퍼 (다음 render 전까지 유효)"""
+        n = self._block.size
+        end = self.clock + n
+        if self._remaining == 0 and (not self._times or self._times[0] >= end):
+            self.clock = end
+            return self.value
+        pos = 0.0
+        while self._times and self._times[0] < end:
+            offset = self._times.popleft() - self.clock
+            if offset < pos:
+                offset = pos
+            self._fill(pos, offset)
+            pos = offset
+            self._apply(self._starts.popleft(), self._targets.popleft(), self._samples.popleft())
+        self._fill(pos, n)
+        self.clock = end
+        return self._buf
+
+
+class _Loop:
+    __slots__ = ("start", "end", "passes", "rates", "index", "trigger", "on_exit", "base_rate")
+
+
+class Deck:
+    """
+    트랙 하나의 재생기 (모노, config.AUDIO_DTYPE)
+
+    position은 트랙 원본의 샘플 위치(소수)이고, rate만큼 선형 보간으로 읽습니다 (1.0 = 원래 속도).
+    cue(position, fn)은 재생 위치가 position을 지나는 순간 fn(offset)을 호출합니다 (offset: 블록 안 샘플 위치).
+    다른 덱을 움직이는 큐는 그 덱이 mixer.decks에서 뒤에 있을 때 같은 블록 안에서 샘플 단위로 정확합니다.
+    """
+
+    def __init__(self, sr, block_size):
+        self.sr = sr
+        self.block_size = block_size
+        self.side = None
+        self.gain = Param(1.0, block_size)
+        self.eq_mix = Param(0.0, block_size)  # 0 = 바이패스, 1 = 하이패스 출력만
+        self.eq = None
+        self.load(np.zeros(0, dtype=audio_dtype()))
+
+        self._block = _Block(block_size)
+        self._pos = np.zeros(block_size, dtype=np.float64)
+        self._floor = np.zeros(block_size, dtype=np.float64)
+        self._idx = np.zeros(block_size, dtype=np.int64)
+        self._frac = np.zeros(block_size, dtype=audio_dtype())
+        self._seg = np.zeros(block_size, dtype=audio_dtype())
+        self._next = np.zeros(block_size, dtype=audio_dtype())
+        self._wet = np.zeros(block_size, dtype=audio_dtype())
+
+    # ------------------------------------------------
+    # 🎛️ 제어 (콜백 밖에서 / 큐 콜백 안에서)
+    # ------------------------------------------------
+    def load(self, audio, bpm=None):
+        """트랙 교체 (콜백 밖에서만, 끝에 0 두 샘플을 붙여서 보간이 배열 끝을 넘지 않게)"""
+        audio = as_audio(audio)
+        self.audio = np.concatenate([audio, np.zeros(2, dtype=audio.dtype)])
+        self._audio_next = self.audio[1:]  # 보간 오른쪽 샘플 (idx + 1 배열을 만들지 않도록)
+        self.length = len(audio)
+        self.bpm = bpm
+        self.position = 0.0
+        self.rate = 1.0
+        self.playing = False
+        self._start_offset = None
+        self._stop_offset = None
+        self._cue_positions = collections.deque()  # 오름차순, 같은 위치는 예약 순
+        self._cue_callbacks = collections.deque()
+        self._loop = None
+
+    def set_eq(self, cutoff, order=4):
+        """하이패스 EQ 설계 (콜백 밖에서만, 켜고 끄기는 eq_mix)"""
+        self.eq = BlockSOSFilter.butter('hp', order, cutoff, self.sr, self.block_size)
+
+    def play(self, position=None, offset=0):
+        """offset 샘플 뒤부터 재생 (position이 있으면 그 위치부터)"""
+        if position is not None:
+            self.position = float(position)
+        self._start_offset = float(offset)
+
+    def stop(self, offset=0):
+        self._stop_offset = float(offset)
+
+    def cue(self, position, callback):
+        """재생 위치가 position을 지나면 callback(offset)을 한 번 호출"""
+        position = float(position)
+        i = bisect.bisect(self._cue_positions, position)
+        self._cue_positions.insert(i, position)
+        self._cue_callbacks.insert(i, callback)
+
+    def loop(self, start, end, passes, rates=None, trigger=None, on_exit=None):
+        """
+        [start, end) 구간을 passes바퀴 재생
+
+        Args:
+            rates: 바퀴별 속도 (create_tempo_ramp와 같은 계단식 템포 램프, 없으면 현재 속도 유지)
+            trigger: 재생 위치가 이 지점을 지나면 start로 점프하며 시작 (None이면 지금 점프)
+            on_exit: 마지막 바퀴가 끝나는 순간 on_exit(offset) (이후 end부터 원래 속도로 계속 재생)
+        """
+        loop = _Loop()
+        loop.start, loop.end, loop.passes = float(start), float(end), int(passes)
+        loop.rates = None if rates is None else [float(r) for r in rates]
+        loop.index = -1
+        loop.trigger = None if trigger is None else float(trigger)
+        loop.on_exit = on_exit
+        loop.base_rate = self.rate
+        self._loop = loop
+        if trigger is None:
+            self._enter_loop(self.position)
+
+    # ------------------------------------------------
+    # 🔊 렌더링 (오디오 콜백)
+    # ------------------------------------------------
+    def render(self, out):
+        """블록 하나를 out(길이 block_size)에 씀 (게인/EQ 적용 후, 재생 중이 아닌 구간은 0)"""
+        n = self.block_size
+        start = 0.0
+        if not self.playing:
+            if self._start_offset is None or self._start_offset >= n:
+                if self._start_offset is not None:
+                    self._start_offset -= n
+                if self._stop_offset is not None:
+                    self._stop_offset -= n
+                    if self._stop_offset < 0:
+                        self._stop_offset = 0.0
+                # 쉬는 덱: 예약된 파라미터 변경만 진행 (EQ는 다음 재생을 무음 상태에서 시작)
+                out.fill(0)
+                self.eq_mix.render()
+                self.gain.render()
+                if self.eq is not None:
+                    self.eq.reset()
+                return out
+            start = self._start_offset
+            self._start_offset = None
+            self.playing = True
+            self._block.put(out, 0.0, start, 0.0)
+
+        stopped = self._read(out, start, n)
+        self._block.put(out, stopped, n, 0.0)
+        if self._stop_offset is not None:
+            self._stop_offset -= n
+
+        self._apply_eq(out)
+        self._block.multiply(out, self.gain.render())
+        self._block.put(out, stopped, n, 0.0)  # 정지 이후 EQ 잔향 제거 (오프라인 전략의 하드 컷과 같게)
+        return out
+
+    def _read(self, out, i, n):
+        """재생 위치부터 out[i:n]을 읽고 큐/루프 경계를 처리. Returns: 재생이 멈춘 블록 위치 (끝까지면 n)"""
+        while i < n:
+            if self._stop_offset is not None and self._stop_offset < n:
+                # 큐 콜백이 stop()을 부르면 그 위치에서 멈춤
+                n = self._stop_offset if self._stop_offset > i else i
+                self._stop_offset = None
+                self.playing = False
+                continue
+
+            k = n - i
+            boundary = self._next_boundary()
+            if boundary is not None:
+                until = (boundary - self.position) / self.rate
+                until = -(-until // 1.0)  # math.ceil (int 대신 float)
+                if until <= 0:
+                    self._cross(i)
+                    continue
+                if until < k:
+                    k = until
+
+            self._interpolate(out, i, k)
+            self.position += k * self.rate
+            i += k
+            if boundary is not None and self.position >= boundary:
+                self._cross(i)
+
+        if self.position >= self.length and self._loop is None:
+            self.playing = False  # 트랙 끝 (남은 구간은 패딩된 0)
+        return n
+
+    def _interpolate(self, out, i, k):
+        """out[i:i + k]에 재생 위치부터 rate 간격으로 읽은 샘플을 씀 (구간 밖은 계산 후 버림)"""
+        block = self._block
+        whole = i <= 0 and k >= self.block_size
+        seg = out if whole else self._seg
+        pos = self._pos
+        np.subtract(block.index, block.sample(i), out=pos)
+        np.multiply(pos, block.sample(self.rate), out=pos)
+        pos += block.sample(self.position)
+        np.floor(pos, out=self._floor)
+        self._idx[...] = self._floor
+        np.subtract(pos, self._floor, out=pos)
+        # 위치는 float64(긴 트랙에서도 정확), 보간 비율은 오디오 dtype (섞어서 곱하면 numpy가 캐스팅 버퍼를 할당)
+        np.copyto(self._frac, pos)
+        self.audio.take(self._idx, out=seg, mode='clip')
+        self._audio_next.take(self._idx, out=self._next, mode='clip')
+        self._next -= seg
+        self._next *= self._frac
+        seg += self._next
+        if not whole:
+            np.putmask(out, block.select(i, i + k), seg)
+
+    def _next_boundary(self):
+        boundary = self._cue_positions[0] if self._cue_positions else None
+        loop = self._loop
+        if loop is not None:
+            edge = loop.trigger if loop.index < 0 else loop.end
+            if boundary is None or edge < boundary:
+                boundary = edge
+        return boundary
+
+    def _cross(self, offset):
+        """재생 위치가 지난 큐/루프 경계 처리"""
+        while self._cue_positions and self._cue_positions[0] <= self.position:
+            self._cue_positions.popleft()
+            self._cue_callbacks.popleft()(offset)
+
+        loop = self._loop
+        if loop is None:
+            return
+        if loop.index < 0:
+            if loop.trigger is not None and self.position >= loop.trigger:
+                self._enter_loop(loop.trigger)
+        elif self.position >= loop.end:
+            if loop.index + 1 < loop.passes:
+                self.position = loop.start + (self.position - loop.end) % (loop.end - loop.start)
+                self._set_pass(loop.index + 1)
+            else:
+                self._loop = None
+                self.rate = loop.base_rate
+                if loop.on_exit is not None:
+                    loop.on_exit(offset)
+
+    def _enter_loop(self, edge):
+        loop = self._loop
+        past = self.position - edge
+        self.position = loop.start + (past if past > 0 else 0.0) % (loop.end - loop.start)
+        self._set_pass(0)
+
+    def _set_pass(self, index):
+        loop = self._loop
+        loop.index = index
+        if loop.rates is not None:
+            self.rate = loop.rates[index if index < len(loop.rates) else -1]
+
+    def _apply_eq(self, out):
+        mix = self.eq_mix.render()
+        if self.eq is None:
+            return
+        if isinstance(mix, float):
+            if mix == 0.0:
+                self.eq.reset()  # 켜질 때 무음 상태에서 시작 (apply_high_pass와 같은 초기 상태)
+                return
+        wet = self.eq.process(out, self._wet)
+        if isinstance(mix, float) and mix == 1.0:
+            np.copyto(out, wet)
+            return
+        wet -= out
+        self._block.multiply(wet, mix)
+        out += wet
+
+
+class LiveMixer:
+    """
+    덱 여러 개 + 크로스페이더 + 마스터
+
+        mixer = LiveMixer()
+        mixer.decks[0].load(y_a, bpm_a); mixer.decks[1].load(y_b, bpm_b)
+        cue_blend(mixer.decks[0], mixer.decks[1], bpm_a, bpm_b, vocal_end, overlap)
+        mixer.decks[0].play(vocal_end - 10 * sr)
+        while ...: mixer.process(block)
+
+    sounddevice 출력은 OutputStream(callback=mixer.callback, blocksize=mixer.block_size, dtype="float32")
+    """
+
+    def __init__(self, sr=None, block_size=None, decks=2, curve="power"):
+        if curve not in CROSSFADER_CURVES:
+            raise ValueError(f"Unknown crossfader curve: {curve} (choose from {CROSSFADER_CURVES})")
+        self.sr = int(sr or config.TARGET_SR)
+        self.block_size = int(block_size or config.LIVE_BLOCK_SIZE)
+        self.decks = [Deck(self.sr, self.block_size) for _ in range(decks)]
+        self.curve = curve
+        self.crossfader = Param(0.5, self.block_size)  # 0 = side "a"만, 1 = side "b"만
+        self.master = Param(1.0, self.block_size)
+
+        dtype = audio_dtype()
+        self._block = _Block(self.block_size)
+        self._deck_out = np.zeros(self.block_size, dtype=dtype)
+        self._gain_a = np.zeros(self.block_size, dtype=dtype)
+        self._gain_b = np.zeros(self.block_size, dtype=dtype)
+        self._out = np.zeros(self.block_size, dtype=dtype)
+        self._out_channels = self._out[:, None]
+
+    @property
+    def samples(self):
+        """지금까지 렌더링한 샘플 수"""
+        return int(self.master.clock)
+
+    def process(self, out):
+        """블록 하나 렌더링 (len(out) == block_size). Returns: out"""
+        out.fill(0)
+        gain_a, gain_b = self._crossfader_gains(self.crossfader.render())
+        i = 0
+        while i < len(self.decks):
+            deck = self.decks[i]
+            i += 1
+            deck.render(self._deck_out)
+            gain = gain_a if deck.side == "a" else gain_b if deck.side == "b" else 1.0
+            if not (isinstance(gain, float) and gain == 1.0):
+                self._block.multiply(self._deck_out, gain)
+            out += self._deck_out
+        self._block.multiply(out, self.master.render())
+        # np.clip(out, -1, 1) (np.clip은 호출마다 할당)
+        np.minimum(out, self._block.scalar(1.0), out=out)
+        np.maximum(out, self._block.scalar(-1.0), out=out)
+        return out
+
+    def callback(self, outdata, frames, time_info, status):
+        """sounddevice 출력 콜백 (frames == block_size, 모노 믹스를 모든 채널에 복사)"""
+        self.process(self._out)
+        np.copyto(outdata, self._out_channels)
+
+    def _crossfader_gains(self, x):
+        if isinstance(x, float):
+            if self.curve == "power":
+                return math.cos(x * math.pi / 2), math.sin(x * math.pi / 2)
+            if self.curve == "linear":
+                return 1.0 - x, x
+            a, b = (1.0 - x) * CUT_CURVE_SLOPE, x * CUT_CURVE_SLOPE
+            return (a if a < 1.0 else 1.0), (b if b < 1.0 else 1.0)
+
+        a, b, block = self._gain_a, self._gain_b, self._block
+        if self.curve == "power":
+            np.multiply(x, block.scalar(np.pi / 2), out=a)
+            np.sin(a, out=b)
+            np.cos(a, out=a)
+        elif self.curve == "linear":
+            np.subtract(block.scalar(1.0), x, out=a)
+            np.copyto(b, x)
+        else:
+            np.subtract(block.scalar(1.0), x, out=a)
+            np.multiply(a, block.scalar(CUT_CURVE_SLOPE), out=a)
+            np.minimum(a, block.scalar(1.0), out=a)
+            np.multiply(x, block.scalar(CUT_CURVE_SLOPE), out=b)
+            np.minimum(b, block.scalar(1.0), out=b)
+        return a, b
+
+
+# ====================================================
+# 🔁 오프라인 전략과 같은 전환 예약
+# ====================================================
+
+def cue_blend(deck_a, deck_b, bpm_a, bpm_b, vocal_end, overlap_samples, entry_b=0):
+    """
+    BlendMixStrategy 전환 예약 (Track A가 vocal_end를 지나는 순간 시작)
+
+        vocal_end ~ +overlap: A는 베이스 킬 하이패스 + 0.8 -> 0 선형 페이드,
+                              B는 entry_b부터 A 템포(바리스피드)로 0.8 게인
+        이후: A 정지, B는 원래 템포/게인 (오프라인 part_b_body와 같은 B 위치)
+
+    Returns: B가 원래 템포로 돌아오는 B 원본 위치 (오프라인 samples_needed_from_b + entry_b)
+    """
+    rate_b = bpm_a / bpm_b
+    needed = int(overlap_samples * rate_b)
+    fade = config.BLEND_OVERLAP_FADE  # config 조회는 할당하므로 콜백 밖에서
+    deck_a.set_eq(config.LIVE_BASS_KILL_HZ, config.LIVE_BASS_KILL_ORDER)
+
+    def start_overlap(offset):
+        deck_a.eq_mix.ramp(1.0, fade, offset)
+        deck_a.gain.ramp(0.0, overlap_samples, offset, start=0.8)
+        deck_b.rate = rate_b
+        deck_b.gain.set(0.8, offset)
+        deck_b.play(entry_b, offset)
+
+    def end_overlap(offset):
+        deck_a.stop(offset)
+
+    def b_body(offset):
+        deck_b.rate = 1.0
+        deck_b.gain.set(1.0, offset)
+
+    deck_a.cue(vocal_end, start_overlap)
+    deck_a.cue(vocal_end + overlap_samples, end_overlap)
+    deck_b.cue(entry_b + needed, b_body)
+    return entry_b + needed
+
+
+def cue_drop(deck_a, deck_b, bpm_a, bpm_b, cut_point, loop_start=None, entry_b=0):
+    """
+    DropMixStrategy 전환 예약 (Track A가 cut_point를 지나는 순간 시작)
+
+        브릿지: [loop_start, loop_start + 1박 * DROP_TIGHTEN_RATIO)를 DROP_LOOP_BARS * 4바퀴,
+                바퀴마다 create_tempo_ramp와 같은 속도(tempo_ramp_rates) + 400Hz 하이패스 + 0.6 -> 1 게인
+        브릿지가 끝나면 A 정지, B는 entry_b(무음 트림 위치)부터
+
+    Args:
+        loop_start: 루프 소스 시작 (DropMixStrategy.select_source가 고른 박, 기본 cut_point 직전 1박)
+
+    Returns: 브릿지 길이 (출력 샘플)
+    """
+    sr = deck_a.sr
+    beat = int(60.0 / bpm_a * sr)
+    loop_start = cut_point - beat if loop_start is None else loop_start
+    tight = int(beat * config.DROP_TIGHTEN_RATIO)
+    repeats = config.DROP_LOOP_BARS * 4
+
+    start_bpm = bpm_a * config.DROP_START_BPM_BOOST
+    target_bpm = bpm_b * config.DROP_TARGET_BPM_MULTIPLIER
+    rates = np.ones(repeats) if start_bpm == target_bpm else tempo_ramp_rates(start_bpm, target_bpm, bpm_a, repeats)
+    bridge = int(np.sum(tight / rates))
+    deck_a.set_eq(config.LIVE_DROP_HP_HZ, config.LIVE_DROP_HP_ORDER)
+
+    def start_bridge(offset):
+        deck_a.eq_mix.set(1.0, offset)
+        deck_a.gain.ramp(1.0, bridge, offset, start=0.6)
+
+    def end_bridge(offset):
+        deck_a.stop(offset)
+        deck_b.play(entry_b, offset)
+
+    deck_a.cue(cut_point, start_bridge)
+    deck_a.loop(loop_start, loop_start + tight, repeats, rates=rates, trigger=cut_point, on_exit=end_bridge)
+    return bridge
@@ -26,6 +26,7 @@ from strategies.blend_mix import BlendMixStrategy
 
 # [Services] 기존 분석 모듈
 from services.analyzer_beat import get_beat_info
+from services.analysis_cache import track_structure
 from services.analyzer_intro import get_intro_duration
 from services.analyzer_outro import find_outro_endpoint
 from services.stem_separation import separate_stems
@@ -84,7 +85,7 @@ def main():
     print(f"   📊 BPM Analysis: A({bpm_a:.1f}) vs B({bpm_b:.1f}) | Diff: {bpm_diff:.1f}")
 
     # 주요 포인트 계산
-    trim_point_vol = find_outro_endpoint(y_a_full, sr)
+    trim_point_vol = find_outro_endpoint(y_a_full, sr, structure=track_structure(file_a))
     snapped_point = find_smart_trim_point(y_a_full, sr, trim_point_vol, bpm_a)
     final_trim_point = snapped_point
     vocal_end_point = find_vocal_end_point(y_a_vocals_only, sr)
@@ -6,10 +6,19 @@ Blend Mix와 Drop Mix를 BPM 차이에 따라 자동 선택하여 두 트랙을
 
 사용법:
     python mix_engine.py '{"trackA":"파일명A.mp3","trackB":"파일명B.mp3","mixType":"blend"}'
+    품질 티어: "tier": "draft" | "standard" | "master" (config.QUALITY_TIERS, 기본 config.QUALITY_TIER)
+    점진적 출력: "progressive": true (기본 config.MIX_PROGRESSIVE)
+    출력 형식: "output": "wav" | "manifest" (기본 config.MIX_OUTPUT, manifest는 전환 구간만 렌더링)
 
 출력:
     - 진행률: {"progress": 50, "message": "믹싱 중..."}
-    - 완료: {"mixUrl": "blends/mix_xxx.wav", "mixType": "blend", "duration": 180}
+    - 완료: {"mixUrl": "blends/cache/<key>.wav", "mixType": "blend", "duration": 180}
+      같은 트랙 내용 + 파라미터 요청은 캐시된 결과를 반환 ("cached": true, services/mix_cache.py)
+    - 점진적 출력 커밋: {"stage": "commit", "partialUrl": "blends/cache/<key>.<pid>.tmp.wav",
+                          "committedBytes": 1048620, "committedSec": 11.9}
+      partialUrl 파일의 앞 committedBytes 바이트는 확정된 WAV (헤더 길이 필드는 미정, 완료 시 mixUrl로 이동)
+    - 매니페스트 출력 완료: {"manifest": {...}, "manifestUrl": "blends/cache/<key>.json",
+                             "segmentUrl": "blends/cache/<key>.wav", ...}  (전체 WAV는 flatten_mix.py)
 """
 
 # ⚠️ [중요] pkg_resources 경고 억제 (madmom 관련)
@@ -20,36 +29,39 @@ warnings.filterwarnings('ignore', category=DeprecationWarning, module='pkg_resou
 import os
 import sys
 import json
-import librosa
 import soundfile as sf
 import numpy as np
 import warnings
-import pyrubberband as pyrb
 
 # 현재 디렉토리를 sys.path에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
-from utils.dsp import (
-    normalize_audio,
-    find_smart_trim_point,
-    load_and_merge_stems
-)
-from strategies.drop_mix import DropMixStrategy
-from strategies.blend_mix import BlendMixStrategy
-from services.analyzer_beat import get_beat_info
-from services.analyzer_intro import get_intro_duration
-from services.analyzer_outro import find_outro_endpoint
-from services.stem_separation import separate_stems
-from services.analyzer_vocal import find_vocal_end_point
-from services.analyzer_key import get_key_from_audio, get_pitch_shift_steps
+from utils.dsp import normalize_audio, normalization_gain
+from utils.mix_manifest import build_manifest, with_tracks
+from utils.progressive_wav import ProgressiveWavWriter
+from pipeline import get_pipeline, resolve_params, required_stems, choose_mix_type, tier_settings, quality_tier
+from services.analysis_cache import get_cached_beat_info
+from services.mix_cache import mix_cache_key, get_or_render, result_url
+from services.stem_separation import (separate_stems, separate_transition_regions, stems_cached,
+                                      transition_regions_cached, get_stem_coverage)
+from services.distributed import is_remote, render_remote
+from utils.profiler import start_profiling, stop_profiling, profile_stage
 
 warnings.filterwarnings("ignore")
 
 
 def emit_progress(progress: int, message: str):
-    """진행률을 JSON 형식으로 stdout에 출력 (Node.js에서 파싱)"""
-    print(json.dumps({"progress": progress, "message": message}), flush=True)
+    """진행률을 JSON 형식으로 stdout에 출력 (Node.js / FastAPI에서 파싱)"""
+    # stage: 스템 분리 등 하위 작업의 진행률 로그와 구분하기 위한 태그
+    print(json.dumps({"progress": progress, "message": message, "stage": "mix"}), flush=True)
+
+
+def emit_commit(partial_path: str, committed_bytes: int, committed_sec: float):
+    """점진적 출력 파일에서 읽어도 되는 범위를 JSON으로 출력"""
+    partial_url = os.path.relpath(partial_path, config.OUTPUT_DIR).replace(os.sep, "/")
+    print(json.dumps({"stage": "commit", "partialUrl": partial_url,
+                      "committedBytes": committed_bytes, "committedSec": round(committed_sec, 3)}), flush=True)
 
 
 def convert_numpy_types(obj):
@@ -63,7 +75,9 @@ def convert_numpy_types(obj):
     return obj
 
 
-def run_mix(track_a_id: str, track_b_id: str, mix_type: str = "auto", bridge_bars: int = 4):
+def run_mix(track_a_id: str, track_b_id: str, mix_type: str = "auto", bridge_bars: int = 4,
+            bpm_a_hint: float = None, bpm_b_hint: float = None, profile: bool = None, params: dict = None,
+            tier: str = None, progressive: bool = None, output: str = None):
     """
     메인 믹싱 함수
     
@@ -72,13 +86,19 @@ def run_mix(track_a_id: str, track_b_id: str, mix_type: str = "auto", bridge_bar
         track_b_id: Track B 파일명 (예: "1738500001.mp3")
         mix_type: "blend", "drop", 또는 "auto" (BPM 차이로 자동 결정)
         bridge_bars: Drop Mix 시 브릿지 마디 수
+        bpm_a_hint / bpm_b_hint: 호출 측에서 이미 분석한 BPM (있으면 비트 분석 생략)
+        profile: 단계별 프로파일 리포트 출력 여부 (None이면 config.PROFILE_ENABLED)
+        params: 이번 요청에만 적용할 믹스 파라미터 (pipeline.TUNABLE_PARAMS, 예: {"DROP_LOOP_BARS": 8})
+        tier: 품질 티어 "draft" | "standard" | "master" (None이면 config.QUALITY_TIER)
+        progressive: 렌더링 중에 앞부분부터 파일에 커밋 (None이면 config.MIX_PROGRESSIVE)
+        output: "wav" (전체 믹스) | "manifest" (전환 구간 + 배치 정보, None이면 config.MIX_OUTPUT)
     
     Returns:
         dict: 믹싱 결과 정보
     """
     
     # 파일 경로 확인
-    tracks_dir = os.path.join(os.path.dirname(__file__), "uploads", "tracks")
+    tracks_dir = config.TRACKS_DIR
     file_a = os.path.join(tracks_dir, track_a_id)
     file_b = os.path.join(tracks_dir, track_b_id)
     
@@ -86,140 +106,233 @@ def run_mix(track_a_id: str, track_b_id: str, mix_type: str = "auto", bridge_bar
         return {"error": f"Track A를 찾을 수 없습니다: {track_a_id}"}
     if not os.path.exists(file_b):
         return {"error": f"Track B를 찾을 수 없습니다: {track_b_id}"}
+    tier = tier or config.QUALITY_TIER
+    try:
+        tier_settings(tier)
+    except ValueError as e:
+        return {"error": str(e)}
     
+    if profile is None:
+        profile = config.PROFILE_ENABLED
+    if progressive is None:
+        progressive = config.MIX_PROGRESSIVE
+    output = output or config.MIX_OUTPUT
+    if output not in ("wav", "manifest"):
+        return {"error": f"Unknown output: {output} (choose from ['wav', 'manifest'])"}
+    if output == "manifest" and progressive:
+        return {"error": "매니페스트 출력은 점진적 출력과 함께 쓸 수 없습니다."}
+    profiler = start_profiling("mix", trace_memory=config.PROFILE_TRACE_MEMORY) if profile else None
+
+    try:
+        with quality_tier(tier):
+            return dict(_run_mix(file_a, file_b, track_a_id, track_b_id, bpm_a_hint, bpm_b_hint, params,
+                                 bool(progressive), output), tier=tier)
+    finally:
+        if profiler is not None:
+            profiler.emit_report()
+            if config.PROFILE_CHROME_TRACE:
+                name_a = os.path.splitext(os.path.basename(track_a_id))[0]
+                name_b = os.path.splitext(os.path.basename(track_b_id))[0]
+                trace_path = os.path.join(config.PROFILE_DIR, f"trace_{name_a}_to_{name_b}.json")
+                profiler.write_chrome_trace(trace_path)
+            stop_profiling()
+
+
+def stems_ready(track_a_id: str, track_b_id: str, bpm_a_hint: float = None, bpm_b_hint: float = None,
+                params: dict = None, tier: str = None):
+    """
+    run_mix가 스템 분리(Demucs) 없이 끝나는지 (전략이 읽는 스템/구간이 이미 있는지)
+    프로세스 안에서 동기로 재렌더링하는 호출 측(백엔드 /api/transition/rerender)이 먼저 확인합니다.
+    잘못된 params / tier면 ValueError
+    """
+    file_a = os.path.join(config.TRACKS_DIR, track_a_id)
+    file_b = os.path.join(config.TRACKS_DIR, track_b_id)
+    with quality_tier(tier):
+        resolved = resolve_params(params)
+        bpm_a = float(bpm_a_hint) if bpm_a_hint else get_cached_beat_info(file_a)['bpm']
+        bpm_b = float(bpm_b_hint) if bpm_b_hint else get_cached_beat_info(file_b)['bpm']
+        stems = required_stems(choose_mix_type(bpm_a, bpm_b, resolved["BPM_THRESHOLD"]))
+        name_a, name_b = os.path.basename(track_a_id), os.path.basename(track_b_id)
+        if config.STEM_SEPARATION_MODE == "region":
+            regions = get_pipeline().stem_regions(file_a, file_b, bpm_a, bpm_b, params=params)
+            return transition_regions_cached(name_a, name_b, regions, stems)
+        return stems_cached(name_a, stems["a"]) and stems_cached(name_b, stems["b"])
+
+
+def _run_mix(file_a, file_b, track_a_id, track_b_id, bpm_a_hint, bpm_b_hint, params=None, progressive=False,
+             output="wav"):
+    """run_mix 본체 (각 단계를 profile_stage로 감쌈)"""
     emit_progress(5, "트랙 분석 시작...")
     
-    # 출력 디렉토리 생성
-    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-    blends_dir = os.path.join(config.OUTPUT_DIR, "blends")
-    os.makedirs(blends_dir, exist_ok=True)
-    
     try:
-        # 스템 분리 (비동기 처리가 더 좋지만 간단히 동기로 처리)
-        emit_progress(10, "Track A 스템 분리 중...")
-        track_a_name = os.path.basename(track_a_id)
-        track_b_name = os.path.basename(track_b_id)
-        
-        separate_stems(track_a_name)
-        emit_progress(25, "Track B 스템 분리 중...")
-        separate_stems(track_b_name)
-        
-        # 오디오 로드
-        emit_progress(40, "오디오 분석 중...")
-        y_a_full, sr = librosa.load(file_a, sr=config.TARGET_SR)
-        y_b_full, _ = librosa.load(file_b, sr=config.TARGET_SR)
-        
-        # 스템 로드
-        y_a_vocals_only = load_and_merge_stems(track_a_name, ['vocals'], config.OUTPUT_DIR, sr)
-        y_a_no_rhythm = load_and_merge_stems(track_a_name, ['vocals', 'other'], config.OUTPUT_DIR, sr)
-        y_b_bass_only = load_and_merge_stems(track_b_name, ['bass'], config.OUTPUT_DIR, sr)
-        y_b_full_bass = load_and_merge_stems(track_b_name, ['bass', 'drums'], config.OUTPUT_DIR, sr)
-        
-        # BPM 분석
-        emit_progress(50, "BPM 분석 중...")
-        info_a = get_beat_info(file_a)
-        info_b = get_beat_info(file_b)
-        bpm_a, bpm_b = info_a['bpm'], info_b['bpm']
-        bpm_diff = abs(bpm_a - bpm_b)
-        
-        # 주요 포인트 계산
-        trim_point_vol = find_outro_endpoint(y_a_full, sr)
-        snapped_point = find_smart_trim_point(y_a_full, sr, trim_point_vol, bpm_a)
-        vocal_end_point = find_vocal_end_point(y_a_vocals_only, sr) if y_a_vocals_only is not None else None
-        
-        emit_progress(60, "믹싱 전략 결정 중...")
-        
-        # ⚠️ 믹스 타입은 항상 BPM 차이로만 결정 (전달받은 mix_type 파라미터 무시)
-        # BPM_THRESHOLD(기본값 20) 이상 차이나면 Drop Mix, 그렇지 않으면 Blend Mix
-        if bpm_diff > config.BPM_THRESHOLD:
-            actual_mix_type = "drop"
-            emit_progress(65, f"BPM 차이 {bpm_diff:.1f} > {config.BPM_THRESHOLD} → DROP MIX 선택")
-        else:
-            actual_mix_type = "blend"
-            emit_progress(65, f"BPM 차이 {bpm_diff:.1f} <= {config.BPM_THRESHOLD} → BLEND MIX 선택")
-        
-        final_mix = None
-        strategy_name = ""
-        
-        # 믹싱 실행
-        emit_progress(70, f"{actual_mix_type.upper()} Mix 실행 중...")
+        # 결과 캐시 조회 (트랙 내용 + 전략 + 파라미터가 같으면 스템 분리부터 전부 생략)
+        with profile_stage("cache_lookup"):
+            resolved = resolve_params(params)
+            bpm_a = float(bpm_a_hint) if bpm_a_hint else get_cached_beat_info(file_a)['bpm']
+            bpm_b = float(bpm_b_hint) if bpm_b_hint else get_cached_beat_info(file_b)['bpm']
+            strategy = choose_mix_type(bpm_a, bpm_b, resolved["BPM_THRESHOLD"])
+            key = mix_cache_key(file_a, file_b, strategy, bpm_a, bpm_b, resolved, progressive, output)
+
+        def render(wav_path):
+            # 매니페스트는 렌더링이 끝난 뒤 옮겨질 최종 경로로 전환 구간을 참조
+            segment_url = result_url(key) if output == "manifest" else None
+            return _render_mix(file_a, file_b, track_a_id, track_b_id, bpm_a, bpm_b, strategy, params, wav_path,
+                               progressive, segment_url)
+
+        result, cached = get_or_render(key, render)
+        if cached:
+            print(f"   ⏩ Cached mix result: {key[:12]}")
+            result = dict(result, cached=True, recomputed=[])
+            emit_progress(100, "믹싱 완료! (캐시)")
+        if "manifest" in result:
+            # 같은 내용의 다른 파일명으로 만든 캐시일 수 있음
+            result = dict(result, manifest=with_tracks(result["manifest"], track_a_id, track_b_id))
+        return result
         
-        if actual_mix_type == "drop":
-            mixer = DropMixStrategy()
-            final_mix = mixer.process(
-                y_a=y_a_full,
-                y_a_vocals=y_a_vocals_only if y_a_vocals_only is not None else y_a_full,
-                y_b=y_b_full,
-                bpm_a=bpm_a,
-                bpm_b=bpm_b,
-                sr=sr,
-                cut_point_a=snapped_point,
-                vocal_end_point=vocal_end_point
-            )
-            strategy_name = "drop_mix"
-        else:
-            # Blend Mix
-            intro_sec_raw_b = get_intro_duration(file_b)
-            intro_beats = max(4, int(round(intro_sec_raw_b * (bpm_b / 60.0))))
-            overlap_duration_target = intro_beats * (60.0 / bpm_a)
-            overlap_samples_target = int(overlap_duration_target * sr)
-            
-            # 키 매칭
-            if y_b_bass_only is not None:
-                key_a, _ = get_key_from_audio(y_a_full, sr)
-                key_b, _ = get_key_from_audio(y_b_bass_only, sr)
-                shift_steps = get_pitch_shift_steps(key_a, key_b)
-                
-                if shift_steps != 0:
-                    y_b_bass_only = pyrb.pitch_shift(y_b_bass_only, sr, n_steps=shift_steps)
-            
-            mixer = BlendMixStrategy()
-            final_mix = mixer.process(
-                y_a_full=y_a_full,
-                y_a_no_rhythm=y_a_no_rhythm if y_a_no_rhythm is not None else y_a_full,
-                y_a_vocals=y_a_vocals_only if y_a_vocals_only is not None else y_a_full,
-                y_b_full=y_b_full,
-                y_b_bass=y_b_bass_only if y_b_bass_only is not None else y_b_full,
-                bpm_a=bpm_a,
-                bpm_b=bpm_b,
-                sr=sr,
-                overlap_samples=overlap_samples_target,
-                vocal_end=vocal_end_point if vocal_end_point else snapped_point,
-                trim_point=snapped_point,
-                track_a_name=track_a_name,
-                output_dir=config.OUTPUT_DIR
-            )
-            strategy_name = "blend_mix"
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _render_mix(file_a, file_b, track_a_id, track_b_id, bpm_a, bpm_b, strategy, params, output_path,
+                progressive=False, segment_url=None):
+    """
+    스템 분리 + 파이프라인 렌더링 후 output_path에 저장 (progressive면 렌더링 중에 앞부분부터 커밋)
+    segment_url이 있으면 전환 구간만 output_path에 쓰고 결과에 매니페스트를 담음 (segment_url은 그 최종 경로)
+    """
+    # 스템 분리 (비동기 처리가 더 좋지만 간단히 동기로 처리)
+    # 전략은 캐시된 비트 분석으로 이미 정해졌으므로 그 전략이 읽는 스템만 분리 (Drop은 A 보컬만)
+    emit_progress(10, "Track A 스템 분리 중...")
+    track_a_name = os.path.basename(track_a_id)
+    track_b_name = os.path.basename(track_b_id)
+    stems = required_stems(strategy)
+    
+    if config.STEM_SEPARATION_MODE == "region":
+        # 전환 주변 구간만 분리 (구간은 원본 분석으로 결정, 분석 결과는 파이프라인이 재사용)
+        regions = get_pipeline().stem_regions(file_a, file_b, bpm_a, bpm_b, params=params)
+        with profile_stage("separation"):
+            separate_transition_regions(track_a_name, track_b_name, regions, stems)
+    else:
+        with profile_stage("separation"):
+            if stems["a"]:
+                separate_stems(track_a_name, stems["a"])
+            emit_progress(25, "Track B 스템 분리 중...")
+            if stems["b"]:
+                separate_stems(track_b_name, stems["b"])
+
+    # 분리에 실패한 스템은 전략이 원본 믹스로 대신하므로, 스템이 생긴 뒤의 결과와 같은 키로 캐시하지 않음
+    missing = _missing_stems(track_a_name, stems["a"]) + _missing_stems(track_b_name, stems["b"])
+    if missing:
+        print(f"   ⚠️ Stems not available ({', '.join(missing)}). Rendering with the full mix; result is not cached.")
+    
+    output = _ProgressiveOutput(output_path) if progressive else None
+
+    # 분석 + 믹싱 (단계별 메모이즈, 바뀐 파라미터에 의존하는 단계만 재계산)
+    try:
+        final_mix, sr, mix_info = get_pipeline().render(
+            file_a, file_b, bpm_a, bpm_b, params=params, progress=emit_progress,
+            on_prefix=output.write_prefix if output else None
+        )
         
         if final_mix is None:
             return {"error": "믹싱 실패: 결과가 생성되지 않았습니다."}
         
         # 정규화 및 저장
         emit_progress(90, "결과 저장 중...")
-        final_mix = normalize_audio(final_mix)
-        
-        name_a = os.path.splitext(track_a_name)[0]
-        name_b = os.path.splitext(track_b_name)[0]
-        output_filename = f"mix_{strategy_name}_{name_a}_to_{name_b}.wav"
-        output_path = os.path.join(blends_dir, output_filename)
-        
-        sf.write(output_path, final_mix, sr)
-        
-        duration = len(final_mix) / sr
-        
-        emit_progress(100, "믹싱 완료!")
-        
-        return {
-            "mixUrl": f"blends/{output_filename}",
-            "mixType": strategy_name,
-            "duration": duration,
-            "bpmA": bpm_a,
-            "bpmB": bpm_b,
-            "bpmDiff": bpm_diff
-        }
-        
-    except Exception as e:
-        return {"error": str(e)}
+        with profile_stage("write"):
+            if output:
+                output.write_rest(final_mix, sr, mix_info["bTailStart"])
+            elif segment_url:
+                gain = normalization_gain(final_mix)
+                sf.write(output_path, final_mix[mix_info["aBodyEnd"]:mix_info["bTailStart"]] * gain, sr)
+                manifest = build_manifest(track_a_id, track_b_id, mix_info, len(final_mix), sr, gain,
+                                          final_mix.dtype, segment_url)
+            else:
+                final_mix = normalize_audio(final_mix)
+                sf.write(output_path, final_mix, sr)
+    finally:
+        if output:
+            output.close()
+    
+    duration = len(final_mix) / sr
+    
+    emit_progress(100, "믹싱 완료!")
+    
+    result = {
+        "mixType": mix_info["mixType"],
+        "duration": duration,
+        "bpmA": mix_info["bpmA"],
+        "bpmB": mix_info["bpmB"],
+        "bpmDiff": mix_info["bpmDiff"],
+        "transitionCandidates": mix_info["transitionCandidates"],
+        "recomputed": mix_info["recomputed"]
+    }
+    if segment_url:
+        result["manifest"] = manifest
+    if missing:
+        result["cacheable"] = False
+    return result
+
+
+def _missing_stems(track_name, stems):
+    """전략이 읽는 스템 중 파일이 없는 것 ("<트랙>:<스템>")"""
+    coverage = get_stem_coverage(track_name)
+    return [f"{track_name}:{stem}" for stem in stems if not coverage[stem]]
+
+
+class _ProgressiveOutput:
+    """
+    점진적 출력 (렌더링 중에 앞부분부터 WAV에 커밋)
+
+    전체 피크를 모르는 상태에서 앞부분을 먼저 쓰므로 정규화 게인을 두 원본 트랙의 피크로 정합니다.
+    A 본체(접두부)와 B 원본 꼬리(bTailStart 이후)는 원본 샘플 그대로라 이 게인으로 -1 dBFS를 넘지 않고,
+    그 사이 전환 구간만 넘으면 가장자리를 BLEND_OVERLAP_FADE로 이어서 전환 구간만 줄입니다.
+    """
+
+    TARGET_DB = -1.0
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.gain = 1.0
+
+    def write_prefix(self, y_a, y_b, prefix_len, sr):
+        """pipeline.render의 on_prefix 콜백"""
+        peak = max(float(np.max(np.abs(y_a))), float(np.max(np.abs(y_b))))
+        self.gain = 10 ** (self.TARGET_DB / 20) / peak if peak > 0 else 1.0
+        self.writer = ProgressiveWavWriter(self.path, sr, on_commit=lambda size, frames: emit_commit(
+            self.path, size, frames / sr))
+        with profile_stage("write_prefix"):
+            self.writer.write(y_a[:prefix_len] * self.gain)
+
+    def write_rest(self, final_mix, sr, b_tail_start):
+        if self.writer is None:
+            # 전환 위치를 알리기 전에 끝난 경우 (예외 경로) -> 일반 모드와 같은 정규화로 한 번에 씀
+            peak = float(np.max(np.abs(final_mix)))
+            self.gain = 10 ** (self.TARGET_DB / 20) / peak if peak > 0 else 1.0
+            self.writer = ProgressiveWavWriter(self.path, sr, on_commit=lambda size, frames: emit_commit(
+                self.path, size, frames / sr))
+
+        start = self.writer.frames
+        tail_start = max(start, min(int(b_tail_start), len(final_mix)))
+        middle = final_mix[start:tail_start] * self.gain
+
+        target = 10 ** (self.TARGET_DB / 20)
+        peak = float(np.max(np.abs(middle))) if len(middle) else 0.0
+        if peak > target:
+            envelope = np.full(len(middle), target / peak, dtype=middle.dtype)
+            ramp = min(config.BLEND_OVERLAP_FADE, len(middle) // 2)
+            if ramp:
+                envelope[:ramp] = np.linspace(1.0, target / peak, ramp)
+                envelope[-ramp:] = np.linspace(target / peak, 1.0, ramp)
+            middle *= envelope
+
+        for segment, gain in ((middle, 1.0), (final_mix[tail_start:], self.gain)):
+            for i in range(0, len(segment), config.PROGRESSIVE_COMMIT_BLOCK):
+                self.writer.write(segment[i:i + config.PROGRESSIVE_COMMIT_BLOCK] * gain)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
 
 
 if __name__ == "__main__":
@@ -235,13 +348,24 @@ if __name__ == "__main__":
         track_b = request_data.get("trackB")
         mix_type = request_data.get("mixType", "auto")
         bridge_bars = request_data.get("bridgeBars", 4)
+        bpm_a_hint = request_data.get("bpmA")
+        bpm_b_hint = request_data.get("bpmB")
+        profile = request_data.get("profile")
+        params = request_data.get("params")
+        tier = request_data.get("tier")
+        progressive = request_data.get("progressive")
+        output = request_data.get("output")
         
         if not track_a or not track_b:
             print(json.dumps({"error": "trackA와 trackB가 모두 필요합니다."}))
             sys.exit(1)
         
-        # 믹싱 실행
-        result = run_mix(track_a, track_b, mix_type, bridge_bars)
+        # 믹싱 실행 (config.DISTRIBUTED_TASKS에 render가 있으면 워커에서, services/distributed.py)
+        if is_remote("render"):
+            result = render_remote(request_data, progress=emit_progress)
+        else:
+            result = run_mix(track_a, track_b, mix_type, bridge_bars, bpm_a_hint, bpm_b_hint, profile, params, tier,
+                             progressive, output)
         
         # 결과 출력
         print(json.dumps(result, default=convert_numpy_types))
@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+"""
+pipeline.py - 단계별 메모이즈 믹스 파이프라인
+
+run_mix의 분석/렌더링을 명시적인 입력을 가진 단계로 나누고 결과를 메모리에 캐시합니다.
+단계의 키는 (단계 이름, 스칼라 입력, 상위 단계 키, 단계가 읽는 config 값)의 해시이므로
+파라미터를 바꾸면 그 값을 읽는 단계와 그 아래 단계만 다시 계산됩니다.
+
+    예) DROP_LOOP_BARS 변경 -> drop_bridge, drop_render만 재계산
+        BLEND_OVERLAP_BEATS 변경 -> blend_sync, blend_render만 재계산
+
+같은 프로세스에서 get_pipeline()을 계속 쓰면(FastAPI 백엔드 등) 파라미터 스윕이 렌더링 단계 비용만 듭니다.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+import config
+from utils.dsp import find_smart_trim_point, load_and_merge_stems, pitch_shift
+from strategies.drop_mix import DropMixStrategy
+from strategies.blend_mix import BlendMixStrategy
+from services.analysis_cache import get_cached_beat_info, load_downbeat_times, track_structure
+from services.stem_separation import stem_folder
+from services.analyzer_intro import get_intro_duration
+from services.analyzer_outro import find_outro_endpoint
+from services.analyzer_vocal import find_vocal_end_point
+from services.analyzer_key import get_key_from_audio, get_pitch_shift_steps
+from services.transition_search import bar_features, search_transitions
+from utils.profiler import profile_stage
+from utils.pcm_cache import load_audio
+from utils.pyramid import AudioPyramid
+
+# 요청마다 바꿀 수 있는 config 값 (render(params=...)로 전달)
+TUNABLE_PARAMS = {
+    "BPM_THRESHOLD",
+    "DROP_TARGET_BPM_MULTIPLIER",
+    "DROP_LOOP_BARS",
+    "DROP_START_BPM_BOOST",
+    "DROP_TIGHTEN_RATIO",
+    "DROP_VOCAL_SENSITIVITY",
+    "BLEND_OVERLAP_FADE",
+    "BLEND_MICRO_FADE",
+    "BLEND_OVERLAP_BEATS",
+    "TRANSITION_SEARCH_ENABLED",
+}
+
+
+STRATEGIES = {"drop": DropMixStrategy, "blend": BlendMixStrategy}
+
+
+def required_stems(mix_type):
+    """전략이 트랙별로 읽는 스템 {"a": [...], "b": [...]}"""
+    return STRATEGIES[mix_type].REQUIRED_STEMS
+
+
+def choose_mix_type(bpm_a, bpm_b, threshold=None):
+    """
+    BPM 차이가 BPM_THRESHOLD(기본값 20)보다 크면 Drop Mix, 그렇지 않으면 Blend Mix
+    threshold: 요청 params로 바꾼 BPM_THRESHOLD (resolve_params 결과, None이면 config 값)
+    """
+    threshold = config.BPM_THRESHOLD if threshold is None else threshold
+    return "drop" if abs(bpm_a - bpm_b) > threshold else "blend"
+
+
+def transition_points(snapped_point, candidates):
+    """
+    전략이 쓸 (A 출구, B 진입) 샘플 위치. A 출구는 컷 포인트이자 보컬 끝으로 씁니다.
+    전환 지점 탐색 1순위가 있으면 그 위치, 없으면 (Smart Trim 지점, 0)
+    stem_regions()가 분리하는 구간과 render() / 미리듣기가 읽는 구간이 어긋나지 않도록 여기서만 정합니다.
+    """
+    if candidates:
+        return candidates[0]["exit"], candidates[0]["entry"]
+    return snapped_point, 0
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return [os.path.abspath(path), st.st_size, int(st.st_mtime)]
+
+
+def _stems_signature(track_name, stems):
+    """
+    스템이 나중에 생성/교체되면 스템 단계가 무효화되도록 (이름, 크기, 수정시각) 목록
+    부분 스템은 파일 크기가 고정이므로 분리된 구간 목록(regions.json)도 포함
+    """
+    stem_dir = os.path.join(config.OUTPUT_DIR, stem_folder(), os.path.splitext(track_name)[0])
+    signature = []
+    for stem in stems:
+        path = os.path.join(stem_dir, f"{stem}.wav")
+        signature.append(_file_signature(path) if os.path.exists(path) else [stem, None])
+    manifest = os.path.join(stem_dir, "regions.json")
+    if os.path.exists(manifest):
+        with open(manifest, "r", encoding="utf-8") as f:
+            signature.append(json.load(f)["regions"])
+    return signature
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 0
+
+
+def _freeze(value):
+    """캐시된 배열이 다음 단계에서 수정되지 않도록 읽기 전용으로"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    return value
+
+
+def resolve_params(params):
+    """
+    요청 params를 검증하고 TUNABLE_PARAMS 전체의 실제 적용 값을 반환
+    (config를 바꾸지 않으므로 렌더링 중인 다른 스레드와 무관하게 호출 가능)
+    """
+    params = params or {}
+    unknown = set(params) - TUNABLE_PARAMS
+    if unknown:
+        raise ValueError(f"Unknown mix params: {sorted(unknown)} (choose from {sorted(TUNABLE_PARAMS)})")
+    return {name: params.get(name, getattr(config, name)) for name in sorted(TUNABLE_PARAMS)}
+
+
+@contextmanager
+def _config_overrides(params):
+    """render() 동안만 config 값을 바꿈 (현재 컨텍스트에만 보임, 다른 요청과 무관)"""
+    params = params or {}
+    resolve_params(params)
+    with config.overrides(params):
+        yield
+
+
+def tier_settings(tier):
+    """티어가 바꾸는 config 값 {이름: 값} (None이면 config.QUALITY_TIER)"""
+    tier = tier or config.QUALITY_TIER
+    if tier not in config.QUALITY_TIERS:
+        raise ValueError(f"Unknown quality tier: {tier} (choose from {list(config.QUALITY_TIERS)})")
+    return dict(config.QUALITY_TIERS[tier])
+
+
+@contextmanager
+def quality_tier(tier):
+    """
+    요청 동안 티어의 config 값(스템 모델/shifts, 비트 백엔드, 샘플레이트, 키 HPSS, 스트레치 엔진)을 적용
+    단계 키와 믹스 캐시 키가 이 값들을 포함하므로 티어별 결과가 섞이지 않습니다.
+    값은 현재 컨텍스트에만 보이므로 다른 티어의 요청을 동시에 처리해도 됩니다.
+    """
+    with config.overrides(tier_settings(tier)):
+        yield
+
+
+class MixPipeline:
+    """
+    단계 결과를 바이트 예산(config.PIPELINE_CACHE_MB) 안에서 LRU로 캐시
+    render()를 호출할 때마다 self.recomputed에 실제로 계산한 단계 목록이 남습니다.
+    """
+
+    def __init__(self, max_mb=None):
+        self.max_bytes = int((max_mb if max_mb is not None else config.PIPELINE_CACHE_MB) * 1024 * 1024)
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.recomputed = []
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def _stage(self, name, inputs, fn, params=(), group=None, label=None):
+        """
+        메모이즈된 단계 실행
+        inputs: JSON으로 직렬화 가능한 값 (상위 단계는 값 대신 키를 넣음)
+        params: 이 단계가 읽는 config 값 이름
+        label: recomputed 목록에 남길 이름 (기본 name)
+        Returns: (키, 결과)
+        """
+        payload = {"stage": name, "inputs": inputs, "params": {p: getattr(config, p) for p in params}}
+        key = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return key, cached[0]
+
+        with profile_stage(group or name):
+            value = _freeze(fn())
+        self.recomputed.append(label or name)
+
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            self._cache[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._bytes -= evicted
+        return key, value
+
+    def render(self, file_a, file_b, bpm_a_hint=None, bpm_b_hint=None, params=None, progress=None,
+               on_prefix=None):
+        """
+        Track A -> B 믹스 렌더링 (스템 분리는 호출 측에서 끝낸 상태로 가정)
+
+        Args:
+            params: TUNABLE_PARAMS 중 바꿀 config 값 (예: {"DROP_LOOP_BARS": 8})
+            progress: (percent, message) 콜백
+            on_prefix: (y_a, y_b, prefix_len, sr) 콜백. 전환 위치가 정해지는 즉시(브릿지/스트레치 렌더링 전)
+                       결과의 앞부분 final_mix[:prefix_len] == y_a[:prefix_len]을 알림 (점진적 출력용)
+
+        Returns:
+            (final_mix, sr, info)  info: mixType, bpmA, bpmB, bpmDiff, transitionStart, bTailStart, bEntrySample,
+                                     aBodyEnd, transitionCandidates (전환 지점 탐색 상위 후보), recomputed
+                  final_mix[:aBodyEnd]는 Track A 원본과, final_mix[bTailStart:]는 Track B 원본 bEntrySample부터와 같음
+        """
+        with self._lock, _config_overrides(params):
+            self.recomputed = []
+            final_mix, sr, info = self._render(file_a, file_b, bpm_a_hint, bpm_b_hint, progress or (lambda p, m: None),
+                                               on_prefix or (lambda y_a, y_b, n, sr: None))
+            info["recomputed"] = list(self.recomputed)
+            return final_mix, sr, info
+
+    def stem_regions(self, file_a, file_b, bpm_a, bpm_b, params=None):
+        """
+        region 분리 모드(config.STEM_SEPARATION_MODE)에서 전략이 읽을 스템 구간 (초, 끝 None = 곡 끝)
+        스템 없이 원본만으로 구하며, 같은 단계 키를 쓰므로 이후 render()에서 그대로 재사용됩니다.
+            a: A 출구(transition_points) REGION_A_LOOKBACK_SEC 전부터 곡 끝까지
+               (보컬 끝 탐색, Drop 루프 소스, Blend 겹침 구간이 모두 이 안에 있음)
+            b: 전략이 Track B 스템을 읽을 때(Blend)만 진입 지점부터 인트로 겹침 구간
+            전환 지점 탐색이 켜져 있으면 탐색한 출구/진입 기준
+        """
+        with self._lock, _config_overrides(params):
+            self.recomputed = []
+            sr = config.TARGET_SR
+            mix_type = choose_mix_type(bpm_a, bpm_b)
+            k_a, y_a = self._decode(file_a, sr, "decode_a")
+            pyr_a = self._pyramid(k_a, y_a, sr, "pyramid_a")
+            snapped_point = self._trim(file_a, k_a, pyr_a, bpm_a, sr)
+            candidates = []
+            if config.TRANSITION_SEARCH_ENABLED:
+                k_b, y_b = self._decode(file_b, sr, "decode_b")
+                candidates = self._search(file_a, file_b, k_a, k_b, pyr_a, y_b, bpm_a, bpm_b, sr, mix_type,
+                                          snapped_point)
+            exit_point, entry_point = transition_points(snapped_point, candidates)
+            regions = {"a": [(max(0.0, exit_point / sr - config.REGION_A_LOOKBACK_SEC), None)], "b": []}
+            if required_stems(mix_type)["b"]:
+                intro_beats = self._intro_beats(file_b, bpm_b)
+                regions["b"].append((entry_point / sr, entry_point / sr + intro_beats * 60.0 / bpm_b
+                                     + config.REGION_PAD_SEC))
+            return regions
+
+    def _decode(self, path, sr, label):
+        # 트랙 단위 단계는 A/B 역할과 무관한 키를 써서 B -> C 믹스에서도 재사용
+        return self._stage("decode", [_file_signature(path), sr],
+                           lambda: load_audio(path, sr=sr)[0], label=label)
+
+    def _pyramid(self, k, y, sr, label):
+        """분석용 다운샘플 피라미드 (하위 레벨을 단계 캐시에 저장, 분석기마다 MIN_SR 레벨 사용)"""
+        _, levels = self._stage("pyramid", [k], lambda: AudioPyramid(y, sr).lower_levels(),
+                                params=["ANALYSIS_PYRAMID_LEVELS"], group="decode", label=label)
+        return AudioPyramid(y, sr, levels)
+
+    def _structure(self, path):
+        # 트랙 단위 (구조 분석 결과는 디스크에도 캐시, services/analysis_cache.py)
+        return self._stage("structure", [_file_signature(path)], lambda: track_structure(path),
+                           params=["STRUCTURE_ENABLED", "STRUCTURE_KERNEL_BEATS", "STRUCTURE_MIN_SECTION_BEATS",
+                                   "ANALYSIS_PYRAMID_LEVELS"])
+
+    def _trim(self, file_a, k_a, pyr_a, bpm_a, sr):
+        k_st, structure = self._structure(file_a)
+
+        def trim():
+            trim_point_vol = find_outro_endpoint(pyr_a, sr, structure=structure)
+            # 다운비트 스냅/위상 보정 결과는 렌더링 컷 포인트이므로 원래 sr로
+            return int(find_smart_trim_point(pyr_a.y, sr, trim_point_vol, bpm_a))
+        return self._stage("trim", [k_a, k_st, bpm_a], trim,
+                           params=["TRIM_BEAT_BACKEND", "ANALYSIS_PYRAMID_LEVELS"])[1]
+
+    def _bar_features(self, path, k, y, sr, bpm):
+        # 트랙 단위 (B -> C 믹스에서도 재사용)
+        k_st, structure = self._structure(path)
+
+        return self._stage("bar_features", [k, k_st, bpm],
+                           lambda: bar_features(y, sr, bpm, downbeats=load_downbeat_times(path), structure=structure),
+                           params=["BEAT_BACKEND", "ANALYSIS_PYRAMID_LEVELS"], group="search")
+
+    def _search(self, file_a, file_b, k_a, k_b, pyr_a, y_b, bpm_a, bpm_b, sr, mix_type, heuristic_exit):
+        """전환 지점 탐색 상위 후보 (services/transition_search.py, 꺼져 있거나 후보가 없으면 빈 목록)"""
+        if not config.TRANSITION_SEARCH_ENABLED:
+            return []
+        k_fa, feats_a = self._bar_features(file_a, k_a, pyr_a, sr, bpm_a)
+        k_fb, feats_b = self._bar_features(file_b, k_b, self._pyramid(k_b, y_b, sr, "pyramid_b"), sr, bpm_b)
+        return self._stage("search", [k_fa, k_fb, mix_type, sr, int(heuristic_exit)],
+                           lambda: search_transitions(feats_a, feats_b, mix_type, sr, heuristic_exit),
+                           params=["TRANSITION_SEARCH_TOP_K", "TRANSITION_SEARCH_WINDOW_BARS",
+                                   "TRANSITION_SEARCH_PHRASE_BARS", "TRANSITION_SEARCH_A_MIN_RATIO",
+                                   "TRANSITION_SEARCH_B_MAX_RATIO", "TRANSITION_SEARCH_WEIGHTS"])[1]
+
+    def _intro_beats(self, file_b, bpm_b):
+        if config.BLEND_OVERLAP_BEATS:
+            return int(config.BLEND_OVERLAP_BEATS)
+        k_st, structure = self._structure(file_b)
+        _, intro_sec_raw_b = self._stage("intro", [_file_signature(file_b), k_st],
+                                         lambda: get_intro_duration(file_b, structure=structure),
+                                         params=["ANALYSIS_PYRAMID_LEVELS"])
+        return max(4, int(round(intro_sec_raw_b * (bpm_b / 60.0))))
+
+    def _render(self, file_a, file_b, bpm_a_hint, bpm_b_hint, progress, on_prefix):
+        sr = config.TARGET_SR
+        name_a = os.path.basename(file_a)
+        name_b = os.path.basename(file_b)
+        sig_a = _file_signature(file_a)
+        sig_b = _file_signature(file_b)
+
+        def stems(track_name, names):
+            return load_and_merge_stems(track_name, names, config.OUTPUT_DIR, sr)
+
+        progress(40, "오디오 분석 중...")
+        k_a, y_a = self._decode(file_a, sr, "decode_a")
+        k_b, y_b = self._decode(file_b, sr, "decode_b")
+        k_va, y_a_vocals = self._stage("stems", [_stems_signature(name_a, ['vocals']), sr],
+                                       lambda: stems(name_a, ['vocals']), group="decode", label="stems_a_vocals")
+
+        progress(50, "BPM 분석 중...")
+        _, bpm_a = self._stage("beat", [sig_a, bpm_a_hint],
+                               lambda: bpm_a_hint if bpm_a_hint else get_cached_beat_info(file_a)['bpm'],
+                               params=["BEAT_BACKEND"], label="beat_a")
+        _, bpm_b = self._stage("beat", [sig_b, bpm_b_hint],
+                               lambda: bpm_b_hint if bpm_b_hint else get_cached_beat_info(file_b)['bpm'],
+                               params=["BEAT_BACKEND"], label="beat_b")
+        bpm_diff = abs(bpm_a - bpm_b)
+
+        pyr_a = self._pyramid(k_a, y_a, sr, "pyramid_a")
+        snapped_point = self._trim(file_a, k_a, pyr_a, bpm_a, sr)
+        _, vocal_end_point = self._stage(
+            "vocal", [k_va],
+            lambda: find_vocal_end_point(y_a_vocals, sr) if y_a_vocals is not None else None,
+            params=["ANALYSIS_PYRAMID_LEVELS"])
+
+        progress(60, "믹싱 전략 결정 중...")
+        mix_type = choose_mix_type(bpm_a, bpm_b)
+        progress(65, f"BPM 차이 {bpm_diff:.1f} → {mix_type.upper()} MIX 선택")
+
+        # 전환 지점 탐색: Smart Trim 지점을 사전 점수로 두고 1순위 (A 출구, B 진입)으로 바꿈
+        # (stem_regions와 같은 단계 키라서 region 분리 모드에서 분리한 구간과 일치). B는 진입 지점부터 잘라서 전략에 넘김
+        candidates = self._search(file_a, file_b, k_a, k_b, pyr_a, y_b, bpm_a, bpm_b, sr, mix_type, snapped_point)
+        if candidates:
+            best = candidates[0]
+            progress(68, f"전환 지점 탐색: A {best['exitTime']:.1f}s → B {best['entryTime']:.1f}s")
+            snapped_point, b_offset = transition_points(snapped_point, candidates)
+            vocal_end_point = snapped_point
+        else:
+            b_offset = 0
+        progress(70, f"{mix_type.upper()} Mix 실행 중...")
+
+        def announce_prefix(transition_start):
+            # 두 전략 모두 A 본체 끝 BLEND_OVERLAP_FADE 샘플만 크로스페이드하고 그 앞은 원본 그대로 (info["aBodyEnd"]와 같음)
+            on_prefix(y_a, y_b, max(0, min(int(transition_start), len(y_a)) - config.BLEND_OVERLAP_FADE), sr)
+
+        if mix_type == "drop":
+            mixer = DropMixStrategy()
+            vocals_or_full = y_a_vocals if y_a_vocals is not None else y_a
+            k_src, (source_chunk, actual_cut_point) = self._stage(
+                "drop_source", [k_a, k_va, bpm_a, sr, snapped_point, vocal_end_point],
+                lambda: mixer.select_source(y_a, vocals_or_full, bpm_a, sr, snapped_point, vocal_end_point),
+                params=["DROP_VOCAL_SENSITIVITY"], group="render")
+            announce_prefix(actual_cut_point)
+            k_bridge, final_bridge = self._stage(
+                "drop_bridge", [k_src, bpm_a, bpm_b, sr],
+                lambda: mixer.build_bridge(source_chunk, bpm_a, bpm_b, sr),
+                params=["DROP_TIGHTEN_RATIO", "DROP_LOOP_BARS", "DROP_START_BPM_BOOST",
+                        "DROP_TARGET_BPM_MULTIPLIER", "STRETCH_ENGINE"], group="render")
+
+            def drop_render():
+                final_mix = mixer.render(y_a, y_b[b_offset:], actual_cut_point, final_bridge)
+                return final_mix, mixer.transition_start, mixer.b_tail_start, mixer.b_entry_sample
+            _, (final_mix, transition_start, b_tail_start, b_entry_sample) = self._stage(
+                "drop_render", [k_a, k_b, b_offset, k_bridge, int(actual_cut_point)], drop_render,
+                params=["BLEND_OVERLAP_FADE"], group="render")
+        else:
+            mixer = BlendMixStrategy()
+            vocal_end = int(vocal_end_point if vocal_end_point else snapped_point)
+            announce_prefix(vocal_end)
+
+            k_bass, y_b_bass = self._stage("stems", [_stems_signature(name_b, ['bass']), sr],
+                                           lambda: stems(name_b, ['bass']), group="decode", label="stems_b_bass")
+            if y_b_bass is None:
+                k_bass, y_b_bass = k_b, y_b
+
+            intro_beats = self._intro_beats(file_b, bpm_b)
+            overlap_samples = int(intro_beats * (60.0 / bpm_a) * sr)
+
+            # 키 매칭
+            def key_shift():
+                key_a, _ = get_key_from_audio(pyr_a, sr)
+                key_b, _ = get_key_from_audio(y_b_bass, sr)
+                return int(get_pitch_shift_steps(key_a, key_b))
+            _, shift_steps = self._stage("key", [k_a, k_bass, sr], key_shift,
+                                         params=["KEY_HPSS", "ANALYSIS_PYRAMID_LEVELS"])
+            if shift_steps != 0:
+                k_bass, y_b_bass = self._stage("key_shift", [k_bass, shift_steps],
+                                               lambda: pitch_shift(y_b_bass, sr, shift_steps),
+                                               params=["STRETCH_ENGINE"], group="key")
+
+            k_sync, (y_b_synced, samples_needed_from_b) = self._stage(
+                "blend_sync", [k_bass, b_offset, bpm_a, bpm_b, sr, overlap_samples],
+                lambda: mixer.sync_b_intro(y_b_bass[b_offset:], bpm_a, bpm_b, sr, overlap_samples),
+                params=["STRETCH_ENGINE"], group="render")
+
+            k_nb, y_a_no_bass = self._stage(
+                "stems", [_stems_signature(name_a, ['vocals', 'drums', 'other']), sr],
+                lambda: stems(name_a, ['vocals', 'drums', 'other']), group="decode", label="stems_a_no_bass")
+            if y_a_no_bass is None:
+                k_nb, y_a_no_bass = k_a, y_a
+
+            def blend_render():
+                final_mix = mixer.render(y_a, y_a_no_bass, y_b[b_offset:], y_b_synced, samples_needed_from_b,
+                                         overlap_samples, vocal_end)
+                return final_mix, mixer.transition_start, mixer.b_tail_start, mixer.b_entry_sample
+            _, (final_mix, transition_start, b_tail_start, b_entry_sample) = self._stage(
+                "blend_render", [k_a, k_nb, k_b, b_offset, k_sync, overlap_samples, vocal_end], blend_render,
+                params=["BLEND_OVERLAP_FADE", "BLEND_MICRO_FADE"], group="render")
+
+        info = {
+            "mixType": f"{mix_type}_mix",
+            "bpmA": bpm_a,
+            "bpmB": bpm_b,
+            "bpmDiff": bpm_diff,
+            "transitionStart": int(transition_start),
+            "bTailStart": int(b_tail_start),
+            "bEntrySample": b_offset + int(b_entry_sample),
+            "aBodyEnd": max(0, int(transition_start) - config.BLEND_OVERLAP_FADE),
+            "transitionCandidates": candidates,
+        }
+        return final_mix, sr, info
+
+
+_default_pipeline = None
+
+
+def get_pipeline():
+    """프로세스 전체에서 공유하는 파이프라인 (캐시 재사용)"""
+    global _default_pipeline
+    if _default_pipeline is None:
+        _default_pipeline = MixPipeline()
+    return _default_pipeline
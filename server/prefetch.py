@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+prefetch.py - 업로드된 트랙의 분석 + 스템 분리를 낮은 우선순위로 미리 실행 (services/prefetch.py)
+
+백엔드 선행 처리 스케줄러가 트랙마다 하나씩 실행하고, 믹스 작업이 시작되면 프로세스 그룹째 일시정지합니다
+(GPU로 스템을 분리 중이면 VRAM을 비우도록 중단 후 다시 대기).
+
+사용법:
+    python prefetch.py '{"trackId":"a.mp3"}'
+
+출력:
+    - 진행률: {"progress": 15, "message": "구조 분석 중...", "stage": "prefetch"}
+      (스템 분리 시작 때는 "device": "cuda"/"cpu" 포함)
+      (스템 분리 중에는 separate_stems의 {"progress": ...}도 섞여 나옴)
+    - 완료: {"prefetched": "a.mp3", "bpm": 124.0, "stems": true}
+"""
+
+import os
+import sys
+import json
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.prefetch import lower_priority, prefetch_track
+
+
+def emit_progress(progress: int, message: str, **info):
+    print(json.dumps({"progress": progress, "message": message, "stage": "prefetch", **info}), flush=True)
+
+
+if __name__ == "__main__":
+    # 분석 모듈(numpy/torch) 임포트 전에 (스레드 수가 임포트 시점에 정해짐, prefetch_track이 실행할 때 임포트)
+    lower_priority()
+
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        if not request_data.get("trackId"):
+            print(json.dumps({"error": "trackId가 필요합니다."}))
+            sys.exit(1)
+        result = prefetch_track(request_data["trackId"], progress=emit_progress)
+        print(json.dumps({"prefetched": result["track"], "bpm": result["bpm"], "stems": result["stems"]}),
+              flush=True)
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
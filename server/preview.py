@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+preview.py - 트랜지션 미리듣기 (전환 구간만 빠르게 렌더링)
+
+run_mix와 같은 분석/전략을 쓰지만 비용이 큰 부분을 줄입니다.
+    - 낮은 샘플레이트(config.PREVIEW_SR)로 디코딩/분석/렌더링
+    - Track B는 앞부분(config.PREVIEW_B_SCAN_SEC)만 디코딩
+    - 전략에는 전환 주변만 잘라서 전달 (렌더링 비용이 곡 길이와 무관)
+    - 스트레치는 프로세스 내 위상 보코더, Smart Trim은 librosa 트래커, 키 분석은 HPSS 생략
+    - 스템 분리는 실행하지 않음 (스템이 없으면 원본 믹스로 대체)
+    - 전환 지점 탐색의 Track B 진입 후보는 디코딩한 앞부분 안에서만
+결과는 파일 대신 WAV 바이트로 반환합니다.
+[전환 시작 - PREVIEW_PRE_SEC, Track B 진입 + PREVIEW_POST_SEC] 구간이며 구간 안에서 피크 정규화합니다.
+
+사용법:
+    python preview.py '{"trackA":"a.mp3","trackB":"b.mp3","output":"preview.wav"}'
+"""
+
+# ⚠️ [중요] pkg_resources 경고 억제 (madmom 관련)
+import warnings
+warnings.filterwarnings('ignore', category=UserWarning, module='pkg_resources')
+warnings.filterwarnings('ignore', category=DeprecationWarning, module='pkg_resources')
+
+import io
+import os
+import sys
+import json
+
+import soundfile as sf
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from mix_engine import convert_numpy_types
+from pipeline import choose_mix_type, transition_points
+from utils.dsp import normalize_audio, find_smart_trim_point, load_and_merge_stems, pitch_shift
+from utils.pcm_cache import load_audio
+from strategies.drop_mix import DropMixStrategy
+from strategies.blend_mix import BlendMixStrategy
+from services.analysis_cache import get_cached_beat_info, load_downbeat_times, track_structure
+from services.analyzer_intro import get_intro_duration
+from services.analyzer_outro import find_outro_endpoint
+from services.analyzer_vocal import find_vocal_end_point
+from services.analyzer_key import get_key_from_audio, get_pitch_shift_steps
+from services.transition_search import bar_features, search_transitions
+
+warnings.filterwarnings("ignore")
+
+def _preview_settings():
+    """미리듣기 동안만 스트레치 엔진 교체 (현재 컨텍스트에만 적용)"""
+    return config.overrides({"STRETCH_ENGINE": config.PREVIEW_STRETCH_ENGINE})
+
+
+def render_preview(track_a_id, track_b_id, pre_sec=None, post_sec=None, sr=None,
+                   bpm_a_hint=None, bpm_b_hint=None):
+    """
+    전환 구간만 렌더링
+
+    Args:
+        pre_sec / post_sec: 전환 시작 전, Track B 진입 후 길이 (None이면 config 값)
+        sr: 렌더링 샘플레이트 (None이면 config.PREVIEW_SR)
+
+    Returns:
+        (wav_bytes, info)
+    """
+    file_a = os.path.join(config.TRACKS_DIR, track_a_id)
+    file_b = os.path.join(config.TRACKS_DIR, track_b_id)
+    for path, track_id in ((file_a, track_a_id), (file_b, track_b_id)):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"트랙을 찾을 수 없습니다: {track_id}")
+
+    pre_sec = config.PREVIEW_PRE_SEC if pre_sec is None else pre_sec
+    post_sec = config.PREVIEW_POST_SEC if post_sec is None else post_sec
+    sr = sr or config.PREVIEW_SR or config.TARGET_SR
+
+    with _preview_settings():
+        return _render_preview(file_a, file_b, pre_sec, post_sec, sr, bpm_a_hint, bpm_b_hint)
+
+
+def _render_preview(file_a, file_b, pre_sec, post_sec, sr, bpm_a_hint, bpm_b_hint):
+    name_a = os.path.basename(file_a)
+    name_b = os.path.basename(file_b)
+    bpm_a = bpm_a_hint if bpm_a_hint else get_cached_beat_info(file_a)['bpm']
+    bpm_b = bpm_b_hint if bpm_b_hint else get_cached_beat_info(file_b)['bpm']
+
+    # Track A: 아웃트로/보컬 분석에 곡 전체가 필요 (낮은 sr이라 저렴)
+    y_a, _ = load_audio(file_a, sr=sr)
+    y_a_vocals = load_and_merge_stems(name_a, ['vocals'], config.OUTPUT_DIR, sr)
+
+    trim_point_vol = find_outro_endpoint(y_a, sr, structure=track_structure(file_a))
+    snapped_point = find_smart_trim_point(y_a, sr, trim_point_vol, bpm_a, backend=config.PREVIEW_TRIM_BEAT_BACKEND)
+    vocal_end_point = find_vocal_end_point(y_a_vocals, sr) if y_a_vocals is not None else None
+
+    # Track B: 앞부분만
+    b_duration = max(config.PREVIEW_B_SCAN_SEC, post_sec + 30.0)
+    y_b, _ = load_audio(file_b, sr=sr, duration=b_duration)
+
+    # 전환 지점 탐색 (pipeline.py와 같은 기준, 1순위 출구/진입으로 컷 포인트와 B 시작 위치를 바꿈)
+    mix_type = choose_mix_type(bpm_a, bpm_b)
+    b_offset = 0
+    if config.TRANSITION_SEARCH_ENABLED:
+        feats_a = bar_features(y_a, sr, bpm_a, downbeats=load_downbeat_times(file_a),
+                               structure=track_structure(file_a))
+        feats_b = bar_features(y_b, sr, bpm_b, downbeats=load_downbeat_times(file_b),
+                               structure=track_structure(file_b))
+        candidates = search_transitions(feats_a, feats_b, mix_type, sr, snapped_point)
+        if candidates:
+            snapped_point, b_offset = transition_points(snapped_point, candidates)
+            vocal_end_point = snapped_point
+
+    # 전략이 볼 수 있는 가장 이른 지점(Drop은 컷 포인트에서 최대 16박 앞까지 보컬을 찾음)부터 자름
+    samples_per_beat_a = int(60.0 / bpm_a * sr)
+    earliest = min(snapped_point, vocal_end_point or snapped_point) - 16 * samples_per_beat_a
+    start_a = max(0, earliest - int(pre_sec * sr))
+
+    def crop_a(y):
+        return y[start_a:] if y is not None else None
+
+    def shift(point):
+        return point - start_a if point is not None else None
+
+    y_a_crop = crop_a(y_a)
+    y_a_vocals_crop = crop_a(y_a_vocals)
+    del y_a, y_a_vocals
+
+    intro_y_b = y_b
+    y_b = y_b[b_offset:]
+    if mix_type == "drop":
+        mixer = DropMixStrategy()
+        final_mix = mixer.process(
+            y_a=y_a_crop,
+            y_a_vocals=y_a_vocals_crop if y_a_vocals_crop is not None else y_a_crop,
+            y_b=y_b,
+            bpm_a=bpm_a,
+            bpm_b=bpm_b,
+            sr=sr,
+            cut_point_a=shift(snapped_point),
+            vocal_end_point=shift(vocal_end_point)
+        )
+    else:
+        y_b_bass = load_and_merge_stems(name_b, ['bass'], config.OUTPUT_DIR, sr, offset=b_offset / sr,
+                                        duration=b_duration - b_offset / sr)
+        y_a_no_bass = crop_a(load_and_merge_stems(name_a, ['vocals', 'drums', 'other'], config.OUTPUT_DIR, sr))
+
+        intro_sec_raw_b = get_intro_duration(file_b, y=intro_y_b, sr=sr)
+        intro_beats = max(4, int(round(intro_sec_raw_b * (bpm_b / 60.0))))
+        overlap_samples_target = int(intro_beats * (60.0 / bpm_a) * sr)
+
+        vocal_end = shift(vocal_end_point if vocal_end_point else snapped_point)
+        if y_b_bass is not None:
+            # 키는 실제로 겹치는 구간만으로 추정 (HPSS 생략)
+            # 구간이 트랙 끝을 넘거나 너무 짧으면 (짧은 트랙) 빈 배열로 키를 추정하지 않도록 생략
+            samples_needed_from_b = int(overlap_samples_target * (bpm_a / bpm_b))
+            key_end_a = min(max(vocal_end, 0), len(y_a_crop))
+            key_window_a = y_a_crop[max(0, key_end_a - int(pre_sec * sr)):key_end_a]
+            key_window_b = y_b_bass[:samples_needed_from_b]
+            min_len = int(config.PREVIEW_KEY_MIN_SEC * sr)
+            if len(key_window_a) < min_len or len(key_window_b) < min_len:
+                print(f"   ⚠️ Key window too short ({len(key_window_a) / sr:.1f}s / {len(key_window_b) / sr:.1f}s). "
+                      f"Skipping key matching.")
+            else:
+                key_a, _ = get_key_from_audio(key_window_a, sr, harmonic=config.PREVIEW_KEY_HPSS)
+                key_b, _ = get_key_from_audio(key_window_b, sr, harmonic=config.PREVIEW_KEY_HPSS)
+                shift_steps = get_pitch_shift_steps(key_a, key_b)
+                if shift_steps != 0:
+                    y_b_bass = pitch_shift(y_b_bass, sr, shift_steps)
+
+        mixer = BlendMixStrategy()
+        final_mix = mixer.process(
+            y_a_full=y_a_crop,
+            y_a_no_rhythm=y_a_crop,
+            y_a_vocals=y_a_vocals_crop if y_a_vocals_crop is not None else y_a_crop,
+            y_b_full=y_b,
+            y_b_bass=y_b_bass if y_b_bass is not None else y_b,
+            bpm_a=bpm_a,
+            bpm_b=bpm_b,
+            sr=sr,
+            overlap_samples=overlap_samples_target,
+            vocal_end=vocal_end,
+            trim_point=shift(snapped_point),
+            track_a_name=name_a,
+            output_dir=config.OUTPUT_DIR,
+            y_a_no_bass=y_a_no_bass if y_a_no_bass is not None else y_a_crop
+        )
+
+    window_start = max(0, mixer.transition_start - int(pre_sec * sr))
+    window_end = min(len(final_mix), mixer.b_tail_start + int(post_sec * sr))
+    clip = normalize_audio(final_mix[window_start:window_end])
+
+    buffer = io.BytesIO()
+    sf.write(buffer, clip, sr, format="WAV", subtype="PCM_16")
+
+    info = {
+        "mixType": f"{mix_type}_mix",
+        "bpmA": bpm_a,
+        "bpmB": bpm_b,
+        "sr": sr,
+        "duration": len(clip) / sr,
+        # 미리듣기 안에서의 위치 (초)
+        "transitionAt": (mixer.transition_start - window_start) / sr,
+        "bEntersAt": (mixer.b_tail_start - window_start) / sr,
+        # 원곡 기준 위치 (초)
+        "cutPointA": (start_a + mixer.transition_start) / sr,
+        "entryPointB": b_offset / sr,
+    }
+    return buffer.getvalue(), info
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        wav_bytes, info = render_preview(
+            request_data.get("trackA"),
+            request_data.get("trackB"),
+            pre_sec=request_data.get("preSec"),
+            post_sec=request_data.get("postSec"),
+            sr=request_data.get("sr"),
+            bpm_a_hint=request_data.get("bpmA"),
+            bpm_b_hint=request_data.get("bpmB"),
+        )
+        output_path = request_data.get("output", "preview.wav")
+        with open(output_path, "wb") as f:
+            f.write(wav_bytes)
+        info["output"] = output_path
+        print(json.dumps(info, default=convert_numpy_types))
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
@@ -54,7 +54,10 @@ const runPythonScript = (scriptName, args, jobId = null) => {
             scriptPath = path.join(__dirname, '../services', scriptName);
         }
 
-        const pythonProcess = spawn('python', [scriptPath, ...args]);
+        // 한글 진행 메시지가 깨지지 않도록 stdout을 UTF-8로 (엔진 모듈은 임포트 시 stdout을 바꾸지 않음)
+        const pythonProcess = spawn('python', [scriptPath, ...args], {
+            env: { ...process.env, PYTHONIOENCODING: 'utf-8' },
+        });
 
         let resultString = '';
         let errorString = '';
@@ -131,7 +134,7 @@ const runPythonScript = (scriptName, args, jobId = null) => {
                         const parsed = JSON.parse(lines[i]);
                         
                         // 1순위: stems 데이터(분리) 또는 bpm 데이터(분석) 또는 mixUrl(믹싱)이 있는 경우 (확실한 성공 결과)
-                        if (parsed.stems || parsed.bpm || parsed.mixUrl) {
+                        if (parsed.stems || parsed.bpm || parsed.mixUrl || parsed.similar) {
                             finalResult = parsed;
                             break;
                         }
@@ -370,4 +373,27 @@ router.post('/blend', (req, res) => {
         });
 });
 
+/**
+ * 5. 비슷한 느낌의 다음 곡 추천 (음색 임베딩 최근접 이웃)
+ * - 업로드 분석 때 인덱스에 추가된 트랙 중에서 검색
+ * @param {string} trackId - 기준 트랙 ID
+ * @param {number} k - 결과 수 (query, 기본: 10)
+ */
+router.get('/similar/:trackId', async (req, res) => {
+    try {
+        const inputJson = JSON.stringify({
+            trackId: req.params.trackId,
+            k: req.query.k ? Number(req.query.k) : undefined
+        });
+        const result = await runPythonScript('similar_tracks.py', [inputJson]);
+        if (result.error) {
+            return res.status(404).json({ success: false, error: result.error });
+        }
+        res.json({ success: true, trackId: req.params.trackId, similar: result.similar, indexed: result.indexed });
+    } catch (error) {
+        console.error('유사 트랙 검색 실패:', error);
+        res.status(500).json({ success: false, error: error.message });
+    }
+});
+
 module.exports = router;
\ No newline at end of file
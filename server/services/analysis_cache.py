@@ -0,0 +1,170 @@
+# server/services/analysis_cache.py
+import os
+import json
+import tempfile
+import numpy as np
+
+import config
+
+
+def _cache_path(file_path):
+    # 확장자까지 키에 넣음 (a.mp3와 a.wav가 같은 캐시 파일을 쓰지 않도록)
+    return os.path.join(config.ANALYSIS_CACHE_DIR, f"{os.path.basename(file_path)}.json")
+
+
+def _write_json(path, payload):
+    """
+    임시 파일에 쓰고 이름을 바꿈 (프리페치/워커/API가 같은 캐시를 동시에 써도 쓰다 만 파일을 읽지 않도록)
+    임시 파일 이름은 쓰는 쪽마다 고유 (같은 프로세스의 스레드끼리도 겹치지 않음)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_signature(file_path):
+    """원본 파일이 바뀌면 캐시를 무효화하기 위한 (크기, 수정시각) 서명"""
+    st = os.stat(file_path)
+    return {"size": st.st_size, "mtime": int(st.st_mtime)}
+
+
+def _backend_matches(cached_backend):
+    """
+    캐시된 결과를 현재 config.BEAT_BACKEND 요청에 쓸 수 있는지
+    librosa(draft 티어)는 어떤 결과든 재사용하고, 그 외에는 같은 백엔드로 분석한 결과만 씀
+    """
+    requested = config.BEAT_BACKEND.lower()
+    return requested == "librosa" or cached_backend == requested
+
+
+def load_beat_info(file_path):
+    """
+    캐시된 비트 분석 결과를 반환합니다. 없거나 원본이 바뀌었거나 다른 백엔드 결과면 None.
+    반환값에는 'audio'가 포함되지 않습니다. (bpm, downbeats, sr)
+    """
+    path = _cache_path(file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("source") != _file_signature(file_path):
+            return None
+        if not _backend_matches(cached.get("backend", "auto")):
+            return None
+        return {
+            "bpm": float(cached["bpm"]),
+            "downbeats": np.asarray(cached["downbeats"], dtype=int),
+            "sr": int(cached["sr"]),
+        }
+    except Exception:
+        return None
+
+
+def store_beat_info(file_path, beat_info):
+    """get_beat_info() 결과를 캐시에 저장 (오디오 배열은 제외)"""
+    try:
+        payload = {
+            "source": _file_signature(file_path),
+            "backend": config.BEAT_BACKEND.lower(),
+            "bpm": float(beat_info["bpm"]),
+            "downbeats": [int(x) for x in beat_info["downbeats"]],
+            "sr": int(beat_info["sr"]),
+        }
+        _write_json(_cache_path(file_path), payload)
+    except Exception as e:
+        print(f"   ⚠️ Analysis cache write failed: {e}")
+
+
+def load_downbeat_times(file_path):
+    """캐시된 다운비트 위치 (초, 비트 분석 캐시가 없으면 None)"""
+    beat_info = load_beat_info(file_path)
+    return beat_info["downbeats"] / beat_info["sr"] if beat_info is not None else None
+
+
+def get_cached_beat_info(file_path):
+    """
+    캐시 우선 비트 분석. 캐시가 없으면 get_beat_info()를 실행하고 저장합니다.
+    """
+    cached = load_beat_info(file_path)
+    if cached is not None:
+        print(f"   ⏩ Cached beat analysis: {os.path.basename(file_path)} ({cached['bpm']:.1f} BPM)")
+        return cached
+
+    if "analyze" in config.DISTRIBUTED_TASKS:
+        # 워커 노드에서 분석하고 캐시 파일만 받아옴 (worker.py)
+        from services.distributed import analyze_remote
+        return analyze_remote(file_path)
+
+    from services.analyzer_beat import get_beat_info
+    info = get_beat_info(file_path)
+    store_beat_info(file_path, info)
+    return {"bpm": info["bpm"], "downbeats": info["downbeats"], "sr": info["sr"]}
+
+
+# =================================================================
+# 🧱 구조 분석 캐시 (services/analyzer_structure.py)
+# =================================================================
+
+STRUCTURE_SETTINGS = ["STRUCTURE_KERNEL_BEATS", "STRUCTURE_MIN_SECTION_BEATS", "TARGET_SR", "ANALYSIS_PYRAMID_LEVELS"]
+STRUCTURE_VERSION = 1
+
+
+def _structure_path(file_path):
+    return _cache_path(file_path)[:-5] + ".structure.json"
+
+
+def _structure_settings():
+    return {"version": STRUCTURE_VERSION, **{name: getattr(config, name) for name in STRUCTURE_SETTINGS}}
+
+
+def get_cached_structure(file_path):
+    """
+    캐시 우선 구조 분석 (섹션, 인트로 끝, 아웃트로 시작)
+    비트 분석 캐시가 있으면 그 BPM/다운비트로 비트 그리드를 맞춤 (없어도 비트 분석을 새로 돌리지는 않음)
+    """
+    path = _structure_path(file_path)
+    settings = _structure_settings()
+    beat_info = load_beat_info(file_path)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            # 비트 분석 전에 추정 그리드로 만든 결과는 비트 분석이 생기면 다시 계산
+            if (cached.get("source") == _file_signature(file_path) and cached.get("settings") == settings
+                    and (cached.get("beatGrid") == "analysis" or beat_info is None)):
+                return cached["structure"]
+        except Exception:
+            pass
+
+    from services.analyzer_structure import analyze_structure
+    if beat_info is not None:
+        structure = analyze_structure(file_path, bpm=beat_info["bpm"],
+                                      downbeats=beat_info["downbeats"] / beat_info["sr"])
+    else:
+        structure = analyze_structure(file_path)
+
+    try:
+        _write_json(path, {"source": _file_signature(file_path), "settings": settings, "structure": structure,
+                           "beatGrid": "analysis" if beat_info is not None else "estimated"})
+    except Exception as e:
+        print(f"   ⚠️ Structure cache write failed: {e}")
+    return structure
+
+
+def track_structure(file_path):
+    """인트로/아웃트로 탐지에 쓸 구조 (config.STRUCTURE_ENABLED가 꺼져 있거나 분석이 실패하면 None)"""
+    if not config.STRUCTURE_ENABLED:
+        return None
+    try:
+        return get_cached_structure(file_path)
+    except Exception as e:
+        print(f"   ⚠️ Structure analysis failed ({e}). Using RMS heuristics.")
+        return None
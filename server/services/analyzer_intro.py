@@ -1,20 +1,43 @@
 import numpy as np
 import librosa
 
-def get_intro_duration(file_path, default_duration=16.0):
+from services.analysis_cache import track_structure
+from utils.pcm_cache import load_audio
+from utils.pyramid import analysis_rate, analysis_view
+
+# RMS 포락선만 쓰므로 11kHz로 충분 (utils/pyramid.py)
+MIN_SR = 11025
+REFERENCE_SR = 22050  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
+def get_intro_duration(file_path, default_duration=16.0, y=None, sr=None, structure=None):
     """
-    오디오의 에너지(RMS) 변화를 분석하여 Intro가 끝나는 시점을 추정합니다.
-    (소리가 갑자기 커지거나 비트가 강해지는 'Drop' 지점을 찾음)
+    Intro가 끝나는 시점을 추정합니다.
+    구조 분석(services/analyzer_structure.py)의 첫 섹션이 Intro면 그 끝을 쓰고,
+    없으면 에너지(RMS) 변화로 소리가 갑자기 커지거나 비트가 강해지는 'Drop' 지점을 찾습니다.
+    y, sr: 이미 디코딩한 오디오(배열 또는 AudioPyramid)가 있으면 파일을 다시 읽지 않음
+    structure: 구조 분석 결과 (None이면 file_path의 캐시된 결과, config.STRUCTURE_ENABLED가 꺼져 있으면 사용 안 함)
     """
     try:
         print(f"   🔍 Detecting intro duration: {file_path}")
+
+        if structure is None and file_path:
+            structure = track_structure(file_path)
+        intro_end = structure.get("introEnd") if structure else None
+        # RMS 휴리스틱과 같은 범위 (5초 이후, 곡 길이의 1/3 이내)
+        if intro_end and 5.0 <= intro_end <= structure["duration"] / 3:
+            print(f"      ✅ Intro Detected (structure): {intro_end:.2f} seconds")
+            return intro_end
         
-        # 1. 오디오 로드 (속도를 위해 sr을 낮춤)
-        y, sr = librosa.load(file_path, sr=22050)
+        # 1. 오디오 로드 (분석 피라미드의 낮은 레벨)
+        if y is None:
+            y, sr = load_audio(file_path, sr=analysis_rate(MIN_SR))
+        else:
+            y, sr = analysis_view(y, sr, MIN_SR)
         
         # 2. RMS 에너지(소리 크기) 계산
-        hop_length = 512
-        frame_length = 2048
+        scale = sr / REFERENCE_SR
+        hop_length = int(512 * scale)
+        frame_length = int(2048 * scale)
         rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
         
         # 3. 시간축 계산
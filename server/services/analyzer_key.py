@@ -1,15 +1,29 @@
 import numpy as np
 import librosa
 
-def get_key_from_audio(y, sr):
+import config
+from utils.pyramid import analysis_view
+
+# chroma_cqt 최고 옥타브(약 4.2kHz)까지 나이퀴스트 안에 들어오는 레벨 (utils/pyramid.py)
+MIN_SR = 22050
+REFERENCE_SR = 44100  # HPSS 중앙값 필터(프레임 단위)를 정한 기준 샘플레이트
+
+def get_key_from_audio(y, sr, harmonic=None):
     """
     오디오의 키(Key)를 분석하여 (0~11, mode) 형태로 반환합니다.
     0: C, 1: C#, ..., 11: B
     mode: 'major' or 'minor'
+    y: 배열 또는 AudioPyramid
+    harmonic: HPSS로 화성 성분만 남긴 뒤 분석 (정확하지만 분석 시간의 대부분을 차지, None이면 config.KEY_HPSS)
     """
+    if harmonic is None:
+        harmonic = config.KEY_HPSS
+    y, sr = analysis_view(y, sr, MIN_SR)
     # 1. Chromagram 추출 (음계 에너지 분포)
     # harmonic 성분만 추출해서 분석하면 더 정확함
-    y_harmonic = librosa.effects.harmonic(y)
+    # 다른 sr에서도 같은 시간/주파수 해상도가 되도록 STFT 크기를 비례 조정
+    scale = sr / REFERENCE_SR
+    y_harmonic = librosa.effects.harmonic(y, n_fft=int(2048 * scale), hop_length=int(512 * scale)) if harmonic else y
     chroma = librosa.feature.chroma_cqt(y=y_harmonic, sr=sr)
     
     # 시간축 평균 -> 12개의 음계 에너지값 (C, C#, D ... B)
@@ -1,13 +1,33 @@
 import numpy as np
 import librosa
 
-def find_outro_endpoint(y, sr):
+from utils.pyramid import AudioPyramid, analysis_view, to_sr
+
+# RMS / Onset 포락선만 쓰지만 Onset은 하이햇 대역(5.5kHz 이상)에 민감하므로 22kHz (utils/pyramid.py)
+MIN_SR = 22050
+REFERENCE_SR = 44100  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
+def find_outro_endpoint(y, sr, structure=None):
     """
     [Final Aggressive Mode]
     뒤에서부터 검사하는 게 아니라, 
     '마지막으로 에너지가 폭발했던 지점'을 찾아서 그 뒤를 전부 날려버립니다.
     기준을 높일수록 더 많이 잘려나갑니다.
+    y는 배열 또는 AudioPyramid, 반환값은 sr 기준 샘플 위치
+    structure: 구조 분석 결과 (services/analysis_cache.track_structure). 마지막 섹션이 Outro면
+               그 시작을 Body 끝으로 쓰고, 없으면 위 방식으로 찾습니다.
     """
+    base_sr = sr
+    outro_start = structure.get("outroStart") if structure else None
+    if outro_start:
+        total = len(y.y) if isinstance(y, AudioPyramid) else len(y)
+        cut_point = int(outro_start * base_sr)
+        # 안전장치는 아래 방식과 같음 (노래의 절반 이상은 자르지 않음)
+        if total * 0.5 <= cut_point < total:
+            print(f"   ✂️ Trimmed at outro section: -{(total - cut_point) / base_sr:.2f} sec")
+            return cut_point
+
+    y, sr = analysis_view(y, sr, MIN_SR)
     try:
         # 1. 분석 범위: 노래의 끝부분 45초
         scan_duration = 45.0
@@ -22,9 +42,11 @@ def find_outro_endpoint(y, sr):
             global_offset = 0
 
         # 2. RMS(볼륨)와 Onset(비트) 계산
-        hop_length = 512
-        rms = librosa.feature.rms(y=y_scan, frame_length=2048, hop_length=hop_length)[0]
-        onset_env = librosa.onset.onset_strength(y=y_scan, sr=sr, hop_length=hop_length)
+        scale = sr / REFERENCE_SR
+        hop_length = int(512 * scale)
+        frame_length = int(2048 * scale)
+        rms = librosa.feature.rms(y=y_scan, frame_length=frame_length, hop_length=hop_length)[0]
+        onset_env = librosa.onset.onset_strength(y=y_scan, sr=sr, n_fft=frame_length, hop_length=hop_length)
         
         # 3. 정규화 (0.0 ~ 1.0)
         # 주의: 1.0은 이 구간 내에서 '가장 시끄러운 순간'을 의미함
@@ -78,8 +100,8 @@ def find_outro_endpoint(y, sr):
         removed_seconds = (len(y) - final_cut_point) / sr
         print(f"   ✂️ Trimmed: -{removed_seconds:.2f} sec (Threshold: V{vol_threshold}/B{beat_threshold})")
         
-        return final_cut_point
+        return to_sr(final_cut_point, sr, base_sr)
 
     except Exception as e:
         print(f"   ⚠️ Analysis Error: {e}")
-        return len(y)
\ No newline at end of file
+        return to_sr(len(y), sr, base_sr)
\ No newline at end of file
@@ -0,0 +1,363 @@
+# server/services/analyzer_stream.py
+"""
+업로드 중 증분 분석 (받은 바이트를 디코딩되는 대로 청크 단위로 분석)
+
+    StreamDecoder        받은 바이트 -> 모노 PCM (native sr)
+    IncrementalAnalyzer  PCM 청크 -> 온셋 엔벨로프 / RMS / 파형 피크 / 템포 추정을 온라인 갱신,
+                         snapshot()은 잠정 BPM + 지금까지의 RMS 레벨, finalize()에서 비트 추적까지 (EOF)
+    UploadAnalyzer       업로드 파일 쓰기 + 디코딩 + 분석을 묶은 것 (백엔드 스트리밍 업로드, stream_analysis.py)
+
+업로드가 끝나는 순간 잠정 BPM/비트/파형(피크 + RMS 엔벨로프)이 나오고, 디코딩한 PCM은 PCM 캐시에 저장되어
+이후 분석/믹싱이 다시 디코딩하지 않습니다.
+
+분석은 백엔드 /api/transition/analyze의 librosa.beat.beat_track(y, sr)과 같은 계산을 나눠서 한 것입니다.
+    온셋: onset_strength(aggregate=median)와 같은 프레임/정렬
+          (업로드 중에는 power_to_db의 top_db 바닥을 지금까지의 최대값 기준으로, finalize()에서 전체 최대값으로 보정)
+    템포: feature.tempo와 같은 템포그램 평균 + 로그정규 사전분포 (템포그램 열을 도착하는 대로 누적)
+    비트: 마지막에 추정 템포로 beat_track (엔벨로프가 이미 있으므로 DP만)
+"""
+
+import io
+import os
+
+import numpy as np
+import soundfile as sf
+import librosa
+import soxr
+
+import config
+
+ANALYSIS_SR = 22050  # 백엔드 분석과 같은 샘플레이트
+N_FFT = 2048
+HOP_LENGTH = 512
+WAVEFORM_POINTS = 2000
+# feature.tempo의 템포그램 창 (기본 ac_size 8초, 프레임)
+TEMPO_WIN = int(librosa.time_to_frames(8.0, sr=ANALYSIS_SR, hop_length=HOP_LENGTH))
+
+
+class _PrefixReader(io.RawIOBase):
+    """받은 바이트의 앞 length 바이트만 보이는 파일 (soundfile 가상 IO용, 복사 없이)"""
+
+    def __init__(self, data, length):
+        self._data = data
+        self._length = length
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._length}[whence]
+        self._pos = min(max(0, base + offset), self._length)
+        return self._pos
+
+    def readinto(self, buf):
+        n = max(0, min(len(buf), self._length - self._pos))
+        buf[:n] = self._data[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+
+class StreamDecoder:
+    """
+    바이트 청크 -> 모노 float32 PCM
+
+    config.STREAM_DECODE_STEP_KB만큼 쌓일 때마다 지금까지 받은 앞부분을 열어 이미 내보낸 프레임 뒤부터 읽습니다.
+    (MP3는 열 때 파일 끝의 ID3 태그를, OGG는 길이를 위해 마지막 페이지를 읽으므로
+     데이터가 다 올 때까지 기다리는 단일 리더 대신 받은 부분을 다시 여는 방식)
+    마지막 라운드 전에는 끝의 config.STREAM_DECODE_MARGIN 프레임을 내보내지 않고 (잘린 프레임 보호),
+    다음 라운드는 같은 길이만큼 앞에서부터 다시 디코딩해 이음매를 맞춥니다.
+    MP3는 탐색할 때마다 앞부분 프레임을 처음부터 다시 훑으므로 (libsndfile/mpg123, 다시 연 핸들은 위치를 기억하지 못함)
+    다음 라운드까지의 간격을 받은 크기의 config.STREAM_DECODE_MP3_GROWTH 배로 늘려 전체 디코딩 비용을 선형으로 유지합니다.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.sr = None
+        self.channels = None
+        self.frames = 0  # 내보낸 프레임 수
+        self._round_at = 0
+        self._step = config.STREAM_DECODE_STEP_KB * 1024
+
+    def feed(self, chunk):
+        """Returns: 새로 디코딩된 모노 PCM (없으면 빈 배열)"""
+        self.data += chunk
+        if len(self.data) - self._round_at < self._step:
+            return np.zeros(0, dtype=np.float32)
+        return self._decode(final=False)
+
+    def finish(self):
+        """EOF: 남은 PCM 전부 (디코딩할 수 없는 파일이면 soundfile 예외)"""
+        return self._decode(final=True)
+
+    def _decode(self, final):
+        self._round_at = len(self.data)
+        try:
+            with sf.SoundFile(_PrefixReader(self.data, len(self.data))) as f:
+                self.sr, self.channels = f.samplerate, f.channels
+                if f.format == "MP3":
+                    self._step = max(config.STREAM_DECODE_STEP_KB * 1024,
+                                     int(len(self.data) * config.STREAM_DECODE_MP3_GROWTH))
+                # MP3는 탐색 직후 비트 저장소가 비어 있어 첫 프레임이 달라질 수 있으므로 앞에서부터 읽고 버림
+                start = max(0, self.frames - config.STREAM_DECODE_MARGIN)
+                if start:
+                    f.seek(start)
+                y = f.read(dtype="float32", always_2d=True)[self.frames - start:]
+        except RuntimeError:
+            if final:
+                raise
+            return np.zeros(0, dtype=np.float32)  # 헤더가 아직 다 오지 않음
+
+        y = y.mean(axis=1) if y.shape[1] > 1 else y[:, 0]  # librosa.to_mono와 같음
+        if not final:
+            y = y[:max(0, len(y) - config.STREAM_DECODE_MARGIN)]
+        self.frames += len(y)
+        return y
+
+
+class IncrementalAnalyzer:
+    """PCM 청크를 받는 대로 온셋/RMS/파형/템포를 갱신 (bpm 속성이 현재 잠정 템포)"""
+
+    def __init__(self):
+        self.sr = None
+        self.samples = 0          # 받은 분석 샘플 수 (ANALYSIS_SR)
+        self._resampler = None
+        # center=True STFT처럼 앞에 n_fft // 2 무음
+        self._buf = np.zeros(N_FFT // 2, dtype=np.float32)
+        self._mel = librosa.filters.mel(sr=ANALYSIS_SR, n_fft=N_FFT).astype(np.float32)
+        self._window = librosa.filters.get_window("hann", N_FFT, fftbins=True).astype(np.float32)
+        self._prev_db = None
+        self._db_max = -np.inf
+        self._db = []             # 바닥을 적용하기 전 멜 dB (finalize에서 최대값이 바뀐 앞부분 재계산용)
+        self._stale = 0           # 이 프레임 전까지는 최종보다 낮은 최대값으로 바닥을 적용함
+
+        # onset_strength의 지연 보정 (lag 1 + n_fft // (2 * hop) 프레임)
+        self._env = [np.zeros(1 + N_FFT // (2 * HOP_LENGTH), dtype=np.float32)]
+        self._rms = []
+        self._rms_sq_sum = 0.0    # 프레임 RMS 제곱 합 (전체 RMS 레벨을 매번 다시 합하지 않도록)
+        self._peaks = []
+        self._frames = 0          # 처리한 STFT 프레임 수
+
+        self._tg_window = librosa.filters.get_window("hann", TEMPO_WIN, fftbins=True)
+        self._tg_sum = np.zeros(TEMPO_WIN)
+        self._tg_columns = 0
+        bpms = librosa.tempo_frequencies(TEMPO_WIN, hop_length=HOP_LENGTH, sr=ANALYSIS_SR)
+        with np.errstate(divide="ignore"):
+            logprior = -0.5 * ((np.log2(bpms) - np.log2(120.0)) / 1.0) ** 2
+        logprior[:np.argmax(bpms < 320.0)] = -np.inf
+        self._bpms, self._logprior = bpms, logprior
+
+    def feed(self, y, sr):
+        """native sr 모노 PCM 청크 추가"""
+        if len(y) == 0:
+            return
+        if self._resampler is None:
+            self.sr = sr
+            self._resampler = soxr.ResampleStream(sr, ANALYSIS_SR, 1, dtype="float32") if sr != ANALYSIS_SR else False
+        x = self._resampler.resample_chunk(y) if self._resampler else np.asarray(y, dtype=np.float32)
+        self._append(x)
+
+    def _append(self, x, final=False):
+        self.samples += len(x)
+        self._buf = np.concatenate([self._buf, x])
+        if final:
+            self._buf = np.concatenate([self._buf, np.zeros(N_FFT // 2, dtype=np.float32)])
+        count = 1 + (len(self._buf) - N_FFT) // HOP_LENGTH if len(self._buf) >= N_FFT else 0
+        if final:
+            count = min(count, 1 + self.samples // HOP_LENGTH - self._frames)  # center=True 프레임 수
+        if count <= 0:
+            return
+
+        frames = np.lib.stride_tricks.sliding_window_view(self._buf, N_FFT)[::HOP_LENGTH][:count]
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        self._rms.append(rms)
+        self._rms_sq_sum += float(np.dot(rms, rms))
+        center = frames[:, N_FFT // 2 - HOP_LENGTH // 2:N_FFT // 2 + HOP_LENGTH // 2]
+        self._peaks.append(np.abs(center).max(axis=1))
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        db = 10.0 * np.log10(np.maximum(1e-10, self._mel @ power.T))
+        self._db.append(db)
+        if db.max() > self._db_max:
+            self._db_max = float(db.max())
+            self._stale = self._frames
+        db = np.maximum(db, self._db_max - 80.0)
+        prev = db[:, :1] if self._prev_db is None else self._prev_db
+        env = self._flux(np.concatenate([prev, db], axis=1))
+        if self._prev_db is None:
+            env = env[1:]  # 첫 프레임은 비교 대상이 없음
+        self._prev_db = db[:, -1:]
+        self._env.append(env)
+        self._frames += count
+        self._buf = self._buf[count * HOP_LENGTH:]
+        self._update_tempogram()
+
+    @staticmethod
+    def _flux(db):
+        """멜 dB (n_mels, n + 1) -> 온셋 강도 n개 (양의 변화량의 주파수 중앙값)"""
+        return np.median(np.maximum(0.0, np.diff(db, axis=1)), axis=0).astype(np.float32)
+
+    def _envelope(self):
+        if len(self._env) > 1:
+            self._env = [np.concatenate(self._env)]
+        return self._env[0][:self._frames]
+
+    def _update_tempogram(self, final=False):
+        """창 전체가 도착한 템포그램 열을 누적 (librosa tempogram center=True와 같은 열)"""
+        env = self._envelope()
+        half = TEMPO_WIN // 2
+        if final:
+            padded = np.pad(env, (half, half), mode="linear_ramp", end_values=(0, 0))
+            end = len(env)
+        else:
+            padded = np.concatenate([np.zeros(half, dtype=env.dtype), env])  # env[0] = 0이라 시작 램프는 0
+            end = len(env) - half
+        if end <= self._tg_columns:
+            return
+        self._tg_sum += self._tempogram_sum(padded, self._tg_columns, end)
+        self._tg_columns = end
+
+    def _tempogram_sum(self, padded, start, end):
+        """템포그램 열 start..end의 합 (열마다 창 자기상관, 최대값 정규화)"""
+        frames = np.lib.stride_tricks.sliding_window_view(padded, TEMPO_WIN)[start:end]
+        ac = librosa.autocorrelate(frames * self._tg_window, axis=-1)
+        return librosa.util.normalize(ac, norm=np.inf, axis=-1).sum(axis=0)
+
+    def _refloor(self):
+        """
+        최대값이 나중에 커졌으면 그 전 프레임들을 최종 top_db 바닥으로 다시 계산 (onset_strength와 같아짐)
+        엔벨로프 앞부분과 그 구간이 창에 걸리는 템포그램 열만 바꿉니다.
+        """
+        if not self._stale:
+            return
+        db = np.concatenate(self._db, axis=1)[:, :self._stale + 1]
+        env = self._envelope()
+        lag = N_FFT // (2 * HOP_LENGTH)  # 프레임 i의 온셋 강도 -> env[i + lag]
+        new = env.copy()
+        flux = self._flux(np.maximum(db, self._db_max - 80.0))[:len(new) - lag - 1]
+        new[lag + 1:lag + 1 + len(flux)] = flux
+
+        half = TEMPO_WIN // 2
+        columns = min(self._tg_columns, lag + self._stale + half)
+        for sign, e in ((-1.0, env), (1.0, new)):
+            padded = np.pad(e, (half, half), mode="linear_ramp", end_values=(0, 0))
+            self._tg_sum += sign * self._tempogram_sum(padded, 0, columns)
+        self._env = [new]
+        self._stale = 0
+
+    @property
+    def bpm(self):
+        """현재 잠정 템포 (템포그램 열이 아직 없으면 None)"""
+        if not self._tg_columns:
+            return None
+        mean = self._tg_sum / self._tg_columns
+        return float(self._bpms[np.argmax(np.log1p(1e6 * mean) + self._logprior)])
+
+    @property
+    def duration(self):
+        return self.samples / ANALYSIS_SR
+
+    def waveform(self, points=WAVEFORM_POINTS):
+        """프레임 피크를 points개 구간 최대값으로"""
+        peaks = np.concatenate(self._peaks) if self._peaks else np.zeros(0, dtype=np.float32)
+        if len(peaks) <= points:
+            return peaks.tolist()
+        edges = np.linspace(0, len(peaks), points + 1).astype(int)
+        return np.maximum.reduceat(peaks, edges[:-1]).tolist()
+
+    @property
+    def rms_db(self):
+        """지금까지의 전체 RMS 레벨 (dBFS, 프레임이 아직 없으면 None)"""
+        if not self._frames:
+            return None
+        return float(10.0 * np.log10(max(self._rms_sq_sum / self._frames, 1e-10)))
+
+    def energy(self, points=WAVEFORM_POINTS):
+        """프레임 RMS를 points개 구간 RMS로 (waveform()과 같은 구간)"""
+        rms = np.concatenate(self._rms) if self._rms else np.zeros(0, dtype=np.float32)
+        if len(rms) <= points:
+            return rms.tolist()
+        edges = np.linspace(0, len(rms), points + 1).astype(int)
+        return np.sqrt(np.add.reduceat(rms ** 2, edges[:-1]) / np.diff(edges)).tolist()
+
+    def snapshot(self):
+        """업로드 중 잠정 결과"""
+        return {"bpm": self.bpm, "duration": self.duration, "rmsDb": self.rms_db}
+
+    def finalize(self):
+        """EOF: 남은 프레임 처리 + 템포 확정 + 비트 추적"""
+        tail = self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True) if self._resampler else \
+            np.zeros(0, dtype=np.float32)
+        self._append(tail, final=True)
+        self._update_tempogram(final=True)
+        self._refloor()
+        self._db = []
+        env = self._envelope()
+        bpm = self.bpm
+        beats = np.zeros(0)
+        if bpm is not None and len(env):
+            _, beat_frames = librosa.beat.beat_track(onset_envelope=env, sr=ANALYSIS_SR, hop_length=HOP_LENGTH, bpm=bpm)
+            beats = librosa.frames_to_time(beat_frames, sr=ANALYSIS_SR, hop_length=HOP_LENGTH)
+        beat_times = beats.tolist()
+        return {
+            "bpm": bpm,
+            "beats": beat_times,
+            "downbeats": list(range(0, len(beat_times), 4)),
+            "duration": self.duration,
+            "rmsDb": self.rms_db,
+            "waveformData": {"peaks": self.waveform(), "rms": self.energy(), "duration": self.duration},
+            "provisional": True,
+        }
+
+
+class UploadAnalyzer:
+    """
+    업로드 파일 하나: 받은 바이트를 path에 쓰면서 디코딩/분석
+
+        upload = UploadAnalyzer(path)
+        for chunk in body: upload.feed(chunk)
+        result = upload.finish()   # {"bpm", "beats", "waveformData", "sampleRate", "channels", ...}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.decoder = StreamDecoder()
+        self.analyzer = IncrementalAnalyzer()
+        self._pcm = []
+        self._file = open(path, "wb")
+
+    def feed(self, chunk):
+        self._file.write(chunk)
+        self._push(self.decoder.feed(chunk))
+
+    def _push(self, y):
+        if len(y):
+            self._pcm.append(y)
+            self.analyzer.feed(y, self.decoder.sr)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def finish(self):
+        """EOF: 파일을 닫고 분석 확정 + 디코딩한 PCM을 PCM 캐시에 저장"""
+        self._file.close()
+        self._push(self.decoder.finish())
+        result = self.analyzer.finalize()
+        result.update(sampleRate=self.decoder.sr, channels=self.decoder.channels)
+
+        from utils.pcm_cache import store_decoded
+        y = np.concatenate(self._pcm) if self._pcm else np.zeros(0, dtype=np.float32)
+        self._pcm = []
+        try:
+            store_decoded(self.path, y, self.decoder.sr, self.decoder.channels)
+        except OSError as e:
+            print(f"   ⚠️ PCM cache store failed: {e}")
+        return result
@@ -0,0 +1,206 @@
+import numpy as np
+import librosa
+
+import config
+from utils.pcm_cache import load_audio
+from utils.pyramid import analysis_rate, analysis_view
+
+# 크로마/MFCC/RMS만 쓰므로 22kHz로 충분 (utils/pyramid.py)
+MIN_SR = 22050
+REFERENCE_SR = 22050  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
+# =================================================================
+# 🧱 비트 단위 구조 분석
+# 1. 고정 템포 비트 그리드(BPM + 위상, 드럼 없는 인트로까지 곡 전체)를 만들고
+#    프레임 특징(크로마, MFCC, RMS)을 비트 구간마다 평균 -> 비트 x 특징 행렬
+# 2. 비트 단위 자기 유사도의 대각선 띠(|i - j| < 2K)만 계산해서 체커보드 커널 노벨티를 구함
+#    (전체 행렬 N x N 대신 N x 2K, 곡 길이에 거의 선형)
+# 3. 노벨티 피크 = 섹션 경계 (다운비트가 있으면 가장 가까운 다운비트로 스냅)
+# 4. 섹션 평균 특징으로 반복 그룹(A, B, C ...)을 묶고, 에너지와 위치로 이름을 붙임
+#    Intro / Verse / Chorus / Breakdown / Outro
+# =================================================================
+
+REPEAT_SIMILARITY = 0.9   # 섹션 평균 특징의 코사인 유사도가 이보다 크면 같은 그룹
+LOW_ENERGY = 0.5          # 가장 큰 섹션 대비 이보다 작으면 Breakdown
+
+
+def beat_grid(onset_env, sr, hop_length, duration, bpm=None, downbeats=None):
+    """
+    곡 전체의 비트 위치 (초)
+    DJ 트랙은 템포가 고정이므로 BPM 간격 그리드의 위상만 구함 (다운비트가 있으면 그 위상, 없으면 비트 트래킹)
+    비트 트래커는 드럼이 없는 인트로/아웃트로에서 비트를 건너뛰므로 그리드를 곡 처음/끝까지 늘림
+    """
+    if not bpm:
+        bpm = float(librosa.feature.tempo(onset_envelope=onset_env, sr=sr, hop_length=hop_length)[0])
+    period = 60.0 / bpm
+    if downbeats is not None and len(downbeats):
+        anchors = np.asarray(downbeats, dtype=float)
+    else:
+        _, frames = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=hop_length, bpm=bpm,
+                                            trim=False)
+        anchors = librosa.frames_to_time(frames, sr=sr, hop_length=hop_length)
+    if len(anchors) == 0:
+        phase = 0.0
+    else:
+        # 원형 평균 (그리드 위상은 period를 주기로 돎)
+        angles = 2 * np.pi * np.mod(anchors, period) / period
+        phase = float(np.mod(np.angle(np.mean(np.exp(1j * angles))), 2 * np.pi) / (2 * np.pi) * period)
+    return np.arange(phase, duration, period), period
+
+
+def _beat_features(S, mel, sr, beat_frames, n_fft):
+    """비트 구간별 특징 (특징 x 비트, 열은 단위 벡터)과 비트별 RMS"""
+    chroma = librosa.feature.chroma_stft(S=S, sr=sr)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=13)
+    rms = librosa.feature.rms(S=np.sqrt(S), frame_length=n_fft)[0]
+
+    bounds = librosa.util.fix_frames(beat_frames, x_min=0, x_max=S.shape[1])
+    groups = []
+    for feature in (chroma, mfcc[1:], np.log1p(100 * rms)[np.newaxis]):
+        synced = librosa.util.sync(feature, bounds, aggregate=np.mean)
+        synced = (synced - synced.mean(axis=1, keepdims=True)) / (synced.std(axis=1, keepdims=True) + 1e-6)
+        groups.append(librosa.util.normalize(synced, norm=2, axis=0) / np.sqrt(3))
+    beat_rms = librosa.util.sync(rms[np.newaxis], bounds, aggregate=np.mean)[0]
+    return np.vstack(groups), beat_rms, bounds
+
+
+def _novelty(features, kernel_beats):
+    """
+    가우시안 체커보드 커널 노벨티 (Foote)
+    novelty[i] = sum_{a,b in [-K, K)} sign(a, b) * w(a, b) * S[i + a, i + b]
+    S[i, j] = features[:, i] . features[:, j] 는 |i - j| < 2K인 띠만 필요
+    """
+    k = int(kernel_beats)
+    n = features.shape[1]
+    padded = np.pad(features, ((0, 0), (k, k)), mode="edge")
+    band = [np.einsum("ij,ij->j", padded[:, :padded.shape[1] - lag], padded[:, lag:]) for lag in range(2 * k)]
+
+    offsets = np.arange(-k, k) + 0.5
+    weight = np.exp(-(offsets[:, None] ** 2 + offsets[None, :] ** 2) / (2 * (k / 2) ** 2))
+    sign = np.where((offsets[:, None] < 0) == (offsets[None, :] < 0), 1.0, -1.0)
+    kernel = sign * weight
+
+    novelty = np.zeros(n)
+    for a in range(2 * k):
+        for b in range(a, 2 * k):
+            # 대칭이므로 a <= b만 (대각선 밖은 두 번)
+            scale = kernel[a, b] * (1 if a == b else 2)
+            novelty += scale * band[b - a][a:a + n]
+    novelty = np.maximum(novelty, 0)
+    return novelty / (novelty.max() + 1e-9)
+
+
+def _pick_boundaries(novelty, min_beats):
+    """노벨티 피크 중 섹션 최소 길이를 지키는 경계 (강한 피크 우선)"""
+    n = len(novelty)
+    half = max(1, min_beats // 2)
+    peaks = librosa.util.peak_pick(novelty, pre_max=half, post_max=half, pre_avg=min_beats, post_avg=min_beats,
+                                   delta=0.05, wait=half)
+    chosen = [0, n]
+    for peak in sorted(peaks, key=lambda p: -novelty[p]):
+        if all(abs(peak - b) >= min_beats for b in chosen):
+            chosen.append(int(peak))
+    return sorted(chosen)
+
+
+def _label_sections(seg_features, seg_energy):
+    """섹션마다 (이름, 반복 그룹 문자)"""
+    n = len(seg_energy)
+    groups, centroids = [], []
+    for vector in seg_features:
+        sims = [float(np.dot(vector, c) / (np.linalg.norm(vector) * np.linalg.norm(c) + 1e-9)) for c in centroids]
+        if sims and max(sims) > REPEAT_SIMILARITY:
+            groups.append(int(np.argmax(sims)))
+        else:
+            groups.append(len(centroids))
+            centroids.append(vector)
+
+    energy = seg_energy / (seg_energy.max() + 1e-9)
+    median = float(np.median(energy))
+    names = ["Verse"] * n
+    if n >= 3 and energy[0] < median:
+        names[0] = "Intro"
+    if n >= 3 and energy[-1] < median:
+        names[-1] = "Outro"
+
+    body = [i for i in range(n) if names[i] == "Verse"]
+    if body:
+        # 반복되는 그룹 중 가장 에너지가 큰 그룹 = Chorus (반복이 없으면 중앙값보다 큰 섹션)
+        repeated = [g for g in set(groups[i] for i in body) if sum(groups[i] == g for i in body) > 1]
+        if repeated:
+            chorus = max(repeated, key=lambda g: np.mean([energy[i] for i in body if groups[i] == g]))
+            chorus_sections = [i for i in body if groups[i] == chorus and energy[i] >= median]
+        else:
+            chorus_sections = [i for i in body if energy[i] > median]
+        for i in chorus_sections:
+            names[i] = "Chorus"
+        for i in body:
+            if names[i] == "Verse" and energy[i] < LOW_ENERGY:
+                names[i] = "Breakdown"
+
+    letters = [chr(ord("A") + g) if g < 26 else f"G{g}" for g in groups]
+    return names, letters, energy
+
+
+def analyze_structure(file_path=None, y=None, sr=None, downbeats=None, bpm=None):
+    """
+    트랙 구조(섹션) 분석
+
+    Args:
+        file_path / y, sr: 파일 경로 또는 디코딩한 오디오 (배열 또는 AudioPyramid)
+        downbeats: 다운비트 위치 (초, 있으면 비트 그리드 위상으로 쓰고 섹션 경계를 가장 가까운 다운비트로 스냅)
+        bpm: 비트 분석 결과 템포 (없으면 추정)
+
+    Returns:
+        {"sections": [{"name", "label", "start", "end", "energy"}, ...],
+         "introEnd": 초 또는 None, "outroStart": 초 또는 None, "duration", "beats": 비트 수}
+    """
+    if y is None:
+        y, sr = load_audio(file_path, sr=analysis_rate(MIN_SR))
+    else:
+        y, sr = analysis_view(y, sr, MIN_SR)
+    duration = len(y) / sr
+
+    scale = sr / REFERENCE_SR
+    hop_length = int(512 * scale)
+    n_fft = int(2048 * scale)
+    # STFT 한 번으로 온셋/크로마/MFCC/RMS를 모두 계산
+    S = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length)) ** 2
+    mel = librosa.feature.melspectrogram(S=S, sr=sr)
+    onset_env = librosa.onset.onset_strength(S=librosa.power_to_db(mel), sr=sr, hop_length=hop_length)
+    beat_times, period = beat_grid(onset_env, sr, hop_length, duration, bpm, downbeats)
+    beat_frames = np.unique(librosa.time_to_frames(beat_times, sr=sr, hop_length=hop_length))
+
+    min_beats = int(config.STRUCTURE_MIN_SECTION_BEATS)
+    if len(beat_frames) < 2 * min_beats:
+        return {"sections": [{"name": "Verse", "label": "A", "start": 0.0, "end": duration, "energy": 1.0}],
+                "introEnd": None, "outroStart": None, "duration": duration, "beats": int(len(beat_frames))}
+
+    features, beat_rms, bounds = _beat_features(S, mel, sr, beat_frames, n_fft)
+    novelty = _novelty(features, config.STRUCTURE_KERNEL_BEATS)
+    cuts = _pick_boundaries(novelty, min_beats)
+
+    # 비트 경계 -> 초 (다운비트 스냅)
+    times = librosa.frames_to_time(bounds, sr=sr, hop_length=hop_length)
+    times[-1] = duration
+    edges = [float(times[c]) for c in cuts]
+    if downbeats is not None and len(downbeats):
+        downbeats = np.asarray(downbeats, dtype=float)
+        for i in range(1, len(edges) - 1):
+            nearest = downbeats[np.argmin(np.abs(downbeats - edges[i]))]
+            if abs(nearest - edges[i]) <= period:
+                edges[i] = float(nearest)
+
+    seg_features = [features[:, s:e].mean(axis=1) for s, e in zip(cuts[:-1], cuts[1:])]
+    seg_energy = np.array([beat_rms[s:e].mean() for s, e in zip(cuts[:-1], cuts[1:])])
+    names, letters, energy = _label_sections(seg_features, seg_energy)
+
+    sections = [{"name": name, "label": letter, "start": start, "end": end, "energy": float(e)}
+                for name, letter, start, end, e in zip(names, letters, edges[:-1], edges[1:], energy)]
+    return {
+        "sections": sections,
+        "introEnd": sections[0]["end"] if sections[0]["name"] == "Intro" else None,
+        "outroStart": sections[-1]["start"] if sections[-1]["name"] == "Outro" else None,
+        "duration": duration,
+        "beats": int(len(beat_frames)),
+    }
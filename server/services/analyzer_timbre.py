@@ -0,0 +1,42 @@
+# server/services/analyzer_timbre.py
+import numpy as np
+import librosa
+
+from utils.pyramid import analysis_view
+
+# MFCC/스펙트럴 대비/크로마 통계만 쓰므로 22kHz로 충분 (utils/pyramid.py)
+MIN_SR = 22050
+REFERENCE_SR = 22050  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
+EMBEDDING_VERSION = 1  # 임베딩 계산 방식이 바뀌면 올림 (저장된 인덱스를 새로 만듦)
+
+# 임베딩 블록 (곡 전체 프레임 통계, 블록마다 단위 길이로 맞춰 한 종류가 유사도를 독점하지 않게)
+#   MFCC 1~19 평균/표준편차 (음색, 0번은 음량이라 제외)
+#   스펙트럴 대비 7밴드 평균/표준편차 (질감: 톤 vs 노이즈)
+#   크로마 평균 (중심화, 화성 분포)
+EMBEDDING_DIM = 19 + 19 + 7 + 7 + 12
+
+
+def get_timbre_embedding(y, sr):
+    """
+    트랙 음색 임베딩 (64차원 float32 단위 벡터, 코사인 유사도로 비교)
+
+    Args:
+        y, sr: 오디오 (배열 또는 AudioPyramid)
+    """
+    y, sr = analysis_view(y, sr, MIN_SR)
+    scale = sr / REFERENCE_SR
+    hop_length = int(512 * scale)
+    n_fft = int(2048 * scale)
+
+    # STFT 한 번으로 모든 특징 계산
+    S = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length))
+    mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=20)[1:]
+    contrast = librosa.feature.spectral_contrast(S=S, sr=sr, n_fft=n_fft)
+    chroma = librosa.feature.chroma_stft(S=S ** 2, sr=sr).mean(axis=1)
+
+    blocks = [mfcc.mean(axis=1), mfcc.std(axis=1), contrast.mean(axis=1), contrast.std(axis=1),
+              chroma - chroma.mean()]
+    blocks = [block / (np.linalg.norm(block) + 1e-9) for block in blocks]
+    return (np.concatenate(blocks) / np.sqrt(len(blocks))).astype(np.float32)
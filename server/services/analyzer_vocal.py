@@ -2,16 +2,25 @@
 import numpy as np
 import librosa
 
+from utils.pyramid import analysis_view, to_sr
+
+# RMS 포락선만 쓰므로 11kHz로 충분 (utils/pyramid.py)
+MIN_SR = 11025
+REFERENCE_SR = 44100  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
 def find_vocal_end_point(y_vocals, sr):
     """
-    보컬 트랙(y_vocals)에서 목소리가 실질적으로 끝나는 지점(샘플 인덱스)을 찾습니다.
+    보컬 트랙(y_vocals)에서 목소리가 실질적으로 끝나는 지점(sr 기준 샘플 인덱스)을 찾습니다.
     """
     if y_vocals is None or len(y_vocals) == 0:
         return 0
+    base_sr = sr
+    y_vocals, sr = analysis_view(y_vocals, sr, MIN_SR)
 
     # 1. RMS 에너지 계산
-    hop_length = 512
-    frame_length = 2048
+    scale = sr / REFERENCE_SR
+    hop_length = int(512 * scale)
+    frame_length = int(2048 * scale)
     rms = librosa.feature.rms(y=y_vocals, frame_length=frame_length, hop_length=hop_length)[0]
     
     # 2. 정규화 및 임계값 설정
@@ -31,6 +40,6 @@ def find_vocal_end_point(y_vocals, sr):
             buffer_frames = int(buffer_sec * sr / hop_length)
             
             end_frame = min(frames, i + buffer_frames)
-            return end_frame * hop_length
+            return to_sr(end_frame * hop_length, sr, base_sr)
             
     return 0 # 보컬이 아예 없음
\ No newline at end of file
@@ -0,0 +1,123 @@
+# server/services/artifact_store.py
+"""
+작업 결과 저장소 (워커 노드와 API 노드가 공유)
+
+키는 "/"로 구분한 상대 경로이고, 노드마다 로컬 디렉토리와 같은 구조로 주고받습니다.
+    tracks/<파일명>                       업로드 원본 (config.TRACKS_DIR)
+    output/<OUTPUT_DIR 기준 상대 경로>     스템, 분석 캐시, 믹스 결과 (config.OUTPUT_DIR)
+
+백엔드는 config.ARTIFACT_STORE_URL의 스킴으로 고릅니다 (STORE_BACKENDS에 등록).
+    file:///공유/디렉토리   LocalArtifactStore (NFS 등 모든 노드에 마운트된 디렉토리, 개발용이면 로컬 디렉토리)
+"""
+
+import os
+import shutil
+import tempfile
+
+import config
+
+
+class ArtifactStore:
+    """저장소 인터페이스"""
+
+    def put(self, key, path):
+        """로컬 파일 path를 key로 저장 (덮어씀)"""
+        raise NotImplementedError
+
+    def get(self, key, path):
+        """key를 로컬 파일 path로 받음. Returns: 있었는지"""
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def list(self, prefix):
+        """prefix 아래의 키 목록"""
+        raise NotImplementedError
+
+
+def _copy_replace(source, target):
+    """source를 target 옆 고유 임시 파일(.tmp)에 복사한 뒤 이름 변경 (컨테이너마다 PID가 같아도 겹치지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)),
+                                    prefix=f".{os.path.basename(target)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    디렉토리 하나 (임시 파일에 쓰고 이름을 바꾸므로 읽는 쪽이 쓰다 만 파일을 보지 않음)
+    수정 시각을 유지하므로 노드마다 받은 원본의 분석 캐시 서명(크기, 수정 시각)이 같습니다.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        parts = [part for part in key.split("/") if part]
+        if not parts or any(part == ".." for part in parts):
+            raise ValueError(f"Invalid artifact key: {key}")
+        return os.path.join(self.root, *parts)
+
+    def put(self, key, path):
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _copy_replace(path, target)
+
+    def get(self, key, path):
+        source = self._path(key)
+        if not os.path.exists(source):
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _copy_replace(source, path)
+        return True
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def list(self, prefix):
+        base = self._path(prefix)
+        if not os.path.isdir(base):
+            return []
+        keys = []
+        for directory, _, files in os.walk(base):
+            for name in files:
+                if not name.endswith(".tmp"):
+                    rel = os.path.relpath(os.path.join(directory, name), self.root)
+                    keys.append(rel.replace(os.sep, "/"))
+        return sorted(keys)
+
+
+# 스킴 -> 생성 함수 (위치 문자열을 받음)
+STORE_BACKENDS = {"file": LocalArtifactStore}
+
+
+def get_artifact_store(url=None):
+    """config.ARTIFACT_STORE_URL (또는 url)의 저장소"""
+    url = url or config.ARTIFACT_STORE_URL
+    scheme, sep, location = url.partition("://")
+    if not sep:
+        scheme, location = "file", url
+    if scheme not in STORE_BACKENDS:
+        raise ValueError(f"Unknown artifact store backend: {scheme} (choose from {sorted(STORE_BACKENDS)})")
+    return STORE_BACKENDS[scheme](location)
+
+
+def track_key(track_filename):
+    return f"tracks/{os.path.basename(track_filename)}"
+
+
+def output_key(path):
+    """config.OUTPUT_DIR 안의 로컬 경로 -> 키"""
+    return "output/" + os.path.relpath(path, config.OUTPUT_DIR).replace(os.sep, "/")
+
+
+def output_path(key):
+    """키 -> config.OUTPUT_DIR 안의 로컬 경로"""
+    return os.path.join(config.OUTPUT_DIR, *key.split("/")[1:])
@@ -0,0 +1,194 @@
+import sys
+import types
+import collections
+import collections.abc
+import numpy as np
+import librosa
+from unittest.mock import MagicMock
+
+import config
+
+# =================================================================
+# 🥁 비트 트래커 백엔드 (BeatNet / Madmom / Librosa)
+# 모든 백엔드는 같은 인터페이스를 가집니다:
+#   tracker.track(y, sr, file_path=None, bpm_hint=None)
+#   -> {"bpm": float, "beats": 초 배열, "downbeats": 초 배열}
+#   MIN_SR: 정확도를 유지하는 가장 낮은 입력 샘플레이트 (utils/pyramid.py 분석 레벨 선택용)
+# 어떤 백엔드를 쓸지는 config.BEAT_BACKEND / config.TRIM_BEAT_BACKEND로 선택합니다.
+# =================================================================
+
+
+class BeatTracker:
+    name = "base"
+    MIN_SR = 44100
+
+    def is_available(self):
+        return True
+
+    def track(self, y, sr, file_path=None, bpm_hint=None):
+        raise NotImplementedError
+
+
+def _bpm_from_beats(beat_times, default=120.0):
+    intervals = np.diff(beat_times)
+    if len(intervals) == 0:
+        return default
+    return float(60.0 / np.mean(intervals))
+
+
+class BeatNetTracker(BeatTracker):
+    """BeatNet (offline, DBN 추론) - 22050Hz 입력 기준"""
+    name = "beatnet"
+    MIN_SR = 22050
+    _estimator = None
+    _load_failed = False
+
+    @classmethod
+    def _load(cls):
+        if cls._estimator is not None or cls._load_failed:
+            return cls._estimator
+
+        # 🚑 BeatNet이 import하기 전에 가짜 PyAudio / collections 호환성 패치 등록
+        try:
+            import pyaudio  # noqa: F401
+        except ImportError:
+            m = types.ModuleType("pyaudio")
+            m.PyAudio = MagicMock()
+            m.paFloat32 = 1
+            m.paInt16 = 2
+            sys.modules["pyaudio"] = m
+
+        if not hasattr(collections, 'MutableSequence'):
+            collections.MutableSequence = collections.abc.MutableSequence
+        if not hasattr(collections, 'Iterable'):
+            collections.Iterable = collections.abc.Iterable
+
+        print("⏳ Loading BeatNet Model...")
+        try:
+            try:
+                from beatnet.BeatNet import BeatNet
+            except ImportError:
+                from BeatNet.BeatNet import BeatNet
+            cls._estimator = BeatNet(1, mode='offline', inference_model='DBN', plot=[], thread=False)
+            print("✅ BeatNet Model Loaded.")
+        except Exception as e:
+            print(f"   ⚠️ BeatNet Load Warning: {e}.")
+            cls._load_failed = True
+        return cls._estimator
+
+    def is_available(self):
+        return self._load() is not None
+
+    def track(self, y, sr, file_path=None, bpm_hint=None):
+        estimator = self._load()
+        if estimator is None:
+            raise RuntimeError("BeatNet is unavailable")
+
+        # 파일 경로가 있으면 BeatNet이 직접 로드, 없으면 22050Hz로 맞춰 전달
+        if file_path is not None:
+            output = estimator.process(file_path)
+        else:
+            output = estimator.process(librosa.resample(y, orig_sr=sr, target_sr=22050))
+
+        if output is None or len(output) == 0:
+            raise ValueError("No beats detected")
+
+        beat_times = output[:, 0]
+        beat_probs = output[:, 1]
+        downbeats = beat_times[beat_probs == 1.0]
+        if len(downbeats) == 0:
+            downbeats = np.array([beat_times[0]])
+
+        return {"bpm": _bpm_from_beats(beat_times), "beats": beat_times, "downbeats": downbeats}
+
+
+class MadmomTracker(BeatTracker):
+    """Madmom RNN + DBN 다운비트 트래커 (bpm_hint가 있으면 ±20% 범위로 제한)"""
+    name = "madmom"
+    MIN_SR = 44100  # 사전학습 모델의 필터뱅크가 44.1kHz 기준
+
+    def is_available(self):
+        try:
+            from madmom.features.downbeats import RNNDownBeatProcessor  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def track(self, y, sr, file_path=None, bpm_hint=None):
+        from madmom.audio.signal import Signal
+        from madmom.features.downbeats import RNNDownBeatProcessor, DBNDownBeatTrackingProcessor
+
+        act = RNNDownBeatProcessor()(Signal(y, sample_rate=sr))
+        if bpm_hint:
+            tracker = DBNDownBeatTrackingProcessor(
+                beats_per_bar=[4], fps=100,
+                min_bpm=bpm_hint * 0.8, max_bpm=bpm_hint * 1.2, transition_lambda=150
+            )
+        else:
+            tracker = DBNDownBeatTrackingProcessor(beats_per_bar=[4], fps=100)
+        beats_info = tracker(act)
+        if len(beats_info) == 0:
+            raise ValueError("No beats detected")
+
+        beat_times = beats_info[:, 0]
+        downbeats = beat_times[beats_info[:, 1] == 1]
+        return {"bpm": _bpm_from_beats(beat_times), "beats": beat_times, "downbeats": downbeats}
+
+
+class LibrosaTracker(BeatTracker):
+    """Librosa onset 기반 비트 트래킹 + 음량 기반 다운비트 추정"""
+    name = "librosa"
+    MIN_SR = 22050
+    REFERENCE_SR = 44100  # 프레임 길이를 정한 기준 샘플레이트 (템포 해상도는 프레임 간격에 비례)
+
+    def track(self, y, sr, file_path=None, bpm_hint=None):
+        # 다른 sr에서도 같은 프레임 간격이 되도록 STFT 크기를 비례 조정
+        scale = sr / self.REFERENCE_SR
+        hop_length = int(512 * scale)
+        onset_env = librosa.onset.onset_strength(y=y, sr=sr, n_fft=int(2048 * scale), hop_length=hop_length)
+        kwargs = {"start_bpm": bpm_hint} if bpm_hint else {}
+        tempo, beats = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=hop_length,
+                                               units='samples', **kwargs)
+
+        # 첫 4박 중 가장 큰 박을 다운비트로 간주
+        candidates = beats[:4]
+        if len(candidates) > 0:
+            loudness = [np.mean(np.abs(y[max(0, b-1000):min(len(y), b+1000)])) for b in candidates]
+            best_offset = np.argmax(loudness)
+        else:
+            best_offset = 0
+
+        beat_times = beats / sr
+        return {
+            "bpm": float(np.atleast_1d(tempo)[0]),
+            "beats": beat_times,
+            "downbeats": beat_times[best_offset::4],
+        }
+
+
+BEAT_BACKENDS = {
+    "beatnet": BeatNetTracker,
+    "madmom": MadmomTracker,
+    "librosa": LibrosaTracker,
+}
+
+_instances = {}
+
+
+def get_beat_tracker(name=None):
+    """
+    이름으로 비트 트래커 반환. "auto"면 config.BEAT_BACKEND_AUTO_ORDER 중 사용 가능한 첫 백엔드.
+    요청한 백엔드를 쓸 수 없으면 None.
+    """
+    name = (name or config.BEAT_BACKEND).lower()
+    candidates = config.BEAT_BACKEND_AUTO_ORDER if name == "auto" else [name]
+
+    for candidate in candidates:
+        if candidate not in BEAT_BACKENDS:
+            raise ValueError(f"Unknown beat backend: {candidate} (choose from {list(BEAT_BACKENDS)})")
+        if candidate not in _instances:
+            _instances[candidate] = BEAT_BACKENDS[candidate]()
+        tracker = _instances[candidate]
+        if tracker.is_available():
+            return tracker
+    return None
@@ -0,0 +1,269 @@
+# server/services/distributed.py
+"""
+분산 작업 종류 (워커: run_task, 보내는 쪽: separate_remote / analyze_remote / render_remote)
+
+    separate  {"track", "stems", "config"}   전체 스템 분리 -> output/<STEM_MODEL>_shifts<STEM_SHIFTS>/<트랙>/*
+    analyze   {"track", "config"}            비트 + 구조 분석 -> output/analysis/<트랙>*.json
+    render    mix_engine.py 요청 JSON         믹스 렌더링 -> mixUrl 등 결과 파일 (+ 렌더링 중 만든 스템/분석)
+
+보내는 쪽은 원본을 저장소(services/artifact_store.py)에 올리고 작업을 큐에 넣은 뒤 끝날 때까지 기다렸다가
+결과 파일을 로컬 output/으로 받아오므로, 이후 코드는 로컬에서 실행한 것과 똑같이 캐시를 읽습니다.
+워커는 실행 전에 원본과 이미 있는 결과를 받아오고(부분 스템 업그레이드, 분석 캐시 재사용), 만든 결과를 올립니다.
+요청마다 바뀌는 config 값(품질 티어의 스템 모델 등)은 payload["config"]로 보내 워커에서 같은 설정으로 실행합니다.
+"""
+
+import os
+import sys
+import json
+
+import config
+from services.artifact_store import get_artifact_store, track_key, output_key, output_path
+from services.task_queue import get_task_queue
+
+TASK_KINDS = ["separate", "analyze", "render"]
+
+# 작업 결과에 영향을 주는 config 값 (보내는 쪽의 현재 값을 payload에 담음, render는 요청의 tier로 정해짐)
+TASK_CONFIG = {
+    "separate": ["STEM_MODEL", "STEM_SHIFTS", "STEM_OVERLAP"],
+    "analyze": ["BEAT_BACKEND", "TARGET_SR", "ANALYSIS_PYRAMID_LEVELS", "STRUCTURE_ENABLED",
+                "STRUCTURE_KERNEL_BEATS", "STRUCTURE_MIN_SECTION_BEATS"],
+    "render": [],
+}
+
+# render 결과 중 파일 경로 (config.OUTPUT_DIR 기준)
+RESULT_FILE_FIELDS = ["mixUrl", "segmentUrl", "manifestUrl"]
+
+
+def _task_config(kind):
+    return {name: getattr(config, name) for name in TASK_CONFIG[kind]}
+
+
+# =================================================================
+# 📦 작업별 입출력 파일
+# =================================================================
+
+def _track_path(track_filename):
+    return os.path.join(config.TRACKS_DIR, os.path.basename(track_filename))
+
+
+def publish_track(store, track_filename):
+    """원본 업로드 (업로드 파일명은 고유하므로 이미 있으면 건너뜀)"""
+    if not store.exists(track_key(track_filename)):
+        store.put(track_key(track_filename), _track_path(track_filename))
+
+
+def fetch_track(store, track_filename):
+    path = _track_path(track_filename)
+    if not os.path.exists(path) and not store.get(track_key(track_filename), path):
+        raise FileNotFoundError(f"Track not in artifact store: {os.path.basename(track_filename)}")
+    return path
+
+
+def _stem_prefix(track_filename):
+    from services.stem_separation import stem_folder
+    name = os.path.splitext(os.path.basename(track_filename))[0]
+    return f"output/{stem_folder()}/{name}"
+
+
+def _stem_dir(track_filename):
+    from services.stem_separation import _output_dir, stem_folder
+    name = os.path.splitext(os.path.basename(track_filename))[0]
+    return os.path.join(_output_dir(), stem_folder(), name)
+
+
+def publish_stems(store, track_filename):
+    stem_dir = _stem_dir(track_filename)
+    if os.path.isdir(stem_dir):
+        for name in os.listdir(stem_dir):
+            store.put(f"{_stem_prefix(track_filename)}/{name}", os.path.join(stem_dir, name))
+
+
+def fetch_stems(store, track_filename):
+    """저장소에 있는 스템(부분 스템의 regions.json 포함)을 로컬로"""
+    prefix = _stem_prefix(track_filename)
+    keys = store.list(prefix)
+    if not keys:
+        return
+    if f"{prefix}/regions.json" not in keys:
+        # 전체 스템이면 남아 있을 수 있는 로컬 부분 스템 표시를 지움
+        stale = os.path.join(_stem_dir(track_filename), "regions.json")
+        if os.path.exists(stale):
+            os.remove(stale)
+    for key in keys:
+        store.get(key, os.path.join(_stem_dir(track_filename), key[len(prefix) + 1:]))
+
+
+def _analysis_files(track_filename):
+    from services.analysis_cache import _cache_path, _structure_path
+    path = _track_path(track_filename)
+    return [_cache_path(path), _structure_path(path)]
+
+
+def publish_analysis(store, track_filename):
+    for path in _analysis_files(track_filename):
+        if os.path.exists(path):
+            store.put(output_key(path), path)
+
+
+def fetch_analysis(store, track_filename):
+    for path in _analysis_files(track_filename):
+        store.get(output_key(path), path)
+
+
+def _result_files(result):
+    """render 결과가 가리키는 파일 + 믹스 캐시 정보(.json)"""
+    paths = []
+    for field in RESULT_FILE_FIELDS:
+        if result.get(field):
+            path = os.path.join(config.OUTPUT_DIR, result[field])
+            paths += [path, os.path.splitext(path)[0] + ".json"]
+    return list(dict.fromkeys(paths))
+
+
+# =================================================================
+# 🛠️ 워커 쪽 실행
+# =================================================================
+
+def run_task(kind, payload, store=None):
+    """작업 하나 실행 (worker.py). Returns: 결과 dict (JSON 직렬화 가능). 실패하면 예외"""
+    store = store or get_artifact_store()
+    if kind == "separate":
+        return _run_separate(store, payload)
+    if kind == "analyze":
+        return _run_analyze(store, payload)
+    if kind == "render":
+        return _run_render(store, payload)
+    raise ValueError(f"Unknown task kind: {kind} (choose from {TASK_KINDS})")
+
+
+def _run_separate(store, payload):
+    from services.stem_separation import separate_stems, get_stem_coverage
+
+    track, stems = payload["track"], payload.get("stems")
+    with config.overrides(payload.get("config") or {}):
+        fetch_track(store, track)
+        fetch_stems(store, track)
+        separate_stems(track, stems)
+        coverage = get_stem_coverage(track)
+        missing = [stem for stem in (stems or coverage) if coverage[stem] != "full"]
+        if missing:
+            raise RuntimeError(f"Stem separation failed: {', '.join(missing)} not produced")
+        publish_stems(store, track)
+    return {"track": track, "stems": [stem for stem, covered in coverage.items() if covered == "full"]}
+
+
+def _run_analyze(store, payload):
+    from services.analysis_cache import get_cached_beat_info, track_structure
+
+    track = payload["track"]
+    with config.overrides(payload.get("config") or {}):
+        path = fetch_track(store, track)
+        fetch_analysis(store, track)
+        bpm = get_cached_beat_info(path)["bpm"]
+        track_structure(path)
+        publish_analysis(store, track)
+    return {"track": track, "bpm": float(bpm)}
+
+
+def _run_render(store, payload):
+    from mix_engine import run_mix
+
+    tracks = [payload["trackA"], payload["trackB"]]
+    for track in tracks:
+        fetch_track(store, track)
+        fetch_stems(store, track)
+        fetch_analysis(store, track)
+    result = run_mix(payload["trackA"], payload["trackB"], payload.get("mixType", "auto"),
+                     payload.get("bridgeBars", 4), payload.get("bpmA"), payload.get("bpmB"), payload.get("profile"),
+                     payload.get("params"), payload.get("tier"), False, payload.get("output"))
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    for track in tracks:
+        publish_stems(store, track)
+        publish_analysis(store, track)
+    for path in _result_files(result):
+        if os.path.exists(path):
+            store.put(output_key(path), path)
+    return json.loads(json.dumps(result, default=float))
+
+
+# =================================================================
+# 📤 보내는 쪽 (config.DISTRIBUTED_TASKS에 있는 종류)
+# =================================================================
+
+def is_remote(kind):
+    return kind in config.DISTRIBUTED_TASKS
+
+
+def _submit_and_wait(kind, payload, key, on_progress=None):
+    queue = get_task_queue()
+    task_id = queue.submit(kind, payload, key=key)
+    task = queue.wait(task_id, timeout=config.TASK_WAIT_TIMEOUT_SEC, on_progress=on_progress,
+                      unclaimed_timeout=config.TASK_UNCLAIMED_TIMEOUT_SEC)
+    if task["status"] != "done":
+        raise RuntimeError(f"{kind} task failed on worker {task['worker'] or '-'}: {task['error']}")
+    return task["result"]
+
+
+def separate_remote(track_filename, stems=None):
+    """separate_stems()를 워커에서 (결과 JSON 출력 형식도 같음)"""
+    from services.stem_separation import get_stem_coverage, _find_input, stem_folder
+
+    input_path = _find_input(track_filename)
+    if input_path is None:
+        print(json.dumps({"error": f"File not found: {_track_path(track_filename)}"}))
+        return
+    track = os.path.basename(input_path)
+    store = get_artifact_store()
+    try:
+        fetch_stems(store, track)
+        wanted = stems or list(get_stem_coverage(track))
+        if not all(get_stem_coverage(track)[stem] == "full" for stem in wanted):
+            publish_track(store, track)
+            sys.stderr.write(f"Separating track on worker: {track} ({config.STEM_MODEL})\n")
+            _submit_and_wait("separate", {"track": track, "stems": stems, "config": _task_config("separate")},
+                             key=f"separate:{config.STEM_MODEL}:{config.STEM_SHIFTS}:{track}:{','.join(sorted(wanted))}",
+                             on_progress=lambda p, m: print(json.dumps({"progress": p, "message": m}), flush=True))
+            fetch_stems(store, track)
+        rel_folder = f"{stem_folder()}/{os.path.splitext(track)[0]}"
+        print(json.dumps({"message": "Separation complete", "progress": 100,
+                          "stems": {stem: f"{rel_folder}/{stem}.wav" for stem in wanted}}, ensure_ascii=False),
+              flush=True)
+    except Exception as e:
+        sys.stderr.write(f"Remote separation failed: {e}\n")
+        print(json.dumps({"error": str(e)}), flush=True)
+
+
+def analyze_remote(file_path):
+    """get_cached_beat_info()의 캐시 미스를 워커에서 (구조 분석 캐시도 함께 받음). Returns: load_beat_info 결과"""
+    from services.analysis_cache import load_beat_info
+
+    track = os.path.basename(file_path)
+    store = get_artifact_store()
+    fetch_analysis(store, track)
+    beat_info = load_beat_info(file_path)
+    if beat_info is None:
+        publish_track(store, track)
+        _submit_and_wait("analyze", {"track": track, "config": _task_config("analyze")},
+                         key=f"analyze:{config.BEAT_BACKEND}:{track}")
+        fetch_analysis(store, track)
+        beat_info = load_beat_info(file_path)
+        if beat_info is None:
+            raise RuntimeError(f"Worker analysis did not produce a usable cache: {track}")
+    return beat_info
+
+
+def render_remote(request_data, progress=None):
+    """mix_engine.py 요청을 워커에서 렌더링 (점진적 출력 없이). Returns: run_mix 결과"""
+    store = get_artifact_store()
+    try:
+        for track in (request_data["trackA"], request_data["trackB"]):
+            publish_track(store, track)
+        result = _submit_and_wait("render", dict(request_data, progressive=False), key=None, on_progress=progress)
+        for field in RESULT_FILE_FIELDS:
+            if result.get(field):
+                key = output_key(os.path.join(config.OUTPUT_DIR, result[field]))
+                store.get(key, output_path(key))
+        return result
+    except Exception as e:
+        return {"error": str(e)}
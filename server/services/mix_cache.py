@@ -0,0 +1,252 @@
+# server/services/mix_cache.py
+"""
+믹스 결과 캐시 (내용 주소 방식)
+
+키 = 두 트랙 파일 내용의 해시 + 전략 + 적용 BPM + 결과에 영향을 주는 config 값
+같은 요청은 렌더링 없이 저장된 WAV를 돌려주고,
+동시에 들어온 같은 요청은 락 파일로 하나만 렌더링하고 나머지는 그 결과를 기다립니다.
+(백엔드가 요청마다 mix_engine.py 프로세스를 따로 띄우므로 프로세스 간에도 동작해야 함)
+스템이 없어 전략이 원본 믹스로 대신한 결과는 캐시하지 않습니다. (스템이 생기면 결과가 달라지므로)
+그런 결과는 요청마다 고유한 파일에 두고, 디스크 예산으로 캐시 항목과 함께 오래된 것부터 지웁니다.
+
+    output/blends/cache/<key>.wav   결과 오디오 (매니페스트 출력이면 전환 구간만)
+    output/blends/cache/<key>.json  run_mix 결과 정보 (mixUrl, duration, bpmA ... / 매니페스트 출력이면 "manifest")
+    output/blends/cache/<key>.lock  렌더링 중 표시 (소유 프로세스 pid)
+    output/blends/cache/<key>.<id>.uncached.wav  캐시하지 않는 결과 오디오 (메타 없음)
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+
+import config
+from utils.hashing import file_digest
+
+# 전략별로 결과에 영향을 주는 파라미터 (pipeline.TUNABLE_PARAMS 중, 다른 전략 값은 키에서 제외)
+STRATEGY_PARAMS = {
+    "drop": ["DROP_TARGET_BPM_MULTIPLIER", "DROP_LOOP_BARS", "DROP_START_BPM_BOOST",
+             "DROP_TIGHTEN_RATIO", "DROP_VOCAL_SENSITIVITY", "BLEND_OVERLAP_FADE", "TRANSITION_SEARCH_ENABLED"],
+    "blend": ["BLEND_OVERLAP_FADE", "BLEND_MICRO_FADE", "BLEND_OVERLAP_BEATS", "TRANSITION_SEARCH_ENABLED"],
+}
+
+# 전략과 무관하게 결과를 바꾸는 config 값
+# (품질 티어가 바꾸는 값이 모두 포함되어야 티어별 결과가 섞이지 않음)
+KEY_CONFIG = ["TARGET_SR", "AUDIO_DTYPE", "BEAT_BACKEND", "TRIM_BEAT_BACKEND", "STRETCH_ENGINE",
+              "STEM_SEPARATION_MODE", "STEM_MODEL", "STEM_SHIFTS", "STEM_OVERLAP", "KEY_HPSS",
+              "ANALYSIS_PYRAMID_LEVELS", "STRUCTURE_ENABLED", "STRUCTURE_KERNEL_BEATS", "STRUCTURE_MIN_SECTION_BEATS",
+              "TRANSITION_SEARCH_TOP_K", "TRANSITION_SEARCH_WINDOW_BARS", "TRANSITION_SEARCH_PHRASE_BARS",
+              "TRANSITION_SEARCH_A_MIN_RATIO", "TRANSITION_SEARCH_B_MAX_RATIO", "TRANSITION_SEARCH_WEIGHTS"]
+
+
+def mix_cache_key(file_a, file_b, strategy, bpm_a, bpm_b, params, progressive=False, output="wav"):
+    """
+    Args:
+        strategy: "drop" | "blend"
+        params: pipeline.resolve_params() 결과 (TUNABLE_PARAMS 전체의 적용 값)
+        progressive: 점진적 출력 결과 여부 (정규화 방식이 달라 별도 항목, False면 기존 키와 같음)
+        output: "wav" | "manifest" (config.MIX_OUTPUT, "wav"면 기존 키와 같음)
+    """
+    payload = {
+        "version": config.MIX_CACHE_VERSION,
+        "a": file_digest(file_a),
+        "b": file_digest(file_b),
+        "strategy": strategy,
+        "bpm": [round(float(bpm_a), 6), round(float(bpm_b), 6)],
+        "params": {name: params[name] for name in STRATEGY_PARAMS[strategy]},
+        "config": {name: getattr(config, name) for name in KEY_CONFIG},
+    }
+    if progressive:
+        payload["progressive"] = True
+    if output != "wav":
+        payload["output"] = output
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _paths(key):
+    base = os.path.join(config.MIX_CACHE_DIR, key)
+    return base + ".wav", base + ".json", base + ".lock"
+
+
+def _url(path):
+    return os.path.relpath(path, config.OUTPUT_DIR).replace(os.sep, "/")
+
+
+def result_url(key):
+    """key의 결과 WAV 경로 (OUTPUT_DIR 기준, 렌더링이 끝나기 전에도 정해져 있음)"""
+    return _url(_paths(key)[0])
+
+
+def lookup(key):
+    """캐시된 run_mix 결과 (없으면 None). 조회한 항목은 최근 사용으로 표시"""
+    wav_path, meta_path, _ = _paths(key)
+    if not (os.path.exists(wav_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        os.utime(meta_path)
+        return result
+    except (OSError, ValueError):
+        return None
+
+
+def _lock_is_stale(lock_path):
+    try:
+        with open(lock_path, "r") as f:
+            pid = int(f.read().strip() or 0)
+        age = time.time() - os.path.getmtime(lock_path)
+    except (OSError, ValueError):
+        return False
+    if age > config.MIX_CACHE_LOCK_STALE_SEC:
+        return True
+    if os.name == "posix" and pid:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True  # 렌더링하던 프로세스가 죽음
+        except PermissionError:
+            pass
+    return False
+
+
+def _acquire(key):
+    """
+    락을 잡으면 None, 기다리는 동안 다른 프로세스가 결과를 만들었으면 그 결과를 반환
+    """
+    _, _, lock_path = _paths(key)
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            cached = lookup(key)
+            if cached is not None:
+                return cached
+            if _lock_is_stale(lock_path):
+                print(f"   ⚠️ Removing stale mix lock: {os.path.basename(lock_path)}")
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            time.sleep(config.MIX_CACHE_POLL_SEC)
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return None
+
+
+UNCACHED_SUFFIX = ".uncached.wav"
+
+
+def _uncached_path(key):
+    return os.path.join(config.MIX_CACHE_DIR, f"{key}.{uuid.uuid4().hex}{UNCACHED_SUFFIX}")
+
+
+def _evict():
+    """디스크 예산(config.MIX_CACHE_MAX_MB)을 넘으면 오래 안 쓴 결과부터 삭제 (캐시하지 않은 결과 포함)"""
+    if not config.MIX_CACHE_MAX_MB:
+        return
+    entries = []
+    total = 0
+    for name in os.listdir(config.MIX_CACHE_DIR):
+        if name.endswith(UNCACHED_SUFFIX):
+            path = os.path.join(config.MIX_CACHE_DIR, name)
+            try:
+                size = os.path.getsize(path)
+                entries.append((os.path.getmtime(path), size, [path]))
+            except FileNotFoundError:
+                continue
+            total += size
+            continue
+        if not name.endswith(".json"):
+            continue
+        key = name[:-5]
+        wav_path, meta_path, lock_path = _paths(key)
+        if not os.path.exists(wav_path) or os.path.exists(lock_path):
+            continue
+        size = os.path.getsize(wav_path)
+        entries.append((os.path.getmtime(meta_path), size, [wav_path, meta_path]))
+        total += size
+
+    budget = config.MIX_CACHE_MAX_MB * 1024 * 1024
+    for _, size, paths in sorted(entries):
+        if total <= budget:
+            break
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+
+
+def get_or_render(key, render):
+    """
+    캐시된 결과를 반환하거나, 락을 잡고 render(wav_path)로 새로 만듭니다.
+
+    Args:
+        render: 주어진 경로에 WAV를 쓰고 run_mix 결과 dict를 반환하는 함수 ("error"가 있으면 캐시하지 않음,
+                "cacheable": False면 WAV를 고유한 경로(<key>.<id>.uncached.wav)에 두고 메타를 쓰지 않아
+                다음 요청이 다시 렌더링)
+
+    Returns:
+        (result, cached)  result["mixUrl"]은 OUTPUT_DIR 기준 상대 경로
+                          (결과에 "manifest"가 있으면 mixUrl 대신 segmentUrl(전환 구간 WAV)과 manifestUrl)
+    """
+    cached = lookup(key)
+    if cached is not None:
+        return cached, True
+
+    os.makedirs(config.MIX_CACHE_DIR, exist_ok=True)
+    cached = _acquire(key)
+    if cached is not None:
+        return cached, True
+
+    wav_path, meta_path, lock_path = _paths(key)
+    try:
+        # 락을 잡기 직전에 다른 프로세스가 끝냈을 수 있음
+        cached = lookup(key)
+        if cached is not None:
+            return cached, True
+
+        tmp_wav = f"{wav_path[:-4]}.{os.getpid()}.tmp.wav"
+        result = render(tmp_wav)
+        if "error" in result:
+            return result, False
+        result = dict(result)
+        cacheable = result.pop("cacheable", True)
+
+        if not cacheable:
+            # 같은 키의 다음 렌더링이 이 결과(이전 작업의 mixUrl/segmentUrl)를 덮어쓰지 않도록 고유한 경로에
+            # 메타를 쓰지 않으므로 매니페스트는 결과 안의 "manifest"로만 전달
+            uncached_path = _uncached_path(key)
+            os.replace(tmp_wav, uncached_path)
+            if "manifest" in result:
+                segments = [dict(segment, url=_url(uncached_path)) if segment.get("url") == _url(wav_path)
+                            else segment for segment in result["manifest"]["segments"]]
+                result = dict(result, segmentUrl=_url(uncached_path),
+                              manifest=dict(result["manifest"], segments=segments))
+            else:
+                result = dict(result, mixUrl=_url(uncached_path))
+        else:
+            if "manifest" in result:
+                result = dict(result, segmentUrl=_url(wav_path), manifestUrl=_url(meta_path))
+            else:
+                result = dict(result, mixUrl=_url(wav_path))
+            tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({k: v for k, v in result.items() if k != "recomputed"}, f, default=float)
+            # WAV를 먼저 옮겨야 메타가 보이는 순간 오디오도 완성되어 있음
+            os.replace(tmp_wav, wav_path)
+            os.replace(tmp_meta, meta_path)
+    finally:
+        for path in (lock_path, f"{wav_path[:-4]}.{os.getpid()}.tmp.wav"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    _evict()
+    return result, False
@@ -0,0 +1,112 @@
+# server/services/prefetch.py
+"""
+업로드 직후 선행 처리 (믹스 요청 전에 무거운 단계를 미리 캐시에 채움)
+
+    1. 비트 분석   services/analysis_cache.get_cached_beat_info (output/analysis)
+    2. 구조 분석   services/analysis_cache.track_structure
+    3. 스템 분리   services/stem_separation.separate_stems, 4스템 전체 (output/<STEM_MODEL>_shifts<STEM_SHIFTS>, config.PREFETCH_STEMS)
+
+단계마다 캐시가 있으면 건너뛰므로 중간에 중단돼도 다시 실행하면 남은 단계만 합니다.
+스케줄링(한 번에 하나, 믹스 작업 중 일시정지, GPU 스템 분리는 VRAM을 잡고 있으므로 중단)은 백엔드가, 자원 예산 판단은 budget_allows()가 합니다.
+CLI: server/prefetch.py
+
+numpy/torch 스레드 수는 임포트 시점에 정해지므로 lower_priority()를 분석 모듈 임포트 전에 호출해야 합니다.
+"""
+
+import os
+
+import config
+
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMBA_NUM_THREADS"]
+
+
+def available_memory_mb():
+    """가용 메모리 (MB, 알 수 없으면 None)"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def cpu_load():
+    """1분 평균 부하 / 코어 수 (알 수 없으면 None)"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        pass
+    try:
+        import psutil
+        return psutil.cpu_percent(interval=None) / 100.0
+    except ImportError:
+        return None
+
+
+def budget_allows(running=False):
+    """
+    자원 예산 확인 (측정할 수 없는 항목은 통과)
+
+    Args:
+        running: 이미 실행 중인 선행 처리를 계속해도 되는지 (메모리 하한만 확인, 부하에는 자기 자신이 포함되므로)
+    Returns: (허용 여부, 거부 이유 또는 None)
+    """
+    memory = available_memory_mb()
+    floor = config.PREFETCH_RESERVE_MB if running else config.PREFETCH_MIN_FREE_MB
+    if memory is not None and memory < floor:
+        return False, f"available memory {memory:.0f}MB < {floor}MB"
+    if not running:
+        load = cpu_load()
+        if load is not None and load > config.PREFETCH_MAX_LOAD:
+            return False, f"cpu load {load:.2f} > {config.PREFETCH_MAX_LOAD}"
+    return True, None
+
+
+def lower_priority():
+    """이 프로세스를 낮은 우선순위 + 제한된 스레드 수로 (이후 실행하는 Demucs 프로세스도 상속)"""
+    threads = str(config.PREFETCH_THREADS)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = threads
+    try:
+        os.nice(config.PREFETCH_NICE)
+    except (AttributeError, OSError):
+        try:
+            import psutil
+            psutil.Process().nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        except (ImportError, AttributeError, OSError):
+            pass
+
+
+def prefetch_track(track_filename, progress=None):
+    """
+    트랙 하나의 분석 + 스템 분리 (이미 캐시된 단계는 건너뜀)
+    progress: (진행률, 메시지, **정보) - 스템 분리를 시작할 때 device="cuda"/"cpu"를 함께 알림
+    Returns: {"track", "bpm", "stems": 전체 스템이 준비됐는지}
+    """
+    from services.analysis_cache import get_cached_beat_info, track_structure
+    from services.stem_separation import separate_stems, get_stem_coverage, separation_device, _find_input
+
+    progress = progress or (lambda p, m, **info: None)
+    path = _find_input(track_filename)
+    if path is None:
+        raise FileNotFoundError(f"File not found: {os.path.join(config.TRACKS_DIR, track_filename)}")
+
+    progress(0, "비트 분석 중...")
+    bpm = get_cached_beat_info(path)["bpm"]
+    progress(15, "구조 분석 중...")
+    track_structure(path)
+
+    if config.PREFETCH_STEMS:
+        progress(25, "스템 분리 중...", device=separation_device())
+        separate_stems(os.path.basename(path))
+        if not all(covered == "full" for covered in get_stem_coverage(os.path.basename(path)).values()):
+            raise RuntimeError("Stem separation did not produce full stems")
+    progress(100, "선행 처리 완료")
+    return {"track": os.path.basename(path), "bpm": float(bpm), "stems": bool(config.PREFETCH_STEMS)}
@@ -9,52 +9,54 @@ import sys
 import os
 import subprocess
 import json
+import tempfile
 
-# 한글 깨짐 방지
-sys.stdout.reconfigure(encoding='utf-8')
-sys.stderr.reconfigure(encoding='utf-8')
+# 단독 실행 시에도 server/config.py를 찾을 수 있도록 상위 폴더 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
 
-def separate_stems(track_filename):
-    # ==========================================
-    # 🎛️ [설정] 고음질 모델 및 옵션 정의
-    # ==========================================
-    MODEL_NAME = "htdemucs_ft"  # 기본 htdemucs보다 정교함
-    SHIFTS = "2"                # 노이즈 제거를 위한 중복 분석 횟수
-    OVERLAP = "0.25"            # 구간 연결 부드러움 정도
+# ==========================================
+# 🎛️ [설정] 모델 및 옵션은 config.STEM_MODEL / STEM_SHIFTS / STEM_OVERLAP
+# (품질 티어가 요청마다 바꾸므로 호출 시점에 읽음)
+# ==========================================
+STEM_NAMES = ["vocals", "drums", "bass", "other"]
+REGIONS_MANIFEST = "regions.json"  # 이 파일이 있으면 구간만 분리된 부분 스템
 
-    # 1. 경로 설정
+
+def _output_dir():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    uploads_dir = os.path.join(base_dir, 'uploads', 'tracks')
-    output_dir = os.path.join(base_dir, 'output')
-    
-    os.environ["PATH"] += os.pathsep + os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, 'output')
+
+
+def stem_folder():
+    """
+    스템 폴더 이름 (output/<이름>/<트랙>/)
+    모델이 같아도 shifts가 다르면 분리 결과가 다르므로 폴더를 나눕니다. (draft / standard 티어 등)
+    """
+    return f"{config.STEM_MODEL}_shifts{config.STEM_SHIFTS}"
 
-    # 2. 입력 파일 찾기
-    input_path = os.path.join(uploads_dir, track_filename)
 
+def _find_input(track_filename):
+    """업로드 폴더에서 입력 파일 찾기 (확장자 생략 허용). 없으면 None"""
+    input_path = os.path.join(config.TRACKS_DIR, track_filename)
     if not os.path.exists(input_path):
         if os.path.exists(input_path + ".mp3"): input_path += ".mp3"
         elif os.path.exists(input_path + ".wav"): input_path += ".wav"
-        else:
-            print(json.dumps({"error": f"File not found: {input_path}"}))
-            return
+        else: return None
+    return input_path
 
-    # =================================================================
-    # 🔥 [수정됨] 모델 이름에 맞춰 폴더 경로 자동 변경
-    # =================================================================
-    track_name_only = os.path.splitext(os.path.basename(input_path))[0]
-    
-    # 모델 이름(htdemucs_ft)이 폴더명이 되므로 변수 사용 필수!
-    expected_result_path = os.path.join(output_dir, MODEL_NAME, track_name_only)
-    
-    req_files = ["vocals.wav", "drums.wav", "bass.wav", "other.wav"]
-    all_exist = all(os.path.exists(os.path.join(expected_result_path, f)) for f in req_files)
 
-    if all_exist:
-        print(f"   ⏩ Stems already exist in '{MODEL_NAME}/{track_name_only}'. Skipping.")
-        return
-    # =================================================================
+def separation_device():
+    """Demucs가 쓸 장치 ("cuda" / "cpu", 메시지 출력 없이)"""
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except Exception:
+        return "cpu"
 
+
+def _detect_device():
+    """GPU/CPU 자동 감지"""
     # =================================================================
     # 🔥 [수정됨] GPU/CPU 자동 감지
     # =================================================================
@@ -73,99 +75,165 @@ def separate_stems(track_filename):
         print(json.dumps({"progress": 0, "message": "Torch 모듈이 설치되지 않았습니다. CPU로 실행합니다."}), flush=True)
     except Exception as e:
         print(json.dumps({"progress": 0, "message": f"Torch 확인 중 오류 발생: {e}. CPU 안전모드로 실행합니다."}), flush=True)
+    return device
+
+
+def _run_demucs(cmd):
+    """Demucs 실행 + stderr 진행바를 진행률 JSON으로 변환 (실패 시 CalledProcessError)"""
+    print(json.dumps({"progress": 0, "message": "모델 로딩 및 초기화 중..."}), flush=True)
+    
+    # 4. 실행 (Popen으로 변경하여 실시간 로그 캡처)
+    # stderr를 파이프로 연결하여 진행률 파싱
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace' # 인코딩 에러 방지
+    )
+
+    # 실시간 로그 모니터링 (Char-by-Char to catch \r)
+    buffer = ""
+    full_log = "" # 전체 로그 저장용
+    
+    while True:
+        # 한 글자씩 읽기 (블로킹 방지 및 \r 캐치)
+        char = process.stderr.read(1)
+        
+        if not char and process.poll() is not None:
+            break
+            
+        if char:
+            buffer += char
+            full_log += char
+            # \r(진행바 업데이트) 또는 \n(줄바꿈)을 만나면 버퍼 분석
+            if char in ['\r', '\n']:
+                # 진행률 파싱 로직
+                if "%" in buffer:
+                    try:
+                        import re
+                        # " 13%" 형태 찾기
+                        match = re.search(r"(\d+)%", buffer)
+                        if match:
+                            progress = int(match.group(1))
+                            # 메시지와 함께 JSON 출력
+                            msg = "스템 분리 진행 중..."
+                            if progress >= 90: msg = "마무리 및 저장 중..."
+                            
+                            result_json = json.dumps({"progress": progress, "message": msg})
+                            print(result_json, flush=True)
+                    except:
+                        pass
+                
+                # 버퍼 초기화 (다음 라인/업데이트 대기)
+                buffer = ""
+        elif not char:
+            # EOF 도달 시 루프 종료
+             break 
+    
+    # 프로세스 종료 대기 (returncode 확보)
+    ret_code = process.wait()
+
+    # 종료 코드 확인
+    if ret_code != 0:
+         # 에러 메시지 읽기 (이미 다 읽었을 수 있으므로 full_log 사용)
+         # 남은게 있다면 읽기
+         sidebar = process.stderr.read()
+         if sidebar: full_log += sidebar
+         
+         # 만약 ret_code가 여전히 None이면 (이론상 불가능하지만) 방어 코드
+         safe_ret = ret_code if ret_code is not None else -1
+         
+         # 상세 에러 JSON 출력
+         error_response = {
+             "error": f"Demucs exited with code {safe_ret}",
+             "details": full_log[-1000:] # 너무 길면 뒤 1000자만
+         }
+         print(json.dumps(error_response), flush=True)
+         
+         # 예외 던지기 (상위 catch에서 잡힘)
+         raise subprocess.CalledProcessError(safe_ret, cmd, full_log)
+
+
+def separate_stems(track_filename, stems=None):
+    """
+    트랙 전체 스템 분리 (이미 있으면 건너뜀)
+    separate_regions()로 만든 부분 스템이 있으면 전체 스템으로 업그레이드합니다.
+
+    Args:
+        stems: 필요한 스템 (None이면 4개 전부). 하나만 필요하면 Demucs 2스템 모드로
+               그 스템과 나머지 합(no_<stem>.wav)만 저장합니다.
+    """
+    if "separate" in config.DISTRIBUTED_TASKS:
+        # 워커 노드에서 분리하고 결과만 받아옴 (worker.py)
+        from services.distributed import separate_remote
+        return separate_remote(track_filename, stems)
+
+    stems = list(stems or STEM_NAMES)
+
+    # 1. 경로 설정
+    output_dir = _output_dir()
+    
+    os.environ["PATH"] += os.pathsep + os.path.dirname(os.path.abspath(__file__))
+
+    # 2. 입력 파일 찾기
+    input_path = _find_input(track_filename)
+    if input_path is None:
+        print(json.dumps({"error": f"File not found: {os.path.join(config.TRACKS_DIR, track_filename)}"}))
+        return
+
+    # =================================================================
+    # 🔥 [수정됨] 모델 이름에 맞춰 폴더 경로 자동 변경
+    # =================================================================
+    track_name_only = os.path.splitext(os.path.basename(input_path))[0]
+    
+    # 폴더명은 모델 + shifts (stem_folder), Demucs는 <out>/<모델>/<트랙>에 쓰므로 임시 폴더에서 옮김
+    expected_result_path = _stem_dir(input_path)
+    
+    coverage = get_stem_coverage(track_filename)
+    if all(coverage[stem] == "full" for stem in stems):
+        print(f"   ⏩ Stems already exist in '{stem_folder()}/{track_name_only}'. Skipping.")
+        return
+    partial = [stem for stem in stems if coverage[stem] != "full" and coverage[stem]]
+    if partial:
+        sys.stderr.write(f"Upgrading partial stems to full: {track_name_only} ({', '.join(partial)})\n")
+
+    two_stem = stems[0] if len(stems) == 1 else None
+    produced = [two_stem] if two_stem else STEM_NAMES
+    # =================================================================
 
     cmd = [
         sys.executable, "-m", "demucs",
-        "-n", MODEL_NAME,     # htdemucs_ft
-        "--shifts", SHIFTS,   # 2 (퀄리티 상승)
-        "--overlap", OVERLAP, # 0.25
-        "-d", device,         # 자동 감지된 장치
-        "--out", output_dir,
-        input_path
+        "-n", config.STEM_MODEL,               # htdemucs_ft
+        "--shifts", str(config.STEM_SHIFTS),   # 2 (퀄리티 상승)
+        "--overlap", str(config.STEM_OVERLAP), # 0.25
+        "-d", _detect_device(),  # 자동 감지된 장치
     ]
+    if two_stem:
+        cmd += ["--two-stems", two_stem]
 
     try:
-        sys.stderr.write(f"Separating track: {os.path.basename(input_path)} (High Quality)...\n")
-        print(json.dumps({"progress": 0, "message": "모델 로딩 및 초기화 중..."}), flush=True)
-        
-        # 4. 실행 (Popen으로 변경하여 실시간 로그 캡처)
-        # stderr를 파이프로 연결하여 진행률 파싱
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            errors='replace' # 인코딩 에러 방지
-        )
-
-        # 실시간 로그 모니터링 (Char-by-Char to catch \r)
-        buffer = ""
-        full_log = "" # 전체 로그 저장용
-        
-        while True:
-            # 한 글자씩 읽기 (블로킹 방지 및 \r 캐치)
-            char = process.stderr.read(1)
-            
-            if not char and process.poll() is not None:
-                break
-                
-            if char:
-                buffer += char
-                full_log += char
-                # \r(진행바 업데이트) 또는 \n(줄바꿈)을 만나면 버퍼 분석
-                if char in ['\r', '\n']:
-                    # 진행률 파싱 로직
-                    if "%" in buffer:
-                        try:
-                            import re
-                            # " 13%" 형태 찾기
-                            match = re.search(r"(\d+)%", buffer)
-                            if match:
-                                progress = int(match.group(1))
-                                # 메시지와 함께 JSON 출력
-                                msg = "스템 분리 진행 중..."
-                                if progress >= 90: msg = "마무리 및 저장 중..."
-                                
-                                result_json = json.dumps({"progress": progress, "message": msg})
-                                print(result_json, flush=True)
-                        except:
-                            pass
-                    
-                    # 버퍼 초기화 (다음 라인/업데이트 대기)
-                    buffer = ""
-            elif not char:
-                # EOF 도달 시 루프 종료
-                 break 
-        
-        # 프로세스 종료 대기 (returncode 확보)
-        ret_code = process.wait()
-
-        # 종료 코드 확인
-        if ret_code != 0:
-             # 에러 메시지 읽기 (이미 다 읽었을 수 있으므로 full_log 사용)
-             # 남은게 있다면 읽기
-             sidebar = process.stderr.read()
-             if sidebar: full_log += sidebar
-             
-             # 만약 ret_code가 여전히 None이면 (이론상 불가능하지만) 방어 코드
-             safe_ret = ret_code if ret_code is not None else -1
-             
-             # 상세 에러 JSON 출력
-             error_response = {
-                 "error": f"Demucs exited with code {safe_ret}",
-                 "details": full_log[-1000:] # 너무 길면 뒤 1000자만
-             }
-             print(json.dumps(error_response), flush=True)
-             
-             # 예외 던지기 (상위 catch에서 잡힘)
-             raise subprocess.CalledProcessError(safe_ret, cmd, full_log)
+        sys.stderr.write(f"Separating track: {os.path.basename(input_path)} ({config.STEM_MODEL}, shifts {config.STEM_SHIFTS}"
+                         f"{', two-stem ' + two_stem if two_stem else ''})...\n")
+        os.makedirs(output_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=output_dir, prefix=".demucs_") as tmp_dir:
+            _run_demucs(cmd + ["--out", tmp_dir, input_path])
+            demucs_result_path = os.path.join(tmp_dir, config.STEM_MODEL, track_name_only)
+            if os.path.isdir(demucs_result_path):
+                os.makedirs(expected_result_path, exist_ok=True)
+                for name in os.listdir(demucs_result_path):
+                    os.replace(os.path.join(demucs_result_path, name), os.path.join(expected_result_path, name))
         
         # 5. 결과 확인
         if os.path.exists(expected_result_path):
+            for stem in produced:
+                coverage[stem] = "full"
+            _save_coverage(expected_result_path, coverage)
+
             # 상대 경로 계산 (output 폴더 기준)
-            # expected_result_path: /app/output/htdemucs_ft/filename
-            # rel_path needed: htdemucs_ft/filename/drums.wav
+            # expected_result_path: /app/output/htdemucs_ft_shifts2/filename
+            # rel_path needed: htdemucs_ft_shifts2/filename/drums.wav
             
             rel_folder = os.path.relpath(expected_result_path, output_dir)
             # Windows path separators to forward slashes for URLs
@@ -174,12 +242,7 @@ def separate_stems(track_filename):
             result = {
                 "message": "Separation complete",
                 "progress": 100,
-                "stems": {
-                    "drums": f"{rel_folder}/drums.wav",
-                    "bass": f"{rel_folder}/bass.wav",
-                    "vocals": f"{rel_folder}/vocals.wav",
-                    "other": f"{rel_folder}/other.wav",
-                }
+                "stems": {stem: f"{rel_folder}/{stem}.wav" for stem in produced}
             }
             print(json.dumps(result, ensure_ascii=False), flush=True)
         else:
@@ -193,7 +256,297 @@ def separate_stems(track_filename):
         sys.stderr.write(f"Unexpected Error: {e}\n")
         print(json.dumps({"error": str(e)}), flush=True)
 
+# =================================================================
+# ✂️ 구간 분리 (config.STEM_SEPARATION_MODE = "region")
+# 전략이 읽는 전환 주변 구간만 Demucs로 분리합니다.
+# 부분 스템은 전체 길이 WAV(분리 안 한 곳은 무음) + regions.json(스템별 분리된 구간)으로 저장하므로
+# load_and_merge_stems 등 기존 로더가 그대로 동작하고, separate_stems()로 전체 스템 업그레이드가 가능합니다.
+# =================================================================
+STEM_SR = 44100  # Demucs 출력 샘플레이트
+
+
+def _stem_dir(input_path):
+    return os.path.join(_output_dir(), stem_folder(), os.path.splitext(os.path.basename(input_path))[0])
+
+
+def _load_manifest(stem_dir):
+    path = os.path.join(stem_dir, REGIONS_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_coverage(stem_dir, coverage, duration=None):
+    """부분 스템의 구간을 regions.json에 기록 (모두 전체 스템이 되면 삭제)"""
+    path = os.path.join(stem_dir, REGIONS_MANIFEST)
+    regions = {stem: covered for stem, covered in coverage.items()
+               if covered != "full" and os.path.exists(os.path.join(stem_dir, f"{stem}.wav"))}
+    if not regions:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    if duration is None:
+        duration = (_load_manifest(stem_dir) or {}).get("duration")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"model": config.STEM_MODEL, "shifts": config.STEM_SHIFTS, "duration": duration, "regions": regions}, f)
+    os.replace(path + ".tmp", path)
+
+
+def _merge_regions(regions):
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _subtract_regions(regions, covered):
+    """regions 중 아직 분리되지 않은 구간"""
+    gaps = []
+    for start, end in regions:
+        cursor = start
+        for c_start, c_end in covered:
+            if c_end <= cursor or c_start >= end:
+                continue
+            if c_start > cursor:
+                gaps.append([cursor, c_start])
+            cursor = max(cursor, c_end)
+        if cursor < end:
+            gaps.append([cursor, end])
+    return [gap for gap in gaps if gap[1] - gap[0] > 0.05]
+
+
+def _create_silent_stems(stem_dir, duration, stems):
+    import numpy as np
+    import soundfile as sf
+
+    os.makedirs(stem_dir, exist_ok=True)
+    frames = int(np.ceil(duration * STEM_SR))
+    block = np.zeros((1 << 18, 2), dtype=np.int16)
+    for stem in stems:
+        with sf.SoundFile(os.path.join(stem_dir, f"{stem}.wav"), "w", STEM_SR, 2, subtype="PCM_16") as f:
+            for pos in range(0, frames, len(block)):
+                f.write(block[:min(len(block), frames - pos)])
+
+
+def get_stem_coverage(track_filename):
+    """
+    스템별 분리 범위
+    Returns: {stem: "full" (전체 스템) | [[시작초, 끝초], ...] (부분 스템) | [] (없음)}
+    """
+    input_path = _find_input(track_filename)
+    if input_path is None:
+        return {stem: [] for stem in STEM_NAMES}
+    stem_dir = _stem_dir(input_path)
+    regions = (_load_manifest(stem_dir) or {}).get("regions", {})
+    coverage = {}
+    for stem in STEM_NAMES:
+        if stem in regions:
+            coverage[stem] = regions[stem]
+        elif os.path.exists(os.path.join(stem_dir, f"{stem}.wav")):
+            coverage[stem] = "full"
+        else:
+            coverage[stem] = []
+    return coverage
+
+
+def separate_regions(track_filename, regions, stems=None):
+    """
+    지정한 구간(초)만 분리해서 부분 스템에 채웁니다. 이미 분리된 구간/스템은 건너뜁니다.
+
+    Args:
+        regions: [(시작초, 끝초 또는 None=곡 끝), ...]
+        stems: 필요한 스템 (None이면 4개 전부, 하나면 2스템 모드)
+    """
+    import librosa
+    import soundfile as sf
+
+    input_path = _find_input(track_filename)
+    if input_path is None:
+        print(json.dumps({"error": f"File not found: {os.path.join(config.TRACKS_DIR, track_filename)}"}))
+        return
+
+    stem_dir = _stem_dir(input_path)
+    coverage = get_stem_coverage(track_filename)
+    pending = [stem for stem in (stems or STEM_NAMES) if coverage[stem] != "full"]
+    if not pending:
+        print(f"   ⏩ Stems already exist in '{stem_folder()}/{os.path.basename(stem_dir)}'. Skipping.")
+        return
+
+    duration = float(librosa.get_duration(path=input_path))
+    wanted = _merge_regions([[max(0.0, start), min(duration, end if end is not None else duration)]
+                             for start, end in regions])
+    todo = _merge_regions([gap for stem in pending for gap in _subtract_regions(wanted, coverage[stem])])
+    if not todo:
+        print(f"   ⏩ Stem regions already separated: {os.path.basename(stem_dir)}")
+        return
+    partial_stems = (_load_manifest(stem_dir) or {}).get("regions", {})
+    missing = [stem for stem in pending if stem not in partial_stems]
+    if missing:
+        _create_silent_stems(stem_dir, duration, missing)
+        _save_coverage(stem_dir, coverage, duration)
+
+    two_stem = pending[0] if len(pending) == 1 else None
+    total = sum(end - start for start, end in todo)
+    sys.stderr.write(f"Separating {len(todo)} region(s) of {os.path.basename(input_path)}: "
+                     f"{total:.1f}s / {duration:.1f}s ({', '.join(pending)})\n")
+    device = _detect_device()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, (start, end) in enumerate(todo):
+            # 경계 잡음을 피하려고 여유를 붙여 분리하고 안쪽만 기록
+            clip_start = max(0.0, start - config.REGION_PAD_SEC)
+            clip_end = min(duration, end + config.REGION_PAD_SEC)
+            y, _ = librosa.load(input_path, sr=STEM_SR, mono=False,
+                                offset=clip_start, duration=clip_end - clip_start)
+            clip_name = f"region_{i}"
+            sf.write(os.path.join(tmp_dir, f"{clip_name}.wav"), y.T if y.ndim > 1 else y, STEM_SR)
+
+            cmd = [
+                sys.executable, "-m", "demucs",
+                "-n", config.STEM_MODEL,
+                "--shifts", str(config.STEM_SHIFTS),
+                "--overlap", str(config.STEM_OVERLAP),
+                "-d", device,
+                "--out", tmp_dir,
+            ]
+            if two_stem:
+                cmd += ["--two-stems", two_stem]
+            _run_demucs(cmd + [os.path.join(tmp_dir, f"{clip_name}.wav")])
+
+            skip = int(round((start - clip_start) * STEM_SR))
+            write_at = int(round(start * STEM_SR))
+            length = int(round((end - start) * STEM_SR))
+            for stem in pending:
+                part, _ = sf.read(os.path.join(tmp_dir, config.STEM_MODEL, clip_name, f"{stem}.wav"),
+                                  dtype="float32", always_2d=True)
+                with sf.SoundFile(os.path.join(stem_dir, f"{stem}.wav"), "r+") as f:
+                    part = part[skip:skip + min(length, f.frames - write_at)]
+                    f.seek(write_at)
+                    f.write(part)
+                coverage[stem] = _merge_regions(coverage[stem] + [[start, end]])
+
+            # 구간마다 기록해두면 중간에 실패해도 끝난 구간은 재사용
+            _save_coverage(stem_dir, coverage, duration)
+
+
+def _region_has_vocals(track_filename, start, end):
+    import numpy as np
+    import soundfile as sf
+
+    stem_path = os.path.join(_stem_dir(_find_input(track_filename)), "vocals.wav")
+    with sf.SoundFile(stem_path) as f:
+        f.seek(int(start * f.samplerate))
+        frames = (int(end * f.samplerate) if end is not None else f.frames) - f.tell()
+        y = f.read(max(0, frames), dtype="float32", always_2d=True).mean(axis=1)
+    hop = 2048
+    if len(y) < hop:
+        return False
+    rms = np.sqrt(np.mean(y[:len(y) // hop * hop].reshape(-1, hop) ** 2, axis=1))
+    return bool(rms.max() > config.REGION_VOCAL_RMS)
+
+
+def locate_vocal_end_coarse(track_filename):
+    """
+    가벼운 모델(config.REGION_COARSE_MODEL, shifts 0, 보컬 2스템)로 트랙 전체를 빠르게 분리해
+    마지막 보컬 위치(초)를 찾습니다. 결과 스템은 저장하지 않습니다. (보컬이 없으면 None)
+    """
+    import librosa
+    from services.analyzer_vocal import find_vocal_end_point, MIN_SR
+
+    input_path = _find_input(track_filename)
+    if input_path is None:
+        return None
+    sys.stderr.write(f"Coarse vocal scan: {os.path.basename(input_path)} ({config.REGION_COARSE_MODEL})\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _run_demucs([
+            sys.executable, "-m", "demucs",
+            "-n", config.REGION_COARSE_MODEL,
+            "--two-stems", "vocals",
+            "--shifts", "0",
+            "-d", _detect_device(),
+            "--out", tmp_dir,
+            input_path
+        ])
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        sr = MIN_SR
+        y_vocals, _ = librosa.load(os.path.join(tmp_dir, config.REGION_COARSE_MODEL, name, "vocals.wav"), sr=sr)
+    end_sample = find_vocal_end_point(y_vocals, sr)
+    return end_sample / sr if end_sample else None
+
+
+def separate_transition_regions(track_a_filename, track_b_filename, regions, stems):
+    """
+    전환 하나에 필요한 구간/스템만 분리
+
+    Args:
+        regions: pipeline.MixPipeline.stem_regions() 결과 {"a": [...], "b": [...]}
+        stems: 전략의 REQUIRED_STEMS {"a": [...], "b": [...]}
+
+    Track A 구간에 보컬이 없으면 대략 분리로 마지막 보컬 위치를 찾아 그 주변을 추가로 분리합니다.
+    """
+    try:
+        if stems["a"]:
+            separate_regions(track_a_filename, regions["a"], stems["a"])
+            if "vocals" in stems["a"] and get_stem_coverage(track_a_filename)["vocals"] != "full":
+                start, end = regions["a"][0]
+                if not _region_has_vocals(track_a_filename, start, end):
+                    vocal_end = locate_vocal_end_coarse(track_a_filename)
+                    if vocal_end is not None:
+                        lookback = config.REGION_A_LOOKBACK_SEC
+                        separate_regions(track_a_filename, [(vocal_end - lookback, vocal_end + lookback)],
+                                         stems["a"])
+        if stems["b"] and regions["b"]:
+            separate_regions(track_b_filename, regions["b"], stems["b"])
+
+    except subprocess.CalledProcessError as e:
+        sys.stderr.write(f"Demucs Failed: {e}\n")
+        print(json.dumps({"error": str(e)}), flush=True)
+    except Exception as e:
+        sys.stderr.write(f"Unexpected Error: {e}\n")
+        print(json.dumps({"error": str(e)}), flush=True)
+
+
+def stems_cached(track_filename, stems, regions=None):
+    """
+    Demucs 없이 바로 쓸 수 있는지 (separate_stems / separate_regions가 건너뛸 상태인지)
+    regions가 None이면 전체 스템, 있으면 그 구간(끝 None = 곡 끝)만 분리되어 있으면 됩니다.
+    """
+    if not stems:
+        return True
+    coverage = get_stem_coverage(track_filename)
+    pending = [stem for stem in stems if coverage[stem] != "full"]
+    if not pending or regions is None:
+        return not pending
+    if any(not coverage[stem] for stem in pending):
+        return False
+    duration = _load_manifest(_stem_dir(_find_input(track_filename)))["duration"]
+    wanted = _merge_regions([[max(0.0, start), min(duration, end if end is not None else duration)]
+                             for start, end in regions])
+    return not any(_subtract_regions(wanted, coverage[stem]) for stem in pending)
+
+
+def transition_regions_cached(track_a_filename, track_b_filename, regions, stems):
+    """separate_transition_regions()가 Demucs를 실행하지 않고 끝나는지 (같은 판단 순서)"""
+    if stems["a"]:
+        if not stems_cached(track_a_filename, stems["a"], regions["a"]):
+            return False
+        if "vocals" in stems["a"] and get_stem_coverage(track_a_filename)["vocals"] != "full":
+            start, end = regions["a"][0]
+            if not _region_has_vocals(track_a_filename, start, end):
+                return False  # 대략 분리로 보컬 위치를 다시 찾아야 함
+    if stems["b"] and regions["b"]:
+        return stems_cached(track_b_filename, stems["b"], regions["b"])
+    return True
+
+
 if __name__ == '__main__':
+    # 한글 깨짐 방지 (CLI로 실행할 때만, 모듈을 임포트한 프로세스의 stdout은 건드리지 않음)
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
     if len(sys.argv) < 2:
         print(json.dumps({"error": "No trackId provided"}))
         sys.exit(1)
@@ -0,0 +1,214 @@
+# server/services/task_queue.py
+"""
+작업 큐 (스템 분리/분석/렌더링을 워커 노드에 나눠 실행, worker.py)
+
+프로토콜:
+    submit(kind, payload, key)   작업 등록 (같은 key의 대기/실행 중 작업이 있으면 그 id를 반환)
+    lease(kinds, worker)         가장 오래된 대기 작업을 lease_sec 동안 점유 -> {"id", "lease", "kind", "payload", ...}
+    heartbeat(id, lease, ...)    점유 연장 (+ 진행률). 점유를 잃었으면 False
+    complete / fail(id, lease)   결과 기록. 점유를 잃었으면 False (다른 워커가 다시 가져간 작업, 결과는 버림)
+
+워커가 죽어서 하트비트가 끊긴 작업은 다음 lease() 호출이 대기열로 되돌리고(attempts 증가),
+max_attempts번 시도해도 끝나지 않으면 failed로 남깁니다. fail(retry=True)도 같은 횟수 제한으로 다시 대기시킵니다.
+점유마다 새 lease 토큰을 발급하므로 되돌려진 뒤 늦게 끝난 이전 워커의 결과는 기록되지 않습니다.
+
+백엔드는 config.TASK_QUEUE_URL의 스킴으로 고릅니다 (QUEUE_BACKENDS에 등록).
+    sqlite:///상대/경로.db, sqlite:////절대/경로.db   SQLiteTaskQueue (개발/테스트, 한 호스트 또는 로컬 볼륨 공유)
+여러 호스트가 네트워크 파일시스템 위의 SQLite를 함께 쓰면 잠금이 안전하지 않으므로
+노드를 여러 대로 늘릴 때는 같은 인터페이스의 서버형 백엔드(Redis 등)를 등록해서 씁니다.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+
+import config
+
+
+class TaskQueue:
+    """큐 백엔드 인터페이스 (작업은 dict: id, kind, key, payload, status, attempts, progress, message, result, error)"""
+
+    def submit(self, kind, payload, key=None, max_attempts=None):
+        raise NotImplementedError
+
+    def lease(self, kinds, worker, lease_sec=None):
+        raise NotImplementedError
+
+    def heartbeat(self, task_id, lease, lease_sec=None, progress=None, message=None):
+        raise NotImplementedError
+
+    def complete(self, task_id, lease, result):
+        raise NotImplementedError
+
+    def fail(self, task_id, lease, error, retry=False):
+        raise NotImplementedError
+
+    def get(self, task_id):
+        raise NotImplementedError
+
+    def wait(self, task_id, timeout=None, on_progress=None, unclaimed_timeout=None):
+        """
+        작업이 끝날 때까지 폴링 (config.TASK_POLL_SEC 간격)
+        Returns: 끝난 작업 dict (status "done" | "failed").
+                 timeout이 지나거나 unclaimed_timeout 동안 한 번도 점유되지 않으면 (워커 없음) TimeoutError
+        """
+        started = time.time()
+        deadline = started + timeout if timeout else None
+        last = None
+        while True:
+            task = self.get(task_id)
+            if task is None:
+                raise KeyError(f"Task not found: {task_id}")
+            if task["status"] in ("done", "failed"):
+                return task
+            if on_progress is not None and task["progress"] is not None and \
+                    (task["progress"], task["message"]) != last:
+                last = (task["progress"], task["message"])
+                on_progress(task["progress"], task["message"] or "")
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError(f"Task {task_id} ({task['kind']}) did not finish in {timeout}s")
+            if unclaimed_timeout and task["status"] == "queued" and not task["attempts"] and \
+                    time.time() - started > unclaimed_timeout:
+                raise TimeoutError(f"Task {task_id} ({task['kind']}) was not picked up by any worker "
+                                   f"in {unclaimed_timeout}s")
+            time.sleep(config.TASK_POLL_SEC)
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """SQLite 파일 하나 (WAL, 연산마다 짧은 트랜잭션이라 여러 프로세스가 같은 파일을 써도 됨)"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")  # 트랜잭션 밖에서만 바꿀 수 있음 (파일에 유지됨)
+        finally:
+            db.close()
+        with self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY, kind TEXT NOT NULL, key TEXT, payload TEXT NOT NULL,
+                    status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL,
+                    worker TEXT, lease TEXT, lease_until REAL, progress REAL, message TEXT,
+                    result TEXT, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (status, kind, created)")
+            db.execute("CREATE INDEX IF NOT EXISTS tasks_key ON tasks (key, status)")
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _Transaction(db)
+
+    def _row(self, row):
+        if row is None:
+            return None
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        task["result"] = json.loads(task["result"]) if task["result"] is not None else None
+        return task
+
+    def submit(self, kind, payload, key=None, max_attempts=None):
+        now = time.time()
+        with self._connect() as db:
+            if key is not None:
+                row = db.execute("SELECT id FROM tasks WHERE key = ? AND status IN ('queued', 'leased')",
+                                 (key,)).fetchone()
+                if row is not None:
+                    return row["id"]
+            task_id = uuid.uuid4().hex
+            db.execute("INSERT INTO tasks (id, kind, key, payload, status, max_attempts, created, updated) "
+                       "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                       (task_id, kind, key, json.dumps(payload), max_attempts or config.TASK_MAX_ATTEMPTS, now, now))
+        return task_id
+
+    def _reclaim(self, db, now):
+        """점유 시간이 지난 작업 (워커 중단/네트워크 단절) -> 대기열 또는 실패"""
+        db.execute("UPDATE tasks SET status = 'failed', error = 'lease expired after ' || attempts || ' attempt(s)', "
+                   "lease = NULL, updated = ? WHERE status = 'leased' AND lease_until < ? AND attempts >= max_attempts",
+                   (now, now))
+        db.execute("UPDATE tasks SET status = 'queued', lease = NULL, worker = NULL, updated = ? "
+                   "WHERE status = 'leased' AND lease_until < ?", (now, now))
+
+    def lease(self, kinds, worker, lease_sec=None):
+        now = time.time()
+        kinds = list(kinds)
+        with self._connect() as db:
+            self._reclaim(db, now)
+            row = db.execute(f"SELECT id FROM tasks WHERE status = 'queued' AND kind IN ({','.join('?' * len(kinds))}) "
+                             "ORDER BY created LIMIT 1", kinds).fetchone()
+            if row is None:
+                return None
+            lease = uuid.uuid4().hex
+            db.execute("UPDATE tasks SET status = 'leased', attempts = attempts + 1, worker = ?, lease = ?, "
+                       "lease_until = ?, progress = NULL, message = NULL, updated = ? WHERE id = ?",
+                       (worker, lease, now + (lease_sec or config.TASK_LEASE_SEC), now, row["id"]))
+            return self._row(db.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone())
+
+    def heartbeat(self, task_id, lease, lease_sec=None, progress=None, message=None):
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute("UPDATE tasks SET lease_until = ?, progress = COALESCE(?, progress), "
+                                "message = COALESCE(?, message), updated = ? "
+                                "WHERE id = ? AND lease = ? AND status = 'leased'",
+                                (now + (lease_sec or config.TASK_LEASE_SEC), progress, message, now, task_id, lease))
+            return cursor.rowcount == 1
+
+    def complete(self, task_id, lease, result):
+        with self._connect() as db:
+            cursor = db.execute("UPDATE tasks SET status = 'done', result = ?, lease = NULL, progress = 100, "
+                                "updated = ? WHERE id = ? AND lease = ? AND status = 'leased'",
+                                (json.dumps(result), time.time(), task_id, lease))
+            return cursor.rowcount == 1
+
+    def fail(self, task_id, lease, error, retry=False):
+        with self._connect() as db:
+            status = "CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END" if retry else "'failed'"
+            cursor = db.execute(f"UPDATE tasks SET status = {status}, error = ?, lease = NULL, worker = NULL, "
+                                "updated = ? WHERE id = ? AND lease = ? AND status = 'leased'",
+                                (str(error), time.time(), task_id, lease))
+            return cursor.rowcount == 1
+
+    def get(self, task_id):
+        with self._connect() as db:
+            return self._row(db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone())
+
+
+class _Transaction:
+    """with 블록 = BEGIN IMMEDIATE 트랜잭션 하나 (lease의 조회 + 갱신이 다른 워커와 겹치지 않게)"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.close()
+
+
+def _sqlite_queue(location):
+    # sqlite:///상대경로, sqlite:////절대경로 (SQLAlchemy와 같은 규칙)
+    return SQLiteTaskQueue(location[1:] if location.startswith("/") else location)
+
+
+# 스킴 -> 생성 함수 (위치 문자열을 받음)
+QUEUE_BACKENDS = {"sqlite": _sqlite_queue}
+
+
+def get_task_queue(url=None):
+    """config.TASK_QUEUE_URL (또는 url)의 큐"""
+    url = url or config.TASK_QUEUE_URL
+    scheme, sep, location = url.partition("://")
+    if not sep:
+        scheme, location = "sqlite", "/" + url
+    if scheme not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown task queue backend: {scheme} (choose from {sorted(QUEUE_BACKENDS)})")
+    return QUEUE_BACKENDS[scheme](location)
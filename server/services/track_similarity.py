@@ -0,0 +1,86 @@
+# server/services/track_similarity.py
+"""
+"비슷한 느낌" 다음 곡 추천 (음색 임베딩 최근접 이웃)
+
+업로드 분석(audio_analysis.py, 백엔드 /api/transition/analyze)이 끝날 때마다 트랙 임베딩
+(services/analyzer_timbre.py)을 디스크 벡터 인덱스(utils/vector_index.py)에 추가하므로
+인덱스는 업로드와 함께 증분으로 커집니다. id는 mix_engine과 같은 트랙 파일명입니다.
+"""
+
+import os
+import threading
+
+import config
+from services.analyzer_timbre import EMBEDDING_DIM, EMBEDDING_VERSION, MIN_SR, get_timbre_embedding
+from utils.pcm_cache import load_audio
+from utils.pyramid import analysis_rate
+from utils.vector_index import VectorIndex
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """프로세스 전체에서 공유하는 인덱스 (다른 프로세스가 추가한 벡터는 검색할 때 다시 읽음)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex(config.SIMILARITY_INDEX_DIR, EMBEDDING_DIM, tag=f"timbre-v{EMBEDDING_VERSION}",
+                                 nprobe=config.SIMILARITY_NPROBE, rebuild_ratio=config.SIMILARITY_REBUILD_RATIO,
+                                 rebuild_min=config.SIMILARITY_REBUILD_MIN)
+        return _index
+
+
+def index_track(file_path, y=None, sr=None):
+    """트랙 임베딩을 계산해서 인덱스에 추가 (이미 있으면 교체). Returns: 임베딩"""
+    if y is None:
+        y, sr = load_audio(file_path, sr=analysis_rate(MIN_SR))
+    embedding = get_timbre_embedding(y, sr)
+    get_index().add([os.path.basename(file_path)], [embedding])
+    return embedding
+
+
+def similar_tracks(track_id, k=None, exclude_missing=True):
+    """
+    track_id와 음색이 비슷한 트랙
+
+    Args:
+        track_id: TRACKS_DIR 기준 트랙 파일명 (인덱스에 없으면 임베딩을 계산해서 추가)
+        k: 결과 수 (기본 config.SIMILARITY_TOP_K)
+        exclude_missing: 인덱스에는 있지만 TRACKS_DIR에서 지워진 트랙 제외
+
+    Returns:
+        [{"trackId", "score"}, ...] 유사도 내림차순 (자기 자신 제외)
+    """
+    k = int(k or config.SIMILARITY_TOP_K)
+    index = get_index()
+    query = index.get(track_id)
+    if query is None:
+        path = os.path.join(config.TRACKS_DIR, track_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"트랙을 찾을 수 없습니다: {track_id}")
+        query = index_track(path)
+
+    # 지워진 트랙을 걸러낼 여유분까지 한 번에
+    results = index.search(query, k=2 * k if exclude_missing else k, exclude=[track_id])
+    if exclude_missing:
+        results = [(other, score) for other, score in results
+                   if os.path.exists(os.path.join(config.TRACKS_DIR, other))]
+    return [{"trackId": other, "score": score} for other, score in results[:k]]
+
+
+def index_missing_tracks(progress=None):
+    """TRACKS_DIR에 있지만 인덱스에 없는 트랙을 추가 (기존 업로드 백필). Returns: 추가한 수"""
+    index = get_index()
+    names = sorted(name for name in os.listdir(config.TRACKS_DIR)
+                   if os.path.isfile(os.path.join(config.TRACKS_DIR, name))
+                   and os.path.splitext(name)[1].lower() in config.AUDIO_EXTENSIONS)
+    missing = [name for name in names if name not in index]
+    for i, name in enumerate(missing):
+        try:
+            index_track(os.path.join(config.TRACKS_DIR, name))
+        except Exception as e:
+            print(f"   ⚠️ Embedding failed: {name} ({e})")
+        if progress:
+            progress(int(100 * (i + 1) / len(missing)), f"임베딩 {i + 1}/{len(missing)}: {name}")
+    return len(missing)
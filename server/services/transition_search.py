@@ -0,0 +1,225 @@
+# server/services/transition_search.py
+import numpy as np
+import librosa
+from scipy import ndimage
+
+import config
+from services.analyzer_structure import beat_grid
+from utils.pyramid import analysis_view
+
+# 크로마/RMS/멜 밴드만 쓰므로 22kHz로 충분 (utils/pyramid.py)
+MIN_SR = 22050
+REFERENCE_SR = 22050  # 프레임 길이를 정한 기준 샘플레이트 (다른 sr에서도 같은 시간 해상도 유지)
+
+# =================================================================
+# 🔎 전환 지점 탐색
+# 1. 트랙마다 마디 단위 특징을 한 번 계산 (에너지, 크로마, 보컬 활동, 섹션 경계)
+# 2. A의 마디 출구 후보 x B의 마디 진입 후보 전체를 행렬 하나로 점수화
+#    (출구/진입 쪽 창 평균은 누적합으로 구하고 항목별 점수는 브로드캐스트, 크로마 유사도는 행렬곱 한 번)
+# 3. 점수 상위 k개 (출구, 진입) 쌍을 반환 -> 전략이 1순위를 컷 포인트/진입 지점으로 사용
+# 기존 휴리스틱 체인(아웃트로 -> Smart Trim -> 보컬 끝)의 출구는 사전 점수(exit_prior)로 반영됩니다.
+# =================================================================
+
+VOCAL_BAND = (300.0, 3400.0)  # 보컬 스템이 없을 때 보컬 활동 추정에 쓰는 대역 (Hz)
+HARMONIC_KERNEL = 31          # 화성(지속음) 성분을 남기는 시간축 메디안 필터 길이 (프레임, 약 0.7초)
+
+# 점수 항목 (config.TRANSITION_SEARCH_WEIGHTS에서 전략별 가중치, 각 항목은 대략 0~1)
+#   energy: A 출구 직전과 B 진입 직후 에너지가 비슷할수록
+#   impact: B 진입 직후 에너지가 클수록 (Drop은 B가 세게 들어와야 함)
+#   harmony: A 출구 주변과 B 진입 직후 크로마 코사인 유사도
+#   vocal_clash: 겹치는 구간에서 A와 B 보컬이 동시에 나오는 정도 (감점)
+#   vocal_cut: 출구 앞뒤 마디 모두 보컬 (프레이즈 중간에서 자름, 감점)
+#   vocal_loop: 출구 직전 마디의 보컬 (Drop 브릿지 루프 소스)
+#   phrase: 출구/진입이 프레이즈(TRANSITION_SEARCH_PHRASE_BARS마디) 경계
+#   section: 출구/진입이 구조 분석 섹션 경계
+#   exit_prior: 휴리스틱 출구에 가까울수록 (폭 2프레이즈) / entry_prior: B 앞부분일수록 (폭 1프레이즈)
+TERMS = ["energy", "impact", "harmony", "vocal_clash", "vocal_cut", "vocal_loop", "phrase", "section",
+         "exit_prior", "entry_prior"]
+
+
+def _bar_starts(onset_env, sr, hop_length, duration, bpm, downbeats):
+    """마디 시작 위치 (초). 비트 그리드에서 다운비트와 가장 잘 맞는(없으면 온셋이 가장 강한) 4박 위상"""
+    beats, period = beat_grid(onset_env, sr, hop_length, duration, bpm, downbeats)
+    if len(beats) < 4:
+        return beats[:1], 4 * period
+    if downbeats is not None and len(downbeats):
+        downbeats = np.asarray(downbeats, dtype=float)
+        dist = np.abs(beats[:, None] - downbeats[None, :]).min(axis=1)
+        scores = [-np.mean(dist[k::4]) for k in range(4)]
+    else:
+        strength = onset_env[np.minimum(librosa.time_to_frames(beats, sr=sr, hop_length=hop_length),
+                                        len(onset_env) - 1)]
+        scores = [np.mean(strength[k::4]) for k in range(4)]
+    return beats[int(np.argmax(scores))::4], 4 * period
+
+
+def bar_features(y, sr, bpm, downbeats=None, structure=None, vocals=None):
+    """
+    마디 단위 특징 (트랙마다 한 번, 모든 후보 쌍이 공유)
+
+    Args:
+        y, sr: 오디오 (배열 또는 AudioPyramid)
+        bpm: 템포 / downbeats: 다운비트 위치 (초, 있으면 마디 위상으로 사용)
+        structure: services.analyzer_structure 결과 (섹션 경계)
+        vocals: 보컬 스템 (y와 같은 sr, 없으면 보컬 대역 화성 성분이 전체 에너지에서 차지하는 비율로 추정)
+
+    Returns:
+        {"bars": 마디 시작 (초), "number": 첫 다운비트부터 센 마디 번호, "barSec", "duration",
+         "energy", "chroma": (12, 마디), "vocal", "boundary"}
+    """
+    base_sr = sr
+    y, sr = analysis_view(y, sr, MIN_SR)
+    duration = len(y) / sr
+
+    scale = sr / REFERENCE_SR
+    hop_length = int(512 * scale)
+    n_fft = int(2048 * scale)
+    S = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length)) ** 2
+    mel = librosa.feature.melspectrogram(S=S, sr=sr)
+    onset_env = librosa.onset.onset_strength(S=librosa.power_to_db(mel), sr=sr, hop_length=hop_length)
+    bars, bar_sec = _bar_starts(onset_env, sr, hop_length, duration, bpm, downbeats)
+
+    bounds = librosa.util.fix_frames(librosa.time_to_frames(bars, sr=sr, hop_length=hop_length),
+                                     x_min=0, x_max=S.shape[1])
+    rms = librosa.feature.rms(S=np.sqrt(S), frame_length=n_fft)[0]
+    energy = np.log1p(100 * librosa.util.sync(rms[np.newaxis], bounds, aggregate=np.mean)[0])
+    chroma = librosa.util.sync(librosa.feature.chroma_stft(S=S, sr=sr), bounds, aggregate=np.mean)
+
+    if vocals is not None:
+        vocals, _ = analysis_view(vocals, base_sr, MIN_SR)
+        vocal_rms = librosa.feature.rms(y=vocals[:len(y)], frame_length=n_fft, hop_length=hop_length)[0]
+        frames = min(len(vocal_rms), len(rms))
+        activity = vocal_rms[:frames] / (rms[:frames] + 1e-6)
+    else:
+        # HPSS의 화성 성분 쪽만 (보컬 대역 멜 밴드에 시간축 메디안, 타악기 온셋은 지워지고 지속음만 남음)
+        freqs = librosa.mel_frequencies(n_mels=mel.shape[0], fmax=sr / 2)
+        band = (freqs >= VOCAL_BAND[0]) & (freqs <= VOCAL_BAND[1])
+        harmonic = ndimage.median_filter(mel[band], size=(1, HARMONIC_KERNEL))
+        activity = harmonic.sum(axis=0) / (mel.sum(axis=0) + 1e-10)
+    vocal = librosa.util.sync(activity[np.newaxis], bounds[bounds <= len(activity)], aggregate=np.mean)[0]
+    vocal = np.pad(vocal, (0, max(0, len(energy) - len(vocal))), mode="edge")[:len(energy)]
+
+    # 경계 프레임 -> 마디 (fix_frames가 0과 끝을 붙이므로 첫 다운비트 앞 여린박 구간이 있으면 번호 -1)
+    starts = librosa.frames_to_time(bounds[:-1], sr=sr, hop_length=hop_length)
+    pickup = bounds[0] < librosa.time_to_frames(bars[0], sr=sr, hop_length=hop_length)
+    number = np.arange(len(starts)) - int(pickup)
+    boundary = np.zeros(len(starts), dtype=bool)
+    for section in (structure or {}).get("sections", [])[1:]:
+        boundary[np.argmin(np.abs(starts - section["start"]))] = True
+
+    return {
+        "bars": starts,
+        "number": number,
+        "barSec": float(bar_sec),
+        "duration": float(duration),
+        "energy": energy / (energy.max() + 1e-9),
+        "chroma": chroma,
+        "vocal": (vocal - vocal.min()) / (np.ptp(vocal) + 1e-9),
+        "boundary": boundary,
+    }
+
+
+def _window_mean(x, starts, length):
+    """x[..., s:s + length]의 평균 (모든 s에 대해 한 번에, 범위를 벗어난 부분은 제외)"""
+    n = x.shape[-1]
+    cumsum = np.concatenate([np.zeros(x.shape[:-1] + (1,)), np.cumsum(x, axis=-1)], axis=-1)
+    lo = np.clip(starts, 0, n)
+    hi = np.clip(starts + length, 0, n)
+    return (cumsum[..., hi] - cumsum[..., lo]) / np.maximum(hi - lo, 1)
+
+
+def _unit_rows(m):
+    return m / (np.linalg.norm(m, axis=1, keepdims=True) + 1e-9)
+
+
+def score_matrix(feats_a, feats_b, exits, entries, weights, heuristic_bar=None):
+    """
+    출구 후보 x 진입 후보 점수 행렬
+
+    Args:
+        exits / entries: A / B 마디 인덱스 배열
+        weights: {항목 이름: 가중치} (TERMS)
+        heuristic_bar: 휴리스틱 출구의 A 마디 인덱스 (없으면 exit_prior 항목은 0)
+
+    Returns:
+        (score (len(exits), len(entries)), {항목 이름: 브로드캐스트 가능한 항목 점수})
+    """
+    window = int(config.TRANSITION_SEARCH_WINDOW_BARS)
+    phrase = int(config.TRANSITION_SEARCH_PHRASE_BARS)
+    e_a, e_b = feats_a["energy"], feats_b["energy"]
+    v_a, v_b = feats_a["vocal"], feats_b["vocal"]
+
+    a_pre = _window_mean(e_a, exits - window, window)[:, None]
+    b_post = _window_mean(e_b, entries, window)[None, :]
+    chroma_a = _unit_rows(_window_mean(feats_a["chroma"], exits - window // 2, window).T)
+    chroma_b = _unit_rows(_window_mean(feats_b["chroma"], entries, window).T)
+    vocal_last = v_a[np.maximum(exits - 1, 0)]
+    vocal_first = v_a[np.minimum(exits, len(v_a) - 1)]
+
+    terms = {
+        "energy": 1.0 - np.abs(a_pre - b_post),
+        "impact": b_post,
+        "harmony": chroma_a @ chroma_b.T,
+        "vocal_clash": _window_mean(v_a, exits, window)[:, None] * _window_mean(v_b, entries, window)[None, :],
+        "vocal_cut": (vocal_last * vocal_first)[:, None],
+        "vocal_loop": vocal_last[:, None],
+        "phrase": (0.5 * (feats_a["number"][exits] % phrase == 0)[:, None]
+                   + 0.5 * (feats_b["number"][entries] % phrase == 0)[None, :]),
+        "section": 0.5 * feats_a["boundary"][exits][:, None] + 0.5 * feats_b["boundary"][entries][None, :],
+        "exit_prior": (np.exp(-0.5 * ((exits - heuristic_bar) / (2 * phrase)) ** 2)[:, None]
+                       if heuristic_bar is not None else np.zeros((len(exits), 1))),
+        "entry_prior": np.exp(-0.5 * (entries / phrase) ** 2)[None, :],
+    }
+    score = np.zeros((len(exits), len(entries)))
+    for name in TERMS:
+        if weights.get(name):
+            score += weights[name] * terms[name]
+    return score, terms
+
+
+def search_transitions(feats_a, feats_b, mix_type, sr, heuristic_exit=None, top_k=None):
+    """
+    A의 모든 마디 출구 x B의 모든 마디 진입 중 점수 상위 k개
+
+    Args:
+        feats_a / feats_b: bar_features() 결과
+        mix_type: "blend" | "drop" (config.TRANSITION_SEARCH_WEIGHTS 선택)
+        sr: 반환할 샘플 위치의 샘플레이트
+        heuristic_exit: 휴리스틱 체인의 컷 포인트 (sr 기준 샘플, 근처 출구에 가산점)
+
+    Returns:
+        점수 내림차순 [{"exit", "entry": sr 기준 샘플, "exitTime", "entryTime", "score", "terms"}, ...]
+        후보가 없으면 (트랙이 너무 짧음) 빈 목록
+    """
+    top_k = int(top_k or config.TRANSITION_SEARCH_TOP_K)
+    bars_a, bars_b = feats_a["bars"], feats_b["bars"]
+    exits = np.flatnonzero((bars_a >= config.TRANSITION_SEARCH_A_MIN_RATIO * feats_a["duration"])
+                           & (bars_a <= feats_a["duration"] - feats_a["barSec"]))
+    entries = np.flatnonzero(bars_b <= config.TRANSITION_SEARCH_B_MAX_RATIO * feats_b["duration"])
+    if len(exits) == 0 or len(entries) == 0:
+        return []
+
+    heuristic_bar = None
+    if heuristic_exit is not None:
+        heuristic_bar = int(np.argmin(np.abs(bars_a - heuristic_exit / sr)))
+    score, terms = score_matrix(feats_a, feats_b, exits, entries, config.TRANSITION_SEARCH_WEIGHTS[mix_type],
+                                heuristic_bar)
+
+    flat = score.ravel()
+    k = min(top_k, flat.size)
+    best = np.argpartition(-flat, k - 1)[:k]
+    best = best[np.argsort(-flat[best], kind="stable")]
+
+    candidates = []
+    for index in best:
+        i, j = np.unravel_index(index, score.shape)
+        exit_time, entry_time = float(bars_a[exits[i]]), float(bars_b[entries[j]])
+        candidates.append({
+            "exit": int(round(exit_time * sr)),
+            "entry": int(round(entry_time * sr)),
+            "exitTime": exit_time,
+            "entryTime": entry_time,
+            "score": float(score[i, j]),
+            "terms": {name: float(np.broadcast_to(terms[name], score.shape)[i, j]) for name in TERMS},
+        })
+    return candidates
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+set_renderer.py - N곡 플레이리스트를 하나의 연속 DJ 세트로 렌더링
+곡 경계마다 BPM 차이로 Blend / Drop을 고르고(mix_engine과 같은 기준),
+결과를 하나의 파일로 스트리밍합니다.
+
+메모리에는 현재 전환 주변의 두 트랙만 유지합니다.
+    - carry: 이전 전환 이후 남은 Track A (원본 그대로인 꼬리 부분)
+    - Track B: 다음 트랙
+전환을 렌더링하면 B가 원본 그대로 이어지는 지점(strategy.b_tail_start) 앞부분만 파일에 쓰고,
+나머지는 다음 전환의 carry가 됩니다. 그동안 그 다음 트랙의 스템 분리/분석을 백그라운드에서 준비합니다.
+
+사용법:
+    python set_renderer.py '{"tracks":["a.mp3","b.mp3","c.mp3"],"name":"friday_set"}'
+
+출력:
+    - 진행률: {"progress": 50, "message": "전환 2/5 렌더링 중...", "stage": "mix"}
+    - 완료: {"mixUrl": "sets/friday_set.wav", "duration": 7200, "transitions": [...]}
+"""
+
+# ⚠️ [중요] pkg_resources 경고 억제 (madmom 관련)
+import warnings
+warnings.filterwarnings('ignore', category=UserWarning, module='pkg_resources')
+warnings.filterwarnings('ignore', category=DeprecationWarning, module='pkg_resources')
+
+import os
+import sys
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from mix_engine import emit_progress, convert_numpy_types
+from pipeline import choose_mix_type, required_stems
+from utils.dsp import find_smart_trim_point, load_and_merge_stems, audio_dtype, pitch_shift
+from utils.pcm_cache import load_audio
+from strategies.drop_mix import DropMixStrategy
+from strategies.blend_mix import BlendMixStrategy
+from services.analysis_cache import get_cached_beat_info, track_structure
+from services.analyzer_intro import get_intro_duration
+from services.analyzer_outro import find_outro_endpoint
+from services.stem_separation import separate_stems
+from services.analyzer_vocal import find_vocal_end_point
+from services.analyzer_key import get_key_from_audio, get_pitch_shift_steps
+from utils.profiler import start_profiling, stop_profiling, profile_stage
+
+warnings.filterwarnings("ignore")
+
+
+def _cached_bpm(track_id):
+    return get_cached_beat_info(os.path.join(config.TRACKS_DIR, track_id))["bpm"]
+
+
+def prepare_track(track_ids, index):
+    """
+    오디오를 메모리에 올리지 않는 준비 단계 (백그라운드 프리페치 대상)
+    스템 분리 + 비트 분석(캐시) + 구조 분석(캐시) + 인트로 길이
+    스템은 앞뒤 경계의 전략이 이 트랙에서 읽는 것만 분리 (mix_engine / batch_mixer와 같은 기준,
+    이웃 트랙 BPM은 캐시된 비트 분석). Drop 경계의 B는 스템을 읽지 않음
+    """
+    track_id = track_ids[index]
+    file_path = os.path.join(config.TRACKS_DIR, track_id)
+    name = os.path.basename(track_id)
+    bpm = _cached_bpm(track_id)
+    # 앞 경계에서는 B, 다음 경계에서는 A
+    prev_type = choose_mix_type(_cached_bpm(track_ids[index - 1]), bpm) if index > 0 else None
+    next_type = choose_mix_type(bpm, _cached_bpm(track_ids[index + 1])) if index < len(track_ids) - 1 else None
+    stems = set()
+    if prev_type:
+        stems.update(required_stems(prev_type)["b"])
+    if next_type:
+        stems.update(required_stems(next_type)["a"])
+    if stems:
+        separate_stems(name, sorted(stems))
+    structure = track_structure(file_path)
+    return {
+        "id": track_id,
+        "file": file_path,
+        "name": name,
+        "bpm": bpm,
+        "next_type": next_type,
+        "structure": structure,
+        "intro_sec": get_intro_duration(file_path, structure=structure),
+    }
+
+
+def _align(y, offset, length):
+    """스템을 carry 구간(offset부터 length 샘플)에 맞춰 자름 (짧으면 0으로 채움)"""
+    if y is None:
+        return None
+    part = y[offset:offset + length]
+    if len(part) < length:
+        part = np.pad(part, (0, length - len(part)))
+    return np.ascontiguousarray(part)
+
+
+def _load_stem(prep, stem, offset, length, sr):
+    """carry 구간(원본 기준 offset부터 length 샘플)만 스템 하나 디코딩 (없으면 None)"""
+    y = load_and_merge_stems(prep["name"], [stem], config.OUTPUT_DIR, sr, offset=offset / sr, duration=length / sr)
+    return _align(y, 0, length)
+
+
+def load_carry(prep, y, offset, mix_type=None):
+    """
+    다음 전환의 Track A로 쓸 carry 생성
+    y: 트랙의 남은 부분 (원본 기준 offset 샘플부터)
+    mix_type: 다음 전환의 전략 (그 전략이 A에서 읽는 스템만 carry 구간만큼 로드, None이면 스템 없음)
+    """
+    carry = {"prep": prep, "y": y, "offset": offset, "vocals": None, "no_bass": None}
+    if mix_type is None:
+        return carry
+    stems = {stem: _load_stem(prep, stem, offset, len(y), config.TARGET_SR)
+             for stem in required_stems(mix_type)["a"]}
+    carry["vocals"] = stems.get("vocals")
+    if mix_type == "blend" and all(part is not None for part in stems.values()):
+        # 베이스 뺀 겹침 구간 (보컬은 한 번 디코딩한 것을 같이 씀)
+        carry["no_bass"] = stems["vocals"] + stems["drums"] + stems["other"]
+    return carry
+
+
+def render_boundary(carry, prep_b, sr):
+    """
+    carry(Track A 남은 부분) -> Track B 전환 렌더링
+
+    Returns:
+        (head, y_b_tail, b_entry_sample, info)
+        head: 세트 파일에 바로 쓸 구간 (A 나머지 + 전환)
+        y_b_tail: B가 원본 그대로 이어지는 부분 (다음 carry)
+        b_entry_sample: y_b_tail의 시작 위치 (B 원본 기준)
+    """
+    prep_a = carry["prep"]
+    y_a = carry["y"]
+    bpm_a, bpm_b = prep_a["bpm"], prep_b["bpm"]
+
+    with profile_stage("decode"):
+        y_b, _ = load_audio(prep_b["file"], sr=sr)
+
+    with profile_stage("trim"):
+        # carry는 원본의 offset 샘플부터이므로 아웃트로 시작도 carry 기준으로
+        structure = prep_a["structure"]
+        if structure and structure.get("outroStart"):
+            structure = dict(structure, outroStart=structure["outroStart"] - carry["offset"] / sr)
+        trim_point_vol = find_outro_endpoint(y_a, sr, structure=structure)
+        snapped_point = find_smart_trim_point(y_a, sr, trim_point_vol, bpm_a)
+    with profile_stage("vocal"):
+        vocal_end_point = find_vocal_end_point(carry["vocals"], sr) if carry["vocals"] is not None else None
+
+    mix_type = prep_a["next_type"]
+    if mix_type == "drop":
+        mixer = DropMixStrategy()
+        with profile_stage("render"):
+            final_mix = mixer.process(
+                y_a=y_a,
+                y_a_vocals=carry["vocals"] if carry["vocals"] is not None else y_a,
+                y_b=y_b,
+                bpm_a=bpm_a,
+                bpm_b=bpm_b,
+                sr=sr,
+                cut_point_a=snapped_point,
+                vocal_end_point=vocal_end_point
+            )
+    else:
+        y_b_bass_only = load_and_merge_stems(prep_b["name"], ['bass'], config.OUTPUT_DIR, sr)
+        intro_beats = max(4, int(round(prep_b["intro_sec"] * (bpm_b / 60.0))))
+        overlap_samples_target = int(intro_beats * (60.0 / bpm_a) * sr)
+
+        # 키 매칭
+        if y_b_bass_only is not None:
+            with profile_stage("key"):
+                key_a, _ = get_key_from_audio(y_a, sr)
+                key_b, _ = get_key_from_audio(y_b_bass_only, sr)
+                shift_steps = get_pitch_shift_steps(key_a, key_b)
+                if shift_steps != 0:
+                    y_b_bass_only = pitch_shift(y_b_bass_only, sr, shift_steps)
+
+        mixer = BlendMixStrategy()
+        with profile_stage("render"):
+            final_mix = mixer.process(
+                y_a_full=y_a,
+                y_a_no_rhythm=y_a,  # Blend 렌더링은 쓰지 않음
+                y_a_vocals=carry["vocals"] if carry["vocals"] is not None else y_a,
+                y_b_full=y_b,
+                y_b_bass=y_b_bass_only if y_b_bass_only is not None else y_b,
+                bpm_a=bpm_a,
+                bpm_b=bpm_b,
+                sr=sr,
+                overlap_samples=overlap_samples_target,
+                vocal_end=vocal_end_point if vocal_end_point else snapped_point,
+                trim_point=snapped_point,
+                track_a_name=prep_a["name"],
+                output_dir=config.OUTPUT_DIR,
+                y_a_no_bass=carry["no_bass"] if carry["no_bass"] is not None else y_a
+            )
+
+    head = final_mix[:mixer.b_tail_start]
+    # final_mix 전체가 남지 않도록 꼬리는 복사해서 분리
+    y_b_tail = final_mix[mixer.b_tail_start:].copy()
+    info = {
+        "from": prep_a["id"],
+        "to": prep_b["id"],
+        "mixType": f"{mix_type}_mix",
+        "bpmA": bpm_a,
+        "bpmB": bpm_b,
+    }
+    return head, y_b_tail, mixer.b_entry_sample, info
+
+
+class _SetWriter:
+    """float32 임시 파일에 순서대로 쓰면서 피크를 추적 (정규화는 마지막에 한 번)"""
+
+    def __init__(self, path, sr):
+        self.path = path
+        self.sr = sr
+        self.frames = 0
+        self.peak = 0.0
+        self._file = sf.SoundFile(path, 'w', samplerate=sr, channels=1, subtype='FLOAT')
+
+    def write(self, y):
+        if len(y) == 0:
+            return
+        self.peak = max(self.peak, float(np.max(np.abs(y))))
+        self._file.write(y)
+        self.frames += len(y)
+
+    def close(self):
+        self._file.close()
+
+    def normalize_to(self, output_path, target_db=-1.0):
+        """utils.dsp.normalize_audio와 같은 피크 정규화를 블록 단위로 적용"""
+        gain = 10 ** (target_db / 20) / self.peak if self.peak > 0 else 1.0
+        with sf.SoundFile(self.path, 'r') as src, \
+                sf.SoundFile(output_path, 'w', samplerate=self.sr, channels=1) as dst:
+            for block in src.blocks(blocksize=config.SET_WRITE_BLOCK, dtype=audio_dtype().name):
+                dst.write(block * block.dtype.type(gain))
+
+
+def render_set(track_ids, name=None, profile=None):
+    """
+    플레이리스트 전체를 하나의 WAV로 렌더링
+
+    Args:
+        track_ids: 재생 순서대로의 트랙 파일명 목록 (2곡 이상)
+        name: 출력 파일 이름 (확장자 제외, 없으면 자동)
+        profile: 단계별 프로파일 리포트 출력 여부 (None이면 config.PROFILE_ENABLED)
+    """
+    if len(track_ids) < 2:
+        return {"error": "세트에는 2곡 이상이 필요합니다."}
+    for track_id in track_ids:
+        if not os.path.exists(os.path.join(config.TRACKS_DIR, track_id)):
+            return {"error": f"트랙을 찾을 수 없습니다: {track_id}"}
+
+    if profile is None:
+        profile = config.PROFILE_ENABLED
+    profiler = start_profiling("set", trace_memory=config.PROFILE_TRACE_MEMORY) if profile else None
+
+    try:
+        return _render_set(track_ids, name)
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        if profiler is not None:
+            profiler.emit_report()
+            stop_profiling()
+
+
+def _render_set(track_ids, name):
+    sr = config.TARGET_SR
+    n_tracks = len(track_ids)
+    n_boundaries = n_tracks - 1
+
+    os.makedirs(config.SETS_DIR, exist_ok=True)
+    if not name:
+        first = os.path.splitext(os.path.basename(track_ids[0]))[0]
+        name = f"set_{first}_{n_tracks}tracks"
+    output_filename = f"{name}.wav"
+    output_path = os.path.join(config.SETS_DIR, output_filename)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}_", suffix=".wav", dir=config.SETS_DIR)
+    os.close(fd)
+    writer = _SetWriter(tmp_path, sr)
+    transitions = []
+
+    emit_progress(2, f"{n_tracks}곡 세트 준비 중...")
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = {i: pool.submit(prepare_track, track_ids, i)
+                       for i in range(min(n_tracks, 2 + config.SET_PREFETCH_AHEAD))}
+
+            with profile_stage("prepare"):
+                prep_a = pending.pop(0).result()
+            with profile_stage("decode"):
+                y_first, _ = load_audio(prep_a["file"], sr=sr)
+                carry = load_carry(prep_a, y_first, 0, prep_a["next_type"])
+            del y_first
+
+            for i in range(1, n_tracks):
+                progress = 5 + int(90 * (i - 1) / n_boundaries)
+                emit_progress(progress, f"전환 {i}/{n_boundaries} 렌더링 중...")
+
+                with profile_stage("prepare"):
+                    prep_b = pending.pop(i).result()
+                # 현재 전환을 렌더링하는 동안 다음 트랙 준비
+                ahead = i + 1 + config.SET_PREFETCH_AHEAD
+                if ahead < n_tracks and ahead not in pending:
+                    pending[ahead] = pool.submit(prepare_track, track_ids, ahead)
+
+                head, y_b_tail, b_entry, info = render_boundary(carry, prep_b, sr)
+                carry = None
+
+                with profile_stage("write"):
+                    info["bStart"] = (writer.frames + len(head)) / sr
+                    writer.write(head)
+                del head
+                transitions.append(info)
+
+                # 마지막 트랙은 다음 전환이 없으므로 스템 불필요 (next_type이 None)
+                carry = load_carry(prep_b, y_b_tail, b_entry, prep_b["next_type"])
+                del y_b_tail
+
+            with profile_stage("write"):
+                writer.write(carry["y"])
+            carry = None
+        writer.close()
+
+        emit_progress(96, "세트 정규화 중...")
+        with profile_stage("normalize"):
+            writer.normalize_to(output_path)
+    finally:
+        writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    emit_progress(100, "세트 렌더링 완료!")
+    return {
+        "mixUrl": f"sets/{output_filename}",
+        "mixType": "set",
+        "duration": writer.frames / sr,
+        "transitions": transitions,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        tracks = request_data.get("tracks") or []
+        result = render_set(tracks, request_data.get("name"), request_data.get("profile"))
+        print(json.dumps(result, default=convert_numpy_types))
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
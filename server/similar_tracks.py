@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+similar_tracks.py - 음색이 비슷한 다음 곡 추천 (services/track_similarity.py)
+
+사용법:
+    python similar_tracks.py '{"trackId":"a.mp3","k":10}'
+    python similar_tracks.py '{"backfill":true}'     # 인덱스에 없는 기존 업로드를 모두 추가
+
+출력:
+    - 진행률 (backfill): {"progress": 50, "message": "임베딩 3/6: c.mp3", "stage": "similarity"}
+    - 완료: {"similar": [{"trackId": "b.mp3", "score": 0.93}, ...], "indexed": 120}
+            backfill: {"similar": [], "added": 6, "indexed": 126}
+"""
+
+import os
+import sys
+import json
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.track_similarity import get_index, index_missing_tracks, similar_tracks
+
+
+def emit_progress(progress: int, message: str):
+    print(json.dumps({"progress": progress, "message": message, "stage": "similarity"}), flush=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "인자가 필요합니다: JSON 형식의 요청 데이터"}))
+        sys.exit(1)
+
+    try:
+        request_data = json.loads(sys.argv[1])
+        if request_data.get("backfill"):
+            added = index_missing_tracks(progress=emit_progress)
+            print(json.dumps({"similar": [], "added": added, "indexed": len(get_index())}))
+        elif request_data.get("trackId"):
+            similar = similar_tracks(request_data["trackId"], request_data.get("k"))
+            print(json.dumps({"similar": similar, "indexed": len(get_index())}))
+        else:
+            print(json.dumps({"error": "trackId 또는 backfill이 필요합니다."}))
+            sys.exit(1)
+
+    except json.JSONDecodeError as e:
+        print(json.dumps({"error": f"JSON 파싱 실패: {str(e)}"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
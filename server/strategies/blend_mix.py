@@ -3,22 +3,50 @@ import config # 🔥 config 임포트
 from utils.dsp import (
     match_bpm_with_safety_margin, 
     load_and_merge_stems, 
-    smooth_concatenate
+    smooth_concatenate,
+    linear_ramp,
+    as_audio
 )
 
 class BlendMixStrategy:
+    """
+    process()는 아래 단계를 순서대로 실행합니다. (pipeline.py는 단계별로 메모이즈)
+        sync_b_intro: Track B 인트로 베이스를 A의 BPM/겹침 길이에 맞춤
+        render: A 본체 + 겹침 구간 + B 본체 연결
+    """
+    # 트랙별로 읽는 스템 (오케스트레이터는 이 스템만 분리)
+    # A: 보컬 끝 탐색(vocals) + 베이스 뺀 겹침 구간, B: 인트로 베이스
+    REQUIRED_STEMS = {"a": ["vocals", "drums", "other"], "b": ["bass"]}
+
     def process(self, y_a_full, y_a_no_rhythm, y_a_vocals, y_b_full, y_b_bass, bpm_a, bpm_b, sr, 
-                overlap_samples, vocal_end, trim_point, track_a_name, output_dir):
-        
+                overlap_samples, vocal_end, trim_point, track_a_name, output_dir, y_a_no_bass=None):
+        """
+        y_a_no_bass: Track A의 베이스 제외 스템 (없으면 스템 폴더에서 로드)
+        처리 후 self.transition_start에 결과 배열에서 전환이 시작되는 위치,
+        self.b_tail_start / self.b_entry_sample에 Track B 원본이 그대로 이어지는 위치를 기록합니다.
+        """
+
         print(f"\n🍹 [Strategy: Blend Mix] Fixed Timing Transition...")
+        y_b_blend_synced, samples_needed_from_b = self.sync_b_intro(y_b_bass, bpm_a, bpm_b, sr, overlap_samples)
+
+        if y_a_no_bass is None:
+            y_a_no_bass = load_and_merge_stems(track_a_name, ['vocals', 'drums', 'other'], output_dir, sr)
 
+        return self.render(y_a_full, y_a_no_bass, y_b_full, y_b_blend_synced, samples_needed_from_b,
+                           overlap_samples, vocal_end)
+
+    def sync_b_intro(self, y_b_bass, bpm_a, bpm_b, sr, overlap_samples):
+        """Returns: (A 템포로 맞춘 B 인트로 베이스, 사용한 B 원본 샘플 수)"""
         samples_needed_from_b = int(overlap_samples * (bpm_a / bpm_b))
-        y_b_intro_raw = y_b_bass[:samples_needed_from_b]
+        y_b_intro_raw = as_audio(y_b_bass[:samples_needed_from_b])
         y_b_intro_raw = y_b_intro_raw * 1.5
         
         y_b_blend_synced = match_bpm_with_safety_margin(y_b_intro_raw, sr, bpm_b, bpm_a, overlap_samples)
+        return y_b_blend_synced, samples_needed_from_b
 
-        y_a_no_bass = load_and_merge_stems(track_a_name, ['vocals', 'drums', 'other'], output_dir, sr)
+    def render(self, y_a_full, y_a_no_bass, y_b_full, y_b_blend_synced, samples_needed_from_b,
+               overlap_samples, vocal_end):
+        y_a_full, y_b_full = as_audio(y_a_full), as_audio(y_b_full)
         
         part_a_main = y_a_full[:vocal_end]
         
@@ -35,7 +63,7 @@ class BlendMixStrategy:
         chunk_b_bass = y_b_blend_synced
         mix_len = overlap_samples 
         
-        fade_out_curve = np.linspace(1.0, 0.0, mix_len)
+        fade_out_curve = linear_ramp(1.0, 0.0, mix_len)
         mixed_chunk = (chunk_a_no_bass * fade_out_curve * 0.8) + (chunk_b_bass * 0.8)
         
         part_b_body = y_b_full[samples_needed_from_b:]
@@ -43,5 +71,12 @@ class BlendMixStrategy:
         # 🔥 config 값 사용
         transition_a_to_blend = smooth_concatenate([part_a_main, mixed_chunk], fade_samples=config.BLEND_OVERLAP_FADE)
         final_mix = smooth_concatenate([transition_a_to_blend, part_b_body], fade_samples=config.BLEND_MICRO_FADE)
-        
-        return final_mix
\ No newline at end of file
+
+        # 마이크로 페이드 이후부터는 Track B 원본 그대로 (세트 렌더러가 다음 전환의 Track A로 사용)
+        fade = config.BLEND_MICRO_FADE
+        crossfaded = len(transition_a_to_blend) >= fade and len(part_b_body) >= fade
+        self.transition_start = min(vocal_end, len(y_a_full))
+        self.b_entry_sample = samples_needed_from_b + (fade if crossfaded else 0)
+        self.b_tail_start = len(final_mix) - (len(y_b_full) - self.b_entry_sample)
+
+        return final_mix
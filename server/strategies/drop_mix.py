@@ -5,17 +5,34 @@ from utils.dsp import (
     create_tempo_ramp, 
     smooth_concatenate, 
     apply_high_pass, 
-    get_best_loop_segment
+    get_best_loop_segment,
+    linear_ramp,
+    as_audio
 )
 
 class DropMixStrategy:
+    """
+    process()는 아래 단계를 순서대로 실행합니다. (pipeline.py는 단계별로 메모이즈)
+        select_source: 브릿지 루프로 쓸 1박 구간과 실제 컷 포인트 선택
+        build_bridge: 루프 반복 + 템포 램프 + 하이패스
+        render: A 본체 + 브릿지 + B 연결
+    """
+    # 트랙별로 읽는 스템 (오케스트레이터는 이 스템만 분리, Track B 스템은 쓰지 않음)
+    REQUIRED_STEMS = {"a": ["vocals"], "b": []}
+
     def process(self, y_a, y_a_vocals, y_b, bpm_a, bpm_b, sr, cut_point_a, vocal_end_point):
+        """
+        처리 후 self.transition_start에 결과 배열에서 전환이 시작되는 위치,
+        self.b_tail_start / self.b_entry_sample에 Track B 원본이 그대로 이어지는 위치를 기록합니다.
+        """
         print(f"\n🚀 [Strategy: Drop Mix] Extreme Riser Mode!")
-        
-        # 🔥 config 값 사용
-        target_bpm = bpm_b * config.DROP_TARGET_BPM_MULTIPLIER 
-        print(f"   🔥 Speed Build-up: {bpm_a:.1f} -> {target_bpm:.1f} BPM (Max {config.DROP_TARGET_BPM_MULTIPLIER}x)")
-        
+        source_chunk, actual_cut_point = self.select_source(y_a, y_a_vocals, bpm_a, sr, cut_point_a, vocal_end_point)
+        final_bridge = self.build_bridge(source_chunk, bpm_a, bpm_b, sr)
+        return self.render(y_a, y_b, actual_cut_point, final_bridge)
+
+    def select_source(self, y_a, y_a_vocals, bpm_a, sr, cut_point_a, vocal_end_point):
+        """Returns: (루프 소스 구간, 실제 컷 포인트)"""
+        y_a, y_a_vocals = as_audio(y_a), as_audio(y_a_vocals)
         source_chunk = None
         samples_per_beat_a = int(60.0 / bpm_a * sr)
         actual_cut_point = cut_point_a 
@@ -63,6 +80,13 @@ class DropMixStrategy:
             if source_chunk is None:
                 source_chunk = y_a[cut_point_a - samples_per_beat_a : cut_point_a]
 
+        return source_chunk, actual_cut_point
+
+    def build_bridge(self, source_chunk, bpm_a, bpm_b, sr):
+        # 🔥 config 값 사용
+        target_bpm = bpm_b * config.DROP_TARGET_BPM_MULTIPLIER 
+        print(f"   🔥 Speed Build-up: {bpm_a:.1f} -> {target_bpm:.1f} BPM (Max {config.DROP_TARGET_BPM_MULTIPLIER}x)")
+
         # ----------------------------------------------------
         # Tightening & Ramp
         # ----------------------------------------------------
@@ -88,13 +112,21 @@ class DropMixStrategy:
         )
         
         filtered_bridge = apply_high_pass(ramped_bridge, sr, cutoff=400)
-        fade_in = np.linspace(0.6, 1.0, len(filtered_bridge))
+        fade_in = linear_ramp(0.6, 1.0, len(filtered_bridge))
         final_bridge = filtered_bridge * fade_in
-        
-        y_b_trimmed, _ = librosa.effects.trim(y_b, top_db=20)
+        return final_bridge
+
+    def render(self, y_a, y_b, actual_cut_point, final_bridge):
+        y_a, y_b = as_audio(y_a), as_audio(y_b)
+        y_b_trimmed, b_range = librosa.effects.trim(y_b, top_db=20)
         
         # 🔥 config 값 사용 (Blend Fade는 여기서도 씀)
         part_1 = smooth_concatenate([y_a[:actual_cut_point], final_bridge], fade_samples=config.BLEND_OVERLAP_FADE)
         final_mix = np.concatenate([part_1, y_b_trimmed])
+
+        # 무음 트림 이후의 Track B는 원본 그대로 (세트 렌더러가 다음 전환의 Track A로 사용)
+        self.transition_start = min(actual_cut_point, len(y_a))
+        self.b_entry_sample = int(b_range[0])
+        self.b_tail_start = len(part_1)
         
         return final_mix
\ No newline at end of file
@@ -5,46 +5,86 @@ warnings.filterwarnings('ignore', category=UserWarning, module='pkg_resources')
 warnings.filterwarnings('ignore', category=DeprecationWarning, module='pkg_resources')
 
 import os
+from functools import lru_cache
 import numpy as np
 import librosa
 import soundfile as sf
 from scipy import signal
 import pyrubberband as pyrb
 
-# Madmom (Downbeat Snap용)
-try:
-    from madmom.features.downbeats import RNNDownBeatProcessor, DBNDownBeatTrackingProcessor
-except ImportError:
-    pass
+import config
+from utils.profiler import profile_stage
+from utils.filters import design_sos, window_energy
+from utils.pyramid import analysis_view
 
-def normalize_audio(y, target_db=-1.0):
+# ====================================================
+# 🎚️ Dtype 정책
+# 모든 오디오 배열은 config.AUDIO_DTYPE(기본 float32)으로 유지합니다.
+# float64 배열(np.linspace 곡선, float64 필터 계수, pyrubberband 출력)과 섞이면
+# 트랙 전체가 float64로 승격되어 메모리/대역폭이 두 배가 되므로,
+# 곡선과 필터 계수는 같은 dtype으로 캐시해 두고 외부 라이브러리 출력은 즉시 변환합니다.
+# ====================================================
+
+def audio_dtype():
+    return np.dtype(config.AUDIO_DTYPE)
+
+def as_audio(y):
+    """오디오 배열을 정책 dtype으로 변환 (이미 같으면 복사하지 않음)"""
+    return np.asarray(y, dtype=audio_dtype())
+
+@lru_cache(maxsize=64)
+def _equal_power_fades(fade_samples, dtype_name):
+    t = np.linspace(0, np.pi / 2, fade_samples)
+    fade_out = np.cos(t).astype(dtype_name)
+    fade_in = np.sin(t).astype(dtype_name)
+    fade_out.flags.writeable = False
+    fade_in.flags.writeable = False
+    return fade_out, fade_in
+
+@lru_cache(maxsize=8)
+def _linear_ramp(start, stop, length, dtype_name):
+    ramp = np.linspace(start, stop, length).astype(dtype_name)
+    ramp.flags.writeable = False
+    return ramp
+
+def linear_ramp(start, stop, length):
+    """정책 dtype의 선형 곡선 (읽기 전용, 캐시됨)"""
+    return _linear_ramp(float(start), float(stop), int(length), audio_dtype().name)
+
+def normalization_gain(y, target_db=-1.0):
+    """normalize_audio가 곱하는 게인 (y.dtype 스칼라, 무음이면 1)"""
+    y = as_audio(y)
     max_val = np.max(np.abs(y))
-    if max_val == 0: return y
+    if max_val == 0: return y.dtype.type(1.0)
     target_amp = 10 ** (target_db / 20)
-    return y * (target_amp / max_val)
+    return y.dtype.type(target_amp / max_val)
+
+def normalize_audio(y, target_db=-1.0):
+    y = as_audio(y)
+    return y * normalization_gain(y, target_db)
 
 def preserve_energy(y_original, y_stretched):
+    y_stretched = as_audio(y_stretched)
     rms_orig = np.sqrt(np.mean(y_original**2))
     rms_new = np.sqrt(np.mean(y_stretched**2))
     if rms_new < 1e-5: return y_stretched
     gain = rms_orig / rms_new
     if gain > 3.0: gain = 3.0
-    return y_stretched * gain
+    return y_stretched * y_stretched.dtype.type(gain)
 
 def smooth_concatenate(arrays, fade_samples=512):
-    if not arrays: return np.array([])
-    if len(arrays) == 1: return arrays[0]
+    if not arrays: return np.array([], dtype=audio_dtype())
+    if len(arrays) == 1: return as_audio(arrays[0])
     
-    result = arrays[0]
+    result = as_audio(arrays[0])
     for i in range(1, len(arrays)):
-        next_arr = arrays[i]
+        next_arr = as_audio(arrays[i])
         
         if len(result) < fade_samples or len(next_arr) < fade_samples:
             result = np.concatenate([result, next_arr])
             continue
             
-        fade_out = np.cos(np.linspace(0, np.pi / 2, fade_samples))
-        fade_in = np.sin(np.linspace(0, np.pi / 2, fade_samples))
+        fade_out, fade_in = _equal_power_fades(fade_samples, result.dtype.name)
         
         overlap_prev = result[-fade_samples:] * fade_out
         overlap_next = next_arr[:fade_samples] * fade_in
@@ -54,17 +94,38 @@ def smooth_concatenate(arrays, fade_samples=512):
         
     return result
 
+# config.STRETCH_ENGINE
+#   "rubberband": pyrubberband (고품질, 호출마다 외부 프로세스 + 임시 파일)
+#   "librosa": 위상 보코더 (프로세스 내 실행, 빠르지만 트랜지언트가 뭉개짐 - 미리듣기용)
+def time_stretch(y, sr, rate):
+    """시간 스트레칭 (출력을 정책 dtype으로 변환)"""
+    with profile_stage("stretch"):
+        if config.STRETCH_ENGINE == "librosa":
+            return as_audio(librosa.effects.time_stretch(as_audio(y), rate=rate))
+        return as_audio(pyrb.time_stretch(y, sr, rate))
+
+def pitch_shift(y, sr, n_steps):
+    """피치 시프트 (출력을 정책 dtype으로 변환)"""
+    with profile_stage("stretch"):
+        if config.STRETCH_ENGINE == "librosa":
+            return as_audio(librosa.effects.pitch_shift(as_audio(y), sr=sr, n_steps=n_steps))
+        return as_audio(pyrb.pitch_shift(y, sr, n_steps=n_steps))
+
 def get_low_freq_energy(y, sr):
     """150Hz 이하 킥/베이스 에너지 측정 (위상 검증용)"""
     try:
-        sos = signal.butter(4, 150, 'lp', fs=sr, output='sos')
-        y_low = signal.sosfilt(sos, y)
-        return np.sqrt(np.mean(y_low**2))
-    except:
+        y = as_audio(y)
+        return window_energy(y, [0], len(y), sos=design_sos('lp', 4, 150, sr))[0]
+    except Exception as e:
+        print(f"   ⚠️ Low-frequency energy check failed ({e}).")
         return 0
 
-def find_smart_trim_point(y, sr, target_sample, bpm_hint):
-    """Smart Snap & Phase Correction"""
+def get_low_freq_energies(y, sr, starts, length):
+    """여러 구간의 150Hz 이하 에너지를 한 번에 측정 (배열 끝을 넘는 구간은 남은 길이만)"""
+    return window_energy(as_audio(y), starts, length, sos=design_sos('lp', 4, 150, sr))
+
+def find_smart_trim_point(y, sr, target_sample, bpm_hint, backend=None):
+    """Smart Snap & Phase Correction (backend: 다운비트 트래커, 기본 config.TRIM_BEAT_BACKEND)"""
     try:
         print(f"   🕵️ Analyzing trim point near {target_sample/sr:.2f}s...")
         start_sec = max(0, (target_sample / sr) - 10.0)
@@ -74,19 +135,17 @@ def find_smart_trim_point(y, sr, target_sample, bpm_hint):
         y_proc = y_cut * 2.0 
         y_proc = np.sign(y_proc) * (np.abs(y_proc) ** 2)
 
-        if 'RNNDownBeatProcessor' not in globals():
-            print("      ⚠️ Madmom not available. Skipping Smart Trim.")
+        # 다운비트 스냅용 트래커 (기본: Madmom)
+        from services.beat_backends import get_beat_tracker
+        backend = backend or config.TRIM_BEAT_BACKEND
+        tracker = get_beat_tracker(backend)
+        if tracker is None:
+            print(f"      ⚠️ {backend} not available. Skipping Smart Trim.")
             return target_sample
 
-        proc = RNNDownBeatProcessor()
-        act = proc(y_proc)
-        
-        tracker = DBNDownBeatTrackingProcessor(
-            beats_per_bar=[4], fps=100,
-            min_bpm=bpm_hint*0.8, max_bpm=bpm_hint*1.2, transition_lambda=150
-        )
-        beats_info = tracker(act)
-        downbeats = beats_info[beats_info[:, 1] == 1][:, 0]
+        # 다운비트 추정은 트래커의 MIN_SR 레벨로 (위상 보정은 원래 sr)
+        y_track, track_sr = analysis_view(y_proc, sr, tracker.MIN_SR)
+        downbeats = tracker.track(y_track, track_sr, bpm_hint=bpm_hint)["downbeats"]
         downbeat_samples = (downbeats * sr).astype(int) + int(start_sec * sr)
         
         candidates_prev = downbeat_samples[downbeat_samples <= target_sample]
@@ -96,12 +155,11 @@ def find_smart_trim_point(y, sr, target_sample, bpm_hint):
         
         # 1. 위상 보정
         check_len = int(0.4 * sr)
-        e1 = get_low_freq_energy(y[chosen_point : chosen_point + check_len], sr)
         samples_per_beat = int(sr * 60 / bpm_hint)
         point_beat3 = chosen_point + (samples_per_beat * 2)
+        e1, e3 = get_low_freq_energies(y, sr, [chosen_point, point_beat3], check_len)
         
         if point_beat3 + check_len < len(y):
-            e3 = get_low_freq_energy(y[point_beat3 : point_beat3 + check_len], sr)
             if e3 > e1 * 1.3:
                 print("      🔄 Trim Phase Fix: Shifted to real Downbeat (+2 beats)")
                 chosen_point = point_beat3
@@ -126,7 +184,7 @@ def match_bpm_with_safety_margin(y, sr, current_bpm, target_bpm, target_len_samp
         return y
     
     rate = target_bpm / current_bpm
-    y_stretched = pyrb.time_stretch(y, sr, rate)
+    y_stretched = time_stretch(y, sr, rate)
     y_stretched = preserve_energy(y, y_stretched)
     
     if len(y_stretched) > target_len_samples:
@@ -136,14 +194,17 @@ def match_bpm_with_safety_margin(y, sr, current_bpm, target_bpm, target_len_samp
         return np.pad(y_stretched, (0, pad_len))
     return y_stretched
 
+def tempo_ramp_rates(start_bpm, end_bpm, base_bpm, steps=32):
+    """create_tempo_ramp의 구간별 속도 배율 (live_engine.py는 같은 곡선을 루프 한 바퀴마다 적용)"""
+    # 🔥 np.geomspace를 사용한 급격한 가속 곡선
+    return np.geomspace(start_bpm, end_bpm, steps) / base_bpm
+
 def create_tempo_ramp(y, sr, start_bpm, end_bpm, base_bpm, steps=32):
     """Geometric Ramp (기하급수 가속)"""
     if start_bpm == end_bpm: return y
     chunk_len = len(y) // steps
     chunks = []
-    
-    # 🔥 np.geomspace를 사용한 급격한 가속 곡선
-    bpm_curve = np.geomspace(start_bpm, end_bpm, steps)
+    rates = tempo_ramp_rates(start_bpm, end_bpm, base_bpm, steps)
     
     for i in range(steps):
         start = i * chunk_len
@@ -153,29 +214,31 @@ def create_tempo_ramp(y, sr, start_bpm, end_bpm, base_bpm, steps=32):
              chunks.append(chunk)
              continue
              
-        current_target_bpm = bpm_curve[i]
-        rate = current_target_bpm / base_bpm
-        
-        stretched = pyrb.time_stretch(chunk, sr, rate)
+        stretched = time_stretch(chunk, sr, rates[i])
         stretched = preserve_energy(chunk, stretched)
         chunks.append(stretched)
     return smooth_concatenate(chunks, fade_samples=64)
 
 def apply_high_pass(y, sr, cutoff=400):
+    """배열 전체 하이패스 (블록 단위 처리는 utils.filters.SOSFilter)"""
     try:
-        sos = signal.butter(10, cutoff, 'hp', fs=sr, output='sos')
-        return signal.sosfilt(sos, y)
-    except:
+        sos = design_sos('hp', 10, cutoff, sr)
+        return signal.sosfilt(sos, as_audio(y))
+    except Exception as e:
+        print(f"   ⚠️ High-pass filter failed ({e}). Using unfiltered audio.")
         return y
 
-def load_and_merge_stems(track_name, stems_to_merge, output_dir, sr):
+def load_and_merge_stems(track_name, stems_to_merge, output_dir, sr, offset=0.0, duration=None):
+    """스템 여러 개를 합쳐서 로드 (offset/duration: 초 단위 구간만 디코딩)"""
+    from services.stem_separation import stem_folder
+
     name_no_ext = os.path.splitext(track_name)[0]
-    demucs_path = os.path.join(output_dir, "htdemucs_ft", name_no_ext)
+    demucs_path = os.path.join(output_dir, stem_folder(), name_no_ext)
     merged_audio = None
     for stem in stems_to_merge:
         stem_path = os.path.join(demucs_path, f"{stem}.wav")
         if not os.path.exists(stem_path): return None
-        y, _ = librosa.load(stem_path, sr=sr)
+        y, _ = librosa.load(stem_path, sr=sr, dtype=audio_dtype(), offset=offset, duration=duration)
         if merged_audio is None: merged_audio = y
         else:
             min_len = min(len(merged_audio), len(y))
@@ -0,0 +1,178 @@
+# server/utils/filters.py
+"""
+필터 뱅크 (Butterworth SOS)
+
+    design_sos: (종류, 차수, 컷오프, sr)별로 설계 결과를 캐시 (정책 dtype, 공유 배열이므로 수정 금지)
+    SOSFilter: zi 상태를 이어가며 블록 단위로 필터링 (청크/스트리밍 렌더링용)
+               블록으로 나눠 처리한 결과는 배열 전체를 한 번에 처리한 결과와 같습니다.
+    BlockSOSFilter: 고정 블록 크기 전용, 미리 만든 행렬 곱으로 필터링 (실시간 콜백용, 호출 중 배열 할당 없음)
+    window_energy: 여러 구간의 필터 후 RMS를 한 번의 sosfilt 호출로 측정
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+import config
+
+
+@lru_cache(maxsize=32)
+def _design_sos(btype, order, cutoff, sr, dtype_name):
+    # 읽기 전용으로 두면 sosfilt가 계수를 복사 없이 memoryview로 잡지 못해 실패하므로 쓰기 가능 상태로 둠
+    return signal.butter(order, cutoff, btype, fs=sr, output='sos').astype(dtype_name)
+
+
+def design_sos(btype, order, cutoff, sr):
+    """정책 dtype(config.AUDIO_DTYPE)의 Butterworth SOS 계수 (btype: 'lp' | 'hp' | 'bp' ...)"""
+    if isinstance(cutoff, (list, tuple)):
+        cutoff = tuple(float(c) for c in cutoff)
+    else:
+        cutoff = float(cutoff)
+    return _design_sos(btype, int(order), cutoff, int(sr), np.dtype(config.AUDIO_DTYPE).name)
+
+
+class SOSFilter:
+    """
+    상태를 가진 SOS 필터 (마지막 축을 시간축으로 블록마다 process() 호출)
+
+        hp = SOSFilter.butter('hp', 10, 400, sr)
+        for block in blocks:
+            out.write(hp.process(block))
+    """
+
+    def __init__(self, sos):
+        self.sos = sos
+        self.zi = None
+
+    @classmethod
+    def butter(cls, btype, order, cutoff, sr):
+        return cls(design_sos(btype, order, cutoff, sr))
+
+    def reset(self):
+        """다음 블록을 새 신호의 시작으로 처리 (무음 초기 상태)"""
+        self.zi = None
+
+    def process(self, block):
+        block = np.asarray(block, dtype=self.sos.dtype)
+        if self.zi is None:
+            # 무음에서 시작 (sosfilt를 배열 전체에 한 번 적용한 것과 같은 초기 상태)
+            self.zi = np.zeros((self.sos.shape[0],) + block.shape[:-1] + (2,), dtype=self.sos.dtype)
+        y, self.zi = signal.sosfilt(self.sos, block, zi=self.zi)
+        return y
+
+
+class BlockSOSFilter:
+    """
+    고정 블록 크기 N의 상태 공간 필터 (live_engine.py의 오디오 콜백용)
+
+    SOS 캐스케이드를 상태 공간(섹션마다 sosfilt의 zi와 같은 DF2T 상태 2개)으로 합친 뒤
+    블록 하나의 입출력을 행렬로 미리 계산해 둡니다.
+        y = H x + O s        H: N x N 임펄스 응답 토플리츠, O: 상태 -> 출력
+        s' = P s + R x       P: A^N, R: 입력 -> 다음 상태
+    process()는 out= 행렬 곱만 쓰므로 호출 중에 배열을 만들지 않습니다 (sosfilt는 매번 출력 배열을 할당).
+    결과는 같은 블록들을 SOSFilter로 처리한 것과 (정책 dtype 반올림 오차 안에서) 같습니다.
+    """
+
+    def __init__(self, sos, block_size):
+        dtype = np.asarray(sos).dtype
+        sos = np.asarray(sos, dtype=np.float64)
+        n = int(block_size)
+
+        # 섹션별 DF2T: y = b0 x + z1, z1' = (b1 - a1 b0) x - a1 z1 + z2, z2' = (b2 - a2 b0) x - a2 z1
+        A = np.zeros((0, 0))
+        B = np.zeros(0)
+        C = np.zeros(0)
+        D = 1.0
+        for b0, b1, b2, _, a1, a2 in sos:
+            A2 = np.array([[-a1, 1.0], [-a2, 0.0]])
+            B2 = np.array([b1 - a1 * b0, b2 - a2 * b0])
+            C2 = np.array([1.0, 0.0])
+            # 직렬 연결 (앞 섹션 출력 = 다음 섹션 입력)
+            k = len(B)
+            A_next = np.zeros((k + 2, k + 2))
+            A_next[:k, :k] = A
+            A_next[k:, :k] = np.outer(B2, C)
+            A_next[k:, k:] = A2
+            A, B, C, D = A_next, np.concatenate([B, B2 * D]), np.concatenate([b0 * C, C2]), b0 * D
+
+        states = len(B)
+        powers = np.empty((n + 1, states, states))  # A^0 ... A^N
+        powers[0] = np.eye(states)
+        for i in range(1, n + 1):
+            powers[i] = powers[i - 1] @ A
+        impulse = np.empty(n)
+        impulse[0] = D
+        impulse[1:] = C @ powers[:n - 1] @ B
+
+        rows = np.arange(n)
+        lags = rows[:, None] - rows[None, :]
+        self.H = np.where(lags >= 0, impulse[np.clip(lags, 0, None)], 0.0).astype(dtype)
+        self.O = np.einsum("s,nst->nt", C, powers[:n]).astype(dtype)
+        self.P = powers[n].astype(dtype)
+        self.R = np.einsum("nst,t->sn", powers[n - 1::-1], B).astype(dtype)
+
+        self.block_size = n
+        self.zi = np.zeros(states, dtype=dtype)
+        self._state_out = np.zeros(n, dtype=dtype)
+        self._state_a = np.zeros(states, dtype=dtype)
+        self._state_b = np.zeros(states, dtype=dtype)
+
+    @classmethod
+    def butter(cls, btype, order, cutoff, sr, block_size):
+        return cls(design_sos(btype, order, cutoff, sr), block_size)
+
+    def reset(self):
+        """다음 블록을 새 신호의 시작으로 처리 (무음 초기 상태)"""
+        self.zi.fill(0)
+
+    def process(self, block, out):
+        """block(길이 N) -> out(길이 N, block과 다른 배열). Returns: out"""
+        np.dot(self.H, block, out=out)
+        np.dot(self.O, self.zi, out=self._state_out)
+        out += self._state_out
+        np.dot(self.P, self.zi, out=self._state_a)
+        np.dot(self.R, block, out=self._state_b)
+        np.add(self._state_a, self._state_b, out=self.zi)
+        return out
+
+
+def filter_blocks(sos, blocks):
+    """블록 이터러블을 상태를 이어가며 필터링 (제너레이터)"""
+    sos_filter = SOSFilter(sos)
+    for block in blocks:
+        yield sos_filter.process(block)
+
+
+def window_energy(y, starts, length, sos=None):
+    """
+    여러 구간 [start, start + length)의 RMS (sos가 있으면 필터 후 RMS)
+    각 구간은 무음 상태에서 필터링하므로 구간을 잘라 하나씩 측정한 결과와 같습니다.
+    배열 끝을 넘는 구간은 남은 길이로만 평균내고, 빈 구간은 0입니다.
+
+    Returns: 구간별 RMS 배열
+    """
+    y = np.asarray(y)
+    starts = np.asarray(starts, dtype=np.int64)
+    if len(starts) == 0 or length <= 0:
+        return np.zeros(len(starts), dtype=y.dtype)
+
+    # 구간들이 걸친 범위만 (끝을 넘는 구간이 있으면 0 패딩해서) 구간 행렬로 만듦
+    starts = np.clip(starts, 0, len(y))
+    lo = int(starts.min())
+    span = y[lo:min(len(y), int(starts.max()) + length)]
+    if starts.max() + length > len(y):
+        span = np.concatenate([span, np.zeros(length, dtype=y.dtype)])
+    windows = np.lib.stride_tricks.sliding_window_view(span, length)[starts - lo]
+    if sos is not None:
+        # 인과 필터라서 구간 뒤에 붙은 0 패딩은 앞쪽 출력에 영향을 주지 않음
+        windows = signal.sosfilt(sos, windows, axis=-1)
+    else:
+        windows = windows.copy()
+
+    counts = np.clip(len(y) - starts, 0, length)
+    np.square(windows, out=windows)
+    for row in np.flatnonzero(counts < length):
+        windows[row, counts[row]:] = 0  # 패딩 구간(필터 잔향 포함)은 평균에서 제외
+    power = windows.sum(axis=1)
+    return np.where(counts > 0, np.sqrt(power / np.maximum(counts, 1)), 0).astype(y.dtype)
@@ -0,0 +1,132 @@
+# server/utils/mix_manifest.py
+"""
+비파괴 믹스 매니페스트 (전환 구간만 렌더링하고 나머지는 원본 트랙을 참조)
+
+믹스 결과에서 새로 만들어지는 오디오는 전환 구간뿐입니다. (pipeline.render info 참고)
+    final_mix[:aBodyEnd]          == Track A 원본 [0, aBodyEnd)
+    final_mix[aBodyEnd:bTailStart] 전환 구간 (크로스페이드, 브릿지, 스트레치가 모두 여기 포함)
+    final_mix[bTailStart:]        == Track B 원본 [bEntrySample, ...)
+그래서 전환 구간만 WAV로 저장하고, 전체 배치는 아래 JSON으로 기록합니다.
+
+    {
+      "version": 1, "sampleRate": 44100, "length": 5306336, "duration": 120.3, "dtype": "float32",
+      "segments": [
+        {"source": "track", "role": "a", "track": "a.mp3", "digest": "<sha256>", "start": 0, "sourceStart": 0,
+         "length": 2645488, "gain": 0.87},
+        {"source": "rendered", "url": "blends/cache/<key>.wav", "start": 2645488, "length": 634368, "gain": 1.0},
+        {"source": "track", "role": "b", "track": "b.mp3", "digest": "<sha256>", "start": 3279856,
+         "sourceStart": 619520, "length": 2026480, "gain": 0.87}
+      ]
+    }
+
+- 위치/길이는 sampleRate 기준 샘플 수. track 구간은 원본을 모노 sampleRate로 디코딩(utils.pcm_cache.load_audio)해서
+  sourceStart부터 length만큼 읽고 gain을 곱합니다. rendered 구간은 정규화 게인이 이미 적용된 WAV입니다.
+- 구간은 겹치지 않고 샘플 단위로 이어 붙입니다. 크로스페이드는 전부 rendered 구간 안에 구워져 있습니다.
+- 믹스 결과 캐시는 파일 내용으로 찾으므로 캐시된 매니페스트의 track 이름은 with_tracks()로 요청한 이름에 맞춥니다.
+- flatten()은 일반 모드(전체 WAV 저장)와 같은 파일을 만듭니다. (PCM_16 양자화까지 동일)
+"""
+
+import os
+import json
+import hashlib
+
+import numpy as np
+import soundfile as sf
+
+import config
+from utils.hashing import file_digest
+from utils.pcm_cache import load_audio
+
+MANIFEST_VERSION = 1
+FLATTEN_BLOCK = 1 << 18  # 원본 구간을 읽어 쓰는 블록 크기 (샘플)
+
+
+def build_manifest(track_a, track_b, info, length, sr, gain, dtype, segment_url):
+    """
+    Args:
+        track_a / track_b: TRACKS_DIR 기준 트랙 파일명
+        info: pipeline.render()의 info (aBodyEnd, bTailStart, bEntrySample)
+        length: 믹스 전체 길이 (샘플)
+        gain: 정규화 게인 (utils.dsp.normalization_gain)
+        segment_url: 전환 구간 WAV 경로 (OUTPUT_DIR 기준)
+    """
+    a_end, b_start = int(info["aBodyEnd"]), int(info["bTailStart"])
+    gain = float(gain)
+    digest_a = file_digest(os.path.join(config.TRACKS_DIR, track_a))
+    digest_b = file_digest(os.path.join(config.TRACKS_DIR, track_b))
+    segments = [
+        {"source": "track", "role": "a", "track": track_a, "digest": digest_a,
+         "start": 0, "sourceStart": 0, "length": a_end, "gain": gain},
+        {"source": "rendered", "url": segment_url, "start": a_end, "length": b_start - a_end, "gain": 1.0},
+        {"source": "track", "role": "b", "track": track_b, "digest": digest_b,
+         "start": b_start, "sourceStart": int(info["bEntrySample"]), "length": int(length) - b_start, "gain": gain},
+    ]
+    return {
+        "version": MANIFEST_VERSION,
+        "sampleRate": int(sr),
+        "length": int(length),
+        "duration": length / sr,
+        "dtype": np.dtype(dtype).name,
+        "segments": [segment for segment in segments if segment["length"] > 0],
+    }
+
+
+def with_tracks(manifest, track_a, track_b):
+    """track 구간의 파일명을 이번 요청의 트랙으로 바꾼 매니페스트 (내용 해시는 같음)"""
+    names = {"a": track_a, "b": track_b}
+    segments = [dict(segment, track=names[segment["role"]]) if segment["source"] == "track" else segment
+                for segment in manifest["segments"]]
+    return dict(manifest, segments=segments)
+
+
+def manifest_digest(manifest):
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def missing_segments(manifest):
+    """
+    파일이 없는 rendered 구간의 url (믹스 캐시 예산 때문에 지워진 경우)
+    캐시 키가 내용 주소라서 같은 요청으로 다시 렌더링하면 같은 경로에 다시 생깁니다.
+    """
+    return [segment["url"] for segment in manifest["segments"]
+            if segment["source"] == "rendered" and not os.path.exists(os.path.join(config.OUTPUT_DIR, segment["url"]))]
+
+
+def _read_segment(segment, sr, dtype):
+    """구간 오디오를 블록 단위로 (gain 적용)"""
+    if segment["source"] == "rendered":
+        y, _ = sf.read(os.path.join(config.OUTPUT_DIR, segment["url"]), dtype=dtype.name)
+        y = y[:segment["length"]]
+    else:
+        path = os.path.join(config.TRACKS_DIR, segment["track"])
+        if file_digest(path) != segment["digest"]:
+            raise ValueError(f"Source track changed since the manifest was written: {segment['track']}")
+        y, _ = load_audio(path, sr=sr, dtype=dtype)
+        y = y[segment["sourceStart"]:segment["sourceStart"] + segment["length"]]
+    gain = dtype.type(segment["gain"])
+    for i in range(0, len(y), FLATTEN_BLOCK):
+        block = y[i:i + FLATTEN_BLOCK]
+        yield block if segment["gain"] == 1.0 else block * gain
+
+
+def flatten(manifest, output_path):
+    """매니페스트를 하나의 WAV로 (일반 모드 출력과 같은 PCM_16)"""
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+    missing = missing_segments(manifest)
+    if missing:
+        raise FileNotFoundError(f"Rendered segment no longer in the mix cache: {', '.join(missing)}")
+    sr = manifest["sampleRate"]
+    dtype = np.dtype(manifest["dtype"])
+
+    frames = 0
+    with sf.SoundFile(output_path, 'w', samplerate=sr, channels=1, subtype='PCM_16') as dst:
+        for segment in sorted(manifest["segments"], key=lambda s: s["start"]):
+            if segment["start"] != frames:
+                raise ValueError(f"Manifest segments are not contiguous at sample {frames}")
+            for block in _read_segment(segment, sr, dtype):
+                dst.write(block)
+                frames += len(block)
+    if frames != manifest["length"]:
+        raise ValueError(f"Flattened length {frames} does not match manifest length {manifest['length']}")
+    return frames
@@ -0,0 +1,191 @@
+# server/utils/pcm_cache.py
+"""
+디코딩된 PCM 캐시 (디스크, 메모리 맵)
+
+업로드 파일을 한 번만 디코딩/리샘플링해서 모노 float32 .npy로 저장하고,
+이후에는 np.load(mmap_mode='r')로 바로 엽니다. (MP3 디코드 + 리샘플 비용 제거)
+키는 파일 내용 해시이므로 파일 이름이 바뀌어도 재사용되고, 내용이 바뀌면 새로 만듭니다.
+
+    output/pcm/<digest>.json        원본 정보 (native sr, 채널 수, 길이)
+    output/pcm/<digest>_<sr>.npy    sr별 모노 PCM (native + TARGET_SR은 첫 디코딩 때 함께 저장)
+                                    분석 피라미드 레벨(22.05k, 11.025k)은 TARGET_SR에서 데시메이션 (utils/pyramid.py)
+
+디스크 예산(config.PCM_CACHE_MAX_MB)을 넘으면 오래 안 쓴 항목부터 삭제합니다.
+반환되는 배열은 읽기 전용 memmap입니다. (수정이 필요하면 복사해서 사용)
+"""
+
+import os
+import json
+
+import numpy as np
+import librosa
+
+import config
+from utils.hashing import file_digest
+from utils.pyramid import level_rates, decimate
+
+
+def _npy_path(digest, sr):
+    return os.path.join(config.PCM_CACHE_DIR, f"{digest}_{int(sr)}.npy")
+
+
+def _meta_path(digest):
+    return os.path.join(config.PCM_CACHE_DIR, f"{digest}.json")
+
+
+def _read_meta(digest):
+    try:
+        with open(_meta_path(digest), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _open(digest, sr):
+    path = _npy_path(digest, sr)
+    try:
+        y = np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    os.utime(path)  # LRU: 최근 사용 표시
+    return y
+
+
+def _store(digest, sr, y):
+    """임시 파일에 쓰고 교체 (동시에 같은 파일을 만들어도 어느 쪽이든 완전한 파일이 남음)"""
+    path = _npy_path(digest, sr)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(y, dtype=np.float32))
+    os.replace(tmp_path, path)
+
+
+def _decode(path, digest):
+    """원본 디코딩 (native sr) -> 모노 저장 + TARGET_SR 버전 저장. Returns: meta"""
+    y, native_sr = librosa.load(path, sr=None, mono=False, dtype=np.float32)
+    channels = 1 if y.ndim == 1 else y.shape[0]
+    return _store_decoded(path, digest, librosa.to_mono(y), native_sr, channels)
+
+
+def store_decoded(path, y, native_sr, channels):
+    """
+    이미 디코딩한 모노 PCM(native sr)을 캐시에 저장 (업로드 중 증분 디코딩 결과, services/analyzer_stream.py)
+    캐시가 이미 있으면 아무것도 하지 않습니다. Returns: meta
+    """
+    if not config.PCM_CACHE_ENABLED:
+        return None
+    digest = file_digest(path)
+    meta = _read_meta(digest)
+    if meta is not None and _open(digest, meta["sr"]) is not None:
+        return meta
+    return _store_decoded(path, digest, np.asarray(y, dtype=np.float32), native_sr, channels)
+
+
+def _store_decoded(path, digest, y, native_sr, channels):
+    os.makedirs(config.PCM_CACHE_DIR, exist_ok=True)
+    _store(digest, native_sr, y)
+    if native_sr != config.TARGET_SR:
+        _store(digest, config.TARGET_SR, librosa.resample(y, orig_sr=native_sr, target_sr=config.TARGET_SR))
+
+    meta = {"sr": int(native_sr), "channels": int(channels), "duration": len(y) / native_sr,
+            "source": os.path.basename(path)}
+    with open(f"{_meta_path(digest)}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(f"{_meta_path(digest)}.{os.getpid()}.tmp", _meta_path(digest))
+    _evict()
+    return meta
+
+
+def _cached_pcm(path, sr):
+    """(sr의 모노 PCM memmap, sr, meta) - 없으면 디코딩/리샘플해서 만듦"""
+    digest = file_digest(path)
+    meta = _read_meta(digest)
+    if meta is None or _open(digest, meta["sr"]) is None:
+        print(f"   💿 Decoding to PCM cache: {os.path.basename(path)}")
+        meta = _decode(path, digest)
+
+    sr = meta["sr"] if sr is None else int(sr)
+    y = _open(digest, sr)
+    if y is None:
+        rates = level_rates(config.TARGET_SR)
+        if sr in rates[1:]:
+            # 분석 피라미드 레벨은 한 단계 위 레벨에서 데시메이션 (파이프라인의 AudioPyramid와 같은 결과)
+            upper, _, _ = _cached_pcm(path, rates[rates.index(sr) - 1])
+            _store(digest, sr, decimate(np.asarray(upper)))
+        else:
+            # 다른 sr은 캐시된 native PCM에서 리샘플 (디코딩 생략)
+            native = _open(digest, meta["sr"])
+            _store(digest, sr, librosa.resample(np.asarray(native), orig_sr=meta["sr"], target_sr=sr))
+        _evict()
+        y = _open(digest, sr)
+    return y, sr, meta
+
+
+def load_audio(path, sr=None, offset=0.0, duration=None, dtype=None):
+    """
+    librosa.load(path, sr=sr, mono=True) 대체 (캐시 사용)
+
+    Args:
+        sr: None이면 원본 샘플레이트
+        offset / duration: 초 단위 구간
+        dtype: None이면 config.AUDIO_DTYPE (float32면 memmap 그대로, 아니면 복사 변환)
+
+    Returns:
+        (y, sr)
+    """
+    dtype = np.dtype(dtype or config.AUDIO_DTYPE)
+    if not config.PCM_CACHE_ENABLED:
+        return librosa.load(path, sr=sr, mono=True, offset=offset, duration=duration, dtype=dtype)
+
+    y, sr, _ = _cached_pcm(path, sr)
+    start = int(round(offset * sr))
+    end = len(y) if duration is None else start + int(round(duration * sr))
+    y = y[start:end]
+    if y.dtype != dtype:
+        y = y.astype(dtype)
+    return y, sr
+
+
+def audio_info(path):
+    """디코딩 없이(캐시가 있으면) 원본 정보 {"sr", "channels", "duration"}. 캐시가 없으면 디코딩해서 채움"""
+    if not config.PCM_CACHE_ENABLED:
+        y, sr = librosa.load(path, sr=None, mono=False)
+        return {"sr": int(sr), "channels": 1 if y.ndim == 1 else y.shape[0],
+                "duration": librosa.get_duration(y=y, sr=sr)}
+    _, _, meta = _cached_pcm(path, None)
+    return {"sr": meta["sr"], "channels": meta["channels"], "duration": meta["duration"]}
+
+
+def _evict():
+    """디스크 예산을 넘으면 오래 안 쓴 PCM부터 삭제 (native가 지워지면 메타도 삭제)"""
+    if not config.PCM_CACHE_MAX_MB:
+        return
+    entries = []
+    total = 0
+    for name in os.listdir(config.PCM_CACHE_DIR):
+        if not name.endswith(".npy"):
+            continue
+        path = os.path.join(config.PCM_CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    budget = config.PCM_CACHE_MAX_MB * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # 다른 프로세스가 열고 있는 경우 (Windows)
+        total -= size
+        digest, sr = os.path.basename(path)[:-4].rsplit("_", 1)
+        meta = _read_meta(digest)
+        if meta is not None and meta["sr"] == int(sr):
+            try:
+                os.remove(_meta_path(digest))
+            except OSError:
+                pass
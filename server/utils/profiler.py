@@ -0,0 +1,264 @@
+"""
+파이프라인 단계별 프로파일러
+
+각 단계(decode, separation, beat, trim, vocal, key, stretch, render, write)의
+Wall time / CPU time / 하위 프로세스 CPU / RSS 변화량 / tracemalloc 피크를 기록합니다.
+    rss_delta_mb          단계 동안 늘어난(줄어든) 현재 RSS
+    process_peak_rss_mb   단계가 끝난 시점까지의 프로세스 전체 최대 RSS (ru_maxrss, 단계별 값이 아님)
+단계는 중첩될 수 있으며 (예: render > stretch), 실행이 끝나면
+JSON 한 줄 리포트와 Chrome Trace(chrome://tracing, Perfetto) 파일로 내보낼 수 있습니다.
+
+사용법:
+    profiler = start_profiling("mix")
+    with profile_stage("decode"):
+        ...
+    profiler.emit_report()
+    stop_profiling()
+
+프로파일러가 켜져 있지 않으면 profile_stage()는 아무 일도 하지 않습니다.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource  # Unix 전용 (Windows에서는 RSS/하위 프로세스 CPU 생략)
+except ImportError:
+    resource = None
+
+
+def _current_rss_mb():
+    """현재 RSS (MB, 알 수 없으면 None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _rusage():
+    """(최대 RSS MB, 하위 프로세스 CPU 초) - resource 모듈이 없으면 (None, 0.0)"""
+    if resource is None:
+        return None, 0.0
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # Linux: KB 단위, macOS: byte 단위
+    max_rss = self_usage.ru_maxrss / 1024.0
+    if sys.platform == "darwin":
+        max_rss /= 1024.0
+    return max_rss, child_usage.ru_utime + child_usage.ru_stime
+
+
+class _Frame:
+    __slots__ = ("name", "path", "depth", "start_wall", "start_cpu", "start_child_cpu", "start_rss", "mem_peak")
+
+    def __init__(self, name, path, depth):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.start_wall = 0.0
+        self.start_cpu = 0.0
+        self.start_child_cpu = 0.0
+        self.start_rss = None
+        self.mem_peak = 0
+
+
+class StageProfiler:
+    def __init__(self, name="pipeline", trace_memory=True):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        path = f"{parent.path}/{name}" if parent else name
+        frame = _Frame(name, path, len(stack))
+
+        if self.trace_memory:
+            # 부모 구간의 피크를 보존한 뒤 이 구간의 피크를 새로 측정
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.mem_peak = max(parent.mem_peak, peak)
+            tracemalloc.reset_peak()
+            frame.mem_peak = current
+
+        stack.append(frame)
+        _, frame.start_child_cpu = _rusage()
+        frame.start_rss = _current_rss_mb()
+        frame.start_cpu = time.process_time()
+        frame.start_wall = time.perf_counter()
+        try:
+            yield frame
+        finally:
+            end_wall = time.perf_counter()
+            end_cpu = time.process_time()
+            max_rss, end_child_cpu = _rusage()
+            end_rss = _current_rss_mb()
+            stack.pop()
+
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                frame.mem_peak = max(frame.mem_peak, peak)
+                if parent is not None:
+                    parent.mem_peak = max(parent.mem_peak, frame.mem_peak)
+                tracemalloc.reset_peak()
+
+            record = {
+                "stage": name,
+                "path": path,
+                "depth": frame.depth,
+                "start_s": round(frame.start_wall - self._origin, 6),
+                "wall_s": round(end_wall - frame.start_wall, 6),
+                "cpu_s": round(end_cpu - frame.start_cpu, 6),
+                "child_cpu_s": round(end_child_cpu - frame.start_child_cpu, 6),
+                "rss_delta_mb": (round(end_rss - frame.start_rss, 1)
+                                 if end_rss is not None and frame.start_rss is not None else None),
+                "process_peak_rss_mb": round(max_rss, 1) if max_rss is not None else None,
+                "peak_py_mb": round(frame.mem_peak / (1024 * 1024), 2) if self.trace_memory else None,
+                "thread": threading.get_ident(),
+            }
+            with self._lock:
+                self.records.append(record)
+
+    def summary(self):
+        """같은 경로(path)의 구간을 합산한 요약 (호출 순서 유지)"""
+        totals = {}
+        for rec in self.records:
+            entry = totals.get(rec["path"])
+            if entry is None:
+                entry = totals[rec["path"]] = {
+                    "path": rec["path"],
+                    "calls": 0,
+                    "wall_s": 0.0,
+                    "cpu_s": 0.0,
+                    "child_cpu_s": 0.0,
+                    "rss_delta_mb": None,
+                    "process_peak_rss_mb": rec["process_peak_rss_mb"],
+                    "peak_py_mb": rec["peak_py_mb"],
+                    "first_start_s": rec["start_s"],
+                }
+            entry["calls"] += 1
+            entry["wall_s"] += rec["wall_s"]
+            entry["cpu_s"] += rec["cpu_s"]
+            entry["child_cpu_s"] += rec["child_cpu_s"]
+            if rec["rss_delta_mb"] is not None:
+                # 여러 번 호출된 단계는 가장 크게 늘어난 호출 기준
+                entry["rss_delta_mb"] = (rec["rss_delta_mb"] if entry["rss_delta_mb"] is None
+                                         else max(entry["rss_delta_mb"], rec["rss_delta_mb"]))
+            if rec["process_peak_rss_mb"] is not None:
+                entry["process_peak_rss_mb"] = max(entry["process_peak_rss_mb"], rec["process_peak_rss_mb"])
+            if rec["peak_py_mb"] is not None:
+                entry["peak_py_mb"] = max(entry["peak_py_mb"], rec["peak_py_mb"])
+
+        stages = sorted(totals.values(), key=lambda e: e["first_start_s"])
+        for entry in stages:
+            for key in ("wall_s", "cpu_s", "child_cpu_s"):
+                entry[key] = round(entry[key], 6)
+            del entry["first_start_s"]
+        return stages
+
+    def report(self):
+        max_rss, _ = _rusage()
+        return {
+            "name": self.name,
+            "total_wall_s": round(time.perf_counter() - self._origin, 6),
+            # 프로세스 전체 최대 RSS (단계별 증가량은 stages[].rss_delta_mb)
+            "peak_rss_mb": round(max_rss, 1) if max_rss is not None else None,
+            "stages": self.summary(),
+        }
+
+    def emit_report(self):
+        """리포트를 JSON 한 줄로 stdout에 출력 ({"profile": {...}})"""
+        print(json.dumps({"profile": self.report()}), flush=True)
+
+    def write_chrome_trace(self, path):
+        """Chrome Trace Event 형식(Complete 이벤트)으로 저장"""
+        pid = os.getpid()
+        events = []
+        for rec in self.records:
+            events.append({
+                "name": rec["stage"],
+                "cat": self.name,
+                "ph": "X",
+                "ts": rec["start_s"] * 1e6,
+                "dur": rec["wall_s"] * 1e6,
+                "pid": pid,
+                "tid": rec["thread"],
+                "args": {
+                    "cpu_s": rec["cpu_s"],
+                    "child_cpu_s": rec["child_cpu_s"],
+                    "rss_delta_mb": rec["rss_delta_mb"],
+                    "process_peak_rss_mb": rec["process_peak_rss_mb"],
+                    "peak_py_mb": rec["peak_py_mb"],
+                },
+            })
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+# ====================================================
+# 전역 프로파일러 (파이프라인 깊은 곳의 DSP 함수에서도 접근)
+# ====================================================
+_active_profiler = None
+
+
+def start_profiling(name="pipeline", trace_memory=True):
+    global _active_profiler
+    _active_profiler = StageProfiler(name, trace_memory=trace_memory)
+    return _active_profiler
+
+
+def stop_profiling():
+    global _active_profiler
+    if _active_profiler is not None:
+        _active_profiler.close()
+    _active_profiler = None
+
+
+def get_profiler():
+    return _active_profiler
+
+
+@contextmanager
+def profile_stage(name):
+    """활성 프로파일러가 있으면 구간을 기록하고, 없으면 그대로 통과"""
+    profiler = _active_profiler
+    if profiler is None:
+        yield None
+        return
+    with profiler.stage(name) as frame:
+        yield frame
@@ -0,0 +1,68 @@
+# server/utils/progressive_wav.py
+"""
+점진적으로 커지는 WAV 파일 (렌더링 중에도 앞부분을 스트리밍할 수 있도록)
+
+헤더의 길이 필드를 최대값(스트리밍 WAV 관례)으로 두고 PCM_16 샘플을 시간 순서대로 덧붙입니다.
+write()가 끝날 때마다 on_commit(committed_bytes, committed_frames)으로 파일에서 읽어도 되는 범위를 알리고,
+close() 때 실제 길이로 헤더를 고칩니다. (닫힌 파일은 일반 WAV와 같음)
+
+샘플 변환은 soundfile(libsndfile)의 float -> PCM_16 변환과 같습니다. (floor(x * 32768), 범위 밖은 클리핑)
+"""
+
+import struct
+
+import numpy as np
+
+HEADER_BYTES = 44
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def _header(sr, data_bytes):
+    riff_size = _UNKNOWN_SIZE if data_bytes == _UNKNOWN_SIZE else 36 + data_bytes
+    return struct.pack("<4sI4s4sIHHIIHH4sI",
+                       b"RIFF", riff_size, b"WAVE",
+                       b"fmt ", 16, 1, 1, sr, sr * 2, 2, 16,  # PCM, 모노, 16비트
+                       b"data", data_bytes)
+
+
+class ProgressiveWavWriter:
+    """
+        writer = ProgressiveWavWriter(path, sr, on_commit=publish)
+        writer.write(prefix)      # 바로 읽을 수 있음
+        writer.write(rest)
+        writer.close()            # 헤더 확정
+    """
+
+    def __init__(self, path, sr, on_commit=None):
+        self.path = path
+        self.sr = int(sr)
+        self.frames = 0
+        self.on_commit = on_commit
+        self._file = open(path, "wb")
+        self._file.write(_header(self.sr, _UNKNOWN_SIZE))
+        self._commit()
+
+    @property
+    def committed_bytes(self):
+        return HEADER_BYTES + self.frames * 2
+
+    def _commit(self):
+        self._file.flush()
+        if self.on_commit is not None:
+            self.on_commit(self.committed_bytes, self.frames)
+
+    def write(self, y):
+        """float 샘플(-1.0 ~ 1.0)을 덧붙이고 커밋 (범위를 넘는 값은 잘라냄)"""
+        if len(y) == 0:
+            return
+        pcm = np.clip(np.floor(np.asarray(y, dtype=np.float32) * np.float32(32768)), -32768, 32767)
+        self._file.write(pcm.astype("<i2").tobytes())
+        self.frames += len(y)
+        self._commit()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_header(self.sr, self.frames * 2))
+        self._file.close()
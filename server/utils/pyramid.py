@@ -0,0 +1,83 @@
+# server/utils/pyramid.py
+"""
+분석용 다운샘플 피라미드 (44.1k -> 22.05k -> 11.025k)
+
+한 번 디코딩한 오디오를 1/2씩 안티에일리어싱 데시메이션(resample_poly, Kaiser FIR)해서
+분석기마다 필요한 가장 낮은 샘플레이트로 분석합니다. 렌더링은 항상 원래 샘플레이트입니다.
+
+    각 분석 모듈은 MIN_SR(정확도를 유지하는 가장 낮은 샘플레이트)을 선언하고
+    analysis_view(y, sr, MIN_SR)로 분석할 배열을 얻습니다.
+    y가 AudioPyramid면 이미 만든 레벨을 공유하고, 배열이면 그 자리에서 데시메이션합니다.
+    분석 결과(샘플 위치)는 to_sr()로 호출 측 샘플레이트로 되돌립니다.
+
+레벨 수는 config.ANALYSIS_PYRAMID_LEVELS (1이면 모든 분석을 원래 샘플레이트로)
+"""
+
+import numpy as np
+from scipy import signal
+
+import config
+
+
+def level_rates(sr):
+    """sr에서 만들 수 있는 피라미드 샘플레이트 목록 (정수로 나누어떨어지는 레벨까지)"""
+    rates = [int(sr)]
+    while len(rates) < config.ANALYSIS_PYRAMID_LEVELS and rates[-1] % 2 == 0:
+        rates.append(rates[-1] // 2)
+    return rates
+
+
+def analysis_rate(min_sr, sr=None):
+    """min_sr 이상인 가장 낮은 피라미드 샘플레이트 (sr 기본값 config.TARGET_SR)"""
+    rates = level_rates(sr or config.TARGET_SR)
+    return min((rate for rate in rates if rate >= min_sr), default=rates[0])
+
+
+def decimate(y):
+    """샘플레이트 1/2 (안티에일리어싱 FIR + 지연 보정, dtype 유지)"""
+    return signal.resample_poly(y, 1, 2, axis=-1).astype(y.dtype, copy=False)
+
+
+def to_sr(samples, from_sr, to_sr):
+    """샘플 위치를 다른 샘플레이트 기준으로 변환"""
+    if from_sr == to_sr:
+        return samples
+    return int(round(samples * to_sr / from_sr))
+
+
+class AudioPyramid:
+    """
+    한 트랙의 다운샘플 레벨 묶음 (필요한 레벨만 처음 요청할 때 만듦)
+
+        pyramid = AudioPyramid(y, sr)
+        y_low, low_sr = pyramid.at(11025)
+    """
+
+    def __init__(self, y, sr, levels=None):
+        """levels: 이미 만든 하위 레벨 (lower_levels() 결과, 파이프라인 캐시 재사용용)"""
+        self.y = y
+        self.sr = int(sr)
+        self.rates = level_rates(sr)
+        self._levels = [y] + list(levels or [])
+
+    def at(self, min_sr):
+        """(min_sr 이상인 가장 낮은 레벨, 그 샘플레이트)"""
+        index = self.rates.index(analysis_rate(min_sr, self.sr))
+        while len(self._levels) <= index:
+            self._levels.append(decimate(self._levels[-1]))
+        return self._levels[index], self.rates[index]
+
+    def lower_levels(self):
+        """원본을 제외한 모든 레벨 (모두 만들어서 반환)"""
+        self.at(self.rates[-1])
+        return tuple(self._levels[1:])
+
+
+def analysis_view(y, sr, min_sr):
+    """
+    분석기가 쓸 (배열, 샘플레이트)
+    y: 배열 또는 AudioPyramid (AudioPyramid면 sr은 pyramid.sr)
+    """
+    if not isinstance(y, AudioPyramid):
+        y = AudioPyramid(np.asarray(y), sr)
+    return y.at(min_sr)
@@ -0,0 +1,117 @@
+# server/utils/task_graph.py
+"""
+의존성 그래프 실행기 (batch_mixer.py)
+
+노드는 키로 식별되므로 같은 키를 여러 번 추가하면 하나로 합쳐집니다. (공유 노드 중복 제거)
+의존 노드가 모두 끝난 노드부터 워커 풀에서 실행하고, heavy 노드(스템 분리, 렌더링 등
+메모리/GPU를 많이 쓰는 작업)는 동시에 heavy_limit개까지만 실행합니다.
+
+    graph = TaskGraph()
+    graph.add(("beat", "a.mp3"), lambda: analyze("a.mp3"))
+    graph.add(("mix", "a", "b"), lambda beat_a, beat_b: mix(...), deps=[("beat", "a.mp3"), ("beat", "b.mp3")],
+              heavy=True)
+    results, errors = graph.run(workers=4, heavy_limit=1)
+
+노드 함수는 의존 노드의 결과를 deps 순서대로 인자로 받습니다.
+실패한 노드에 의존하는 노드는 실행하지 않고 같은 오류로 실패 처리합니다. (다른 노드는 계속 진행)
+노드는 run()을 호출한 컨텍스트의 복사본에서 실행되므로 config.overrides(티어 등) 값이 그대로 보입니다.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class TaskGraph:
+
+    def __init__(self):
+        self._nodes = {}  # key -> (fn, deps, heavy)
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self, key, fn, deps=(), heavy=False):
+        """노드 추가 (이미 있는 키면 무시하고 기존 노드 유지)"""
+        if key not in self._nodes:
+            self._nodes[key] = (fn, tuple(deps), heavy)
+        return key
+
+    def _check(self):
+        for key, (_, deps, _) in self._nodes.items():
+            missing = [dep for dep in deps if dep not in self._nodes]
+            if missing:
+                raise ValueError(f"Node {key} depends on unknown nodes: {missing}")
+
+    def run(self, workers=4, heavy_limit=1, on_done=None):
+        """
+        모든 노드 실행
+
+        Args:
+            on_done: (key, 완료 노드 수, 전체 노드 수) 콜백 (실패/건너뜀 포함)
+
+        Returns:
+            (results, errors)  results: {key: 결과}, errors: {key: 예외}
+        """
+        self._check()
+        waiting = {key: set(deps) for key, (_, deps, _) in self._nodes.items()}
+        dependents = {key: [] for key in self._nodes}
+        for key, (_, deps, _) in self._nodes.items():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        results, errors = {}, {}
+        ready = [key for key, deps in waiting.items() if not deps]
+        running = {}  # future -> key
+        heavy_running = 0
+        total = len(self._nodes)
+
+        def finish(key):
+            for child in dependents[key]:
+                waiting[child].discard(key)
+                if not waiting[child] and child not in errors:
+                    ready.append(child)
+            if on_done is not None:
+                on_done(key, len(results) + len(errors), total)
+
+        def fail(key, error):
+            # 의존 노드 전체를 같은 오류로 실패 처리
+            stack = [key]
+            while stack:
+                node = stack.pop()
+                if node in errors:
+                    continue
+                errors[node] = error
+                if on_done is not None:
+                    on_done(node, len(results) + len(errors), total)
+                stack.extend(dependents[node])
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while ready or running:
+                # 가벼운 노드는 바로, heavy 노드는 슬롯이 남을 때만 제출 (추가 순서 유지)
+                for key in list(ready):
+                    fn, deps, heavy = self._nodes[key]
+                    if heavy and heavy_running >= heavy_limit:
+                        continue
+                    ready.remove(key)
+                    if key in errors:
+                        continue
+                    heavy_running += heavy
+                    context = contextvars.copy_context()
+                    running[pool.submit(context.run, fn, *(results[dep] for dep in deps))] = key
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    heavy_running -= self._nodes[key][2]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        fail(key, e)
+                        continue
+                    finish(key)
+
+        return results, errors
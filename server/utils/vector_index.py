@@ -0,0 +1,370 @@
+# server/utils/vector_index.py
+"""
+디스크 벡터 인덱스 (메모리 맵 + IVF 근사 최근접 이웃, 코사인 유사도)
+
+    <root>/vectors.<세대>.f32    단위 벡터 행렬 (float32, 행 단위 추가, 용량은 두 배씩 늘림)
+    <root>/centroids.<세대>.npy  IVF 중심 (nlist x dim)
+    <root>/offsets.<세대>.npy    IVF 리스트 경계 (nlist + 1)
+    <root>/ids.<세대>.log        행 순서대로의 id (한 줄에 JSON 문자열 하나, 추가만)
+    <root>/meta.json            {"dim", "tag", "generation", "count", "sorted", "idsBytes"} (크기 고정)
+    <root>/index.lock           쓰기 락 (소유 프로세스 pid, 여러 분석 프로세스가 동시에 추가할 수 있음)
+
+행 [0, sorted)는 IVF 리스트 순서로 정렬되어 리스트 l의 벡터가 vectors[offsets[l]:offsets[l + 1]]에 연속으로 있고,
+행 [sorted, count)는 새로 추가된 꼬리로 검색할 때 전부 비교합니다. (추가는 꼬리에 붙이기만 하므로 증분)
+꼬리가 정렬된 부분의 rebuild_ratio를 넘으면 살아 있는 벡터 전체로 중심을 다시 학습하고 파일을 다시 정렬합니다.
+같은 id를 다시 추가하면 마지막 행만 살아 있는 것으로 보고 이전 행은 재정렬 때 정리합니다.
+id 목록은 ids.<세대>.log 끝에 붙이기만 하고 meta.json의 idsBytes까지만 유효하므로 (쓰다 죽은 꼬리는 다음 추가가 잘라냄)
+추가 한 번의 쓰기 비용이 인덱스 크기와 무관합니다.
+재정렬은 새 세대 파일에 쓰고 meta.json 교체로 전환하므로 읽는 쪽은 항상 짝이 맞는 meta와 벡터 파일을 봅니다.
+
+검색: 중심 nlist개와 비교해서 가까운 nprobe개 리스트 + 꼬리만 내적 (10만 개, nprobe 8 기준 약 3천 개)
+읽기 쪽은 meta.json이 바뀌면 같은 세대면 ids.log의 새 꼬리만, 세대가 바뀌었으면 전체를 다시 읽습니다.
+(같은 프로세스의 인덱스 객체를 계속 재사용하는 전제)
+"""
+
+import os
+import json
+import time
+import threading
+
+import numpy as np
+
+INDEX_VERSION = 2
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 20000     # 중심 학습에 쓰는 최대 벡터 수
+LOCK_STALE_SEC = 600
+LOCK_POLL_SEC = 0.05
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+def train_centroids(vectors, nlist, seed=0):
+    """구면 k-means (코사인), 중심은 단위 벡터"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_SAMPLE:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_SAMPLE, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]  # 빈 리스트는 이전 중심 유지
+        centroids = _normalize(sums)
+    return centroids
+
+
+class VectorIndex:
+    """
+    Args:
+        root: 인덱스 폴더
+        dim: 벡터 차원
+        tag: 벡터를 만든 방법의 버전 (저장된 인덱스와 다르면 빈 인덱스로 새로 시작)
+        nprobe: 검색할 IVF 리스트 수
+        rebuild_ratio / rebuild_min: 꼬리가 max(rebuild_min, 정렬된 행 수 * rebuild_ratio)를 넘으면 재정렬
+    """
+
+    def __init__(self, root, dim, tag=None, nprobe=8, rebuild_ratio=0.1, rebuild_min=1024):
+        self.root = root
+        self.dim = int(dim)
+        self.tag = tag
+        self.nprobe = int(nprobe)
+        self.rebuild_ratio = float(rebuild_ratio)
+        self.rebuild_min = int(rebuild_min)
+        self._lock = threading.RLock()
+        self._loaded_stamp = None
+        self._reset_state()
+
+    # ------------------------------------------------------------------
+    # 파일
+    # ------------------------------------------------------------------
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def _reset_state(self):
+        self.generation = 0
+        self.count = 0
+        self.sorted = 0
+        self.ids_bytes = 0
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.ids = []       # 행 -> id (교체된 이전 행 포함)
+        self.rows = {}      # id -> 살아 있는 행
+        self.alive = np.zeros(0, dtype=bool)
+        self.centroids = np.zeros((0, self.dim), dtype=np.float32)
+        self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+
+    def _open_vectors(self, mode):
+        path = self._path(f"vectors.{self.generation}.f32")
+        rows = os.path.getsize(path) // (self.dim * 4) if os.path.exists(path) else 0
+        if rows == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(path, dtype=np.float32, mode=mode, shape=(rows, self.dim))
+
+    def _meta_stamp(self):
+        st = os.stat(self._path("meta.json"))
+        return st.st_ino, st.st_mtime_ns
+
+    def _read_ids(self, generation, start, end):
+        """ids.<세대>.log의 [start, end) 바이트 -> id 목록"""
+        if end <= start:
+            return []
+        with open(self._path(f"ids.{generation}.log"), "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        if len(data) != end - start:
+            raise ValueError("ids log is shorter than meta.json")
+        return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+    def _apply_ids(self, new_ids):
+        """행을 순서대로 추가 (같은 id의 이전 행은 죽은 행으로)"""
+        start = len(self.ids)
+        self.alive = np.concatenate([self.alive, np.ones(len(new_ids), dtype=bool)])
+        for offset, track_id in enumerate(new_ids):
+            row = self.rows.get(track_id)
+            if row is not None:
+                self.alive[row] = False
+            self.rows[track_id] = start + offset
+        self.ids.extend(new_ids)
+
+    def refresh(self):
+        """다른 프로세스가 meta.json을 바꿨으면 다시 읽음 (같은 세대면 새로 붙은 id만)"""
+        with self._lock:
+            try:
+                stamp = self._meta_stamp()
+            except OSError:
+                if self._loaded_stamp is not None:
+                    self._reset_state()
+                    self._loaded_stamp = None
+                return
+            if stamp == self._loaded_stamp:
+                return
+            try:
+                with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("version") != INDEX_VERSION or meta.get("dim") != self.dim or \
+                        meta.get("tag") != self.tag:
+                    # 다른 방법으로 만든 벡터: 빈 인덱스로 보고 다음 추가는 새 세대 파일에 씀
+                    self._reset_state()
+                    self.generation = int(meta.get("generation", 0)) + 1
+                    self._loaded_stamp = stamp
+                    return
+
+                generation, count, ids_bytes = int(meta["generation"]), int(meta["count"]), int(meta["idsBytes"])
+                if self._loaded_stamp is not None and generation == self.generation and \
+                        count >= self.count and ids_bytes >= self.ids_bytes:
+                    new_ids = self._read_ids(generation, self.ids_bytes, ids_bytes)
+                    self._apply_ids(new_ids)
+                else:
+                    ids = self._read_ids(generation, 0, ids_bytes)
+                    offsets = np.load(self._path(f"offsets.{generation}.npy")) if int(meta["sorted"]) else \
+                        np.zeros(1, dtype=np.int64)
+                    centroids = (np.load(self._path(f"centroids.{generation}.npy")) if len(offsets) > 1
+                                 else np.zeros((0, self.dim), dtype=np.float32))
+                    self._reset_state()
+                    self.generation, self.offsets, self.centroids = generation, offsets, centroids
+                    self._apply_ids(ids)
+            except (OSError, ValueError, KeyError):
+                return  # 재정렬 중 이전 세대 파일이 지워졌으면 다음 호출에서 새 세대로
+            self.count, self.sorted, self.ids_bytes = count, int(meta["sorted"]), ids_bytes
+            self.vectors = self._open_vectors("r")
+            self._loaded_stamp = stamp
+
+    def _write_meta(self):
+        payload = {
+            "version": INDEX_VERSION,
+            "dim": self.dim,
+            "tag": self.tag,
+            "generation": self.generation,
+            "count": self.count,
+            "sorted": self.sorted,
+            "idsBytes": self.ids_bytes,
+        }
+        tmp_path = self._path(f"meta.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self._path("meta.json"))
+        self._loaded_stamp = self._meta_stamp()
+
+    def _append_ids(self, ids):
+        """ids.<세대>.log의 유효한 끝(idsBytes)부터 이어 씀"""
+        path = self._path(f"ids.{self.generation}.log")
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(self.ids_bytes)
+            f.seek(self.ids_bytes)
+            f.write("".join(json.dumps(track_id) + "\n" for track_id in ids).encode("utf-8"))
+            self.ids_bytes = f.tell()
+        self._apply_ids(list(ids))
+
+    def _acquire(self):
+        lock_path = self._path("index.lock")
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    stale = time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SEC
+                except OSError:
+                    continue
+                if stale:
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                time.sleep(LOCK_POLL_SEC)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return lock_path
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def add(self, ids, vectors):
+        """
+        벡터 추가 (같은 id가 있으면 교체). 꼬리가 길어지면 IVF를 다시 학습합니다.
+
+        Args:
+            ids: 문자열 id 목록 / vectors: (len(ids), dim)
+        """
+        vectors = _normalize(vectors).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError(f"ids ({len(ids)}) and vectors ({len(vectors)}) differ in length")
+        if len(ids) == 0:
+            return
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            lock_path = self._acquire()
+            try:
+                self.refresh()
+                self._append(vectors)
+                self._append_ids(ids)
+                self.count = len(self.ids)
+
+                live = len(self.rows)
+                if self.count - self.sorted > max(self.rebuild_min, self.sorted * self.rebuild_ratio) or \
+                        self.count > 2 * max(live, 1):
+                    self._rebuild()
+                self._write_meta()
+                self._remove_old_generations()
+            finally:
+                os.remove(lock_path)
+            self.vectors = self._open_vectors("r")
+
+    def _append(self, vectors):
+        path = self._path(f"vectors.{self.generation}.f32")
+        row_bytes = self.dim * 4
+        capacity = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        needed = self.count + len(vectors)
+        if needed > capacity:
+            with open(path, "ab") as f:
+                f.truncate(max(2 * capacity, needed, 1024) * row_bytes)
+        mm = self._open_vectors("r+")
+        mm[self.count:needed] = vectors
+        mm.flush()
+        del mm
+
+    def _rebuild(self):
+        """살아 있는 벡터로 중심 재학습 + 리스트 순서로 파일 재작성"""
+        live_rows = np.flatnonzero(self.alive_mask())
+        vectors = np.asarray(self._open_vectors("r")[live_rows])
+        ids = [self.ids[row] for row in live_rows]
+        nlist = int(np.clip(np.sqrt(len(vectors)), 1, 4096))
+        centroids = train_centroids(vectors, nlist)
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+
+        self.generation += 1
+        capacity = max(2 * len(vectors), 1024)
+        with open(self._path(f"vectors.{self.generation}.f32"), "wb") as f:
+            f.truncate(capacity * self.dim * 4)
+        mm = self._open_vectors("r+")
+        mm[:len(vectors)] = vectors[order]
+        mm.flush()
+        del mm
+        np.save(self._path(f"centroids.{self.generation}.npy"), centroids)
+        self.centroids = centroids
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))]).astype(np.int64)
+        np.save(self._path(f"offsets.{self.generation}.npy"), self.offsets)
+
+        self.ids, self.rows, self.alive, self.ids_bytes = [], {}, np.zeros(0, dtype=bool), 0
+        self._append_ids([ids[i] for i in order])
+        self.count = self.sorted = len(self.ids)
+
+    def _remove_old_generations(self):
+        """이전 세대 파일 삭제 (다른 프로세스가 아직 열고 있어서 지우지 못하면 다음 재정렬 때 다시 시도)"""
+        for name in os.listdir(self.root):
+            parts = name.split(".")
+            if len(parts) == 3 and parts[0] in ("vectors", "centroids", "offsets", "ids") and parts[1].isdigit() \
+                    and int(parts[1]) < self.generation:
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def alive_mask(self):
+        return self.alive[:self.count]
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def __len__(self):
+        self.refresh()
+        return len(self.rows)
+
+    def __contains__(self, track_id):
+        self.refresh()
+        return track_id in self.rows
+
+    def get(self, track_id):
+        """저장된 (단위) 벡터, 없으면 None"""
+        self.refresh()
+        with self._lock:
+            row = self.rows.get(track_id)
+            return None if row is None else np.array(self.vectors[row])
+
+    def search(self, query, k=10, nprobe=None, exclude=()):
+        """
+        코사인 유사도 상위 k개
+
+        Returns:
+            [(id, score), ...] 내림차순
+        """
+        self.refresh()
+        with self._lock:
+            if not self.rows:
+                return []
+            q = _normalize(query).reshape(self.dim)
+            nprobe = min(int(nprobe or self.nprobe), len(self.centroids))
+
+            blocks, starts = [], []
+            if nprobe:
+                lists = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+                for l in lists:
+                    lo, hi = int(self.offsets[l]), int(self.offsets[l + 1])
+                    if hi > lo:
+                        blocks.append(self.vectors[lo:hi])
+                        starts.append(np.arange(lo, hi))
+            if self.count > self.sorted:
+                blocks.append(self.vectors[self.sorted:self.count])
+                starts.append(np.arange(self.sorted, self.count))
+            if not blocks:
+                return []
+
+            rows = np.concatenate(starts)
+            scores = np.concatenate(blocks) @ q
+            scores[~self.alive[rows]] = -np.inf
+            for track_id in exclude:
+                row = self.rows.get(track_id)
+                if row is not None:
+                    scores[rows == row] = -np.inf
+
+            k = min(int(k), len(scores))
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            return [(self.ids[rows[i]], float(scores[i])) for i in best if np.isfinite(scores[i])]
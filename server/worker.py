@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+worker.py - 분산 작업 워커 (큐에서 스템 분리/분석/렌더링 작업을 가져와 실행, services/distributed.py)
+
+API 노드가 config.DISTRIBUTED_TASKS(DAW_DISTRIBUTED_TASKS)에 넣은 종류의 작업을 큐(config.TASK_QUEUE_URL)에 넣으면
+워커가 가져가 실행하고 결과를 공유 저장소(config.ARTIFACT_STORE_URL)에 올립니다.
+CPU 노드를 늘릴 때는 같은 큐/저장소를 가리키는 워커만 더 띄우면 됩니다 (API 쪽 변경 없음).
+
+    - 작업을 실행하는 동안 config.TASK_HEARTBEAT_SEC마다 하트비트로 점유를 연장하고 진행률을 기록
+    - 워커가 죽으면 점유 시간(config.TASK_LEASE_SEC)이 지난 뒤 다른 워커가 다시 가져감 (config.TASK_MAX_ATTEMPTS번까지)
+    - SIGTERM/SIGINT: 실행 중인 작업을 끝내고 종료
+
+사용법:
+    python worker.py                                   # 모든 종류 (separate, analyze, render)
+    python worker.py --kinds separate,analyze --id cpu-1
+    python worker.py --once                            # 작업 하나만 처리하고 종료 (빈 큐면 바로 종료)
+"""
+
+import io
+import os
+import sys
+import json
+import signal
+import socket
+import argparse
+import threading
+import traceback
+from contextlib import redirect_stdout
+
+# 현재 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from services.task_queue import get_task_queue
+from services.artifact_store import get_artifact_store
+from services.distributed import TASK_KINDS, run_task
+
+
+class ProgressTap(io.TextIOBase):
+    """작업이 stdout에 쓰는 진행률 JSON({"progress", "message"})의 마지막 값을 기억하며 그대로 출력"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.progress = None
+        self.message = None
+        self._line = ""
+
+    def write(self, text):
+        self.stream.write(text)
+        self._line += text
+        *lines, self._line = self._line.split("\n")
+        for line in lines:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(msg, dict) and "progress" in msg and msg.get("stage") != "commit":
+                self.progress, self.message = msg["progress"], msg.get("message")
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class Heartbeat(threading.Thread):
+    """실행 중인 작업의 점유 연장 + 진행률 기록"""
+
+    def __init__(self, queue, task, tap):
+        super().__init__(daemon=True)
+        self.queue, self.task, self.tap = queue, task, tap
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(config.TASK_HEARTBEAT_SEC):
+            try:
+                alive = self.queue.heartbeat(self.task["id"], self.task["lease"], progress=self.tap.progress,
+                                             message=self.tap.message)
+            except Exception as e:
+                sys.stderr.write(f"Heartbeat failed: {e}\n")
+                continue
+            if not alive and not self.lost:
+                # 다른 워커가 다시 가져간 작업: 끝까지 실행하지만 결과는 기록되지 않음
+                self.lost = True
+                sys.stderr.write(f"Lease lost: task {self.task['id']} ({self.task['kind']})\n")
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def process_task(queue, store, task):
+    """점유한 작업 하나 실행 + 결과/실패 기록. Returns: 기록됐는지"""
+    sys.stderr.write(f"▶ Task {task['id']} ({task['kind']}, attempt {task['attempts']}/{task['max_attempts']})\n")
+    tap = ProgressTap(sys.stdout)
+    heartbeat = Heartbeat(queue, task, tap)
+    heartbeat.start()
+    try:
+        with redirect_stdout(tap):
+            result = run_task(task["kind"], task["payload"], store)
+    except Exception as e:
+        heartbeat.stop()
+        traceback.print_exc()
+        recorded = queue.fail(task["id"], task["lease"], f"{type(e).__name__}: {e}", retry=True)
+        sys.stderr.write(f"✖ Task {task['id']} failed: {e}\n")
+        return recorded
+    heartbeat.stop()
+    recorded = queue.complete(task["id"], task["lease"], result)
+    sys.stderr.write(f"✔ Task {task['id']} done{'' if recorded else ' (lease lost, result discarded)'}\n")
+    return recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", default=",".join(TASK_KINDS), help="처리할 작업 종류 (쉼표 구분)")
+    parser.add_argument("--id", default=f"{socket.gethostname()}-{os.getpid()}", help="워커 이름 (큐에 기록)")
+    parser.add_argument("--queue", default=None, help="큐 URL (기본 config.TASK_QUEUE_URL)")
+    parser.add_argument("--store", default=None, help="저장소 URL (기본 config.ARTIFACT_STORE_URL)")
+    parser.add_argument("--once", action="store_true", help="작업 하나만 처리하고 종료")
+    args = parser.parse_args()
+
+    kinds = [kind for kind in args.kinds.split(",") if kind]
+    unknown = set(kinds) - set(TASK_KINDS)
+    if unknown:
+        parser.error(f"Unknown task kinds: {sorted(unknown)} (choose from {TASK_KINDS})")
+
+    # 워커 안에서는 항상 로컬 실행 (다시 큐로 보내지 않음)
+    config.DISTRIBUTED_TASKS = []
+    queue = get_task_queue(args.queue)
+    store = get_artifact_store(args.store)
+
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+
+    sys.stderr.write(f"Worker {args.id}: {', '.join(kinds)} (queue {args.queue or config.TASK_QUEUE_URL})\n")
+    while not stopping.is_set():
+        task = queue.lease(kinds, args.id)
+        if task is None:
+            if args.once:
+                break
+            stopping.wait(config.TASK_POLL_SEC)
+            continue
+        process_task(queue, store, task)
+        if args.once:
+            break
+
+
+if __name__ == "__main__":
+    main()